@@ -2,6 +2,8 @@
 FeedForward Application Package
 """
 
+import asyncio
+import contextlib
 import inspect
 import os
 import secrets
@@ -66,6 +68,29 @@ favicon = fh.Link(
 # errors, so they are dev-only; session cookies tighten in production too.
 _IS_PROD = os.environ.get("FEEDFORWARD_ENV", "dev") == "production"
 
+
+@contextlib.asynccontextmanager
+async def _lifespan(app):
+    """Background services for the app's lifetime: the health monitor, the
+    mail worker (when mail is still queued from before a restart) and the
+    resumption of feedback batch jobs left running by a timeout or restart."""
+    # Imported here: the models must not load before DATABASE_PATH is final.
+    from app.models.outbox import email_outbox
+    from app.services import feedback_batch, health_monitor
+    from app.utils import email
+
+    health_monitor.start()
+    if email_outbox.count_where("status = ?", ["queued"]):
+        email.start_mail_worker()
+    feedback_batch.start_resume()
+    try:
+        yield
+    finally:
+        await feedback_batch.stop_resume()
+        await asyncio.to_thread(email.stop_mail_worker)
+        await health_monitor.stop()
+
+
 app, rt = fh.fast_app(
     live=not _IS_PROD,
     debug=not _IS_PROD,
@@ -78,6 +103,7 @@ app, rt = fh.fast_app(
     same_site="lax",
     sess_https_only=_IS_PROD,
     max_age=7 * 24 * 3600,  # sessions expire after a week, not a year
+    lifespan=_lifespan,
 )
 
 # We'll use explicit route handlers for error pages instead of exception handlers
@@ -90,6 +116,31 @@ async def _maybe_await(result):
     return await result if inspect.isawaitable(result) else result
 
 
+def _user_injector(f, wrapper):
+    """Let ``wrapper`` hand the resolved user to ``f`` as its ``user`` argument.
+
+    Handlers opt in by declaring a ``user`` parameter. It is hidden from the
+    wrapper's signature so FastHTML doesn't try to fill it from the request;
+    the returned ``call(user, session, *args, **kwargs)`` binds the
+    request-filled arguments by name and adds ``user``.
+    """
+    sig = inspect.signature(f)
+    if "user" not in sig.parameters:
+        wrapper.__signature__ = sig
+        return lambda user, *args, **kwargs: f(*args, **kwargs)
+
+    visible = sig.replace(
+        parameters=[p for name, p in sig.parameters.items() if name != "user"]
+    )
+    wrapper.__signature__ = visible
+
+    def call(user, *args, **kwargs):
+        bound = visible.bind(*args, **kwargs)
+        return f(**bound.arguments, user=user)
+
+    return call
+
+
 # --- Basic Authentication Decorator ---
 def basic_auth(f):
     @wraps(f)
@@ -98,9 +149,9 @@ def basic_auth(f):
             return fh.RedirectResponse("/login", status_code=303)
 
         try:
-            from app.models.user import users
+            from app.models.user import get_user
 
-            user = users[session["auth"]]
+            user = get_user(session["auth"])
             # Add role check based on domain
             if not user.verified:
                 del session["auth"]
@@ -109,8 +160,9 @@ def basic_auth(f):
             del session["auth"]
             return fh.RedirectResponse("/login", status_code=303)
 
-        return await _maybe_await(f(session, *args, **kwargs))
+        return await _maybe_await(call(user, session, *args, **kwargs))
 
+    call = _user_injector(f, wrapper)
     return wrapper
 
 
@@ -121,17 +173,18 @@ def login_required(f):
     @wraps(f)
     async def wrapper(session, *args, **kwargs):
         try:
-            from app.models.user import users
+            from app.models.user import get_user
 
-            user = users[session["auth"]]
+            user = get_user(session["auth"])
             if not user.verified:
                 del session["auth"]
                 return fh.RedirectResponse("/login", status_code=303)
         except Exception:
             return fh.RedirectResponse("/login", status_code=303)
 
-        return await _maybe_await(f(session, *args, **kwargs))
+        return await _maybe_await(call(user, session, *args, **kwargs))
 
+    call = _user_injector(f, wrapper)
     return wrapper
 
 
@@ -141,9 +194,9 @@ def role_required(role):
         @wraps(f)
         async def wrapper(session, *args, **kwargs):
             try:
-                from app.models.user import Role, users
+                from app.models.user import Role, get_user
 
-                user = users[session["auth"]]
+                user = get_user(session["auth"])
                 # Sessions for unverified (or unapproved instructor) accounts
                 # must not reach role-gated pages.
                 if not user.verified or (
@@ -163,8 +216,9 @@ def role_required(role):
             except Exception:
                 return fh.RedirectResponse("/login", status_code=303)
 
-            return await _maybe_await(f(session, *args, **kwargs))
+            return await _maybe_await(call(user, session, *args, **kwargs))
 
+        call = _user_injector(f, wrapper)
         return wrapper
 
     return decorator
@@ -43,11 +43,20 @@ if assessment_services not in db.t:
             "is_active": bool,
             "last_health_check": str,
             "health_status": str,  # 'healthy', 'unhealthy', 'unknown'
+            "health_error": str,  # Last probe failure, if any
+            "service_version": str,  # As reported by /health
             "created_at": str,
             "updated_at": str,
         },
         pk="id",
     )
+else:
+    # Migration: health monitor detail columns added 2026-10-19.
+    _as_cols = {c.name for c in assessment_services.columns}
+    if "health_error" not in _as_cols:
+        assessment_services.add_column("health_error", str)
+    if "service_version" not in _as_cols:
+        assessment_services.add_column("service_version", str)
 AssessmentService = assessment_services.dataclass()
 
 # Define submission_files table
@@ -69,3 +78,52 @@ if submission_files not in db.t:
         pk="id",
     )
 SubmissionFile = submission_files.dataclass()
+# Reference counts for the content-addressed store come from live rows here
+submission_files.create_index(["checksum"], if_not_exists=True)
+
+# Define file_blobs table — one row per distinct uploaded file (by SHA-256);
+# see app/services/file_store.py
+file_blobs = db.t.file_blobs
+if file_blobs not in db.t:
+    file_blobs.create(
+        {
+            "checksum": str,  # SHA256 hash — also the blob's storage name
+            "file_size": int,
+            "created_at": str,
+            "last_stored_at": str,  # Latest upload of these bytes (GC grace)
+        },
+        pk="checksum",
+    )
+FileBlob = file_blobs.dataclass()
+
+# Define extracted_texts table — text extracted from a blob, per extractor
+# version (a budget or parser change yields a new version)
+extracted_texts = db.t.extracted_texts
+if extracted_texts not in db.t:
+    extracted_texts.create(
+        {
+            "id": int,
+            "checksum": str,
+            "extractor_version": str,
+            "text": str,
+            "extracted_at": str,
+            "size": int,  # Bytes of text, for the cache size bound
+            "hits": int,
+            "last_used_at": str,  # LRU eviction order
+        },
+        pk="id",
+    )
+    extracted_texts.create_index(
+        ["checksum", "extractor_version"], unique=True, if_not_exists=True
+    )
+else:
+    # Migration: LRU bookkeeping for the text cache added 2026-10-19.
+    _et_cols = {c.name for c in extracted_texts.columns}
+    if "size" not in _et_cols:
+        extracted_texts.add_column("size", int)
+    if "hits" not in _et_cols:
+        extracted_texts.add_column("hits", int)
+    if "last_used_at" not in _et_cols:
+        extracted_texts.add_column("last_used_at", str)
+extracted_texts.create_index(["last_used_at"], if_not_exists=True)
+ExtractedText = extracted_texts.dataclass()
@@ -34,6 +34,7 @@ if assignments not in db.t:
         },
         pk="id",
     )
+assignments.create_index(["course_id"], if_not_exists=True)
 Assignment = assignments.dataclass()
 
 # Define rubrics table if it doesn't exist
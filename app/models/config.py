@@ -74,11 +74,26 @@ if ai_models not in db.t:
             "capabilities": str,  # JSON array of capabilities: ['text', 'vision', 'code', 'audio']
             "max_context": int,  # Maximum context length
             "active": bool,
+            "health_status": str,  # From the health monitor; see llm_health statuses
+            "health_error": str,
+            "health_latency": float,  # Probe round-trip in seconds
+            "last_health_check": str,
             "created_at": str,
             "updated_at": str,
         },
         pk="id",
     )
+else:
+    # Migration: health monitor columns added 2026-10-19.
+    _am_cols = {c.name for c in ai_models.columns}
+    for _col, _type in (
+        ("health_status", str),
+        ("health_error", str),
+        ("health_latency", float),
+        ("last_health_check", str),
+    ):
+        if _col not in _am_cols:
+            ai_models.add_column(_col, _type)
 AIModel = ai_models.dataclass()
 
 # Define model capabilities table for easier querying
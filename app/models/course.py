@@ -26,10 +26,12 @@ elif "description" not in {c.name for c in courses.columns}:
     # Migration: the course forms always offered a Description field, but the
     # column was never created, so the create/update handlers crashed.
     courses.add_column("description", str)
+courses.create_index(["instructor_email"], if_not_exists=True)
 Course = courses.dataclass()
 
 # Define enrollments table if it doesn't exist
 enrollments = db.t.enrollments
 if enrollments not in db.t:
     enrollments.create({"id": int, "course_id": int, "student_email": str}, pk="id")
+enrollments.create_index(["student_email"], if_not_exists=True)
 Enrollment = enrollments.dataclass()
@@ -46,6 +46,8 @@ if drafts not in db.t:
         },
         pk="id",
     )
+# Per-assignment newest-first reads (instructor recent activity)
+drafts.create_index(["assignment_id", "submission_date"], if_not_exists=True)
 Draft = drafts.dataclass()
 
 # Define model runs table if it doesn't exist
@@ -64,6 +66,7 @@ if model_runs not in db.t:
             "preprocessing_service_id": int,  # Track which service processed the submission
             "service_response_time": float,  # Time in seconds
             "input_tokens": int,  # LLM prompt tokens (cost tracking)
+            "cached_tokens": int,  # Prompt tokens served from a provider prefix cache
             "output_tokens": int,  # LLM completion tokens (cost tracking)
             "cost_usd": float,  # Estimated cost of this run in USD
         },
@@ -78,8 +81,35 @@ else:
         model_runs.add_column("output_tokens", int)
     if "cost_usd" not in _mr_cols:
         model_runs.add_column("cost_usd", float)
+    # Migration: prompt-prefix cache accounting added 2026-10-19.
+    if "cached_tokens" not in _mr_cols:
+        model_runs.add_column("cached_tokens", int)
 ModelRun = model_runs.dataclass()
 
+# Define feedback batches table if it doesn't exist — provider batch-API jobs
+# for bulk feedback runs (see services/feedback_batch.py)
+feedback_batches = db.t.feedback_batches
+if feedback_batches not in db.t:
+    feedback_batches.create(
+        {
+            "id": int,
+            "assignment_id": int,
+            "model_id": int,
+            "group_key": str,  # Shared by every job from one bulk run
+            "provider_batch_id": str,
+            "input_file_id": str,
+            "output_file_id": str,
+            "error_file_id": str,
+            "model_run_ids": str,  # JSON list of model_runs.id in this job
+            "request_count": int,
+            "status": str,  # provider status: 'validating', 'in_progress', 'completed', 'failed', ...
+            "created_at": str,
+            "completed_at": str,
+        },
+        pk="id",
+    )
+FeedbackBatch = feedback_batches.dataclass()
+
 # Define category scores table if it doesn't exist
 category_scores = db.t.category_scores
 if category_scores not in db.t:
@@ -148,4 +178,29 @@ if aggregated_feedback not in db.t:
         },
         pk="id",
     )
+# Per-draft reads (review pages, exports, cohort analytics joins)
+aggregated_feedback.create_index(["draft_id"], if_not_exists=True)
 AggregatedFeedback = aggregated_feedback.dataclass()
+
+# Define progress snapshots table if it doesn't exist — one precomputed
+# progress history per student and assignment (see services/progress_snapshot.py)
+progress_snapshots = db.t.progress_snapshots
+if progress_snapshots not in db.t:
+    progress_snapshots.create(
+        {
+            "id": int,
+            "student_email": str,
+            "assignment_id": int,
+            "entries": str,  # JSON list of per-draft score entries, oldest first
+            "metrics": str,  # JSON improvement metrics over those entries
+            "recommendations": str,  # JSON next steps for recommendations_draft_id
+            "recommendations_draft_id": int,
+            "rubric_key": str,  # Rubric categories the scores were computed with
+            "updated_at": str,
+        },
+        pk="id",
+    )
+progress_snapshots.create_index(
+    ["student_email", "assignment_id"], unique=True, if_not_exists=True
+)
+ProgressSnapshot = progress_snapshots.dataclass()
@@ -0,0 +1,29 @@
+"""
+Outbound email queue — messages waiting for the mail worker
+(see app/utils/email.py: queue_email / deliver_due).
+
+Rows are deleted once delivered; a message that keeps failing is kept with
+status 'failed' and its last error for the admin to inspect.
+"""
+
+from app.models.user import db
+
+# Define email_outbox table if it doesn't exist
+email_outbox = db.t.email_outbox
+if email_outbox not in db.t:
+    email_outbox.create(
+        {
+            "id": int,
+            "to_email": str,
+            "subject": str,
+            "content": str,  # plain-text body
+            "status": str,  # 'queued' or 'failed'
+            "attempts": int,  # delivery attempts so far
+            "last_error": str,
+            "created_at": str,
+            "next_attempt_at": str,  # ISO timestamp; due when <= now
+        },
+        pk="id",
+    )
+    email_outbox.create_index(["status", "next_attempt_at"], if_not_exists=True)
+OutboxEmail = email_outbox.dataclass()
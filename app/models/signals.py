@@ -24,3 +24,25 @@ if signals not in db.t:
         pk="id",
     )
 Signal = signals.dataclass()
+
+# Define signal_backfill table — lens sources skipped for a draft because the
+# analyser was down (circuit open or health monitor), to re-extract later
+# (see signal_service.backfill_skipped_signals)
+signal_backfill = db.t.signal_backfill
+if signal_backfill not in db.t:
+    signal_backfill.create(
+        {
+            "id": int,
+            "draft_id": int,
+            "source": str,  # analyser that was skipped
+            "reason": str,  # 'circuit_open', 'service_down', 'request_failed'
+            "attempts": int,  # backfill attempts so far
+            "created_at": str,
+            "last_attempt_at": str,
+        },
+        pk="id",
+    )
+    signal_backfill.create_index(
+        ["draft_id", "source"], unique=True, if_not_exists=True
+    )
+SignalBackfill = signal_backfill.dataclass()
@@ -3,9 +3,15 @@ User model definitions
 """
 
 # Initialize database
+import copy
 import os
+import threading
+import time
+from datetime import datetime
 from enum import Enum
+from typing import Any, Optional
 
+from apswutils.db import NotFoundError
 from fasthtml.common import database
 
 # Use absolute path in Docker, relative path for local development
@@ -37,6 +43,7 @@ if users not in db.t:
             "role": str,
             "verified": bool,
             "verification_token": str,
+            "verification_token_expiry": str,  # ISO timestamp; empty = no expiry
             "approved": bool,
             "department": str,
             "reset_token": str,
@@ -46,6 +53,86 @@ if users not in db.t:
         },
         pk="email",
     )
+else:
+    # Migration: expiring verification/invitation tokens added 2026-10-19.
+    if "verification_token_expiry" not in {c.name for c in users.columns}:
+        users.add_column("verification_token_expiry", str)
+# Token-bearing links (/verify, /student/join, /reset-password) resolve their
+# user through these indexes rather than scanning every account.
+users.create_index(["verification_token"], if_not_exists=True)
+users.create_index(["reset_token"], if_not_exists=True)
 
 # Create user dataclass
 User = users.dataclass()
+
+
+# Short-TTL identity cache. Every authenticated request resolves the session
+# user; the auth decorators in app/__init__.py go through get_user() so a
+# burst of requests (HTMX polling, page + fragments) costs one primary-key
+# lookup rather than one per request. Writes that change what the decorators
+# check — profile edits, verification/approval, password resets, deletion —
+# call invalidate_user(); the TTL bounds staleness from other processes.
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", "30"))
+
+_user_cache: dict[str, tuple[float, Any]] = {}
+_user_cache_lock = threading.Lock()
+
+
+def get_user(email: str) -> Optional[Any]:
+    """The user row for ``email`` (a private copy), or ``None`` if absent."""
+    now = time.monotonic()
+    with _user_cache_lock:
+        hit = _user_cache.get(email)
+    if hit is not None and hit[0] > now:
+        return copy.copy(hit[1])
+    try:
+        user = users[email]
+    except NotFoundError:
+        invalidate_user(email)
+        return None
+    if USER_CACHE_TTL > 0:
+        with _user_cache_lock:
+            _user_cache[email] = (now + USER_CACHE_TTL, user)
+    return copy.copy(user)
+
+
+def invalidate_user(email: str) -> None:
+    """Drop ``email`` from the identity cache after a write to its row."""
+    with _user_cache_lock:
+        _user_cache.pop(email, None)
+
+
+def clear_user_cache() -> None:
+    """Empty the identity cache (tests, bulk user imports)."""
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+_TOKEN_COLUMNS = {
+    "verification": ("verification_token", "verification_token_expiry"),
+    "reset": ("reset_token", "reset_token_expiry"),
+}
+
+
+def find_user_by_token(token: str, kind: str = "verification") -> Optional[Any]:
+    """The user holding a live ``kind`` token ('verification' or 'reset').
+
+    One indexed lookup. Expired tokens resolve to ``None``; a verification
+    token issued before expiries were recorded (empty expiry) stays valid.
+    """
+    from app.utils.db_query import first
+
+    if not token:
+        return None
+    column, expiry_column = _TOKEN_COLUMNS[kind]
+    user = first(users, **{column: token})
+    if user is None:
+        return None
+    expiry = getattr(user, expiry_column, "") or ""
+    if not expiry:
+        return user if kind == "verification" else None
+    try:
+        expired = datetime.fromisoformat(expiry) <= datetime.now()
+    except ValueError:
+        expired = True
+    return None if expired else user
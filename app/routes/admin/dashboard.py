@@ -2,17 +2,20 @@
 Admin dashboard routes
 """
 
+import asyncio
+
 from fasthtml import common as fh
 
 from app import admin_required, rt
-from app.models.user import Role, users
-from app.utils import analyser_client
+from app.models.user import Role
+from app.services import health_monitor
 from app.utils.ui import action_button, card, dashboard_layout
 
 
 def _signal_services_card():
-    """Dashboard summary card: how many lens analysers are currently reachable."""
-    services = analyser_client.service_health()
+    """Dashboard summary card: how many lens analysers were reachable at the
+    last background health check."""
+    services = health_monitor.cached_service_health()
     up = sum(1 for s in services if s["ok"])
     total = len(services)
     colour = (
@@ -43,11 +46,8 @@ def _signal_services_card():
 
 @rt("/admin/dashboard")
 @admin_required
-def admin_dashboard(session):
+def admin_dashboard(session, user):
     """Admin dashboard view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Sidebar content
     sidebar_content = fh.Div(
         # User welcome card
@@ -239,24 +239,29 @@ def admin_dashboard(session):
 @rt("/admin/signal-services")
 @admin_required
 def admin_signal_services(session):
-    """Live health of the lens analyser sidecars (ADR 012).
+    """Health of the lens analyser sidecars (ADR 012).
 
-    Probes each analyser's /health so an operator can see, at a glance, whether
-    signals will be extracted — and which sidecar to start if not.
+    Shows each analyser's status from the background health monitor so an
+    operator can see, at a glance, whether signals will be extracted — and
+    which sidecar to start if not. "Check now" probes on demand.
     """
-    services = analyser_client.service_health()
+    services = health_monitor.cached_service_health()
+    checked = max((s["checked_at"] or "" for s in services), default="")
 
     rows = []
     for s in services:
-        if s["ok"]:
+        if s["status"] == "healthy":
             status = fh.Span("● reachable", cls="text-sm font-semibold text-green-600")
             detail = fh.Span(
                 f"v{s['version']}" if s["version"] else "running",
                 cls="text-xs text-gray-500",
             )
-        else:
+        elif s["status"] == "unhealthy":
             status = fh.Span("● down", cls="text-sm font-semibold text-red-600")
             detail = fh.Span(s["error"] or "unreachable", cls="text-xs text-gray-500")
+        else:
+            status = fh.Span("● unknown", cls="text-sm font-semibold text-gray-400")
+            detail = fh.Span("not checked recently", cls="text-xs text-gray-500")
         rows.append(
             fh.Div(
                 fh.Div(
@@ -291,7 +296,23 @@ def admin_signal_services(session):
             "variable (DOCUMENT_ANALYSER_URL / CODE_ANALYSER_URL / CITE_SIGHT_URL).",
             cls="text-sm text-gray-500 mb-4",
         ),
-        fh.Div(*rows, cls="bg-white p-6 rounded-lg shadow mb-6"),
+        fh.Div(*rows, cls="bg-white p-6 rounded-lg shadow mb-2"),
+        fh.Form(
+            fh.Span(
+                f"Last checked {checked[:16].replace('T', ' ')}"
+                if checked
+                else "Not checked yet",
+                cls="text-xs text-gray-400",
+            ),
+            fh.Button(
+                "Check now",
+                type="submit",
+                cls="text-xs text-teal-600 hover:text-teal-700 font-medium",
+            ),
+            method="post",
+            action="/admin/signal-services/check",
+            cls="flex items-center justify-end gap-3 mb-6",
+        ),
         fh.P(
             "Start all three locally with: ",
             fh.Code("make sidecars", cls="text-xs bg-gray-100 px-2 py-1 rounded"),
@@ -308,6 +329,52 @@ def admin_signal_services(session):
     )
 
 
+@rt("/admin/signal-services/check", methods=["post"])
+@admin_required
+async def admin_signal_services_check(session):
+    """Probe the analysers now instead of waiting for the next round."""
+    await asyncio.to_thread(health_monitor.check_analysers)
+    return fh.RedirectResponse("/admin/signal-services", status_code=303)
+
+
+def _text_cache_card():
+    """Document text cache size and this worker's hit rate."""
+    from app.utils.text_cache import cache_stats
+
+    stats = cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    rows = [
+        ("Cached documents", f"{stats['entries']:,}"),
+        (
+            "Cache size",
+            f"{stats['bytes'] / 1e6:,.1f} / {stats['max_bytes'] / 1e6:,.0f} MB",
+        ),
+        (
+            "Hit rate",
+            f"{stats['hit_rate']:.0%} of {lookups:,} lookups" if lookups else "—",
+        ),
+        ("Evictions", f"{stats['evictions']:,}"),
+    ]
+    return fh.Div(
+        fh.H2("Document Text Cache", cls="text-lg font-semibold text-gray-900 mb-1"),
+        fh.P(
+            "Text extracted from uploaded PDF and Word files, reused when the "
+            "same file is seen again. Hit rate and evictions count since this "
+            "server process started.",
+            cls="text-sm text-gray-500 mb-3",
+        ),
+        *[
+            fh.Div(
+                fh.Span(label, cls="text-sm text-gray-600"),
+                fh.Span(value, cls="text-sm text-gray-900 font-mono tabular-nums"),
+                cls="flex justify-between py-1 border-b border-gray-100 last:border-0",
+            )
+            for label, value in rows
+        ],
+        cls="bg-white p-6 rounded-lg shadow mb-6",
+    )
+
+
 @rt("/admin/usage")
 @admin_required
 def admin_usage(session):
@@ -322,6 +389,7 @@ def admin_usage(session):
     grand = {
         "llm_runs": sum(r["llm_runs"] for r in rows),
         "input_tokens": sum(r["input_tokens"] for r in rows),
+        "cached_tokens": sum(r["cached_tokens"] for r in rows),
         "output_tokens": sum(r["output_tokens"] for r in rows),
         "cost_usd": round(sum(r["cost_usd"] for r in rows), 4),
     }
@@ -332,9 +400,16 @@ def admin_usage(session):
     header = fh.Div(
         *[
             fh.Span(label, cls="text-xs font-semibold text-gray-500 uppercase")
-            for label in ("Course", "Runs", "Input tok", "Output tok", "Cost (USD)")
+            for label in (
+                "Course",
+                "Runs",
+                "Input tok",
+                "Cached tok",
+                "Output tok",
+                "Cost (USD)",
+            )
         ],
-        cls="grid grid-cols-5 gap-2 pb-2 border-b border-gray-200",
+        cls="grid grid-cols-6 gap-2 pb-2 border-b border-gray-200",
     )
 
     body_rows = [
@@ -345,12 +420,13 @@ def admin_usage(session):
             ),
             _num(r["llm_runs"]),
             _num(r["input_tokens"]),
+            _num(r["cached_tokens"]),
             _num(r["output_tokens"]),
             fh.Span(
                 f"${r['cost_usd']:.4f}",
                 cls="text-sm text-gray-900 font-mono tabular-nums",
             ),
-            cls="grid grid-cols-5 gap-2 py-2 border-b border-gray-100 last:border-0",
+            cls="grid grid-cols-6 gap-2 py-2 border-b border-gray-100 last:border-0",
         )
         for r in rows
     ] or [fh.P("No feedback has been generated yet.", cls="text-gray-500 py-4")]
@@ -360,12 +436,13 @@ def admin_usage(session):
             fh.Span("All courses", cls="text-sm font-semibold text-gray-900"),
             _num(grand["llm_runs"]),
             _num(grand["input_tokens"]),
+            _num(grand["cached_tokens"]),
             _num(grand["output_tokens"]),
             fh.Span(
                 f"${grand['cost_usd']:.4f}",
                 cls="text-sm font-semibold text-gray-900 font-mono tabular-nums",
             ),
-            cls="grid grid-cols-5 gap-2 pt-3 mt-1 border-t-2 border-gray-300",
+            cls="grid grid-cols-6 gap-2 pt-3 mt-1 border-t-2 border-gray-300",
         )
         if rows
         else fh.Div()
@@ -384,13 +461,16 @@ def admin_usage(session):
         fh.P(
             "Token usage and estimated cost from AI feedback generation, summed "
             "per course. Cost is LiteLLM's estimate from each provider's price "
-            "map; providers that don't report usage contribute zero. Signal-engine "
-            "and mock runs are excluded.",
+            "map; providers that don't report usage contribute zero. Cached tokens "
+            "are the share of input served from a provider prompt cache (the "
+            "shared assignment and rubric prefix). Signal-engine and mock runs "
+            "are excluded.",
             cls="text-sm text-gray-500 mb-4",
         ),
         fh.Div(
             header, *body_rows, grand_row, cls="bg-white p-6 rounded-lg shadow mb-6"
         ),
+        _text_cache_card(),
         cls="max-w-3xl mx-auto px-4 py-6",
     )
     return dashboard_layout(
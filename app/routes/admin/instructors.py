@@ -6,7 +6,7 @@ from fasthtml import common as fh
 
 from app import admin_required, rt
 from app.models.course import courses, enrollments
-from app.models.user import Role, users
+from app.models.user import Role, invalidate_user, users
 from app.utils.ui import action_button, dashboard_layout
 
 
@@ -162,6 +162,7 @@ def admin_instructor_approve(session, email: str):
         # Update approval status
         instructor.approved = True
         users.update(instructor)
+        invalidate_user(instructor.email)
 
         # Return success message with auto-refresh
         return fh.Div(
@@ -183,6 +184,7 @@ def admin_instructor_reject(session, email: str):
     try:
         # Get the instructor and delete
         users.delete(email)
+        invalidate_user(email)
 
         # Return success message with auto-refresh
         return fh.Div(
@@ -401,9 +403,11 @@ def admin_instructor_remove(session, email: str):
         if hasattr(instructor, "status"):
             instructor.status = "deleted"
             users.update(instructor)
+            invalidate_user(email)
         else:
             # Hard delete if no status field
             users.delete(email)
+            invalidate_user(email)
 
         # Return success message with auto-refresh
         return fh.Div(
@@ -7,7 +7,25 @@ from fasthtml import common as fh
 from app import admin_required, rt
 from app.models.config import ai_models
 from app.models.user import Role
-from app.utils.ui import action_button, dashboard_layout
+from app.utils.ui import action_button, connection_test_result, dashboard_layout
+
+
+def _health_note(model):
+    """Last background health check of an active model, under its status."""
+    if not model.active or not model.health_status:
+        return ""
+    if model.health_status == "healthy":
+        latency = model.health_latency
+        text = f"● healthy ({latency:.1f}s)" if latency else "● healthy"
+        colour = "text-green-600"
+    else:
+        text = f"● {model.health_error or model.health_status}"
+        colour = "text-red-600"
+    return fh.Div(
+        text,
+        title=f"Checked {model.last_health_check[:16].replace('T', ' ')}",
+        cls=f"text-xs {colour} mt-1",
+    )
 
 
 @rt("/admin/ai-models")
@@ -177,6 +195,7 @@ def admin_models_list(session):
                                                     else "bg-gray-100 text-gray-800"
                                                 ),
                                             ),
+                                            _health_note(model),
                                             cls="py-4 px-6",
                                         ),
                                         fh.Td(
@@ -243,7 +262,6 @@ def admin_models_list(session):
 # - admin_models_create() - create model POST handler
 # - admin_models_edit() - edit model form
 # - admin_models_update() - update model POST handler
-# - admin_models_test() - test model API
 # - admin_models_delete() - delete model handler
 
 
@@ -392,6 +410,19 @@ def admin_models_new(session):
                 ),
                 cls="mb-6",
             ),
+            # Test configuration section
+            fh.Div(
+                fh.Button(
+                    "Test Connection",
+                    type="button",
+                    hx_post="/admin/ai-models/test",
+                    hx_include="closest form",
+                    hx_target="#test-result",
+                    cls="bg-gray-600 text-white px-4 py-2 rounded-md hover:bg-gray-700 transition-colors",
+                ),
+                fh.Div(id="test-result", cls="mt-4"),
+                cls="bg-gray-50 p-4 rounded-lg mb-6",
+            ),
             # Submit buttons
             fh.Div(
                 fh.Button(
@@ -444,9 +475,29 @@ def admin_models_edit_update(session, id: int):
 
 @rt("/admin/ai-models/test")
 @admin_required
-def admin_models_test(session):
-    """Placeholder for test AI model API"""
-    return fh.Div(fh.P("AI Model test API - To be implemented"))
+async def admin_models_test(
+    session,
+    provider: str = "",
+    model_id: str = "",
+    api_key: str = "",
+    base_url: str = "",
+):
+    """Test an AI model configuration (cached per configuration, see llm_health)"""
+    from app.services.llm_health import check_connection
+
+    if not provider:
+        return fh.Div(
+            fh.P("Please select a provider", cls="text-red-600"),
+            cls="p-4 bg-red-50 rounded-lg",
+        )
+    if not model_id and provider != "ollama":
+        return fh.Div(
+            fh.P("Please enter a model ID", cls="text-red-600"),
+            cls="p-4 bg-red-50 rounded-lg",
+        )
+
+    result = await check_connection(provider, model_id.strip(), api_key, base_url)
+    return connection_test_result(result)
 
 
 @rt("/admin/ai-models/{id}")
@@ -21,8 +21,9 @@ from fastlite import NotFoundError
 
 # Get the route table and FastHTML components from the app
 from app import rt
-from app.models.user import Role, User, users
+from app.models.user import Role, User, find_user_by_token, invalidate_user, users
 from app.utils.auth import (
+    VERIFICATION_TOKEN_HOURS,
     generate_token_expiry,
     get_password_hash,
     is_institutional_email,
@@ -33,7 +34,8 @@ from app.utils.auth import (
 from app.utils.email import (
     APP_DOMAIN,
     generate_verification_token,
-    send_email_async,
+    queue_password_reset_email,
+    queue_verification_email,
     send_password_reset_email,
     send_verification_email,
 )
@@ -201,6 +203,9 @@ def post(request, name: str, email: str, password: str, confirm_password: str):
             existing_user.password = get_password_hash(password)
             existing_user.verified = False
             existing_user.verification_token = token
+            existing_user.verification_token_expiry = generate_token_expiry(
+                VERIFICATION_TOKEN_HOURS
+            )
             existing_user.approved = auto_approve if role == Role.INSTRUCTOR else True
             existing_user.department = ""
             existing_user.reset_token = ""
@@ -210,10 +215,11 @@ def post(request, name: str, email: str, password: str, confirm_password: str):
 
             # Update in database
             users.update(existing_user)
+            invalidate_user(existing_user.email)
 
             # Send verification email
             if _IS_PROD:
-                send_email_async(send_verification_email, email, token)
+                queue_verification_email(email, token)
                 success, message = True, ""
             else:
                 success, message = send_verification_email(email, token)
@@ -280,6 +286,7 @@ def post(request, name: str, email: str, password: str, confirm_password: str):
             role=role,
             verified=False,
             verification_token=token,
+            verification_token_expiry=generate_token_expiry(VERIFICATION_TOKEN_HOURS),
             approved=auto_approve
             if role == Role.INSTRUCTOR
             else True,  # Auto-approve based on domain
@@ -295,7 +302,7 @@ def post(request, name: str, email: str, password: str, confirm_password: str):
 
         # Send verification email
         if _IS_PROD:
-            send_email_async(send_verification_email, email, token)
+            queue_verification_email(email, token)
             success, message = True, ""
         else:
             success, message = send_verification_email(email, token)
@@ -416,64 +423,58 @@ def get(token: str):
     # Import UI components
 
     # Debug print
-    # Look for a user with the matching token (constant-time comparison)
-    for user in users():
-        if user.verification_token and secrets.compare_digest(
-            user.verification_token, token
-        ):
-            user.verified = True
-            # Clear the token after successful verification
-            user.verification_token = ""
-            users.update(user)
-
-            # Success message content
-            verify_success_content = fh.Div(
+    # One indexed lookup; an expired token resolves to None
+    user = find_user_by_token(token)
+    if user is not None:
+        user.verified = True
+        # Clear the token after successful verification
+        user.verification_token = ""
+        user.verification_token_expiry = ""
+        users.update(user)
+        invalidate_user(user.email)
+
+        # Success message content
+        verify_success_content = fh.Div(
+            fh.Div(
                 fh.Div(
+                    # Success icon
+                    fh.Div(fh.Span("✅", cls="text-5xl block mb-4"), cls="text-center"),
+                    # Brand logo
                     fh.Div(
-                        # Success icon
-                        fh.Div(
-                            fh.Span("✅", cls="text-5xl block mb-4"), cls="text-center"
-                        ),
-                        # Brand logo
-                        fh.Div(
-                            fh.Span("Feed", cls="font-serif font-bold text-[#1a2e44]"),
-                            fh.Span(
-                                "Forward", cls="font-serif font-bold text-teal-600"
-                            ),
-                            cls="text-3xl mb-4 text-center",
-                        ),
-                        fh.H1(
-                            "Email Verified Successfully!",
-                            cls="font-serif text-2xl font-semibold text-[#1a2e44] mb-4 text-center",
-                        ),
-                        fh.P(
-                            "Your email has been verified."
-                            + (
-                                " You can now log in to your account."
-                                if user.approved
-                                else " Your account requires administrator approval before you can log in."
-                            ),
-                            cls="text-gray-600 mb-6 text-center",
+                        fh.Span("Feed", cls="font-serif font-bold text-[#1a2e44]"),
+                        fh.Span("Forward", cls="font-serif font-bold text-teal-600"),
+                        cls="text-3xl mb-4 text-center",
+                    ),
+                    fh.H1(
+                        "Email Verified Successfully!",
+                        cls="font-serif text-2xl font-semibold text-[#1a2e44] mb-4 text-center",
+                    ),
+                    fh.P(
+                        "Your email has been verified."
+                        + (
+                            " You can now log in to your account."
+                            if user.approved
+                            else " Your account requires administrator approval before you can log in."
                         ),
-                        fh.Div(
-                            fh.A(
-                                "Login to Your Account",
-                                href="/login",
-                                cls="inline-block bg-[#1a2e44] text-[#faf8f2] px-6 py-3 rounded font-medium uppercase tracking-[0.15em] text-sm hover:bg-[#0f1e30] transition-colors",
-                            ),
-                            cls="text-center",
+                        cls="text-gray-600 mb-6 text-center",
+                    ),
+                    fh.Div(
+                        fh.A(
+                            "Login to Your Account",
+                            href="/login",
+                            cls="inline-block bg-[#1a2e44] text-[#faf8f2] px-6 py-3 rounded font-medium uppercase tracking-[0.15em] text-sm hover:bg-[#0f1e30] transition-colors",
                         ),
                         cls="text-center",
                     ),
-                    cls="bg-[#fdfcf8] p-8 rounded border border-slate-300 max-w-md w-full",
+                    cls="text-center",
                 ),
-                cls="flex justify-center items-center py-16 px-4",
-            )
+                cls="bg-[#fdfcf8] p-8 rounded border border-slate-300 max-w-md w-full",
+            ),
+            cls="flex justify-center items-center py-16 px-4",
+        )
 
-            # Return the complete page
-            return page_container(
-                "Email Verified - FeedForward", verify_success_content
-            )
+        # Return the complete page
+        return page_container("Email Verified - FeedForward", verify_success_content)
 
     # Error message content for invalid token
     verify_error_content = fh.Div(
@@ -639,8 +640,10 @@ def post(session, request, email: str, password: str):
         # Re-issue a verification token so the user can recover from a stale one.
         token = generate_verification_token(email)
         user.verification_token = token
+        user.verification_token_expiry = generate_token_expiry(VERIFICATION_TOKEN_HOURS)
         users.update(user)
-        send_email_async(send_verification_email, email, token)
+        invalidate_user(user.email)
+        queue_verification_email(email, token)
         return fh.Div(
             fh.P(
                 "Your email is not verified yet. Please check your inbox or spam folder.",
@@ -761,10 +764,11 @@ def post(request, email: str):
         user.reset_token = reset_token
         user.reset_token_expiry = generate_token_expiry(24)
         users.update(user)
+        invalidate_user(user.email)
 
         # Send password reset email
         if _IS_PROD:
-            send_email_async(send_password_reset_email, email, reset_token)
+            queue_password_reset_email(email, reset_token)
             success, message = True, ""
         else:
             success, message = send_password_reset_email(email, reset_token)
@@ -821,18 +825,9 @@ def get(token: str):
     # Import UI components
 
     # Validate token
-    valid_token = False
-    user_email = ""
-
-    for user in users():
-        if (
-            user.reset_token
-            and secrets.compare_digest(user.reset_token, token)
-            and is_reset_token_valid(user.reset_token_expiry)
-        ):
-            valid_token = True
-            user_email = user.email
-            break
+    user = find_user_by_token(token, "reset")
+    valid_token = user is not None
+    user_email = user.email if user else ""
 
     if not valid_token:
         # Error message content for invalid token
@@ -975,6 +970,7 @@ def post(token: str, email: str, password: str, confirm_password: str):
 
         # Save changes
         users.update(user)
+        invalidate_user(user.email)
 
         # Redirect to login
         return HttpHeader("HX-Redirect", "/login?message=password_reset_success")
@@ -8,21 +8,40 @@ from fasthtml import common as fh
 from fastlite import NotFoundError
 
 from app import instructor_required, rt
-from app.models.assignment import assignments, rubric_categories
+from app.models.assignment import assignments, rubric_categories, rubrics
 from app.models.config import ai_models
 from app.models.course import courses
 from app.models.feedback import aggregated_feedback, category_scores, drafts, model_runs
-from app.models.user import Role, users
-from app.utils.ui import dashboard_layout
+from app.models.user import Role
+from app.services import cohort_analytics
+from app.utils.csv_export import build_cohort_csv
+from app.utils.db_query import by_id, first, where
+from app.utils.ui import dashboard_layout, data_table, tabs
+
+
+def _analytics_tabs(assignment_id: int, active_index: int):
+    base = f"/instructor/assignments/{assignment_id}/analytics"
+    return tabs(
+        [("Overview", base), ("Cohort progression", f"{base}/cohort")],
+        active_index=active_index,
+    )
+
+
+def _owned_assignment(user, assignment_id: int):
+    """``(assignment, course)`` if the instructor owns the assignment, else None."""
+    assignment = by_id(assignments, assignment_id)
+    if assignment is None:
+        return None
+    course = by_id(courses, assignment.course_id)
+    if course is None or course.instructor_email != user.email:
+        return None
+    return assignment, course
 
 
 @rt("/instructor/assignments/{assignment_id}/analytics")
 @instructor_required
-def instructor_assignment_analytics(session, assignment_id: int):
+def instructor_assignment_analytics(session, user, assignment_id: int):
     """Analytics dashboard for assignment performance and LLM effectiveness"""
-    # Get current user and verify access
-    user = users[session["auth"]]
-
     try:
         assignment = assignments[assignment_id]
         course = courses[assignment.course_id]
@@ -36,10 +55,8 @@ def instructor_assignment_analytics(session, assignment_id: int):
     assignment_drafts = [d for d in all_drafts if d.assignment_id == assignment_id]
 
     # Get rubric categories
-    rubric_cats = rubric_categories()
-    assignment_rubric = [
-        cat for cat in rubric_cats if cat.assignment_id == assignment_id
-    ]
+    rubric = first(rubrics, assignment_id=assignment_id)
+    assignment_rubric = where(rubric_categories, rubric_id=rubric.id) if rubric else []
 
     # Get all model runs
     all_runs = model_runs()
@@ -294,7 +311,7 @@ def instructor_assignment_analytics(session, assignment_id: int):
                     f"Analytics: {assignment.title}",
                     cls="text-2xl font-bold text-gray-900",
                 ),
-                fh.P(f"Course: {course.name}", cls="text-gray-600"),
+                fh.P(f"Course: {course.title}", cls="text-gray-600"),
                 cls="flex-1",
             ),
             fh.Div(
@@ -312,6 +329,7 @@ def instructor_assignment_analytics(session, assignment_id: int):
             ),
             cls="flex items-center justify-between mb-6",
         ),
+        _analytics_tabs(assignment_id, 0),
         # Summary stats
         stats_cards,
         # LLM performance comparison
@@ -425,3 +443,226 @@ def instructor_assignment_analytics(session, assignment_id: int):
         user_role=Role.INSTRUCTOR,
         current_path=f"/instructor/assignments/{assignment_id}/analytics",
     )
+
+
+def _fmt(value, signed=False):
+    if value is None:
+        return "—"
+    return f"{value:+.1f}" if signed else f"{value:.1f}"
+
+
+def _change_rows(rows):
+    return [
+        [
+            row["category"],
+            str(row["n"]),
+            _fmt(row["mean"], signed=True),
+            _fmt(row["p50"], signed=True),
+            f"{_fmt(row['p25'], signed=True)} to {_fmt(row['p75'], signed=True)}"
+            if row["n"]
+            else "—",
+        ]
+        for row in rows
+    ]
+
+
+_CHANGE_HEADERS = ["Category", "Students", "Mean change", "Median", "Middle 50%"]
+
+
+@rt("/instructor/assignments/{assignment_id}/analytics/cohort")
+@instructor_required
+def instructor_cohort_analytics(
+    session, user, assignment_id: int, from_version: int = 0, to_version: int = 0
+):
+    """Class-wide draft-over-draft progression for one assignment."""
+    owned = _owned_assignment(user, assignment_id)
+    if owned is None:
+        return fh.RedirectResponse("/instructor/dashboard", status_code=303)
+    assignment, course = owned
+    base = f"/instructor/assignments/{assignment_id}/analytics"
+
+    analytics = cohort_analytics.cohort_analytics(assignment_id)
+    versions = analytics["versions"]
+
+    if len(versions) < 2:
+        body = fh.Div(
+            fh.P(
+                "Cohort progression appears once students have scored feedback "
+                "on at least two drafts.",
+                cls="text-gray-500 text-center py-8",
+            ),
+            cls="bg-white rounded-lg shadow mb-8",
+        )
+    else:
+        if from_version not in versions:
+            from_version = versions[0]
+        if to_version not in versions:
+            to_version = versions[-1]
+        comparison = cohort_analytics.compare_versions(
+            assignment_id, from_version, to_version
+        )
+
+        def version_select(name, selected):
+            return fh.Select(
+                *[
+                    fh.Option(f"Draft {v}", value=str(v), selected=v == selected)
+                    for v in versions
+                ],
+                name=name,
+                cls="border border-gray-300 rounded-lg px-3 py-2",
+            )
+
+        compare_section = fh.Div(
+            fh.H3("Compare drafts across the class", cls="text-lg font-semibold mb-4"),
+            fh.Form(
+                version_select("from_version", from_version),
+                fh.Span("→", cls="px-2 text-gray-500"),
+                version_select("to_version", to_version),
+                fh.Button(
+                    "Compare",
+                    type="submit",
+                    cls="bg-[#1a2e44] text-[#faf8f2] px-4 py-2 rounded-lg font-medium ml-3",
+                ),
+                method="get",
+                action=f"{base}/cohort",
+                cls="flex items-center mb-4",
+            ),
+            data_table(_CHANGE_HEADERS, _change_rows(comparison)),
+            cls="mb-8",
+        )
+
+        improvement = analytics["improvement"]
+        most_bucket = max((count for _, count in improvement["buckets"]), default=0)
+        distribution_section = fh.Div(
+            fh.H3(
+                "First → latest draft: overall change per student",
+                cls="text-lg font-semibold mb-4",
+            ),
+            fh.Div(
+                *[
+                    fh.Div(
+                        fh.Span(label, cls="w-32 text-sm text-gray-600"),
+                        fh.Div(
+                            fh.Div(
+                                cls="h-4 bg-teal-600 rounded",
+                                style=f"width: {count / most_bucket * 100 if most_bucket else 0:.0f}%",
+                            ),
+                            cls="flex-1 bg-gray-200 rounded-full h-4 mx-3",
+                        ),
+                        fh.Span(str(count), cls="w-8 text-sm text-right"),
+                        cls="flex items-center",
+                    )
+                    for label, count in improvement["buckets"]
+                ],
+                cls="space-y-2 bg-white p-4 rounded-lg shadow",
+            ),
+            cls="mb-8",
+        )
+
+        improved_section = fh.Div(
+            fh.H3(
+                "Which categories improved most (first → latest draft)",
+                cls="text-lg font-semibold mb-4",
+            ),
+            data_table(
+                _CHANGE_HEADERS, _change_rows(analytics["category_improvement"])
+            ),
+            cls="mb-8",
+        )
+
+        bands_section = fh.Div(
+            fh.H3("Score bands by draft", cls="text-lg font-semibold mb-4"),
+            data_table(
+                ["Category", "Draft", "Students", "P10", "P25", "Median", "P75", "P90"],
+                [
+                    [
+                        row["category"],
+                        str(row["version"]),
+                        str(row["n"]),
+                        _fmt(row["p10"]),
+                        _fmt(row["p25"]),
+                        _fmt(row["p50"]),
+                        _fmt(row["p75"]),
+                        _fmt(row["p90"]),
+                    ]
+                    for row in analytics["bands"]
+                ],
+            ),
+            cls="mb-8",
+        )
+        body = fh.Div(
+            compare_section, distribution_section, improved_section, bands_section
+        )
+
+    main_content = fh.Div(
+        fh.Div(
+            fh.Div(
+                fh.H1(
+                    f"Analytics: {assignment.title}",
+                    cls="text-2xl font-bold text-gray-900",
+                ),
+                fh.P(f"Course: {course.title}", cls="text-gray-600"),
+                cls="flex-1",
+            ),
+            fh.Div(
+                fh.A(
+                    "← Back to Assignment",
+                    href=f"/instructor/assignments/{assignment_id}",
+                    cls="bg-gray-100 text-gray-700 px-4 py-2 rounded-lg font-medium hover:bg-gray-200 transition-colors",
+                ),
+                fh.A(
+                    "Export CSV",
+                    href=f"{base}/cohort/export",
+                    cls="bg-[#1a2e44] text-[#faf8f2] px-4 py-2 rounded-lg font-medium hover:bg-[#0f1e30] transition-colors ml-3",
+                ),
+                cls="flex items-center",
+            ),
+            cls="flex items-center justify-between mb-6",
+        ),
+        _analytics_tabs(assignment_id, 1),
+        body,
+        cls="max-w-7xl mx-auto px-4 py-6",
+    )
+
+    improvement = analytics["improvement"]
+    sidebar_content = fh.Div(
+        fh.H3("Cohort", cls="text-lg font-semibold text-gray-900 mb-4"),
+        fh.P(
+            f"{analytics['students']} students with scored drafts",
+            cls="text-sm text-gray-600 mb-2",
+        ),
+        fh.P(
+            f"Drafts scored: {', '.join(map(str, versions)) or 'none yet'}",
+            cls="text-sm text-gray-600 mb-2",
+        ),
+        fh.P(
+            f"Median overall change, first → latest: {_fmt(improvement['p50'], signed=True)}",
+            cls="text-sm text-gray-600",
+        ),
+    )
+
+    return dashboard_layout(
+        f"Cohort progression: {assignment.title} | FeedForward",
+        sidebar_content,
+        main_content,
+        user_role=Role.INSTRUCTOR,
+        current_path=f"{base}/cohort",
+    )
+
+
+@rt("/instructor/assignments/{assignment_id}/analytics/cohort/export")
+@instructor_required
+def export_cohort_analytics_csv(session, user, assignment_id: int):
+    """CSV download of the cohort progression bands and changes."""
+    from starlette.responses import Response
+
+    if _owned_assignment(user, assignment_id) is None:
+        return fh.RedirectResponse("/instructor/dashboard", status_code=303)
+
+    csv_text = build_cohort_csv(cohort_analytics.cohort_analytics(assignment_id))
+    filename = f"cohort-progression-assignment-{assignment_id}.csv"
+    return Response(
+        csv_text,
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -7,6 +7,7 @@ from datetime import datetime
 from typing import Optional
 
 from fasthtml import common as fh
+from starlette.responses import Response
 
 from app import instructor_required, rt
 from app.models.assignment import (
@@ -26,7 +27,8 @@ from app.models.config import (
 )
 from app.models.course import courses
 from app.models.instructor_preferences import instructor_model_prefs
-from app.models.user import Role, users
+from app.models.user import Role
+from app.utils.db_query import first
 from app.utils.ui import action_button, dashboard_layout, status_badge
 
 
@@ -76,11 +78,8 @@ def get_instructor_course(course_id, instructor_email):
 
 @rt("/instructor/courses/{course_id}/assignments")
 @instructor_required
-def instructor_assignments_list(session, course_id: int):
+def instructor_assignments_list(session, user, course_id: int):
     """Shows all assignments for a specific course"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the course with permission check
     course, error = get_instructor_course(course_id, user.email)
 
@@ -313,11 +312,8 @@ def instructor_assignments_list(session, course_id: int):
 
 @rt("/instructor/courses/{course_id}/assignments/new", methods=["get"])
 @instructor_required
-def instructor_assignments_new(session, course_id: int):
+def instructor_assignments_new(session, user, course_id: int):
     """Create new assignment page"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the course with permission check
     course, error = get_instructor_course(course_id, user.email)
     if error:
@@ -714,13 +710,11 @@ def instructor_assignments_new(session, course_id: int):
 @instructor_required
 async def instructor_assignments_create(
     session,
+    user,
     request,
     course_id: int,
 ):
     """Create a new assignment with optional specification upload"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify course ownership
     _course, error = get_instructor_course(course_id, user.email)
     if error:
@@ -870,11 +864,8 @@ async def instructor_assignments_create(
 
 @rt("/instructor/assignments/{assignment_id}")
 @instructor_required
-def instructor_assignment_view(session, assignment_id: int):
+def instructor_assignment_view(session, user, assignment_id: int):
     """View assignment details"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment
     try:
         assignment = assignments[assignment_id]
@@ -903,11 +894,8 @@ def instructor_assignment_view(session, assignment_id: int):
 
 @rt("/instructor/assignments/{assignment_id}/status")
 @instructor_required
-def instructor_assignment_update_status(session, assignment_id: int, status: str):
+def instructor_assignment_update_status(session, user, assignment_id: int, status: str):
     """Update assignment status"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment
     try:
         assignment = assignments[assignment_id]
@@ -933,11 +921,8 @@ def instructor_assignment_update_status(session, assignment_id: int, status: str
 
 @rt("/instructor/assignments/{assignment_id}/edit", methods=["get"])
 @instructor_required
-def instructor_assignment_edit(session, assignment_id: int):
+def instructor_assignment_edit(session, user, assignment_id: int):
     """Edit assignment page"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment
     try:
         assignment = assignments[assignment_id]
@@ -1136,6 +1121,7 @@ def instructor_assignment_edit(session, assignment_id: int):
 @instructor_required
 def instructor_assignment_update(
     session,
+    user,
     assignment_id: int,
     title: str,
     instructions: str,
@@ -1144,9 +1130,6 @@ def instructor_assignment_update(
     max_drafts: int = 3,
 ):
     """Update assignment details"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment
     try:
         assignment = assignments[assignment_id]
@@ -1208,11 +1191,8 @@ def get_instructor_assignment(assignment_id, instructor_email):
 
 @rt("/instructor/assignments/{assignment_id}/rubric")
 @instructor_required
-def instructor_rubric_view(session, assignment_id: int):
+def instructor_rubric_view(session, user, assignment_id: int):
     """View and manage rubric for an assignment"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment with permission check
     assignment, error = get_instructor_assignment(assignment_id, user.email)
 
@@ -1686,7 +1666,7 @@ def instructor_rubric_view(session, assignment_id: int):
 
 @rt("/instructor/assignments/{assignment_id}/rubric/export")
 @instructor_required
-def instructor_rubric_export(session, assignment_id: int):
+def instructor_rubric_export(session, user, assignment_id: int):
     """Download the assignment's rubric as a .ffrubric file.
 
     The format is the server↔desktop contract defined in
@@ -1695,7 +1675,6 @@ def instructor_rubric_export(session, assignment_id: int):
     """
     from starlette.responses import JSONResponse
 
-    user = users[session["auth"]]
     assignment, error = get_instructor_assignment(assignment_id, user.email)
     if error:
         return fh.RedirectResponse("/instructor/courses", status_code=303)
@@ -1760,11 +1739,8 @@ def instructor_rubric_export(session, assignment_id: int):
 
 @rt("/instructor/assignments/{assignment_id}/rubric/create")
 @instructor_required
-def instructor_rubric_create(session, assignment_id: int):
+def instructor_rubric_create(session, user, assignment_id: int):
     """Create a new rubric for an assignment"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment with permission check
     _assignment, error = get_instructor_assignment(assignment_id, user.email)
     if error:
@@ -1807,15 +1783,13 @@ def instructor_rubric_create(session, assignment_id: int):
 @instructor_required
 def instructor_rubric_category_add(
     session,
+    user,
     assignment_id: int,
     name: str,
     description: Optional[str] = None,
     weight: float = 0,
 ):
     """Add a new category to a rubric"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment with permission check
     _assignment, error = get_instructor_assignment(assignment_id, user.email)
     if error:
@@ -1872,13 +1846,19 @@ def instructor_rubric_category_add(
         )
 
 
+# How often the page polls a running rubric-generation job
+RUBRIC_JOB_POLL = "every 2s"
+
+
 @rt("/instructor/assignments/{assignment_id}/rubric/generate")
 @instructor_required
-def instructor_rubric_generate(session, assignment_id: int):
-    """Generate a rubric using AI based on assignment specification"""
-    # Get current user
-    user = users[session["auth"]]
+async def instructor_rubric_generate(session, user, assignment_id: int):
+    """Start generating a rubric from the assignment specification.
 
+    The model call runs as a background job (see
+    ``rubric_generator.start_rubric_job``); this returns a fragment that polls
+    for the result and offers a cancel button.
+    """
     # Get the assignment with permission check
     assignment, error = get_instructor_assignment(assignment_id, user.email)
     if error:
@@ -1887,34 +1867,94 @@ def instructor_rubric_generate(session, assignment_id: int):
         )
 
     # Check if rubric already exists
-    for r in rubrics():
-        if r.assignment_id == assignment_id:
-            return fh.Div(
-                fh.P(
-                    "A rubric already exists. Please delete it first to generate a new one.",
-                    cls="text-amber-600",
-                ),
-                cls="p-4 bg-amber-50 rounded-lg",
-            )
+    if first(rubrics, assignment_id=assignment_id):
+        return fh.Div(
+            fh.P(
+                "A rubric already exists. Please delete it first to generate a new one.",
+                cls="text-amber-600",
+            ),
+            cls="p-4 bg-amber-50 rounded-lg",
+        )
 
-    # Generate rubric using AI
-    from app.services.rubric_generator import generate_rubric_from_spec
+    from app.services.rubric_generator import start_rubric_job
+
+    job_id = start_rubric_job(assignment, user.email)
+    return _rubric_job_poller(assignment_id, job_id)
 
-    success, categories, error_msg = generate_rubric_from_spec(
-        assignment_title=assignment.title,
-        assignment_instructions=getattr(
-            assignment, "instructions", assignment.description
-        ),
-        spec_content=getattr(assignment, "spec_content", None),
-    )
 
-    if not success:
+@rt("/instructor/assignments/{assignment_id}/rubric/generate/{job_id}")
+@instructor_required
+def instructor_rubric_generate_status(session, user, assignment_id: int, job_id: str):
+    """Poll a rubric-generation job: 204 while it runs, then the result."""
+    from app.services.rubric_generator import get_rubric_job
+
+    job = get_rubric_job(job_id, user.email)
+    if job is None or job["assignment_id"] != assignment_id:
         return fh.Div(
-            fh.P(f"Failed to generate rubric: {error_msg}", cls="text-red-600"),
+            fh.P(
+                "This rubric generation has expired. Please start it again.",
+                cls="text-amber-600",
+            ),
+            cls="p-4 bg-amber-50 rounded-lg",
+        )
+    if job["status"] == "running":
+        return Response(status_code=204)
+    if job["status"] == "cancelled":
+        return _rubric_job_cancelled()
+    if job["status"] == "error":
+        return fh.Div(
+            fh.P(f"Failed to generate rubric: {job['error']}", cls="text-red-600"),
             cls="p-4 bg-red-50 rounded-lg",
         )
+    return _generated_rubric_preview(assignment_id, job["categories"])
+
+
+@rt(
+    "/instructor/assignments/{assignment_id}/rubric/generate/{job_id}/cancel",
+    methods=["post"],
+)
+@instructor_required
+def instructor_rubric_generate_cancel(session, user, assignment_id: int, job_id: str):
+    """Cancel a running rubric-generation job."""
+    from app.services.rubric_generator import cancel_rubric_job
+
+    cancel_rubric_job(job_id, user.email)
+    return _rubric_job_cancelled()
+
+
+def _rubric_job_poller(assignment_id: int, job_id: str):
+    """Progress fragment that polls a rubric job and swaps in its result."""
+    return fh.Div(
+        fh.P(
+            "Generating a rubric from your specification. This can take up to "
+            "a minute; you can leave this page open or cancel.",
+            cls="text-purple-800 mb-3",
+        ),
+        fh.Button(
+            "Cancel",
+            type="button",
+            hx_post=f"/instructor/assignments/{assignment_id}/rubric/generate/{job_id}/cancel",
+            hx_target="#rubric-generation-job",
+            hx_swap="outerHTML",
+            cls="bg-gray-400 text-white px-4 py-2 rounded-lg font-medium hover:bg-gray-500 transition-colors shadow-sm",
+        ),
+        id="rubric-generation-job",
+        hx_get=f"/instructor/assignments/{assignment_id}/rubric/generate/{job_id}",
+        hx_trigger=RUBRIC_JOB_POLL,
+        hx_swap="outerHTML",
+        cls="p-4 bg-purple-50 rounded-lg border border-purple-200",
+    )
+
+
+def _rubric_job_cancelled():
+    return fh.Div(
+        fh.P("Rubric generation cancelled.", cls="text-gray-600"),
+        cls="p-4 bg-gray-50 rounded-lg",
+    )
 
-    # Display generated rubric for review
+
+def _generated_rubric_preview(assignment_id: int, categories: list):
+    """Review table and save form for a generated rubric."""
     return fh.Div(
         fh.H3(
             "Generated Rubric Preview", cls="text-xl font-semibold text-indigo-800 mb-4"
@@ -1971,11 +2011,10 @@ def instructor_rubric_generate(session, assignment_id: int):
 
 @rt("/instructor/assignments/{assignment_id}/rubric/template/{template_type}")
 @instructor_required
-def instructor_rubric_apply_template(session, assignment_id: int, template_type: str):
+def instructor_rubric_apply_template(
+    session, user, assignment_id: int, template_type: str
+):
     """Apply a rubric template"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment with permission check
     _assignment, error = get_instructor_assignment(assignment_id, user.email)
     if error:
@@ -2057,11 +2096,10 @@ def instructor_rubric_apply_template(session, assignment_id: int, template_type:
 
 @rt("/instructor/assignments/{assignment_id}/rubric/save-generated")
 @instructor_required
-def instructor_rubric_save_generated(session, assignment_id: int, categories: str):
+def instructor_rubric_save_generated(
+    session, user, assignment_id: int, categories: str
+):
     """Save a generated or template rubric"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the assignment with permission check
     _assignment, error = get_instructor_assignment(assignment_id, user.email)
     if error:
@@ -2115,14 +2153,12 @@ def instructor_rubric_save_generated(session, assignment_id: int, categories: st
 
 @rt("/instructor/assignments/load-models")
 @instructor_required
-def load_models_for_assignment(session):
+def load_models_for_assignment(session, user):
     """Load available AI models for assignment configuration"""
-    current_user = users[session["auth"]]
-
     # Get instructor's model preferences
     instructor_prefs = {}
     for pref in instructor_model_prefs():
-        if pref.instructor_email == current_user.email:
+        if pref.instructor_email == user.email:
             instructor_prefs[pref.model_id] = pref.is_active
 
     # Get all available models
@@ -2131,10 +2167,7 @@ def load_models_for_assignment(session):
         # Include if system model or owned by this instructor
         if model.active and (
             model.owner_type == "system"
-            or (
-                model.owner_type == "instructor"
-                and model.owner_id == current_user.email
-            )
+            or (model.owner_type == "instructor" and model.owner_id == user.email)
         ):
             # Check if instructor has enabled this model
             is_enabled = instructor_prefs.get(model.id, model.active)
@@ -9,18 +9,15 @@ from fasthtml import common as fh
 
 from app import instructor_required, rt
 from app.models.course import Course, courses, enrollments
-from app.models.user import Role, users
+from app.models.user import Role
 from app.utils.db_query import count, where
 from app.utils.ui import action_button, dashboard_layout, status_badge
 
 
 @rt("/instructor/courses")
 @instructor_required
-def instructor_courses_list(session, request):
+def instructor_courses_list(session, user, request):
     """Course listing page for instructors"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get all courses taught by this instructor
     instructor_courses = []
     for course in courses():
@@ -235,9 +232,6 @@ def instructor_courses_list(session, request):
 @instructor_required
 def instructor_courses_new(session):
     """Course creation page for instructors"""
-    # Get current user
-    users[session["auth"]]
-
     # Main content
     main_content = fh.Div(
         fh.H2("Create New Course", cls="text-2xl font-bold text-[#1a2e44] mb-6"),
@@ -357,15 +351,13 @@ def instructor_courses_new(session):
 @instructor_required
 def instructor_courses_create(
     session,
+    user,
     title: str,
     code: str,
     term: Optional[str] = None,
     description: Optional[str] = None,
 ):
     """Create a new course"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Validate inputs
     if not title or not code:
         return fh.RedirectResponse("/instructor/courses/new", status_code=303)
@@ -392,11 +384,8 @@ def instructor_courses_create(
 
 @rt("/instructor/courses/{course_id}/edit", methods=["get"])
 @instructor_required
-def instructor_course_edit(session, course_id: int):
+def instructor_course_edit(session, user, course_id: int):
     """Edit course page"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the course
     try:
         course = courses[course_id]
@@ -571,6 +560,7 @@ def instructor_course_edit(session, course_id: int):
 @instructor_required
 def instructor_course_update(
     session,
+    user,
     course_id: int,
     title: str,
     code: str,
@@ -579,9 +569,6 @@ def instructor_course_update(
     description: Optional[str] = None,
 ):
     """Update course details"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the course
     try:
         course = courses[course_id]
@@ -607,13 +594,12 @@ def instructor_course_update(
 
 @rt("/instructor/courses/{course_id}")
 @instructor_required
-def instructor_course_detail(session, course_id: int):
+def instructor_course_detail(session, user, course_id: int):
     """Course overview hub — info, stats, and links to assignments/students."""
     from fastlite import NotFoundError
 
     from app.models.assignment import assignments
 
-    user = users[session["auth"]]
     try:
         course = courses[course_id]
     except NotFoundError:
@@ -702,6 +688,11 @@ def instructor_course_detail(session, course_id: int):
                 color="gray",
                 href=f"/instructor/courses/{course_id}/edit",
             ),
+            action_button(
+                "Export Submissions (CSV)",
+                color="gray",
+                href=f"/instructor/courses/{course_id}/submissions/export",
+            ),
             cls="flex flex-wrap gap-3 mb-8",
         ),
         fh.Div(
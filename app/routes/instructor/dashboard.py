@@ -3,28 +3,22 @@ Instructor dashboard routes
 """
 
 from fasthtml import common as fh
+from starlette.responses import Response
 
 from app import instructor_required, rt
 from app.models.assignment import assignments
 from app.models.course import courses, enrollments
-from app.models.feedback import drafts
-from app.models.user import users
-from app.utils.db_query import count
+from app.services.activity import activity_marker, recent_activity
+from app.utils.db_query import count, where
 from app.utils.ui import action_button, card, dashboard_layout, status_badge
 
 
 @rt("/instructor/dashboard")
 @instructor_required
-def instructor_dashboard(session, request):
+def instructor_dashboard(session, user, request):
     """Main instructor dashboard view"""
-    # Get current instructor
-    instructor = users[session["auth"]]
-
     # Get instructor's courses
-    instructor_courses = []
-    for course in courses():
-        if course.instructor_email == instructor.email:
-            instructor_courses.append(course)
+    instructor_courses = where(courses, instructor_email=user.email)
 
     # Get enrollment counts
     course_enrollments = {}
@@ -38,26 +32,12 @@ def instructor_dashboard(session, request):
         assignment_count = count(assignments, course_id=course.id)
         course_assignments[course.id] = assignment_count
 
-    # Get recent submissions
-    recent_submissions = []
-    for draft in sorted(drafts(), key=lambda d: d.submission_date, reverse=True)[:10]:
-        # Check if this draft is for one of instructor's assignments
-        for assignment in assignments():
-            if draft.assignment_id == assignment.id:
-                for course in instructor_courses:
-                    if assignment.course_id == course.id:
-                        recent_submissions.append(
-                            {"draft": draft, "assignment": assignment, "course": course}
-                        )
-                        break
-                break
-
     # Sidebar content
     sidebar_content = fh.Div(
         # Welcome card
         fh.Div(
             fh.H3(
-                f"Welcome, {instructor.name or instructor.email}",
+                f"Welcome, {user.name or user.email}",
                 cls="text-xl font-semibold text-[#1a2e44] mb-2",
             ),
             fh.P("Instructor Dashboard", cls="text-gray-600 mb-4"),
@@ -183,47 +163,8 @@ def instructor_dashboard(session, request):
             ),
             cls="mb-8",
         ),
-        # Recent submissions section
-        fh.Div(
-            fh.H2("Recent Submissions", cls="text-2xl font-bold text-[#1a2e44] mb-6"),
-            fh.Div(
-                *(
-                    fh.A(
-                        fh.Div(
-                            fh.P(
-                                f"Student submitted draft for {sub['assignment'].title}",
-                                cls="text-indigo-800 font-medium",
-                            ),
-                            fh.P(
-                                f"Course: {sub['course'].title}",
-                                cls="text-sm text-gray-500",
-                            ),
-                            fh.P(
-                                f"Status: {sub['draft'].status.replace('_', ' ').capitalize()}",
-                                cls="text-sm text-gray-600 mt-1",
-                            ),
-                            cls="flex-1",
-                        ),
-                        status_badge(
-                            sub["draft"].status.replace("_", " ").capitalize(),
-                            "green"
-                            if sub["draft"].status == "feedback_ready"
-                            else "yellow"
-                            if sub["draft"].status == "processing"
-                            else "blue",
-                        ),
-                        href=f"/instructor/submissions/{sub['draft'].id}",
-                        cls="flex justify-between items-start p-4 border-l-4 border-indigo-500 bg-white rounded-r-lg shadow-sm mb-3 hover:shadow-md transition-shadow",
-                    )
-                    for sub in recent_submissions[:5]
-                )
-            )
-            if recent_submissions
-            else fh.P(
-                "No recent submissions",
-                cls="text-gray-500 italic p-4 bg-white rounded-xl border border-gray-200",
-            ),
-        ),
+        # Recent submissions section (refreshes itself; see below)
+        recent_activity_section(user.email),
     )
 
     return dashboard_layout(
@@ -233,3 +174,74 @@ def instructor_dashboard(session, request):
         user_role="instructor",
         current_path="/instructor/dashboard",
     )
+
+
+# How many drafts the feed shows, and how often an open dashboard checks
+# for newer drafts or status changes.
+RECENT_ACTIVITY_LIMIT = 5
+RECENT_ACTIVITY_POLL = "every 30s"
+
+
+def recent_activity_section(instructor_email: str, items=None):
+    """The dashboard's recent-submissions feed, with its own poller."""
+    if items is None:
+        items = recent_activity(instructor_email, limit=RECENT_ACTIVITY_LIMIT)
+    return fh.Div(
+        fh.H2("Recent Submissions", cls="text-2xl font-bold text-[#1a2e44] mb-6"),
+        fh.Div(
+            *(
+                fh.A(
+                    fh.Div(
+                        fh.P(
+                            f"Student submitted draft for {item['assignment_title']}",
+                            cls="text-indigo-800 font-medium",
+                        ),
+                        fh.P(
+                            f"Course: {item['course_title']}",
+                            cls="text-sm text-gray-500",
+                        ),
+                        fh.P(
+                            f"Status: {_status_label(item['status'])}",
+                            cls="text-sm text-gray-600 mt-1",
+                        ),
+                        cls="flex-1",
+                    ),
+                    status_badge(
+                        _status_label(item["status"]),
+                        "green"
+                        if item["status"] == "feedback_ready"
+                        else "yellow"
+                        if item["status"] == "processing"
+                        else "blue",
+                    ),
+                    href=f"/instructor/submissions/{item['draft_id']}",
+                    cls="flex justify-between items-start p-4 border-l-4 border-indigo-500 bg-white rounded-r-lg shadow-sm mb-3 hover:shadow-md transition-shadow",
+                )
+                for item in items
+            )
+        )
+        if items
+        else fh.P(
+            "No recent submissions",
+            cls="text-gray-500 italic p-4 bg-white rounded-xl border border-gray-200",
+        ),
+        id="recent-activity",
+        hx_get=f"/instructor/recent-activity?seen={activity_marker(items)}",
+        hx_trigger=RECENT_ACTIVITY_POLL,
+        hx_swap="outerHTML",
+    )
+
+
+def _status_label(status: str) -> str:
+    return (status or "").replace("_", " ").capitalize()
+
+
+@rt("/instructor/recent-activity")
+@instructor_required
+def instructor_recent_activity(session, user, seen: str = ""):
+    """Poll target for the dashboard feed: 204 (nothing to swap) while the
+    feed still matches the ``seen`` marker, else the refreshed section."""
+    items = recent_activity(user.email, limit=RECENT_ACTIVITY_LIMIT)
+    if activity_marker(items) == seen:
+        return Response(status_code=204)
+    return recent_activity_section(user.email, items)
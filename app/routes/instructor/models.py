@@ -14,9 +14,14 @@ from app.models.instructor_preferences import (
     InstructorModelPref,
     instructor_model_prefs,
 )
-from app.models.user import users
 from app.utils.crypto import encrypt_sensitive_data
-from app.utils.ui import action_button, card, dashboard_layout, status_badge
+from app.utils.ui import (
+    action_button,
+    card,
+    connection_test_result,
+    dashboard_layout,
+    status_badge,
+)
 
 
 def get_instructor_id(user_email):
@@ -26,16 +31,14 @@ def get_instructor_id(user_email):
 
 @rt("/instructor/models")
 @instructor_required
-def instructor_models_list(session, request):
+def instructor_models_list(session, user, request):
     """List all AI models available to instructor"""
-    # Get current instructor information
-    current_user = users[session["auth"]]
-    instructor_id = get_instructor_id(current_user.email)
+    instructor_id = get_instructor_id(user.email)
 
     # Get instructor's model preferences
     instructor_prefs = {}
     for pref in instructor_model_prefs():
-        if pref.instructor_email == current_user.email:
+        if pref.instructor_email == user.email:
             instructor_prefs[pref.model_id] = pref.is_active
 
     # Get all available models (system models + instructor's own models)
@@ -253,9 +256,6 @@ def instructor_models_list(session, request):
 @instructor_required
 def instructor_models_new(session, request):
     """Create new AI model configuration"""
-    # Get current instructor
-    users[session["auth"]]
-
     # Sidebar content
     sidebar_content = fh.Div(
         fh.Div(
@@ -456,6 +456,7 @@ def instructor_models_new(session, request):
 @instructor_required
 def instructor_models_create(
     session,
+    user,
     provider: str,
     model_id: str,
     name: str,
@@ -463,9 +464,7 @@ def instructor_models_create(
     base_url: Optional[str] = None,
 ):
     """Create a new AI model configuration"""
-    # Get current instructor
-    current_user = users[session["auth"]]
-    instructor_id = get_instructor_id(current_user.email)
+    instructor_id = get_instructor_id(user.email)
 
     # Validate inputs
     if not provider or not model_id or not name:
@@ -516,50 +515,37 @@ def instructor_models_create(
 
 @rt("/instructor/models/fetch-ollama")
 @instructor_required
-def fetch_ollama_models(session, base_url: str):
+async def fetch_ollama_models(session, base_url: str):
     """Fetch available models from Ollama server"""
     import requests
 
-    try:
-        # Clean up the URL
-        ollama_url = base_url.strip().rstrip("/") + "/api/tags"
-
-        # Try to fetch models
-        resp = requests.get(ollama_url, timeout=5, verify=True)
+    from app.services.llm_health import list_ollama_models
 
-        if resp.status_code == 200:
-            models_data = resp.json()
-            models = models_data.get("models", [])
+    try:
+        models = await list_ollama_models(base_url)
 
-            if models:
-                options = [
-                    fh.Option(
-                        f"{m['name']} ({m.get('size', 'Unknown size')})",
-                        value=m["name"].replace(":latest", ""),
-                    )
-                    for m in models
-                ]
-                return fh.Select(
-                    fh.Option("Select a model", value="", selected=True, disabled=True),
-                    *options,
-                    id="model_id",
-                    name="model_id",
-                    cls="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-teal-600",
-                    required=True,
-                )
-            else:
-                return fh.Div(
-                    fh.P("No models found on server", cls="text-amber-600"),
-                    fh.P(
-                        "Please pull models first using: ollama pull <model-name>",
-                        cls="text-sm text-gray-500 mt-1",
-                    ),
+        if models:
+            options = [
+                fh.Option(
+                    f"{m['name']} ({m.get('size', 'Unknown size')})",
+                    value=m["name"].replace(":latest", ""),
                 )
+                for m in models
+            ]
+            return fh.Select(
+                fh.Option("Select a model", value="", selected=True, disabled=True),
+                *options,
+                id="model_id",
+                name="model_id",
+                cls="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-teal-600",
+                required=True,
+            )
         else:
             return fh.Div(
+                fh.P("No models found on server", cls="text-amber-600"),
                 fh.P(
-                    f"Server responded with status {resp.status_code}",
-                    cls="text-red-600",
+                    "Please pull models first using: ollama pull <model-name>",
+                    cls="text-sm text-gray-500 mt-1",
                 ),
             )
     except requests.exceptions.SSLError:
@@ -570,7 +556,7 @@ def fetch_ollama_models(session, base_url: str):
                 cls="text-sm text-gray-500 mt-1",
             ),
         )
-    except requests.exceptions.ConnectionError:
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
         return fh.Div(
             fh.P("Cannot connect to Ollama server", cls="text-red-600"),
             fh.P(
@@ -586,15 +572,15 @@ def fetch_ollama_models(session, base_url: str):
 
 @rt("/instructor/models/test")
 @instructor_required
-def instructor_models_test(
+async def instructor_models_test(
     session,
     provider: str,
     api_key: Optional[str] = None,
     base_url: Optional[str] = None,
     model_id: Optional[str] = None,
 ):
-    """Test AI model connection"""
-    import litellm
+    """Test AI model connection (cached per configuration, see llm_health)"""
+    from app.services.llm_health import check_connection
 
     # Validate provider
     if not provider:
@@ -602,89 +588,23 @@ def instructor_models_test(
             fh.P("Please select a provider", cls="text-red-600"),
             cls="p-4 bg-red-50 rounded-lg",
         )
-
-    # Build test configuration
-    test_config = {}
-    if api_key and api_key.strip():
-        test_config["api_key"] = api_key.strip()
-    if base_url and base_url.strip():
-        # For Ollama, use api_base instead of base_url
-        if provider == "ollama":
-            test_config["api_base"] = base_url.strip()
-        else:
-            test_config["base_url"] = base_url.strip()
-    elif provider == "ollama":
-        test_config["api_base"] = "http://localhost:11434"
-
-    # Test the connection
-    try:
-        # For Ollama, first try to get available models
-        if provider == "ollama" and base_url:
-            try:
-                import requests
-
-                # Try to fetch available models from Ollama
-                ollama_url = base_url.strip().rstrip("/") + "/api/tags"
-                resp = requests.get(ollama_url, timeout=5)
-                if resp.status_code == 200:
-                    models_data = resp.json()
-                    available_models = [
-                        m["name"] for m in models_data.get("models", [])
-                    ]
-                    if available_models:
-                        # Use the first available model for testing
-                        model = f"ollama/{available_models[0].replace(':latest', '')}"
-                    else:
-                        model = "ollama/llama2"
-                else:
-                    model = "ollama/llama2"
-            except Exception:
-                model = "ollama/llama2"
-        else:
-            # Simple test prompt
-            model = (
-                "ollama/llama2" if provider == "ollama" else f"{provider}/gpt-3.5-turbo"
-            )
-
-        response = litellm.completion(
-            model=model,
-            messages=[
-                {"role": "user", "content": "Say 'test successful' in 3 words or less"}
-            ],
-            max_tokens=10,
-            temperature=0,
-            **test_config,
-        )
-
-        return fh.Div(
-            fh.P("✅ Connection successful!", cls="text-green-600 font-medium"),
-            fh.P(
-                f"Response: {response.choices[0].message.content}",
-                cls="text-gray-600 text-sm mt-1",
-            ),
-            cls="p-4 bg-green-50 rounded-lg",
-        )
-    except Exception as e:
-        error_msg = str(e)
-        if "api_key" in error_msg.lower():
-            error_msg = "Invalid or missing API key"
-        elif "connection" in error_msg.lower():
-            error_msg = "Could not connect to the service"
-
+    if not model_id and provider != "ollama":
         return fh.Div(
-            fh.P("❌ Connection failed", cls="text-red-600 font-medium"),
-            fh.P(f"Error: {error_msg}", cls="text-gray-600 text-sm mt-1"),
+            fh.P("Please enter a model ID", cls="text-red-600"),
             cls="p-4 bg-red-50 rounded-lg",
         )
 
+    result = await check_connection(
+        provider, (model_id or "").strip(), api_key or "", base_url or ""
+    )
+    return connection_test_result(result)
+
 
 @rt("/instructor/models/view/{model_id}")
 @instructor_required
-def instructor_models_view(session, model_id: int):
+def instructor_models_view(session, user, model_id: int):
     """View and edit AI model configuration"""
-    # Get current instructor
-    current_user = users[session["auth"]]
-    instructor_id = get_instructor_id(current_user.email)
+    instructor_id = get_instructor_id(user.email)
 
     # Get the model
     model = None
@@ -835,14 +755,12 @@ def instructor_models_view(session, model_id: int):
 
 @rt("/instructor/models/toggle/{model_id}")
 @instructor_required
-def toggle_model_preference(session, model_id: int):
+def toggle_model_preference(session, user, model_id: int):
     """Toggle a model's active status for an instructor"""
-    current_user = users[session["auth"]]
-
     # Check if preference already exists
     existing_pref = None
     for pref in instructor_model_prefs():
-        if pref.instructor_email == current_user.email and pref.model_id == model_id:
+        if pref.instructor_email == user.email and pref.model_id == model_id:
             existing_pref = pref
             break
 
@@ -859,7 +777,7 @@ def toggle_model_preference(session, model_id: int):
 
         new_pref = InstructorModelPref(
             id=next_id,
-            instructor_email=current_user.email,
+            instructor_email=user.email,
             model_id=model_id,
             is_active=True,
             created_at=datetime.now().isoformat(),
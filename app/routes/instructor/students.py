@@ -2,16 +2,15 @@
 Instructor student management routes
 """
 
-import random
-import string
 import urllib.parse
-from datetime import datetime
 
 from fasthtml import common as fh
 
 from app import instructor_required, rt
-from app.models.course import Enrollment, courses, enrollments
-from app.models.user import Role, User, users
+from app.models.course import courses, enrollments
+from app.models.user import Role, User, find_user_by_token, invalidate_user, users
+from app.utils.auth import INVITE_TOKEN_HOURS, generate_token_expiry
+from app.utils.db_query import by_id, first
 from app.utils.email import APP_DOMAIN, generate_verification_token
 from app.utils.ui import action_button, card, dashboard_layout, status_badge
 
@@ -23,19 +22,49 @@ def student_join_link(token: str) -> str:
     return f"{APP_DOMAIN}/student/join?token={token}"
 
 
-def generate_invitation_token(length=40):
-    """Generate a random token for student invitations"""
-    chars = string.ascii_letters + string.digits + "-_"
-    return "".join(random.choice(chars) for _ in range(length))
+def invite_token_for(email: str) -> str:
+    """A live join token for ``email``: creates the student account on first
+    invite and re-issues the token once it has expired (INVITE_TOKEN_HOURS).
+    Students who already completed registration keep their (cleared) token —
+    a join link must never reset an active account's password."""
+    student = by_id(users, email)
+    if student is not None and (
+        student.verified or find_user_by_token(student.verification_token)
+    ):
+        return student.verification_token or ""
+    token = generate_verification_token(email)
+    expiry = generate_token_expiry(INVITE_TOKEN_HOURS)
+    if student is None:
+        users.insert(
+            User(
+                email=email,
+                name="",
+                password="",  # Set when they complete registration
+                role=Role.STUDENT,
+                verified=False,
+                verification_token=token,
+                verification_token_expiry=expiry,
+                approved=True,
+                department="",
+                reset_token="",
+                reset_token_expiry="",
+                status="active",
+                last_active="",
+            )
+        )
+    else:
+        users.update(
+            {"verification_token": token, "verification_token_expiry": expiry},
+            pk_values=email,
+        )
+        invalidate_user(email)
+    return token
 
 
 @rt("/instructor/manage-students")
 @instructor_required
-def instructor_manage_students(session, request):
+def instructor_manage_students(session, user, request):
     """Overview page for managing students across all courses"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get all courses for this instructor
     instructor_courses = []
     for course in courses():
@@ -229,11 +258,8 @@ def instructor_manage_students(session, request):
 
 @rt("/instructor/courses/{course_id}/students")
 @instructor_required
-def instructor_course_students(session, course_id: int):
+def instructor_course_students(session, user, course_id: int):
     """View and manage students for a specific course"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the course
     target_course = None
     for course in courses():
@@ -426,11 +452,8 @@ def instructor_course_students(session, course_id: int):
 
 @rt("/instructor/resend-invitation")
 @instructor_required
-def instructor_resend_invitation(session, request, email: str, course_id: int):
+def instructor_resend_invitation(session, user, request, email: str, course_id: int):
     """Resend invitation to a student"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify the course belongs to this instructor
     course = None
     for c in courses():
@@ -459,22 +482,7 @@ def instructor_resend_invitation(session, request, email: str, course_id: int):
     # Send the invitation email
     try:
         # Check if student exists
-        try:
-            student = users[email]
-            token = student.verification_token
-        except Exception:
-            # Create student account if doesn't exist
-            token = generate_verification_token()
-            new_student = User(
-                email=email,
-                password_hash="",  # Will be set when they register
-                role=Role.STUDENT,
-                name=None,
-                verified=False,
-                verification_token=token,
-                created_at=datetime.now(),
-            )
-            users.insert(new_student)
+        token = invite_token_for(email)
 
         # FeedForward doesn't email students — hand the instructor the link.
         link = student_join_link(token)
@@ -501,11 +509,8 @@ def instructor_resend_invitation(session, request, email: str, course_id: int):
 
 @rt("/instructor/remove-student")
 @instructor_required
-def instructor_remove_student(session, request, email: str, course_id: int):
+def instructor_remove_student(session, user, request, email: str, course_id: int):
     """Remove a student from a course"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify the course belongs to this instructor
     course = None
     for c in courses():
@@ -546,11 +551,8 @@ def instructor_remove_student(session, request, email: str, course_id: int):
 
 @rt("/instructor/invite-students", methods=["get"])
 @instructor_required
-def instructor_invite_students_form(session, request):
+def instructor_invite_students_form(session, user, request):
     """Show the invite students form"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get course_id from query parameters if provided
     course_id = request.query_params.get("course_id")
 
@@ -612,13 +614,33 @@ def instructor_invite_students_form(session, request):
                     name="emails",
                     rows=6,
                     placeholder="Enter one email per line\nexample1@email.com\nexample2@email.com",
-                    required=True,
                     cls="w-full px-3 py-2 border border-gray-300 rounded-md focus:outline-none focus:ring-2 focus:ring-teal-600",
                 ),
                 fh.P(
                     "Enter one email address per line. Students will receive an invitation to join your course.",
                     cls="text-sm text-gray-500 mt-1",
                 ),
+                cls="mb-4",
+            ),
+            # Roster upload
+            fh.Div(
+                fh.Label(
+                    "Or upload a class roster (CSV)",
+                    for_="roster",
+                    cls="block text-sm font-medium text-gray-700 mb-2",
+                ),
+                fh.Input(
+                    type="file",
+                    id="roster",
+                    name="roster",
+                    accept=".csv,text/csv",
+                    cls="w-full text-sm text-gray-700",
+                ),
+                fh.P(
+                    "An LMS roster export works as-is: the column headed "
+                    "'Email' is used.",
+                    cls="text-sm text-gray-500 mt-1",
+                ),
                 cls="mb-6",
             ),
             # Submit buttons
@@ -637,6 +659,7 @@ def instructor_invite_students_form(session, request):
             ),
             action="/instructor/invite-students",
             method="post",
+            enctype="multipart/form-data",
             cls="bg-white p-6 rounded-xl shadow-md",
         ),
     )
@@ -673,86 +696,37 @@ def instructor_invite_students_form(session, request):
 
 @rt("/instructor/invite-students", methods=["post"])
 @instructor_required
-def instructor_invite_students_process(session, course_id: int, emails: str):
-    """Process student invitations"""
-    # Get current user
-    user = users[session["auth"]]
+async def instructor_invite_students_process(session, user, request):
+    """Process student invitations (pasted emails and/or a CSV roster)"""
+    from app.services.invitations import (
+        invite_students,
+        parse_email_list,
+        parse_roster_csv,
+    )
 
-    # Verify course ownership
-    course = None
-    for c in courses():
-        if c.id == course_id and c.instructor_email == user.email:
-            course = c
-            break
+    form_data = await request.form()
+    try:
+        course_id = int(form_data.get("course_id") or 0)
+    except ValueError:
+        course_id = 0
 
+    # Verify course ownership
+    course = first(courses, id=course_id, instructor_email=user.email)
     if not course:
         return fh.RedirectResponse("/instructor/dashboard", status_code=303)
 
-    # Parse emails
-    email_list = [
-        email.strip() for email in emails.strip().split("\n") if email.strip()
-    ]
+    email_list = parse_email_list(form_data.get("emails") or "")
+    roster = form_data.get("roster")
+    if roster and hasattr(roster, "filename") and roster.filename:
+        raw = await roster.read()
+        email_list += parse_roster_csv(raw.decode("utf-8", errors="replace"))
 
-    # Remove duplicates
-    email_list = list(set(email_list))
-
-    # Track results
-    invited = []
-    already_enrolled = []
-    failed = []
-
-    for email in email_list:
-        # Basic email validation
-        if "@" not in email or "." not in email:
-            failed.append((email, "Invalid email format"))
-            continue
-
-        # Check if already enrolled
-        enrollment_exists = False
-        for e in enrollments():
-            if e.course_id == course_id and e.student_email == email:
-                enrollment_exists = True
-                already_enrolled.append(email)
-                break
-
-        if enrollment_exists:
-            continue
-
-        try:
-            # Check if student exists
-            student = None
-            try:
-                student = users[email]
-                token = student.verification_token
-            except Exception:
-                # Create student account if doesn't exist
-                token = generate_verification_token()
-                new_student = User(
-                    email=email,
-                    password_hash="",  # Will be set when they register
-                    role=Role.STUDENT,
-                    name=None,
-                    verified=False,
-                    verification_token=token,
-                    created_at=datetime.now(),
-                )
-                users.insert(new_student)
-
-            # Create enrollment
-            new_enrollment = Enrollment(
-                id=None,
-                course_id=course_id,
-                student_email=email,
-                invitation_token=generate_invitation_token(),
-                invited_at=datetime.now(),
-                enrolled_at=None,
-            )
-            enrollments.insert(new_enrollment)
-
-            # No email is sent — the instructor distributes the join link.
-            invited.append((email, student_join_link(token)))
-        except Exception as e:
-            failed.append((email, str(e)))
+    result = invite_students(course_id, email_list)
+    # No email is sent — the instructor distributes the join links.
+    invited = [(email, student_join_link(token)) for email, token in result["invited"]]
+    enrolled = result["enrolled"]
+    already_enrolled = result["already_enrolled"]
+    failed = result["failed"]
 
     # Results page: FeedForward never emails students, so hand the
     # instructor every join link to distribute via their own channel.
@@ -802,6 +776,15 @@ def instructor_invite_students_process(session, course_id: int, emails: str):
                 "No new invitations were created.", cls="text-slate-500 italic mb-6"
             )
         ),
+        (
+            fh.P(
+                f"Enrolled with their existing account ({len(enrolled)}): "
+                + ", ".join(enrolled),
+                cls="text-sm text-slate-700 mb-2",
+            )
+            if enrolled
+            else ""
+        ),
         (
             fh.P(
                 f"Already enrolled ({len(already_enrolled)}): "
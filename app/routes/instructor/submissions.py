@@ -2,6 +2,7 @@
 Instructor submission review and feedback management routes
 """
 
+import re
 from datetime import datetime
 
 from fasthtml import common as fh
@@ -15,8 +16,8 @@ from app.models.feedback import (
     drafts,
     model_runs,
 )
-from app.models.user import Role, users
-from app.utils.csv_export import build_submissions_csv
+from app.models.user import Role
+from app.utils.csv_export import iter_submissions_csv
 from app.utils.db_query import by_id, first, where
 from app.utils.mailto import student_mailto
 from app.utils.markdown_export import build_feedback_markdown
@@ -60,11 +61,8 @@ def _bulk_td(sub: dict, has_bulk_eligible: bool) -> tuple:
 
 @rt("/instructor/assignments/{assignment_id}/submissions")
 @instructor_required
-def instructor_submissions_list(session, assignment_id: int):
+def instructor_submissions_list(session, user, assignment_id: int):
     """List all submissions for an assignment with feedback status"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get assignment and verify ownership
     try:
         assignment = assignments[assignment_id]
@@ -366,7 +364,12 @@ def instructor_submissions_list(session, assignment_id: int):
         fh.Div(
             fh.A(
                 "Export Data",
-                href=f"/instructor/assignments/{assignment_id}/submissions.csv",
+                href=f"/instructor/assignments/{assignment_id}/submissions/export",
+                cls="block text-teal-600 hover:text-teal-700 mb-2",
+            ),
+            fh.A(
+                "Export All Feedback (ZIP)",
+                href=f"/instructor/assignments/{assignment_id}/feedback/export",
                 cls="block text-teal-600 hover:text-teal-700 mb-2",
             ),
             fh.A(
@@ -377,7 +380,18 @@ def instructor_submissions_list(session, assignment_id: int):
             fh.A(
                 "Assignment Settings",
                 href=f"/instructor/assignments/{assignment_id}/edit",
-                cls="block text-teal-600 hover:text-teal-700",
+                cls="block text-teal-600 hover:text-teal-700 mb-2",
+            ),
+            fh.Form(
+                fh.Button(
+                    "Batch Feedback Run",
+                    type="submit",
+                    title="Process every pending draft through the providers' "
+                    "batch APIs — cheaper, results within 24 hours",
+                    cls="text-teal-600 hover:text-teal-700",
+                ),
+                method="post",
+                action=f"/instructor/assignments/{assignment_id}/feedback/batch",
             ),
         ),
     )
@@ -393,10 +407,8 @@ def instructor_submissions_list(session, assignment_id: int):
 
 @rt("/instructor/assignments/{assignment_id}/submissions/bulk-approve")
 @instructor_required
-async def bulk_approve_submissions(session, request, assignment_id: int):
+async def bulk_approve_submissions(session, user, request, assignment_id: int):
     """Bulk-release pending feedback for the selected drafts (Bulk Review)."""
-    user = users[session["auth"]]
-
     assignment = by_id(assignments, assignment_id)
     if assignment is None:
         return fh.RedirectResponse("/instructor/dashboard", status_code=303)
@@ -429,14 +441,46 @@ async def bulk_approve_submissions(session, request, assignment_id: int):
     )
 
 
-@rt("/instructor/assignments/{assignment_id}/submissions.csv")
+@rt("/instructor/assignments/{assignment_id}/feedback/batch", methods=["post"])
 @instructor_required
-def export_submissions_csv(session, assignment_id: int):
-    """CSV download of every draft for one assignment (one row per draft)."""
-    from starlette.responses import Response
+async def queue_batch_feedback(session, assignment_id: int):
+    """Queue a batch-API feedback run for every pending draft of the assignment."""
+    if _verify_assignment_ownership(session, assignment_id) is None:
+        return fh.RedirectResponse("/instructor/dashboard", status_code=303)
+
+    from app.services.background_tasks import queue_assignment_batch
+
+    await queue_assignment_batch(assignment_id)
+
+    return fh.RedirectResponse(
+        f"/instructor/assignments/{assignment_id}/submissions",
+        status_code=303,
+    )
+
+
+def _csv_stream(assignment_ids: list[int], filename: str, with_assignment: bool):
+    from starlette.responses import StreamingResponse
+
+    from app.services import submission_export
+
+    body = iter_submissions_csv(
+        submission_export.iter_export_rows(assignment_ids),
+        categories=submission_export.category_columns(assignment_ids),
+        with_assignment=with_assignment,
+    )
+    return StreamingResponse(
+        body,
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
-    user = users[session["auth"]]
 
+# Not ``.../submissions.csv``: FastHTML's static-file route claims ``*.csv`` paths.
+@rt("/instructor/assignments/{assignment_id}/submissions/export")
+@instructor_required
+def export_submissions_csv(session, user, assignment_id: int):
+    """CSV download of every draft for one assignment (one row per draft),
+    streamed with a column per rubric category."""
     assignment = by_id(assignments, assignment_id)
     if assignment is None:
         return fh.RedirectResponse("/instructor/dashboard", status_code=303)
@@ -444,39 +488,72 @@ def export_submissions_csv(session, assignment_id: int):
     if course is None or course.instructor_email != user.email:
         return fh.RedirectResponse("/instructor/dashboard", status_code=303)
 
-    drafts_for_assignment = where(drafts, assignment_id=assignment_id)
-    all_agg = list(aggregated_feedback())
+    filename = f"submissions-assignment-{assignment_id}.csv"
+    return _csv_stream([assignment_id], filename, with_assignment=False)
+
+
+@rt("/instructor/courses/{course_id}/submissions/export")
+@instructor_required
+def export_course_submissions_csv(session, user, course_id: int):
+    """CSV download of every draft across a course's assignments."""
+    from app.services.submission_export import course_assignment_ids
+
+    course = by_id(courses, course_id)
+    if course is None or course.instructor_email != user.email:
+        return fh.RedirectResponse("/instructor/dashboard", status_code=303)
+
+    filename = f"submissions-course-{course_id}.csv"
+    return _csv_stream(course_assignment_ids(course_id), filename, with_assignment=True)
 
-    rows = []
-    for draft in drafts_for_assignment:
-        agg_for_draft = [af for af in all_agg if af.draft_id == draft.id]
-        if agg_for_draft:
-            overall = sum(af.aggregated_score for af in agg_for_draft) / len(
-                agg_for_draft
-            )
-        else:
-            overall = None
-        rows.append((draft, overall))
 
-    csv_text = build_submissions_csv(rows)
-    filename = f"submissions-assignment-{assignment_id}.csv"
-    return Response(
-        csv_text,
-        media_type="text/csv",
+def _feedback_filename(draft) -> str:
+    # Use the local part of the email as a friendly filename hint; fall back
+    # to "draft" if the email is empty or weird. The name is also a ZIP entry,
+    # so anything that could form a path (``/``, ``\``, leading dots) goes.
+    handle = (draft.student_email or "").split("@")[0]
+    handle = re.sub(r"[^A-Za-z0-9._-]", "_", handle).lstrip(".") or "draft"
+    return f"feedback-{handle}-{draft.id}.md"
+
+
+@rt("/instructor/assignments/{assignment_id}/feedback/export")
+@instructor_required
+def export_assignment_feedback_zip(session, user, assignment_id: int):
+    """Streamed ZIP of every draft's feedback as Markdown, one file per draft."""
+    from starlette.responses import StreamingResponse
+
+    from app.services.submission_export import iter_feedback_rows
+    from app.utils.zip_stream import iter_zip
+
+    assignment = by_id(assignments, assignment_id)
+    if assignment is None:
+        return fh.RedirectResponse("/instructor/dashboard", status_code=303)
+    course = by_id(courses, assignment.course_id)
+    if course is None or course.instructor_email != user.email:
+        return fh.RedirectResponse("/instructor/dashboard", status_code=303)
+
+    files = (
+        (
+            _feedback_filename(draft),
+            build_feedback_markdown(draft, assignment, course.title, rows, names),
+        )
+        for draft, rows, names in iter_feedback_rows(assignment_id)
+    )
+    filename = f"feedback-assignment-{assignment_id}.zip"
+    return StreamingResponse(
+        iter_zip(files),
+        media_type="application/zip",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
 @rt("/instructor/submissions/{draft_id}/export")
 @instructor_required
-def export_feedback_markdown_for_draft(session, draft_id: int):
+def export_feedback_markdown_for_draft(session, user, draft_id: int):
     """Download one draft's aggregated feedback as Markdown (per-draft Export Feedback)."""
     from starlette.responses import Response
 
     from app.models.assignment import rubric_categories
 
-    user = users[session["auth"]]
-
     draft = by_id(drafts, draft_id)
     if draft is None:
         return fh.RedirectResponse("/instructor/dashboard", status_code=303)
@@ -498,10 +575,7 @@ def export_feedback_markdown_for_draft(session, draft_id: int):
         category_name_by_id,
     )
 
-    # Use the local part of the email as a friendly filename hint; fall back
-    # to "draft" if the email is empty or weird.
-    handle = (draft.student_email or "").split("@")[0] or "draft"
-    filename = f"feedback-{handle}-{draft_id}.md"
+    filename = _feedback_filename(draft)
     return Response(
         md,
         media_type="text/markdown; charset=utf-8",
@@ -511,12 +585,9 @@ def export_feedback_markdown_for_draft(session, draft_id: int):
 
 @rt("/instructor/submissions/{draft_id}")
 @instructor_required
-def instructor_submission_detail(session, draft_id: int):
+def instructor_submission_detail(session, user, draft_id: int):
     """View detailed submission information with AI feedback breakdown"""
 
-    # Get current user
-    user = users[session["auth"]]
-
     # Get draft
     try:
         draft = drafts[draft_id]
@@ -797,14 +868,13 @@ def _signal_row(label: str, value: float):
 
 def _verify_draft_ownership(session, draft_id: int):
     """Return (draft, assignment) if the current instructor owns it, else None."""
-    user = users[session["auth"]]
     try:
         draft = drafts[draft_id]
         assignment = assignments[draft.assignment_id]
         course = courses[assignment.course_id]
     except NotFoundError:
         return None
-    if course.instructor_email != user.email:
+    if course.instructor_email != session["auth"]:
         return None
     return draft, assignment
 
@@ -960,12 +1030,9 @@ def instructor_submission_signals_extract(session, draft_id: int):
 
 @rt("/instructor/submissions/{draft_id}/review")
 @instructor_required
-def instructor_feedback_review(session, draft_id: int):
+def instructor_feedback_review(session, user, draft_id: int):
     """Review and edit AI-generated feedback before approval"""
 
-    # Get current user
-    user = users[session["auth"]]
-
     # Get draft and verify permissions
     try:
         draft = drafts[draft_id]
@@ -1126,11 +1193,9 @@ def instructor_feedback_review(session, draft_id: int):
 @rt("/instructor/submissions/{draft_id}/review/save")
 @instructor_required
 async def instructor_feedback_save(
-    session, request, draft_id: int, action: str = "save"
+    session, user, request, draft_id: int, action: str = "save"
 ):
     """Save per-category reviewed feedback; 'approve' releases it to the student."""
-    user = users[session["auth"]]
-
     try:
         draft = drafts[draft_id]
         assignment = assignments[draft.assignment_id]
@@ -1164,13 +1229,12 @@ async def instructor_feedback_save(
 
 def _verify_assignment_ownership(session, assignment_id: int):
     """Return the assignment if the current instructor owns its course, else None."""
-    user = users[session["auth"]]
     try:
         assignment = assignments[assignment_id]
         course = courses[assignment.course_id]
     except NotFoundError:
         return None
-    if course.instructor_email != user.email:
+    if course.instructor_email != session["auth"]:
         return None
     return assignment
 
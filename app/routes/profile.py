@@ -8,18 +8,15 @@ from typing import Optional
 from fasthtml import common as fh
 
 from app import login_required, rt
-from app.models.user import users
+from app.models.user import invalidate_user, users
 from app.utils.auth import get_password_hash, verify_password
 from app.utils.ui import action_button, card, dashboard_layout
 
 
 @rt("/profile")
 @login_required
-def profile_view(session):
+def profile_view(session, user):
     """View user profile"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Sidebar content
     sidebar_content = fh.Div(
         # Navigation
@@ -267,10 +264,8 @@ def profile_view(session):
 
 @rt("/profile/edit")
 @login_required
-def profile_edit(session):
+def profile_edit(session, user):
     """Edit user profile form"""
-    user = users[session["auth"]]
-
     # Sidebar content
     sidebar_content = fh.Div(
         fh.Div(
@@ -381,17 +376,16 @@ def profile_edit(session):
 
 @rt("/profile/update")
 @login_required
-def profile_update(session, name: str, department: Optional[str] = None):
+def profile_update(session, user, name: str, department: Optional[str] = None):
     """Handle profile update"""
-    user = users[session["auth"]]
-
     # Update user information
     update_data = {"name": name}
     if user.role == "instructor" and department is not None:
         update_data["department"] = department
 
     # Update the user record
-    users.update(user.email, update_data)
+    users.update(update_data, pk_values=user.email)
+    invalidate_user(user.email)
 
     # Redirect back to profile with success message
     return fh.RedirectResponse("/profile", status_code=303)
@@ -399,10 +393,8 @@ def profile_update(session, name: str, department: Optional[str] = None):
 
 @rt("/profile/change-password")
 @login_required
-def change_password_form(session):
+def change_password_form(session, user):
     """Change password form"""
-    user = users[session["auth"]]
-
     # Sidebar content
     sidebar_content = fh.Div(
         fh.Div(
@@ -512,11 +504,9 @@ def change_password_form(session):
 @rt("/profile/update-password")
 @login_required
 def update_password(
-    session, current_password: str, new_password: str, confirm_password: str
+    session, user, current_password: str, new_password: str, confirm_password: str
 ):
     """Handle password update"""
-    user = users[session["auth"]]
-
     # Validate current password
     if not verify_password(current_password, user.password):
         return fh.Div(
@@ -539,7 +529,8 @@ def update_password(
 
     # Update password
     hashed_password = get_password_hash(new_password)
-    users.update(user.email, {"password": hashed_password})
+    users.update({"password": hashed_password}, pk_values=user.email)
+    invalidate_user(user.email)
 
     # Return success message and redirect
     return fh.Div(
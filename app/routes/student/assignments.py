@@ -10,7 +10,8 @@ from app.models.assignment import assignments, rubric_categories, rubrics
 from app.models.config import assignment_settings, mark_display_options
 from app.models.course import courses, enrollments
 from app.models.feedback import drafts
-from app.models.user import Role, users
+from app.models.user import Role
+from app.services import progress_snapshot
 from app.services.progress_analyzer import ProgressAnalyzer
 from app.utils.design import COLOR, RADIUS, TEXT
 from app.utils.feedback_formatter import (
@@ -209,14 +210,14 @@ def render_enhanced_feedback(
 
 
 def create_progress_tracking_ui(
-    drafts_list, feedback_dict, rubric_cats, assignment, display=DEFAULT_DISPLAY
+    drafts_list, snapshot, rubric_cats, assignment, display=DEFAULT_DISPLAY
 ):
     """
-    Create progress tracking UI components using the ProgressAnalyzer.
+    Create progress tracking UI components from the student's progress snapshot.
 
     Args:
-        drafts_list: List of student drafts
-        feedback_dict: Dictionary of feedback by draft ID
+        drafts_list: List of student drafts, oldest first
+        snapshot: Precomputed progress (``progress_snapshot.get_snapshot``)
         rubric_cats: List of rubric categories
         assignment: Assignment object
         display: Mark display mode ('numeric' | 'hidden' | 'icon')
@@ -224,18 +225,12 @@ def create_progress_tracking_ui(
     Returns:
         List of UI components for progress tracking
     """
-    # Flatten feedback dictionary to list
-    all_feedback = []
-    for _draft_id, feedback_list in feedback_dict.items():
-        all_feedback.extend(feedback_list)
-
-    # Initialize analyzer
-    analyzer = ProgressAnalyzer(drafts_list, all_feedback)
+    analyzer = ProgressAnalyzer.from_entries(drafts_list, snapshot["entries"])
 
     ui_components = []
 
     # 1. Overall improvement metrics
-    metrics = analyzer.get_improvement_metrics()
+    metrics = {**snapshot["metrics"], "drafts_submitted": len(drafts_list)}
     ui_components.append(improvement_metrics_card(metrics, display))
 
     # 2. Draft comparison (compare last two drafts if available)
@@ -247,21 +242,17 @@ def create_progress_tracking_ui(
         )
         ui_components.append(draft_comparison_card(comparison, display))
 
-    # 3. Next steps recommendations
-    if drafts_list and all_feedback:
-        latest_draft = drafts_list[-1]
-        latest_feedback = feedback_dict.get(latest_draft.id, [])
-        if latest_feedback:
-            recommendations = analyzer.get_next_steps_recommendations(
-                latest_feedback, rubric_cats
-            )
-            remaining_drafts = assignment.max_drafts - len(drafts_list)
-            if recommendations:
-                ui_components.append(
-                    next_steps_recommendations(
-                        recommendations, remaining_drafts, display
-                    )
-                )
+    # 3. Next steps recommendations (only while they are for the latest draft)
+    recommendations = snapshot["recommendations"]
+    if (
+        drafts_list
+        and recommendations
+        and snapshot["recommendations_draft_id"] == drafts_list[-1].id
+    ):
+        remaining_drafts = assignment.max_drafts - len(drafts_list)
+        ui_components.append(
+            next_steps_recommendations(recommendations, remaining_drafts, display)
+        )
 
     # 4. Category progression chart (if we have rubric categories)
     if rubric_cats and len(drafts_list) > 1:
@@ -409,11 +400,8 @@ def get_student_assignment(assignment_id, student_email):
 
 @rt("/student/assignments/{assignment_id}")
 @student_required
-def student_assignment_view(session, request, assignment_id: int):
+def student_assignment_view(session, user, request, assignment_id: int):
     """Student assignment detail view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify access to the assignment
     assignment, course, error = get_student_assignment(assignment_id, user.email)
     if error:
@@ -721,7 +709,9 @@ def student_assignment_view(session, request, assignment_id: int):
                 fh.Div(
                     *create_progress_tracking_ui(
                         assignment_drafts,
-                        draft_feedback,
+                        progress_snapshot.get_snapshot(
+                            user.email, assignment_id, rubric_cats
+                        ),
                         rubric_cats,
                         assignment,
                         display=mark_display,
@@ -746,11 +736,8 @@ def student_assignment_view(session, request, assignment_id: int):
 
 @rt("/student/assignments")
 @student_required
-def student_assignments_list(session, request):
+def student_assignments_list(session, user, request):
     """Student assignments list view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get student's enrollments and courses
     student_enrollments = []
     enrolled_courses = {}
@@ -1006,11 +993,8 @@ def student_assignments_list(session, request):
 
 @rt("/student/assignments/{assignment_id}/spec")
 @student_required
-def student_assignment_spec_view(session, assignment_id: int):
+def student_assignment_spec_view(session, user, assignment_id: int):
     """Serve assignment specification file to students"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify access to the assignment
     assignment, _course, error = get_student_assignment(assignment_id, user.email)
     if error:
@@ -8,7 +8,7 @@ from app import rt, student_required
 from app.models.assignment import assignments
 from app.models.course import courses, enrollments
 from app.models.feedback import drafts
-from app.models.user import Role, users
+from app.models.user import Role
 from app.utils.assignment_filter import filter_assignments_by_status
 from app.utils.ui import action_button, dashboard_layout, status_badge
 
@@ -59,11 +59,8 @@ def get_student_course(course_id, student_email):
 
 @rt("/student/courses/{course_id}")
 @student_required
-def student_course_view(session, request, course_id: int):
+def student_course_view(session, user, request, course_id: int):
     """Student course detail view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify course and enrollment
     course, error = get_student_course(course_id, user.email)
     if error:
@@ -290,11 +287,8 @@ def student_course_view(session, request, course_id: int):
 
 @rt("/student/courses/{course_id}/assignments")
 @student_required
-def student_course_assignments(session, request, course_id: int):
+def student_course_assignments(session, user, request, course_id: int):
     """Student course assignments list view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify course and enrollment
     course, error = get_student_course(course_id, user.email)
     if error:
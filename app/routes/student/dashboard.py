@@ -8,7 +8,7 @@ from app import rt, student_required
 from app.models.assignment import assignments
 from app.models.course import courses, enrollments
 from app.models.feedback import drafts
-from app.models.user import Role, users
+from app.models.user import Role
 from app.utils.ui import (
     action_button,
     card,
@@ -138,11 +138,8 @@ def generate_assignments_sidebar(student_assignments, student_drafts):
 
 @rt("/student/dashboard")
 @student_required
-def student_dashboard(session, request):
+def student_dashboard(session, user, request):
     """Student dashboard view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get student's enrollments and courses
     student_enrollments = []
     for enrollment in enrollments():
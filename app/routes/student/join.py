@@ -9,8 +9,9 @@ from fasthtml import common as fh
 
 from app import rt
 from app.models.course import enrollments
-from app.models.user import Role, users
+from app.models.user import Role, find_user_by_token, invalidate_user, users
 from app.utils.auth import get_password_hash, is_strong_password
+from app.utils.db_query import where
 from app.utils.ui import page_container
 
 logger = logging.getLogger(__name__)
@@ -19,12 +20,10 @@ logger = logging.getLogger(__name__)
 @rt("/student/join", methods=["get"])
 def student_join_form(token: str):
     """Student join form from invitation token"""
-    # Check if token is valid
-    found_user = None
-    for user in users():
-        if user.verification_token == token and user.role == Role.STUDENT:
-            found_user = user
-            break
+    # Check if token is valid (one indexed lookup; expired links fail)
+    found_user = find_user_by_token(token)
+    if found_user is not None and found_user.role != Role.STUDENT:
+        found_user = None
 
     if not found_user:
         # Invalid token
@@ -185,8 +184,8 @@ def student_join_process(
 
     # Find user with matching token
     try:
-        user = users[email]
-        if user.verification_token != token or user.role != Role.STUDENT:
+        user = find_user_by_token(token)
+        if user is None or user.email != email or user.role != Role.STUDENT:
             return "Invalid registration token"
 
         # Update user information
@@ -194,25 +193,26 @@ def student_join_process(
         user.password = get_password_hash(password)
         user.verified = True
         user.verification_token = ""  # Clear the token
+        user.verification_token_expiry = ""
         users.update(user)
+        invalidate_user(user.email)
 
         # Update enrollment status if there's a status field
         # Note: The current schema doesn't have these fields, but this
         # is a placeholder for when they are added
         try:
             now = datetime.now().isoformat()
-            for enrollment in enrollments():
-                if enrollment.student_email == email:
-                    if hasattr(enrollment, "status") and enrollment.status == "pending":
-                        enrollment.status = "active"
-                    if (
-                        hasattr(enrollment, "date_enrolled")
-                        and not enrollment.date_enrolled
-                    ):
-                        enrollment.date_enrolled = now
-                    if hasattr(enrollment, "last_access"):
-                        enrollment.last_access = now
-                    enrollments.update(enrollment)
+            for enrollment in where(enrollments, student_email=email):
+                if hasattr(enrollment, "status") and enrollment.status == "pending":
+                    enrollment.status = "active"
+                if (
+                    hasattr(enrollment, "date_enrolled")
+                    and not enrollment.date_enrolled
+                ):
+                    enrollment.date_enrolled = now
+                if hasattr(enrollment, "last_access"):
+                    enrollment.last_access = now
+                enrollments.update(enrollment)
         except Exception as e:
             print(f"Note: Could not update enrollment status: {e!s}")
 
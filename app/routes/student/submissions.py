@@ -10,7 +10,7 @@ from app import rt, student_required
 from app.models.assignment import assignments
 from app.models.course import courses
 from app.models.feedback import Draft, drafts
-from app.models.user import Role, users
+from app.models.user import Role
 from app.utils.privacy import calculate_word_count
 from app.utils.ui import action_button, dashboard_layout, status_badge
 
@@ -80,11 +80,8 @@ def get_student_assignment(assignment_id, student_email):
 
 @rt("/student/assignments/{assignment_id}/submit", methods=["get"])
 @student_required
-def student_assignment_submit_form(session, request, assignment_id: int):
+def student_assignment_submit_form(session, user, request, assignment_id: int):
     """Student assignment submission form view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify access to the assignment
     assignment, course, error = get_student_assignment(assignment_id, user.email)
     if error:
@@ -328,12 +325,14 @@ def student_assignment_submit_form(session, request, assignment_id: int):
 @rt("/student/assignments/{assignment_id}/submit", methods=["post"])
 @student_required
 async def student_assignment_submit_process(
-    session, request, assignment_id: int, version: int, submission_type: str = "text"
+    session,
+    user,
+    request,
+    assignment_id: int,
+    version: int,
+    submission_type: str = "text",
 ):
     """Student assignment submission POST handler with file upload support"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Verify access to the assignment
     _assignment, _course, error = get_student_assignment(assignment_id, user.email)
     if error:
@@ -349,7 +348,8 @@ async def student_assignment_submit_process(
     # Process based on submission type
     content = ""
     original_filename = None
-    file_path = None
+    stored = None
+    file_ext = ""
 
     # Parse form data
     form_data = await request.form()
@@ -372,9 +372,12 @@ async def student_assignment_submit_process(
             )
 
         # Import file handling utilities
+        from pathlib import Path
+
         from app.utils.file_handlers import (
-            extract_file_content,
+            extraction_queue_full,
             get_safe_filename,
+            is_supported_file,
             validate_file_size,
         )
 
@@ -392,33 +395,44 @@ async def student_assignment_submit_process(
                 ),
             )
 
-        try:
-            # Extract text content from file
-            content = await extract_file_content(file_upload)
-            original_filename = file_upload.filename
-
-            # Save file to storage for record keeping (will be deleted after feedback)
-            import hashlib
-            from pathlib import Path
-
-            # Create storage directory if it doesn't exist
-            storage_dir = Path("data/uploads") / str(assignment_id) / user.email
-            storage_dir.mkdir(parents=True, exist_ok=True)
-
-            # Generate safe filename with timestamp
-            safe_filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{get_safe_filename(original_filename)}"
-            file_path = storage_dir / safe_filename
+        if not is_supported_file(file_upload.filename):
+            return fh.Div(
+                fh.P(
+                    f"Unsupported file type: {Path(file_upload.filename).suffix or 'none'}",
+                    cls="text-red-600 bg-red-50 p-4 rounded-lg",
+                ),
+                fh.A(
+                    "Try Again",
+                    href=f"/student/assignments/{assignment_id}/submit",
+                    cls="mt-4 inline-block bg-[#1a2e44] text-[#faf8f2] px-4 py-2 rounded-lg",
+                ),
+            )
 
-            # Save file
-            file_content = await file_upload.read()
-            await file_upload.seek(0)  # Reset for potential re-read
+        # Text extraction happens in the background; refuse new uploads
+        # rather than queueing without bound when the extractor is saturated.
+        if extraction_queue_full():
+            return fh.Div(
+                fh.P(
+                    "Too many documents are being processed right now. Please try again in a minute.",
+                    cls="text-red-600 bg-red-50 p-4 rounded-lg",
+                ),
+                fh.A(
+                    "Try Again",
+                    href=f"/student/assignments/{assignment_id}/submit",
+                    cls="mt-4 inline-block bg-[#1a2e44] text-[#faf8f2] px-4 py-2 rounded-lg",
+                ),
+            )
 
-            with open(file_path, "wb") as f:
-                f.write(file_content)
+        original_filename = file_upload.filename
+        file_ext = Path(original_filename).suffix.lower()
 
-            # Calculate checksum
-            checksum = hashlib.sha256(file_content).hexdigest()
+        # Save file to the content-addressed store, hashing it in the same
+        # pass; identical bytes already on file are reused
+        from app.services.file_store import UPLOAD_ROOT, put_upload
 
+        safe_filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{get_safe_filename(original_filename)}"
+        try:
+            stored = await put_upload(file_upload, max_bytes=10 * 1024 * 1024)
         except Exception as e:
             return fh.Div(
                 fh.P(
@@ -451,38 +465,49 @@ async def student_assignment_submit_process(
     # Calculate word count for statistics
     word_count = calculate_word_count(content)
 
-    # Create a new draft
+    # Create a new draft. Uploads start in "processing" with no content until
+    # the background extractor fills it in.
     new_draft = Draft(
         assignment_id=assignment_id,
         student_email=user.email,
         version=version,
         content=content,
         submission_date=datetime.now().isoformat(),
-        status="submitted",
+        status="processing" if stored else "submitted",
         word_count=word_count,
+        submission_type="file" if stored else "text",
+        preprocessing_status="pending" if stored else None,
     )
 
     # Insert the draft
     try:
-        draft_id = drafts.insert(new_draft)
+        draft = drafts.insert(new_draft)
 
-        # If file was uploaded, save file metadata
-        if file_path:
+        if stored:
+            # Save file metadata, then extract + generate feedback in background
             from app.models.assessment import SubmissionFile, submission_files
+            from app.services.background_tasks import queue_upload_processing
 
             submission_file = SubmissionFile(
-                draft_id=draft_id,
+                draft_id=draft.id,
                 filename=safe_filename,
                 original_filename=original_filename,
-                file_path=str(file_path.relative_to("data/uploads")),
-                file_size=len(file_content),
+                file_path=str(stored.path.relative_to(UPLOAD_ROOT)),
+                file_size=stored.size,
                 mime_type=file_upload.content_type or "application/octet-stream",
-                checksum=checksum,
+                checksum=stored.checksum,
                 uploaded_at=datetime.now().isoformat(),
                 removed_at=None,
             )
             submission_files.insert(submission_file)
 
+            await queue_upload_processing(draft.id, stored.checksum, file_ext)
+
+            return fh.RedirectResponse(
+                f"/student/assignments/{assignment_id}",
+                status_code=303,
+            )
+
         # Trigger AI feedback generation in background
         try:
             import asyncio
@@ -491,10 +516,10 @@ async def student_assignment_submit_process(
 
             # Run feedback generation in background
             # Store task reference to prevent garbage collection
-            feedback_task = asyncio.create_task(process_draft_submission(draft_id))  # noqa: F841, RUF006
+            feedback_task = asyncio.create_task(process_draft_submission(draft.id))  # noqa: F841, RUF006
         except Exception as e:
             print(
-                f"Warning: Failed to start feedback generation for draft {draft_id}: {e}"
+                f"Warning: Failed to start feedback generation for draft {draft.id}: {e}"
             )
             # Continue anyway - the draft was saved successfully
 
@@ -502,10 +527,10 @@ async def student_assignment_submit_process(
         try:
             from app.services.signal_service import queue_signal_extraction
 
-            queue_signal_extraction(draft_id)
+            queue_signal_extraction(draft.id)
         except Exception as e:
             print(
-                f"Warning: Failed to start signal extraction for draft {draft_id}: {e}"
+                f"Warning: Failed to start signal extraction for draft {draft.id}: {e}"
             )
 
         # Redirect to the assignment view to see the submitted draft
@@ -530,11 +555,8 @@ async def student_assignment_submit_process(
 
 @rt("/student/submissions")
 @student_required
-def student_submissions_list(session, request):
+def student_submissions_list(session, user, request):
     """Student submissions history view"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get all student drafts
     student_drafts = []
 
@@ -776,11 +798,8 @@ def student_submissions_list(session, request):
 
 @rt("/student/submissions/hide/{draft_id}")
 @student_required
-def student_submission_hide(session, draft_id: int):
+def student_submission_hide(session, user, draft_id: int):
     """Hide a draft from the student's view (soft delete)"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the draft
     target_draft = None
 
@@ -805,6 +824,11 @@ def student_submission_hide(session, draft_id: int):
         target_draft.hidden_by_student = True
     drafts.update(target_draft)
 
+    # The student has discarded this draft; drop any upload still stored
+    from app.services.file_store import release_draft_files
+
+    release_draft_files(target_draft.id)
+
     # Return a confirmation message that will replace the table row
     return fh.Div(
         fh.Td(
@@ -818,11 +842,8 @@ def student_submission_hide(session, draft_id: int):
 
 @rt("/student/submissions/hidden")
 @student_required
-def student_submissions_hidden(session, request):
+def student_submissions_hidden(session, user, request):
     """Show the student's hidden submissions"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get all student hidden drafts
     hidden_drafts = []
     assignment_info = {}
@@ -976,11 +997,8 @@ def student_submissions_hidden(session, request):
 
 @rt("/student/submissions/unhide/{draft_id}")
 @student_required
-def student_submission_unhide(session, draft_id: int):
+def student_submission_unhide(session, user, draft_id: int):
     """Unhide a draft previously hidden by the student"""
-    # Get current user
-    user = users[session["auth"]]
-
     # Get the draft
     target_draft = None
 
@@ -1004,3 +1022,23 @@ def student_submission_unhide(session, draft_id: int):
     # Redirect back to hidden submissions view (which will now show one less item)
 
     return fh.RedirectResponse("/student/submissions/hidden", status_code=303)
+
+
+@rt("/student/submissions/{draft_id}/status")
+@student_required
+def student_submission_status(session, user, draft_id: int):
+    """Feedback generation progress for one of the student's drafts (JSON).
+
+    Polled while a draft is processing; with streaming generation enabled
+    ``categories_completed`` rises as each rubric category is scored.
+    """
+    from starlette.responses import JSONResponse
+
+    from app.services.feedback_generator import get_feedback_status
+    from app.utils.db_query import by_id
+
+    draft = by_id(drafts, draft_id)
+    if not draft or draft.student_email != user.email:
+        return JSONResponse({"error": "Draft not found"}, status_code=404)
+
+    return JSONResponse(get_feedback_status(draft_id))
@@ -0,0 +1,49 @@
+"""
+Recent-activity feed for the instructor dashboard.
+
+The newest drafts across one instructor's courses, read with a single
+``courses → assignments → drafts`` join ordered by ``submission_date`` and
+cut off with ``LIMIT`` — SQLite walks the instructor's courses and their
+assignments through indexes and never looks at other instructors' drafts.
+The dashboard's poller sends back the ``activity_marker`` of the feed it
+shows; the poll re-runs that same ``LIMIT`` query and only re-renders the
+feed when the marker differs — a new draft arrived, or a shown draft's status
+moved on (e.g. "Processing" → "Feedback ready").
+"""
+
+import hashlib
+from typing import Any
+
+from app.models.feedback import drafts
+
+_FROM = """
+    FROM courses c
+    JOIN assignments a ON a.course_id = c.id
+    JOIN drafts d ON d.assignment_id = a.id
+    WHERE c.instructor_email = ?
+"""
+
+
+def recent_activity(instructor_email: str, limit: int = 10) -> list[dict[str, Any]]:
+    """The ``limit`` newest drafts in this instructor's courses, newest first.
+
+    Each item: ``draft_id, status, submission_date, version, assignment_id,
+    assignment_title, course_id, course_title``.
+    """
+    sql = f"""
+        SELECT d.id AS draft_id, d.status, d.submission_date, d.version,
+               a.id AS assignment_id, a.title AS assignment_title,
+               c.id AS course_id, c.title AS course_title
+        {_FROM}
+        ORDER BY d.submission_date DESC, d.id DESC
+        LIMIT ?
+    """
+    return list(drafts.db.query(sql, [instructor_email, limit]))
+
+
+def activity_marker(items: list[dict[str, Any]]) -> str:
+    """Short digest of the shown drafts and their statuses (the poll cursor)."""
+    digest = hashlib.blake2b(digest_size=8)
+    for item in items:
+        digest.update(f"{item['draft_id']}:{item['status']};".encode())
+    return digest.hexdigest()
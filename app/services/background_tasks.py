@@ -8,11 +8,16 @@ callers.
 """
 
 import asyncio
+import json
 import logging
 import threading
+import time
 from typing import Optional
 
-from app.services.feedback_generator import process_draft_submission
+from app.services.feedback_generator import (
+    process_assignment_batch,
+    process_draft_submission,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -20,6 +25,9 @@ logger = logging.getLogger(__name__)
 # Task tracking — maps draft_id to asyncio.Task or threading.Thread
 active_tasks: dict[int, asyncio.Task | threading.Thread] = {}
 
+# Batch-mode runs — maps assignment_id to its asyncio.Task
+active_batch_runs: dict[int, asyncio.Task] = {}
+
 
 async def queue_feedback_generation(draft_id: int) -> bool:
     """
@@ -97,6 +105,61 @@ def queue_feedback_generation_sync(draft_id: int) -> bool:
         return False
 
 
+async def queue_upload_processing(draft_id: int, checksum: str, file_ext: str) -> bool:
+    """
+    Extract an uploaded file into its draft, then generate feedback.
+
+    The submit handler stores the upload and creates the draft in
+    ``processing`` state; this task fills in the content off the event loop
+    (see ``file_store.extract_blob_text``, which reuses text already extracted
+    from the same bytes) and then runs the normal signal extraction and
+    feedback pipeline.
+
+    Args:
+        draft_id: ID of the draft the upload belongs to
+        checksum: SHA-256 of the stored upload (its blob name)
+        file_ext: Lower-case file extension, e.g. ``.pdf``
+
+    Returns:
+        True if the task was queued
+    """
+    existing = active_tasks.get(draft_id)
+    if isinstance(existing, asyncio.Task) and not existing.done():
+        logger.info(f"Draft {draft_id} is already being processed")
+        return False
+
+    task = asyncio.create_task(
+        _process_upload_with_tracking(draft_id, checksum, file_ext)
+    )
+    active_tasks[draft_id] = task
+    logger.info(f"Queued upload extraction for draft {draft_id}")
+    return True
+
+
+async def queue_assignment_batch(assignment_id: int) -> bool:
+    """
+    Queue batch-mode feedback for every pending draft of an assignment.
+
+    One run per assignment at a time; the run submits provider batch jobs
+    and polls them until the results are stored.
+
+    Args:
+        assignment_id: ID of the assignment to process
+
+    Returns:
+        True if the run was queued, False if one is already in progress
+    """
+    existing = active_batch_runs.get(assignment_id)
+    if existing is not None and not existing.done():
+        logger.info(f"Assignment {assignment_id} already has a batch run")
+        return False
+
+    task = asyncio.create_task(_process_batch_with_tracking(assignment_id))
+    active_batch_runs[assignment_id] = task
+    logger.info(f"Queued batch feedback run for assignment {assignment_id}")
+    return True
+
+
 # ------------------------------------------------------------------
 # Internal helpers
 # ------------------------------------------------------------------
@@ -119,6 +182,73 @@ async def _process_draft_with_tracking(draft_id: int):
         active_tasks.pop(draft_id, None)
 
 
+async def _extract_upload_into_draft(
+    draft_id: int, checksum: str, file_ext: str
+) -> bool:
+    """Fill a draft's content from its stored upload. True on success."""
+    from app.models.feedback import drafts
+    from app.services.file_store import extract_blob_text
+    from app.utils.privacy import calculate_word_count
+
+    draft = drafts[draft_id]
+    draft.preprocessing_status = "processing"
+    drafts.update(draft)
+
+    started = time.perf_counter()
+    try:
+        content = await extract_blob_text(checksum, file_ext)
+        if not content:
+            raise ValueError("No text content found in file")
+    except Exception as e:
+        logger.error(f"Extraction failed for draft {draft_id}: {e!s}")
+        draft.status = "error"
+        draft.preprocessing_status = "error"
+        draft.preprocessing_result = json.dumps({"error": str(e)})
+        drafts.update(draft)
+        return False
+
+    draft.content = content
+    draft.word_count = calculate_word_count(content)
+    draft.status = "submitted"
+    draft.preprocessing_status = "complete"
+    draft.preprocessing_result = json.dumps(
+        {"seconds": round(time.perf_counter() - started, 3)}
+    )
+    drafts.update(draft)
+    return True
+
+
+async def _process_upload_with_tracking(draft_id: int, checksum: str, file_ext: str):
+    """Extract, then run signals + feedback; clean up tracking when done."""
+    from app.services.file_store import release_draft_files
+
+    try:
+        extracted = await _extract_upload_into_draft(draft_id, checksum, file_ext)
+        # The text is on the draft now (or the draft failed and must be
+        # resubmitted): the uploaded file itself is not kept
+        release_draft_files(draft_id)
+        if extracted:
+            from app.services.signal_service import queue_signal_extraction
+
+            queue_signal_extraction(draft_id)
+            await process_draft_submission(draft_id)
+    except Exception as e:
+        logger.error(f"Error processing upload for draft {draft_id}: {e!s}")
+    finally:
+        active_tasks.pop(draft_id, None)
+
+
+async def _process_batch_with_tracking(assignment_id: int):
+    """Run a batch-mode pass and clean up tracking when done."""
+    try:
+        summary = await process_assignment_batch(assignment_id)
+        logger.info(f"Batch feedback run for assignment {assignment_id}: {summary}")
+    except Exception as e:
+        logger.error(f"Batch run failed for assignment {assignment_id}: {e!s}")
+    finally:
+        active_batch_runs.pop(assignment_id, None)
+
+
 def _process_draft_in_thread(draft_id: int):
     """Wrapper that creates a new event loop in a thread for async processing."""
     try:
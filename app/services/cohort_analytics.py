@@ -0,0 +1,241 @@
+"""
+Cohort-level progression analytics for one assignment.
+
+Where ``ProgressAnalyzer`` follows one student, this answers class-wide
+questions — "which rubric categories improved most between draft 1 and 3?"
+— without clicking through every student. One ``drafts JOIN aggregated_feedback``
+query loads every scored category row of the assignment; a single pass
+arranges them into a student -> draft version -> category score matrix, and
+everything else is computed from that matrix:
+
+- ``bands``: per draft version and category (plus the weighted overall
+  score), the mean and the 10th/25th/50th/75th/90th percentiles;
+- ``deltas``: draft-over-draft changes for each pair of consecutive versions,
+  over the students scored on both;
+- ``improvement``: each student's first → latest overall change, summarised
+  and bucketed into a distribution;
+- ``category_improvement``: first → latest change per category, largest
+  mean gain first.
+
+Scores are the instructor's view: every aggregated row counts, released or
+still pending review. Results are cached per assignment and reused until the
+assignment's feedback or rubric changes, so re-opening the tab or downloading
+the CSV does no recomputation. The change check never reads the scores: new
+aggregated rows raise the table's highest id, and score edits bump the
+assignment's revision through ``feedback_changed``.
+"""
+
+import math
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.models.assignment import rubric_categories, rubrics
+from app.models.feedback import drafts
+from app.services.progress_analyzer import weighted_score
+from app.utils.db_query import first, where
+from app.utils.stats import percentile
+
+OVERALL = "Overall"
+BAND_PERCENTILES = (10, 25, 50, 75, 90)
+# Edges (points) of the first → latest improvement distribution
+IMPROVEMENT_BUCKETS = (-10, -5, 5, 10, 20)
+
+_CACHE_SIZE = 32
+# assignment id -> (fingerprint, matrix, analytics)
+_cache: OrderedDict[int, tuple[tuple, dict, dict[str, Any]]] = OrderedDict()
+# assignment id -> revision, bumped by ``feedback_changed``
+_revisions: dict[int, int] = {}
+
+_FROM = """
+    FROM drafts d
+    JOIN aggregated_feedback af ON af.draft_id = d.id
+    WHERE d.assignment_id = ? AND af.aggregated_score IS NOT NULL
+"""
+
+
+def band(values: list[float]) -> dict[str, Any]:
+    """``n``, ``mean`` and the ``BAND_PERCENTILES`` of ``values``."""
+    if not values:
+        return {"n": 0, "mean": None, **{f"p{q}": None for q in BAND_PERCENTILES}}
+    ordered = sorted(values)
+    return {
+        "n": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 1),
+        **{f"p{q}": round(percentile(ordered, q), 1) for q in BAND_PERCENTILES},
+    }
+
+
+def _bucket_labels() -> list[str]:
+    edges = IMPROVEMENT_BUCKETS
+    labels = [f"below {edges[0]:+d}"]
+    labels += [f"{lo:+d} to {hi:+d}" for lo, hi in zip(edges, edges[1:])]
+    labels.append(f"{edges[-1]:+d} or more")
+    return labels
+
+
+def _bucket_index(change: float) -> int:
+    return sum(1 for edge in IMPROVEMENT_BUCKETS if change >= edge)
+
+
+def _categories(assignment_id: int) -> list[Any]:
+    rubric = first(rubrics, assignment_id=assignment_id)
+    return where(rubric_categories, rubric_id=rubric.id) if rubric else []
+
+
+def feedback_changed(assignment_id: int) -> None:
+    """Record that scores of the assignment were edited (the cache is stale)."""
+    _revisions[assignment_id] = _revisions.get(assignment_id, 0) + 1
+
+
+def _fingerprint(assignment_id: int, categories: list[Any]) -> tuple:
+    """Changes whenever a scored row is added or re-scored, or the rubric changes.
+
+    Added rows raise ``MAX(id)`` of ``aggregated_feedback`` (a primary-key
+    lookup, whichever process inserted them); re-scoring goes through
+    ``feedback_changed``. Nothing here scans the assignment's rows.
+    """
+    (max_id,) = drafts.db.execute(
+        "SELECT COALESCE(MAX(id), 0) FROM aggregated_feedback"
+    ).fetchone()
+    return (
+        max_id,
+        _revisions.get(assignment_id, 0),
+        tuple((c.id, c.name, c.weight) for c in categories),
+    )
+
+
+def _load_matrix(assignment_id: int) -> dict[str, dict[int, dict[int, float]]]:
+    """student email -> draft version -> category id -> score."""
+    matrix: dict[str, dict[int, dict[int, float]]] = {}
+    sql = f"SELECT d.student_email, d.version, af.category_id, af.aggregated_score {_FROM}"
+    for email, version, category_id, score in drafts.db.execute(sql, [assignment_id]):
+        matrix.setdefault(email, {}).setdefault(version, {})[category_id] = float(score)
+    return matrix
+
+
+def _series(categories: list[Any]) -> list[tuple[str, Any]]:
+    """``(label, score_of)`` per category and the overall score, where
+    ``score_of(scores)`` reads that series from one draft's category scores."""
+    weights = {c.id: float(c.weight or 0) for c in categories}
+
+    def overall(scores: dict[int, float]) -> Optional[float]:
+        return weighted_score(scores, weights) if scores else None
+
+    series: list[tuple[str, Any]] = [(OVERALL, overall)]
+    for cat in categories:
+        series.append((cat.name, lambda scores, cid=cat.id: scores.get(cid)))
+    return series
+
+
+def _changes(
+    matrix: dict[str, dict[int, dict[int, float]]],
+    score_of: Any,
+    from_version: Optional[int],
+    to_version: Optional[int],
+) -> list[float]:
+    """Per-student change in one series between two versions (``None`` for a
+    version means each student's first / latest scored draft)."""
+    changes = []
+    for by_version in matrix.values():
+        versions = sorted(by_version)
+        a = versions[0] if from_version is None else from_version
+        b = versions[-1] if to_version is None else to_version
+        if a == b or a not in by_version or b not in by_version:
+            continue
+        before, after = score_of(by_version[a]), score_of(by_version[b])
+        if before is not None and after is not None:
+            changes.append(after - before)
+    return changes
+
+
+def _compute(
+    matrix: dict[str, dict[int, dict[int, float]]], categories: list[Any]
+) -> dict[str, Any]:
+    versions = sorted({v for by_version in matrix.values() for v in by_version})
+    series = _series(categories)
+
+    bands = []
+    for version in versions:
+        drafts_at = [bv[version] for bv in matrix.values() if version in bv]
+        for label, score_of in series:
+            values = [s for s in map(score_of, drafts_at) if s is not None]
+            bands.append({"category": label, "version": version, **band(values)})
+
+    deltas = [
+        {
+            "category": label,
+            "from_version": a,
+            "to_version": b,
+            **band(_changes(matrix, score_of, a, b)),
+        }
+        for a, b in zip(versions, versions[1:])
+        for label, score_of in series
+    ]
+
+    overall_changes = _changes(matrix, series[0][1], None, None)
+    buckets = [0] * (len(IMPROVEMENT_BUCKETS) + 1)
+    for change in overall_changes:
+        buckets[_bucket_index(change)] += 1
+    category_improvement = [
+        {"category": label, **band(_changes(matrix, score_of, None, None))}
+        for label, score_of in series[1:]
+    ]
+    category_improvement.sort(
+        key=lambda row: row["mean"] if row["mean"] is not None else -math.inf,
+        reverse=True,
+    )
+
+    return {
+        "students": len(matrix),
+        "versions": versions,
+        "bands": bands,
+        "deltas": deltas,
+        "improvement": {
+            **band(overall_changes),
+            "buckets": list(zip(_bucket_labels(), buckets)),
+        },
+        "category_improvement": category_improvement,
+    }
+
+
+def _cached(assignment_id: int) -> tuple[dict, dict[str, Any], list[Any]]:
+    categories = _categories(assignment_id)
+    fingerprint = _fingerprint(assignment_id, categories)
+    entry = _cache.get(assignment_id)
+    if entry is not None and entry[0] == fingerprint:
+        _cache.move_to_end(assignment_id)
+        return entry[1], entry[2], categories
+    matrix = _load_matrix(assignment_id)
+    analytics = _compute(matrix, categories)
+    _cache[assignment_id] = (fingerprint, matrix, analytics)
+    _cache.move_to_end(assignment_id)
+    while len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return matrix, analytics, categories
+
+
+def cohort_analytics(assignment_id: int) -> dict[str, Any]:
+    """Class-wide progression analytics for one assignment (see module doc).
+
+    Returns ``students``, ``versions``, ``bands``, ``deltas``,
+    ``improvement`` and ``category_improvement``. Treat it as read-only: the
+    dict is shared with the cache.
+    """
+    return _cached(assignment_id)[1]
+
+
+def compare_versions(
+    assignment_id: int, from_version: int, to_version: int
+) -> list[dict[str, Any]]:
+    """Change per category (and overall) from one draft version to another,
+    over the students scored on both — e.g. draft 1 → draft 3."""
+    matrix, _, categories = _cached(assignment_id)
+    return [
+        {
+            "category": label,
+            "from_version": from_version,
+            "to_version": to_version,
+            **band(_changes(matrix, score_of, from_version, to_version)),
+        }
+        for label, score_of in _series(categories)
+    ]
@@ -0,0 +1,526 @@
+"""
+Provider batch-API mode for bulk feedback runs.
+
+Re-running feedback for a whole assignment, or a deadline rush, sends hundreds
+of drafts through ``litellm.acompletion`` one at a time at interactive prices.
+For work that isn't time-critical, ``BatchFeedbackRunner`` instead packs every
+eligible draft's prompts into one provider batch job per model (the OpenAI
+``/v1/batches`` API, which OpenAI-compatible ``custom`` endpoints also speak),
+polls until the job finishes, and feeds each result back through the normal
+``FeedbackGenerator._store_model_feedback`` / ``_aggregate_feedback`` path.
+
+State is durable: each job is a ``feedback_batches`` row, and each request is a
+``model_runs`` row in ``batched`` status with ``custom_id`` ``run-<model_run_id>``.
+Jobs still running when ``wait_for`` gives up, or in flight across a restart,
+are picked back up by ``resume_pending_batches``: app startup runs it in the
+background (``start_resume``), and ``tools/resume_feedback_batches.py`` runs
+it on demand.
+
+Models whose provider has no batch endpoint through LiteLLM (``acreate_batch``
+doesn't create Anthropic batches; Ollama has none) run interactively when their
+draft is finalised, alongside the signal evidence source.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+import litellm
+
+from app.assessment.registry import get_assessment_handler, type_code_for_assignment
+from app.models.assignment import Assignment, assignments
+from app.models.config import AIModel, ai_models
+from app.models.feedback import (
+    Draft,
+    FeedbackBatch,
+    ModelRun,
+    drafts,
+    feedback_batches,
+    model_runs,
+)
+from app.services.feedback_generator import (
+    FeedbackGenerator,
+    _extract_usage,
+    feedback_generator,
+)
+from app.services.prompt_templates import generate_feedback_prompt_parts
+from app.utils.db_query import by_id, count, where
+
+logger = logging.getLogger(__name__)
+
+# FeedForward provider -> LiteLLM ``custom_llm_provider`` for the batch API
+_BATCH_PROVIDERS = {"openai": "openai", "custom": "openai"}
+_BATCH_ENDPOINT = "/v1/chat/completions"
+_MAX_REQUESTS_PER_BATCH = 50_000  # OpenAI's per-job request limit
+
+_POLL_INTERVAL = float(os.environ.get("FEEDBACK_BATCH_POLL_SECONDS", "60"))
+_POLL_TIMEOUT = float(os.environ.get("FEEDBACK_BATCH_TIMEOUT", str(24 * 3600)))
+
+_resume_task: Optional[asyncio.Task] = None
+
+_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+_ELIGIBLE_DRAFT_STATUSES = ("submitted", "error")
+
+
+def supports_batch(model: AIModel) -> bool:
+    """True if the model's provider can take a batch job via LiteLLM."""
+    return (model.provider or "").lower() in _BATCH_PROVIDERS
+
+
+def _usage_from_body(body: dict[str, Any]) -> dict[str, Any]:
+    """Token/cost usage for one batch result body (a chat completion dict)."""
+    try:
+        response: Any = litellm.ModelResponse(**body)
+    except Exception:  # malformed body — usage is best-effort
+        response = None
+    return _extract_usage(response)
+
+
+class BatchFeedbackRunner:
+    """Collect eligible drafts into provider batch jobs and see them through."""
+
+    def __init__(
+        self,
+        generator: Optional[FeedbackGenerator] = None,
+        poll_interval: float = _POLL_INTERVAL,
+        timeout: float = _POLL_TIMEOUT,
+    ):
+        self.generator = generator or feedback_generator
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+
+    def eligible_drafts(self, assignment_id: int) -> list[Draft]:
+        """Drafts awaiting feedback (or whose last run failed) that have content."""
+        return [
+            d
+            for d in where(drafts, assignment_id=assignment_id)
+            if d.status in _ELIGIBLE_DRAFT_STATUSES and d.content
+        ]
+
+    async def run_assignment(self, assignment_id: int) -> dict[str, int]:
+        """Submit every eligible draft of an assignment and wait for the results.
+
+        Falls back to the interactive pipeline when none of the instructor's
+        models supports batching. Returns a small summary for logging.
+        """
+        eligible = self.eligible_drafts(assignment_id)
+        jobs = await self.submit_assignment(assignment_id, eligible)
+        if not jobs:
+            for draft in eligible:
+                await self.generator.generate_feedback_for_draft(draft.id)
+            return {"drafts": len(eligible), "batches": 0, "requests": 0}
+
+        await self.wait_for(jobs)
+        return {
+            "drafts": len(eligible),
+            "batches": len(jobs),
+            "requests": sum(job.request_count for job in jobs),
+        }
+
+    async def submit_assignment(
+        self, assignment_id: int, eligible: Optional[list[Draft]] = None
+    ) -> list[FeedbackBatch]:
+        """Create ``model_runs`` for every eligible draft and submit batch jobs.
+
+        Returns the created ``feedback_batches`` rows — empty when there is
+        nothing to batch (no eligible drafts or no batch-capable model).
+        """
+        gen = self.generator
+        assignment = by_id(assignments, assignment_id)
+        if assignment is None:
+            return []
+        settings = gen._get_assignment_settings(assignment_id)
+        if settings is None:
+            logger.error(f"No settings found for assignment {assignment_id}")
+            return []
+
+        if eligible is None:
+            eligible = self.eligible_drafts(assignment_id)
+        batch_models = [
+            m
+            for m in gen._get_instructor_active_models(assignment.created_by)
+            if supports_batch(m)
+        ]
+        if not eligible or not batch_models:
+            return []
+
+        # Build every prompt before touching draft state: a missing rubric
+        # fails the whole run up front rather than stranding drafts.
+        prompts = {
+            d.id: generate_feedback_prompt_parts(
+                assignment=assignment,
+                student_submission=d.content,
+                draft_version=d.version,
+                feedback_style_id=settings.feedback_style_id,
+                feedback_level=settings.feedback_level,
+            )
+            for d in eligible
+        }
+
+        for draft in eligible:
+            draft.status = "processing"
+            drafts.update(draft)
+
+        group_key = uuid.uuid4().hex
+        num_runs = getattr(settings, "num_runs", 1) or 1
+        jobs: list[FeedbackBatch] = []
+        for model in batch_models:
+            api_config = gen._get_model_config(model)
+            requests: list[tuple[int, str]] = []
+            for draft in eligible:
+                prefix, suffix = prompts[draft.id]
+                messages = gen._build_messages(model, prefix, suffix)
+                for run_number in range(1, num_runs + 1):
+                    run = model_runs.insert(
+                        ModelRun(
+                            draft_id=draft.id,
+                            model_id=model.id,
+                            run_number=run_number,
+                            timestamp=datetime.now().isoformat(),
+                            prompt=prefix + "\n\n" + suffix,
+                            raw_response="",
+                            status="batched",
+                        )
+                    )
+                    requests.append(
+                        (
+                            run.id,
+                            self._request_line(model, run.id, messages, api_config),
+                        )
+                    )
+
+            for start in range(0, len(requests), _MAX_REQUESTS_PER_BATCH):
+                chunk = requests[start : start + _MAX_REQUESTS_PER_BATCH]
+                job = await self._submit(
+                    assignment, model, api_config, chunk, group_key
+                )
+                if job is not None:
+                    jobs.append(job)
+
+        # Drafts whose every batched request failed to submit are done now.
+        await self._finalize_ready_drafts(group_key, {d.id for d in eligible})
+        logger.info(
+            f"Submitted {len(jobs)} feedback batch job(s) for assignment "
+            f"{assignment_id} ({len(eligible)} drafts)"
+        )
+        return jobs
+
+    async def wait_for(self, jobs: list[FeedbackBatch]) -> bool:
+        """Poll until every job is terminal or the timeout passes.
+
+        Returns True when all jobs finished. Jobs still running at the
+        timeout stay in ``feedback_batches`` for ``resume_pending_batches``.
+        """
+        pending = [job.id for job in jobs]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        while pending:
+            still_pending = []
+            for job_id in pending:
+                job = by_id(feedback_batches, job_id)
+                if job is None:
+                    continue
+                try:
+                    done = await self.poll(job)
+                except Exception as e:  # transient provider error — retry next tick
+                    logger.warning(f"Polling batch {job.provider_batch_id}: {e!s}")
+                    done = False
+                if not done:
+                    still_pending.append(job_id)
+            pending = still_pending
+            if not pending:
+                return True
+            if loop.time() >= deadline:
+                logger.warning(f"{len(pending)} feedback batch job(s) still running")
+                return False
+            await asyncio.sleep(self.poll_interval)
+        return True
+
+    async def poll(self, job: FeedbackBatch) -> bool:
+        """Check one job once; on completion store its results. True if terminal."""
+        if job.completed_at:  # results already collected
+            return True
+        model = by_id(ai_models, job.model_id)
+        if model is None:
+            return self._abandon(job, "model no longer exists")
+
+        kwargs = self._provider_kwargs(model, self.generator._get_model_config(model))
+        remote = await litellm.aretrieve_batch(batch_id=job.provider_batch_id, **kwargs)
+        job.status = str(remote.status)
+        if job.status not in _TERMINAL_STATUSES:
+            feedback_batches.update(job)
+            return False
+
+        job.output_file_id = remote.output_file_id or ""
+        job.error_file_id = remote.error_file_id or ""
+        job.completed_at = datetime.now().isoformat()
+        feedback_batches.update(job)
+
+        draft_ids = await self._collect_results(job, kwargs)
+        await self._finalize_ready_drafts(job.group_key, draft_ids)
+        return True
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def _provider_kwargs(
+        self, model: AIModel, api_config: dict[str, Any]
+    ) -> dict[str, Any]:
+        """LiteLLM files/batches kwargs: provider, key and base URL."""
+        kwargs: dict[str, Any] = {
+            "custom_llm_provider": _BATCH_PROVIDERS[(model.provider or "").lower()]
+        }
+        if "api_key" in api_config:
+            kwargs["api_key"] = api_config["api_key"]
+        base_url = self.generator._resolve_base_url(model, api_config)
+        if base_url:
+            kwargs["api_base"] = base_url
+        return kwargs
+
+    def _request_line(
+        self,
+        model: AIModel,
+        run_id: int,
+        messages: list[dict[str, Any]],
+        api_config: dict[str, Any],
+    ) -> str:
+        """One JSONL request: the same body an interactive call would send."""
+        params = self.generator._build_call_params(model, messages, api_config)
+        body = {k: v for k, v in params.items() if k not in ("api_key", "api_base")}
+        body["model"] = str(model.model_id)
+        return json.dumps(
+            {
+                "custom_id": f"run-{run_id}",
+                "method": "POST",
+                "url": _BATCH_ENDPOINT,
+                "body": body,
+            }
+        )
+
+    async def _submit(
+        self,
+        assignment: Assignment,
+        model: AIModel,
+        api_config: dict[str, Any],
+        requests: list[tuple[int, str]],
+        group_key: str,
+    ) -> Optional[FeedbackBatch]:
+        """Upload one JSONL file and create its batch job."""
+        run_ids = [run_id for run_id, _ in requests]
+        kwargs = self._provider_kwargs(model, api_config)
+        try:
+            upload = await litellm.acreate_file(
+                file=(
+                    f"feedforward-assignment-{assignment.id}.jsonl",
+                    "\n".join(line for _, line in requests).encode(),
+                ),
+                purpose="batch",
+                **kwargs,
+            )
+            remote = await litellm.acreate_batch(
+                completion_window="24h",
+                endpoint=_BATCH_ENDPOINT,
+                input_file_id=upload.id,
+                metadata={"assignment_id": str(assignment.id)},
+                **kwargs,
+            )
+        except Exception as e:
+            logger.error(f"Batch submission failed for model {model.id}: {e!s}")
+            self._fail_runs(run_ids, f"Batch submission failed: {e!s}")
+            return None
+
+        return feedback_batches.insert(
+            FeedbackBatch(
+                assignment_id=assignment.id,
+                model_id=model.id,
+                group_key=group_key,
+                provider_batch_id=remote.id,
+                input_file_id=upload.id,
+                output_file_id="",
+                error_file_id="",
+                model_run_ids=json.dumps(run_ids),
+                request_count=len(run_ids),
+                status=str(remote.status or "validating"),
+                created_at=datetime.now().isoformat(),
+                completed_at="",
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    async def _collect_results(
+        self, job: FeedbackBatch, kwargs: dict[str, Any]
+    ) -> set[int]:
+        """Store every result of a finished job; return the affected draft ids."""
+        records: dict[str, dict[str, Any]] = {}
+        for file_id in (job.output_file_id, job.error_file_id):
+            if not file_id:
+                continue
+            content = await litellm.afile_content(file_id=file_id, **kwargs)
+            for line in content.content.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                records[record.get("custom_id", "")] = record
+
+        draft_ids: set[int] = set()
+        for run_id in json.loads(job.model_run_ids or "[]"):
+            run = by_id(model_runs, run_id)
+            if run is None or run.status != "batched":
+                continue
+            draft_ids.add(run.draft_id)
+            record = records.get(f"run-{run_id}") or {}
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                await self._store_result(run, job.assignment_id, response["body"])
+            else:
+                error = record.get("error") or response.get("body")
+                run.status = "error"
+                run.raw_response = json.dumps(
+                    error or f"No result (batch {job.status})"
+                )
+                model_runs.update(run)
+        return draft_ids
+
+    async def _store_result(
+        self, run: ModelRun, assignment_id: int, body: dict[str, Any]
+    ) -> None:
+        gen = self.generator
+        try:
+            content = body["choices"][0]["message"]["content"]
+            if content is None:
+                raise ValueError("Empty response from AI model")
+            feedback_data = gen._parse_ai_response(str(content))
+            usage = _usage_from_body(body)
+
+            run.raw_response = str(content)
+            run.status = "complete"
+            run.input_tokens = usage["input_tokens"]
+            run.cached_tokens = usage["cached_tokens"]
+            run.output_tokens = usage["output_tokens"]
+            run.cost_usd = usage["cost_usd"]
+            model_runs.update(run)
+
+            await gen._store_model_feedback(run.id, assignment_id, feedback_data)
+        except Exception as e:
+            logger.error(f"Error storing batch result for run {run.id}: {e!s}")
+            run.status = "error"
+            run.raw_response = str(e)
+            model_runs.update(run)
+
+    def _fail_runs(self, run_ids: list[int], message: str) -> None:
+        for run_id in run_ids:
+            run = by_id(model_runs, run_id)
+            if run is not None:
+                run.status = "error"
+                run.raw_response = message
+                model_runs.update(run)
+
+    def _abandon(self, job: FeedbackBatch, reason: str) -> bool:
+        job.status = "cancelled"
+        job.completed_at = datetime.now().isoformat()
+        feedback_batches.update(job)
+        self._fail_runs(json.loads(job.model_run_ids or "[]"), reason)
+        return True
+
+    # ------------------------------------------------------------------
+    # Draft finalisation
+    # ------------------------------------------------------------------
+
+    def _group_run_ids(self, group_key: str) -> list[int]:
+        run_ids: list[int] = []
+        for job in where(feedback_batches, group_key=group_key):
+            run_ids.extend(json.loads(job.model_run_ids or "[]"))
+        return run_ids
+
+    async def _finalize_ready_drafts(self, group_key: str, draft_ids: set[int]):
+        """Aggregate drafts whose batched runs (across the group) are all done."""
+        if not draft_ids:
+            return
+        runs_by_draft: dict[int, list[ModelRun]] = {}
+        for run_id in self._group_run_ids(group_key):
+            run = by_id(model_runs, run_id)
+            if run is not None and run.draft_id in draft_ids:
+                runs_by_draft.setdefault(run.draft_id, []).append(run)
+
+        for draft_id in sorted(draft_ids):
+            runs = runs_by_draft.get(draft_id, [])
+            if any(r.status == "batched" for r in runs):
+                continue
+            draft = by_id(drafts, draft_id)
+            if draft is None or draft.status != "processing":
+                continue
+            await self._finalize_draft(draft, runs)
+
+    async def _finalize_draft(self, draft: Draft, batched_runs: list[ModelRun]):
+        """Add interactive + signal evidence, then aggregate as the pipeline does.
+
+        The extra sources come from the assessment handler, as for an
+        interactive run, given only the models that had no batch endpoint.
+        """
+        gen = self.generator
+        try:
+            assignment = assignments[draft.assignment_id]
+            settings = gen._get_assignment_settings(assignment.id)
+            interactive = [
+                m
+                for m in gen._get_instructor_active_models(assignment.created_by)
+                if not supports_batch(m)
+            ]
+            handler = get_assessment_handler(type_code_for_assignment(assignment.id))
+            await gen._gather_evidence_and_aggregate(
+                draft,
+                assignment,
+                settings,
+                handler.evidence_sources(gen, interactive, settings),
+                completed_run_ids=[
+                    r.id for r in batched_runs if r.status == "complete"
+                ],
+            )
+        except Exception as e:
+            logger.error(f"Error finalising batched draft {draft.id}: {e!s}")
+            draft.status = "error"
+            drafts.update(draft)
+
+
+async def resume_pending_batches(runner: Optional[BatchFeedbackRunner] = None):
+    """Resume polling every unfinished batch job (e.g. after a restart)."""
+    runner = runner or BatchFeedbackRunner()
+    pending = where(feedback_batches, completed_at="")
+    if pending:
+        await runner.wait_for(pending)
+
+
+def start_resume() -> Optional[asyncio.Task]:
+    """Resume unfinished jobs on the running loop (app startup). Idempotent."""
+    global _resume_task
+    if _resume_task is not None and not _resume_task.done():
+        return _resume_task
+    if not count(feedback_batches, completed_at=""):
+        return None
+    _resume_task = asyncio.get_running_loop().create_task(resume_pending_batches())
+    logger.info("Resuming unfinished feedback batch jobs")
+    return _resume_task
+
+
+async def stop_resume() -> None:
+    """Cancel the resume task (app shutdown); the jobs stay pending for next time."""
+    global _resume_task
+    if _resume_task is None:
+        return
+    _resume_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _resume_task
+    _resume_task = None
@@ -11,6 +11,7 @@ import logging
 import os
 import re
 import statistics
+from collections.abc import Awaitable, Callable, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Optional
@@ -44,9 +45,11 @@ from app.models.feedback import (
     model_runs,
 )
 from app.models.instructor_preferences import instructor_model_prefs
-from app.services.evidence import SignalEvidenceSource
-from app.services.prompt_templates import generate_feedback_prompt
+from app.services.evidence import EvidenceSource, SignalEvidenceSource
+from app.services.feedback_stream import CriteriaStreamParser
+from app.services.prompt_templates import generate_feedback_prompt_parts
 from app.utils.crypto import decrypt_sensitive_data
+from app.utils.db_query import first, where
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -70,6 +73,22 @@ _ENV_VAR_MAP = {
     "custom": "CUSTOM_LLM_API_KEY",
 }
 
+# Providers where LiteLLM forwards explicit ``cache_control`` breakpoints on
+# message content blocks. OpenAI-compatible providers cache a stable prompt
+# prefix automatically, so they only need the prefix sent first.
+_CACHE_CONTROL_PROVIDERS = {"anthropic"}
+
+_SYSTEM_PROMPT = (
+    "You are an expert educational assessment assistant. "
+    "Provide feedback in valid JSON format only."
+)
+
+# Streaming mode: criteria are persisted as each one completes in the reply, so
+# a timeout or truncated stream keeps what finished. On by default only when
+# FEEDBACK_STREAMING=true; a model's api_config "stream" key overrides it.
+_STREAM_DEFAULT = os.environ.get("FEEDBACK_STREAMING", "false").lower() == "true"
+_STREAM_TIMEOUT = float(os.environ.get("FEEDBACK_STREAM_TIMEOUT", "120"))
+
 # API key env vars to check for mock fallback detection
 _API_KEY_VARS = [
     "OPENAI_API_KEY",
@@ -97,10 +116,20 @@ def _extract_usage(response: Any) -> dict[str, Any]:
     providers and computes cost from its model price map. Both can be absent
     (some providers/proxies omit usage; cost lookup fails for unknown models) —
     return zeros rather than raising, so cost tracking never breaks feedback.
+
+    ``cached_tokens`` is the share of ``input_tokens`` served from a provider
+    prompt cache: OpenAI-style ``prompt_tokens_details.cached_tokens``, or
+    Anthropic's ``cache_read_input_tokens`` as surfaced by LiteLLM.
     """
     usage = getattr(response, "usage", None)
     input_tokens = int(getattr(usage, "prompt_tokens", 0) or 0)
     output_tokens = int(getattr(usage, "completion_tokens", 0) or 0)
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = int(
+        getattr(details, "cached_tokens", 0)
+        or getattr(usage, "cache_read_input_tokens", 0)
+        or 0
+    )
 
     cost = 0.0
     try:
@@ -110,6 +139,7 @@ def _extract_usage(response: Any) -> dict[str, Any]:
 
     return {
         "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
         "output_tokens": output_tokens,
         "cost_usd": cost,
     }
@@ -181,41 +211,11 @@ class FeedbackGenerator:
             handler = get_assessment_handler(type_code_for_assignment(assignment.id))
             sources = handler.evidence_sources(self, active_models, settings)
 
-            # Run all sources concurrently; each writes its own model_run rows.
-            all_results = await asyncio.gather(
-                *[s.produce(draft, assignment, settings) for s in sources],
-                return_exceptions=True,
-            )
-
-            # Collect successful runs; require ≥1 LLM run (signals are additive).
-            successful_runs: list[FeedbackGenerationResult] = []
-            llm_success_count = 0
-            for r in all_results:
-                if isinstance(r, Exception):
-                    logger.error(f"Evidence source exception: {r!s}")
-                    continue
-                if r.success and r.model_run_id is not None:
-                    successful_runs.append(
-                        FeedbackGenerationResult(
-                            model_run_id=r.model_run_id, success=True
-                        )
-                    )
-                    if r.kind == "llm":
-                        llm_success_count += 1
-
-            if llm_success_count == 0:
-                logger.error(f"No successful LLM runs for draft {draft_id}")
-                draft.status = "error"
-                drafts.update(draft)
+            if not await self._gather_evidence_and_aggregate(
+                draft, assignment, settings, sources
+            ):
                 return False
 
-            # Aggregate feedback from successful runs
-            await self._aggregate_feedback(draft, assignment, settings, successful_runs)
-
-            # Update draft status
-            draft.status = "feedback_ready"
-            drafts.update(draft)
-
             logger.info(f"Successfully generated feedback for draft {draft_id}")
             return True
 
@@ -229,6 +229,58 @@ class FeedbackGenerator:
                 pass
             return False
 
+    async def _gather_evidence_and_aggregate(
+        self,
+        draft: Draft,
+        assignment: Assignment,
+        settings: AssignmentSettings,
+        sources: list[EvidenceSource],
+        completed_run_ids: Sequence[int] = (),
+    ) -> bool:
+        """Run ``sources``, aggregate the successful runs and set the draft status.
+
+        ``completed_run_ids`` are LLM runs that already finished elsewhere (the
+        batch API); they are aggregated and count towards the one successful
+        LLM run a draft needs. Returns True once the draft is
+        ``feedback_ready``; with no successful LLM run it is set to ``error``.
+        """
+        # Run all sources concurrently; each writes its own model_run rows.
+        all_results = await asyncio.gather(
+            *[s.produce(draft, assignment, settings) for s in sources],
+            return_exceptions=True,
+        )
+
+        # Collect successful runs; require ≥1 LLM run (signals are additive).
+        successful_runs = [
+            FeedbackGenerationResult(model_run_id=run_id, success=True)
+            for run_id in completed_run_ids
+        ]
+        llm_success_count = len(successful_runs)
+        for r in all_results:
+            if isinstance(r, BaseException):
+                logger.error(f"Evidence source exception: {r!s}")
+                continue
+            if r.success and r.model_run_id is not None:
+                successful_runs.append(
+                    FeedbackGenerationResult(model_run_id=r.model_run_id, success=True)
+                )
+                if r.kind == "llm":
+                    llm_success_count += 1
+
+        if llm_success_count == 0:
+            logger.error(f"No successful LLM runs for draft {draft.id}")
+            draft.status = "error"
+            drafts.update(draft)
+            return False
+
+        # Aggregate feedback from successful runs
+        await self._aggregate_feedback(draft, assignment, settings, successful_runs)
+
+        # Update draft status
+        draft.status = "feedback_ready"
+        drafts.update(draft)
+        return True
+
     async def _run_single_model(
         self,
         draft: Draft,
@@ -253,8 +305,8 @@ class FeedbackGenerator:
         model_runs.insert(model_run)
 
         try:
-            # Generate prompt
-            prompt = generate_feedback_prompt(
+            # Generate prompt: static (cacheable) prefix + per-draft suffix
+            prompt_prefix, prompt_suffix = generate_feedback_prompt_parts(
                 assignment=assignment,
                 student_submission=draft.content,
                 draft_version=draft.version,
@@ -263,15 +315,21 @@ class FeedbackGenerator:
             )
 
             # Update prompt in model run
-            model_run.prompt = prompt
+            model_run.prompt = prompt_prefix + "\n\n" + prompt_suffix
             model_runs.update(model_run)
 
             # Prepare API configuration
             api_config = self._get_model_config(model)
 
+            messages = self._build_messages(model, prompt_prefix, prompt_suffix)
+            if self._streaming_enabled(api_config):
+                return await self._run_streaming_model(
+                    model_run, draft.assignment_id, model, messages, api_config
+                )
+
             # Call the AI model
             response, usage = await self._call_ai_model(
-                model=model, prompt=prompt, api_config=api_config
+                model=model, messages=messages, api_config=api_config
             )
 
             # Parse the response
@@ -281,6 +339,7 @@ class FeedbackGenerator:
             model_run.raw_response = response
             model_run.status = "complete"
             model_run.input_tokens = usage["input_tokens"]
+            model_run.cached_tokens = usage["cached_tokens"]
             model_run.output_tokens = usage["output_tokens"]
             model_run.cost_usd = usage["cost_usd"]
             model_runs.update(model_run)
@@ -304,6 +363,75 @@ class FeedbackGenerator:
                 model_run_id=model_run.id, success=False, error_message=str(e)
             )
 
+    def _streaming_enabled(self, api_config: dict[str, Any]) -> bool:
+        """Per-model ``stream`` setting, else the FEEDBACK_STREAMING default."""
+        return bool(api_config.get("stream", _STREAM_DEFAULT))
+
+    async def _run_streaming_model(
+        self,
+        model_run: ModelRun,
+        assignment_id: int,
+        model: AIModel,
+        messages: list[dict[str, Any]],
+        api_config: dict[str, Any],
+    ) -> FeedbackGenerationResult:
+        """Streaming variant of the model call + storage in ``_run_single_model``.
+
+        Each ``criteria_feedback`` entry is written as soon as it completes in
+        the stream, with the run in ``streaming`` status so the status endpoint
+        can report progress. A cut-short stream that produced at least one
+        criterion leaves the run ``partial`` with those criteria kept, but is
+        not a successful run: it never reached every category or the overall
+        feedback, so aggregating it would score the missing categories as 0.
+        One that produced nothing raises to the caller's error handling.
+        """
+        rubric_cats = self._rubric_category_ids(assignment_id)
+        stored: set[str] = set()
+
+        async def on_criterion(criterion: dict[str, Any]) -> None:
+            name = criterion.get("criterion_name", "")
+            if name in stored:
+                return
+            stored.add(name)
+            self._store_criterion_feedback(model_run.id, rubric_cats, criterion)
+
+        model_run.status = "streaming"
+        model_runs.update(model_run)
+
+        response, usage, complete = await self._stream_ai_model(
+            model=model,
+            messages=messages,
+            api_config=api_config,
+            on_criterion=on_criterion,
+        )
+
+        feedback_data: Optional[dict[Any, Any]] = None
+        if complete:
+            feedback_data = self._parse_ai_response(response)
+            # Anything the incremental parser couldn't see (e.g. a reply that
+            # only parsed via the regex fallback) is stored now.
+            for criterion in feedback_data.get("criteria_feedback") or []:
+                await on_criterion(criterion)
+            self._store_overall_feedback(model_run.id, feedback_data)
+
+        model_run.raw_response = response
+        model_run.status = "complete" if complete else "partial"
+        model_run.input_tokens = usage["input_tokens"]
+        model_run.cached_tokens = usage["cached_tokens"]
+        model_run.output_tokens = usage["output_tokens"]
+        model_run.cost_usd = usage["cost_usd"]
+        model_runs.update(model_run)
+
+        if not complete:
+            return FeedbackGenerationResult(
+                model_run_id=model_run.id,
+                success=False,
+                error_message=f"Stream ended early after {len(stored)} criteria",
+            )
+        return FeedbackGenerationResult(
+            model_run_id=model_run.id, success=True, feedback_data=feedback_data
+        )
+
     def _get_model_config(self, model: AIModel) -> dict[str, Any]:
         """Extract model configuration, decrypting API keys and resolving env vars."""
         try:
@@ -343,8 +471,14 @@ class FeedbackGenerator:
         self, model: AIModel, api_config: dict[str, Any]
     ) -> Optional[str]:
         """Resolve the base URL for provider-specific routing."""
+        base_url: Optional[str]
         if "api_base" in api_config:
-            return api_config["api_base"]
+            base_url = api_config["api_base"]
+            return base_url
+        # Model forms save the endpoint as "base_url"
+        if api_config.get("base_url"):
+            base_url = api_config["base_url"]
+            return base_url
 
         provider = model.provider.lower()
         if provider == "ollama":
@@ -355,30 +489,39 @@ class FeedbackGenerator:
             return os.environ.get("CUSTOM_LLM_BASE_URL")
         return None
 
-    async def _call_ai_model(
-        self, model: AIModel, prompt: str, api_config: dict
-    ) -> tuple[str, dict[str, Any]]:
-        """Call the AI model using LiteLLM with retries.
+    def _build_messages(
+        self, model: AIModel, prompt_prefix: str, prompt_suffix: str
+    ) -> list[dict[str, Any]]:
+        """Chat messages with the static prompt prefix ahead of the submission.
 
-        Returns ``(content, usage)`` where usage is
-        ``{input_tokens, output_tokens, cost_usd}`` (zeros if the provider
-        didn't report usage).
+        The prefix is byte-identical for every draft of an assignment, so
+        providers with automatic prefix caching reuse it as-is. For providers
+        that take explicit breakpoints the prefix becomes its own content
+        block marked ``cache_control: ephemeral``.
         """
+        if model.provider.lower() in _CACHE_CONTROL_PROVIDERS:
+            user_content: Any = [
+                {
+                    "type": "text",
+                    "text": prompt_prefix,
+                    "cache_control": {"type": "ephemeral"},
+                },
+                {"type": "text", "text": prompt_suffix},
+            ]
+        else:
+            user_content = prompt_prefix + "\n\n" + prompt_suffix
 
-        model_string = self._build_litellm_model_name(model)
-
-        # Prepare messages
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are an expert educational assessment assistant. "
-                    "Provide feedback in valid JSON format only."
-                ),
-            },
-            {"role": "user", "content": prompt},
+        return [
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "user", "content": user_content},
         ]
 
+    def _build_call_params(
+        self, model: AIModel, messages: list[dict[str, Any]], api_config: dict
+    ) -> dict[str, Any]:
+        """LiteLLM completion kwargs for a model and message list."""
+        model_string = self._build_litellm_model_name(model)
+
         # Build call parameters
         call_params: dict[str, Any] = {
             "model": model_string,
@@ -400,6 +543,20 @@ class FeedbackGenerator:
         if model.provider.lower() == "openai":
             call_params["response_format"] = {"type": "json_object"}
 
+        return call_params
+
+    async def _call_ai_model(
+        self, model: AIModel, messages: list[dict[str, Any]], api_config: dict
+    ) -> tuple[str, dict[str, Any]]:
+        """Call the AI model using LiteLLM with retries.
+
+        Returns ``(content, usage)`` where usage is
+        ``{input_tokens, cached_tokens, output_tokens, cost_usd}`` (zeros if
+        the provider didn't report usage).
+        """
+
+        call_params = self._build_call_params(model, messages, api_config)
+
         # Make the API call with retries
         for attempt in range(self.max_retries):
             try:
@@ -418,6 +575,75 @@ class FeedbackGenerator:
 
         raise RuntimeError("Failed to get AI response after all retries")
 
+    async def _stream_ai_model(
+        self,
+        model: AIModel,
+        messages: list[dict[str, Any]],
+        api_config: dict,
+        on_criterion: Callable[[dict[str, Any]], Awaitable[None]],
+    ) -> tuple[str, dict[str, Any], bool]:
+        """Stream a completion, passing each finished criterion to ``on_criterion``.
+
+        Returns ``(content, usage, complete)``. Retries cover opening the
+        stream only — once tokens flow, a failure or the stream deadline
+        (``stream_timeout`` in api_config, default FEEDBACK_STREAM_TIMEOUT)
+        ends the run with ``complete=False`` if any criterion already
+        finished, and re-raises otherwise.
+        """
+        call_params = self._build_call_params(model, messages, api_config)
+        call_params["stream"] = True
+        call_params["stream_options"] = {"include_usage": True}
+        deadline = float(api_config.get("stream_timeout", _STREAM_TIMEOUT))
+
+        stream: Any = None  # set by the loop below, which otherwise raises
+        for attempt in range(self.max_retries):
+            try:
+                stream = await litellm.acompletion(**call_params)
+                break
+            except Exception as e:
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(self.retry_delay)
+                    continue
+                raise e
+
+        parser = CriteriaStreamParser()
+        chunks: list[Any] = []
+
+        async def consume() -> None:
+            async for chunk in stream:
+                chunks.append(chunk)
+                choices = getattr(chunk, "choices", None) or []
+                delta = getattr(choices[0].delta, "content", None) if choices else None
+                for criterion in parser.feed(delta or ""):
+                    await on_criterion(criterion)
+
+        complete = True
+        try:
+            await asyncio.wait_for(consume(), timeout=deadline)
+        except Exception as e:
+            if not parser.criteria:
+                raise
+            logger.warning(
+                f"Stream from {model.provider} ended early after "
+                f"{len(parser.criteria)} criteria: {e!r}"
+            )
+            complete = False
+
+        if complete and not parser.text.strip():
+            raise ValueError("Empty response from AI model")
+
+        return parser.text, self._stream_usage(chunks, messages), complete
+
+    def _stream_usage(
+        self, chunks: list[Any], messages: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Usage for a streamed reply, rebuilt from its chunks by LiteLLM."""
+        try:
+            response = litellm.stream_chunk_builder(chunks, messages=messages)
+        except Exception:  # partial/odd chunk streams — usage is best-effort
+            response = None
+        return _extract_usage(response)
+
     def _parse_ai_response(self, response: str) -> dict[Any, Any]:
         """Parse the AI response into structured feedback"""
         try:
@@ -459,74 +685,87 @@ class FeedbackGenerator:
         """Store the parsed feedback data in the database"""
 
         # Get rubric categories for scoring
-        assignment_rubric = None
-        for rubric in rubrics():
-            if rubric.assignment_id == assignment_id:
-                assignment_rubric = rubric
-                break
-
-        rubric_cats = {}
-        if assignment_rubric:
-            for cat in rubric_categories():
-                if cat.rubric_id == assignment_rubric.id:
-                    rubric_cats[cat.name] = cat.id
+        rubric_cats = self._rubric_category_ids(assignment_id)
 
         # Store criterion-level feedback if present
-        if "criteria_feedback" in feedback_data:
-            for criterion in feedback_data["criteria_feedback"]:
-                criterion_name = criterion.get("criterion_name", "")
-                category_id = rubric_cats.get(criterion_name)
-
-                if category_id:
-                    # Store score
-                    score = CategoryScore(
-                        id=self._get_next_id(category_scores),
-                        model_run_id=model_run_id,
-                        category_id=category_id,
-                        score=float(criterion.get("score", 0)),
-                        confidence=0.8,
-                    )
-                    category_scores.insert(score)
-
-                    # Store feedback items
-                    for strength in criterion.get("strengths", []):
-                        item = FeedbackItem(
-                            id=self._get_next_id(feedback_items),
-                            model_run_id=model_run_id,
-                            category_id=category_id,
-                            type="strength",
-                            content=strength,
-                            is_strength=True,
-                            is_aggregated=False,
-                        )
-                        feedback_items.insert(item)
-
-                    for improvement in criterion.get("improvements", []):
-                        item = FeedbackItem(
-                            id=self._get_next_id(feedback_items),
-                            model_run_id=model_run_id,
-                            category_id=category_id,
-                            type="improvement",
-                            content=improvement,
-                            is_strength=False,
-                            is_aggregated=False,
-                        )
-                        feedback_items.insert(item)
+        for criterion in feedback_data.get("criteria_feedback") or []:
+            self._store_criterion_feedback(model_run_id, rubric_cats, criterion)
 
         # Store overall feedback if present
-        if "overall_feedback" in feedback_data:
-            overall = feedback_data["overall_feedback"]
+        self._store_overall_feedback(model_run_id, feedback_data)
+
+    def _rubric_category_ids(self, assignment_id: int) -> dict[str, int]:
+        """Map rubric category name -> id for an assignment's rubric"""
+        assignment_rubric = first(rubrics, assignment_id=assignment_id)
+        if not assignment_rubric:
+            return {}
+        return {
+            cat.name: cat.id
+            for cat in where(rubric_categories, rubric_id=assignment_rubric.id)
+        }
+
+    def _store_criterion_feedback(
+        self, model_run_id: int, rubric_cats: dict[str, int], criterion: dict
+    ) -> None:
+        """Store one criteria_feedback entry: its score and feedback items"""
+        criterion_name = criterion.get("criterion_name", "")
+        category_id = rubric_cats.get(criterion_name)
+        if not category_id:
+            return
+
+        # Store score
+        score = CategoryScore(
+            id=self._get_next_id(category_scores),
+            model_run_id=model_run_id,
+            category_id=category_id,
+            score=float(criterion.get("score", 0)),
+            confidence=0.8,
+        )
+        category_scores.insert(score)
+
+        # Store feedback items
+        for strength in criterion.get("strengths", []):
+            item = FeedbackItem(
+                id=self._get_next_id(feedback_items),
+                model_run_id=model_run_id,
+                category_id=category_id,
+                type="strength",
+                content=strength,
+                is_strength=True,
+                is_aggregated=False,
+            )
+            feedback_items.insert(item)
 
-            summary_item = FeedbackItem(
+        for improvement in criterion.get("improvements", []):
+            item = FeedbackItem(
                 id=self._get_next_id(feedback_items),
                 model_run_id=model_run_id,
-                category_id=None,
-                type="general",
-                content=overall.get("summary", ""),
+                category_id=category_id,
+                type="improvement",
+                content=improvement,
                 is_strength=False,
                 is_aggregated=False,
             )
-            feedback_items.insert(summary_item)
+            feedback_items.insert(item)
+
+    def _store_overall_feedback(
+        self, model_run_id: int, feedback_data: dict[Any, Any]
+    ) -> None:
+        """Store the overall_feedback summary, if the response has one"""
+        if "overall_feedback" not in feedback_data:
+            return
+        overall = feedback_data["overall_feedback"]
+
+        summary_item = FeedbackItem(
+            id=self._get_next_id(feedback_items),
+            model_run_id=model_run_id,
+            category_id=None,
+            type="general",
+            content=overall.get("summary", ""),
+            is_strength=False,
+            is_aggregated=False,
+        )
+        feedback_items.insert(summary_item)
 
     async def _aggregate_feedback(
         self,
@@ -779,25 +1018,40 @@ class FeedbackGenerator:
     # ------------------------------------------------------------------
 
     def get_feedback_status(self, draft_id: int) -> dict:
-        """Get current feedback processing status for a draft."""
+        """Get current feedback processing status for a draft.
+
+        ``categories_completed`` / ``categories_total`` report streaming
+        progress: rubric categories that already have a score from at least
+        one LLM run (streamed runs write each category as it completes).
+        """
         try:
             draft = drafts[draft_id]
 
-            all_runs = model_runs()
-            draft_runs = [run for run in all_runs if run.draft_id == draft_id]
+            draft_runs = where(model_runs, draft_id=draft_id)
+            draft_agg_feedback = where(aggregated_feedback, draft_id=draft_id)
 
-            all_agg_feedback = aggregated_feedback()
-            draft_agg_feedback = [
-                af for af in all_agg_feedback if af.draft_id == draft_id
-            ]
+            scored_categories: set[int] = set()
+            for run in draft_runs:
+                if (run.model_id or 0) > 0:
+                    scored_categories.update(
+                        s.category_id
+                        for s in where(category_scores, model_run_id=run.id)
+                    )
 
             return {
                 "draft_status": draft.status,
+                "extraction_status": draft.preprocessing_status or "",
                 "total_runs": len(draft_runs),
                 "completed_runs": len(
                     [r for r in draft_runs if r.status == "complete"]
                 ),
+                "streaming_runs": len(
+                    [r for r in draft_runs if r.status == "streaming"]
+                ),
+                "partial_runs": len([r for r in draft_runs if r.status == "partial"]),
                 "failed_runs": len([r for r in draft_runs if r.status == "error"]),
+                "categories_completed": len(scored_categories),
+                "categories_total": len(self._rubric_category_ids(draft.assignment_id)),
                 "has_aggregated_feedback": len(draft_agg_feedback) > 0,
                 "feedback_status": (
                     draft_agg_feedback[0].status
@@ -810,13 +1064,33 @@ class FeedbackGenerator:
             logger.error(f"Error getting feedback status: {e!s}")
             return {
                 "draft_status": "unknown",
+                "extraction_status": "",
                 "total_runs": 0,
                 "completed_runs": 0,
+                "streaming_runs": 0,
+                "partial_runs": 0,
                 "failed_runs": 0,
+                "categories_completed": 0,
+                "categories_total": 0,
                 "has_aggregated_feedback": False,
                 "feedback_status": "error",
             }
 
+    async def generate_feedback_batch(self, assignment_id: int) -> dict[str, int]:
+        """
+        Generate feedback for every pending draft of an assignment via the
+        providers' batch APIs (cheaper, slower; see ``feedback_batch``).
+
+        Args:
+            assignment_id: ID of the assignment whose drafts to process
+
+        Returns:
+            Summary counts: drafts, batches and requests submitted
+        """
+        from app.services.feedback_batch import BatchFeedbackRunner
+
+        return await BatchFeedbackRunner(self).run_assignment(assignment_id)
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -831,12 +1105,12 @@ class FeedbackGenerator:
 
         if not active_model_ids:
             for model in ai_models():
-                if model.is_active and model.created_by == "system":
+                if model.active and model.owner_type == "system":
                     active_model_ids.add(model.id)
 
         active_models = []
         for model in ai_models():
-            if model.id in active_model_ids and model.is_active:
+            if model.id in active_model_ids and model.active:
                 active_models.append(model)
 
         return active_models
@@ -890,6 +1164,11 @@ async def process_draft_submission(draft_id: int) -> bool:
     return await feedback_generator.generate_feedback_for_draft(draft_id)
 
 
+async def process_assignment_batch(assignment_id: int) -> dict[str, int]:
+    """Generate feedback for an assignment's pending drafts in batch mode."""
+    return await feedback_generator.generate_feedback_batch(assignment_id)
+
+
 def get_feedback_status(draft_id: int) -> dict:
     """Get current feedback processing status for a draft."""
     return feedback_generator.get_feedback_status(draft_id)
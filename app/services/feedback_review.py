@@ -11,7 +11,9 @@ from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
 
-from app.models.feedback import aggregated_feedback
+from app.models.feedback import aggregated_feedback, drafts
+from app.services.cohort_analytics import feedback_changed
+from app.utils.db_query import by_id
 
 RELEASED = "approved"  # AggregatedFeedback.status value that students may see
 
@@ -41,10 +43,12 @@ def apply_review(
 
     ``fields`` maps form names to values (``score_<id>`` / ``feedback_<id>``).
     ``approve=True`` releases the feedback (status → approved, stamps release_date).
+    Edits to already-released feedback update the student's progress snapshot too.
     Returns the number of category rows updated.
     """
     now = datetime.now().isoformat()
     updated = 0
+    released = False
     for af in aggregated_feedback():
         if af.draft_id != draft_id:
             continue
@@ -62,6 +66,12 @@ def apply_review(
             af.release_date = now
         aggregated_feedback.update(af)
         updated += 1
+        released = released or af.status == RELEASED
+    draft = by_id(drafts, draft_id) if updated else None
+    if draft is not None:
+        feedback_changed(draft.assignment_id)
+    if released:
+        _refresh_progress(draft_id)
     return updated
 
 
@@ -96,4 +106,13 @@ def bulk_approve(draft_ids: Iterable[int], instructor_email: str) -> dict[str, i
         aggregated_feedback.update(af)
         drafts_touched.add(af.draft_id)
         rows_released += 1
+    for draft_id in sorted(drafts_touched):
+        _refresh_progress(draft_id)
     return {"drafts_approved": len(drafts_touched), "rows_released": rows_released}
+
+
+def _refresh_progress(draft_id: int) -> None:
+    """Fold a draft's released feedback into the student's progress snapshot."""
+    from app.services import progress_snapshot
+
+    progress_snapshot.record_release(draft_id)
@@ -0,0 +1,111 @@
+"""
+Incremental parser for streamed feedback responses.
+
+The feedback contract (see ``prompt_templates._get_json_format_instructions``)
+is a JSON object whose ``criteria_feedback`` array holds one object per rubric
+criterion. When a model streams its reply, each of those objects is complete —
+and worth persisting — long before the whole document is. ``CriteriaStreamParser``
+watches the text as it arrives and hands back every ``criteria_feedback`` entry
+the moment its closing brace lands, so a timeout or truncated reply still keeps
+the criteria that finished.
+
+Only the array entries are parsed incrementally; the full document (including
+``overall_feedback``) is still parsed once at the end by
+``FeedbackGenerator._parse_ai_response``. Markdown fences and prose around the
+JSON are tolerated because the parser keys off the ``"criteria_feedback"``
+property, not the start of the text.
+"""
+
+import json
+import re
+from typing import Any
+
+_ARRAY_START = re.compile(r'"criteria_feedback"\s*:\s*\[')
+
+# Characters kept from the end of the text when re-searching for the array
+# start, so a key split across two chunks is still found.
+_SEEK_OVERLAP = 64
+
+
+class CriteriaStreamParser:
+    """Emit ``criteria_feedback`` entries from a streamed JSON reply.
+
+    Call ``feed(chunk)`` with each piece of text; it returns the criteria that
+    became complete in that chunk (usually zero or one). ``criteria`` holds
+    everything emitted so far and ``text`` the full reply.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.criteria: list[dict[str, Any]] = []
+        self._state = "seek"  # 'seek' -> 'array' -> 'done'
+        self._pos = 0  # next character to scan
+        self._depth = 0  # nesting depth inside the array ({ and [)
+        self._item_start = -1
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        """True once the closing ``]`` of ``criteria_feedback`` was seen."""
+        return self._state == "done"
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Consume the next piece of streamed text; return newly complete criteria."""
+        if not chunk:
+            return []
+        self.text += chunk
+        if self._state == "seek":
+            match = _ARRAY_START.search(self.text, max(0, self._pos - _SEEK_OVERLAP))
+            if not match:
+                self._pos = len(self.text)
+                return []
+            self._state = "array"
+            self._pos = match.end()
+        if self._state != "array":
+            return []
+        return self._scan()
+
+    def _scan(self) -> list[dict[str, Any]]:
+        emitted: list[dict[str, Any]] = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0 and ch == "{":
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:
+                    # ']' closing criteria_feedback itself
+                    self._state = "done"
+                    self._pos = i + 1
+                    return emitted
+                self._depth -= 1
+                if self._depth == 0 and ch == "}" and self._item_start >= 0:
+                    item = self._load(text[self._item_start : i + 1])
+                    self._item_start = -1
+                    if item is not None:
+                        self.criteria.append(item)
+                        emitted.append(item)
+        self._pos = len(text)
+        return emitted
+
+    @staticmethod
+    def _load(fragment: str) -> dict[str, Any] | None:
+        try:
+            item = json.loads(fragment)
+        except json.JSONDecodeError:
+            return None
+        return item if isinstance(item, dict) else None
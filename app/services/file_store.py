@@ -0,0 +1,150 @@
+"""
+Content-addressed store for submission uploads.
+
+Every upload is hashed while it is written (``file_handlers.store_upload``)
+and then filed under its SHA-256: ``<UPLOAD_ROOT>/blobs/ab/abcdef…``. The
+same bytes uploaded again — a resubmitted draft, a group member's copy — land
+on the existing blob instead of a new file, and their extracted text comes
+from the text cache (``app.utils.text_cache``) instead of being parsed again.
+
+Reference counts are not stored; they are the number of live
+``submission_files`` rows (``removed_at IS NULL``) with the blob's checksum,
+so they can never drift from the rows that use them. ``release`` marks a row
+removed and collects the blob once nothing references it. An upload is only
+needed until its text is on the draft, so the upload pipeline releases it
+once extraction is done, and hiding a draft releases anything left; ``collect_garbage``
+sweeps everything unreferenced (see ``tools/collect_file_blobs.py``). Blobs
+stored within ``BLOB_GC_GRACE_SECONDS`` are left alone so an upload whose
+``submission_files`` row is not inserted yet is never collected under it.
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from starlette.datastructures import UploadFile
+
+from app.models.assessment import FileBlob, file_blobs, submission_files
+from app.utils import text_cache
+from app.utils.db_query import by_id, count, where
+from app.utils.file_handlers import (
+    DOCUMENT_EXTENSIONS,
+    StoredUpload,
+    extract_stored_file,
+    store_upload,
+)
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ROOT = Path(os.environ.get("UPLOAD_ROOT", "data/uploads"))
+BLOB_GC_GRACE_SECONDS = int(os.environ.get("BLOB_GC_GRACE_SECONDS", "3600"))
+
+
+def blob_path(checksum: str) -> Path:
+    """Where the blob with this SHA-256 lives (two-level fan-out)."""
+    return UPLOAD_ROOT / "blobs" / checksum[:2] / checksum
+
+
+async def put_upload(
+    file: UploadFile, max_bytes: int = 10 * 1024 * 1024
+) -> StoredUpload:
+    """Store an upload by content and return its blob.
+
+    The upload is streamed to a temporary file in the blob directory, hashed
+    on the way, then renamed onto its content address — or dropped if those
+    bytes are already stored. ``path`` in the result is the blob.
+    """
+    tmp = UPLOAD_ROOT / "blobs" / "tmp" / uuid.uuid4().hex
+    stored = await store_upload(file, tmp, max_bytes=max_bytes)
+
+    dest = blob_path(stored.checksum)
+    if dest.exists():
+        tmp.unlink(missing_ok=True)
+    else:
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, dest)
+
+    now = datetime.now().isoformat()
+    blob = by_id(file_blobs, stored.checksum)
+    if blob is None:
+        file_blobs.insert(
+            FileBlob(
+                checksum=stored.checksum,
+                file_size=stored.size,
+                created_at=now,
+                last_stored_at=now,
+            ),
+            replace=True,
+        )
+    else:
+        file_blobs.update({"last_stored_at": now}, pk_values=stored.checksum)
+        logger.info(f"Upload deduplicated onto blob {stored.checksum[:12]}")
+    return StoredUpload(path=dest, size=stored.size, checksum=stored.checksum)
+
+
+def reference_count(checksum: str) -> int:
+    """Live ``submission_files`` rows pointing at this blob."""
+    return count(submission_files, checksum=checksum, removed_at=None)
+
+
+async def extract_blob_text(checksum: str, file_ext: str) -> str:
+    """Text of a stored blob; documents are parsed at most once per
+    extractor version (see ``text_cache``)."""
+    if file_ext.lower() not in DOCUMENT_EXTENSIONS:
+        return await extract_stored_file(blob_path(checksum), file_ext)
+    return await text_cache.extract_cached(
+        checksum, lambda: extract_stored_file(blob_path(checksum), file_ext)
+    )
+
+
+def release(submission_file_id: int) -> bool:
+    """Mark an upload removed; delete its blob if nothing else uses it.
+
+    Returns True if the blob was collected. A blob stored within the grace
+    period is kept for the next ``collect_garbage`` sweep.
+    """
+    row = by_id(submission_files, submission_file_id)
+    if row is None or row.removed_at:
+        return False
+    submission_files.update(
+        {"removed_at": datetime.now().isoformat()}, pk_values=submission_file_id
+    )
+    if not row.checksum or reference_count(row.checksum):
+        return False
+    return _delete_blob(row.checksum, _gc_cutoff())
+
+
+def release_draft_files(draft_id: int) -> int:
+    """``release`` every live upload of a draft. Returns blobs collected."""
+    live = where(submission_files, draft_id=draft_id, removed_at=None)
+    return sum(release(row.id) for row in live)
+
+
+def collect_garbage() -> int:
+    """Delete every blob with no live references. Returns how many went."""
+    cutoff = _gc_cutoff()
+    collected = 0
+    for blob in file_blobs():
+        if reference_count(blob.checksum):
+            continue
+        if _delete_blob(blob.checksum, cutoff):
+            collected += 1
+    if collected:
+        logger.info(f"Collected {collected} unreferenced upload blobs")
+    return collected
+
+
+def _gc_cutoff() -> str:
+    return (datetime.now() - timedelta(seconds=BLOB_GC_GRACE_SECONDS)).isoformat()
+
+
+def _delete_blob(checksum: str, cutoff: str) -> bool:
+    blob = by_id(file_blobs, checksum)
+    if blob is None or (blob.last_stored_at or "") > cutoff:
+        return False  # gone, or stored again within the grace period
+    blob_path(checksum).unlink(missing_ok=True)
+    text_cache.forget(checksum)
+    file_blobs.delete(checksum)
+    return True
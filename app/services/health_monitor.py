@@ -0,0 +1,177 @@
+"""
+Background health monitor for the lens analysers and the active AI models.
+
+Probing on demand put up to 9 s of blocking I/O (3 s per analyser) into
+every admin page render whenever sidecars were down. Instead, a task started
+with the app probes on an interval and records the outcome:
+
+- analysers → one ``assessment_services`` row per service (``health_status``
+  'healthy' / 'unhealthy', ``last_health_check``, version or error);
+- active AI models → the ``health_*`` columns of their ``ai_models`` row,
+  via one ``llm_health`` probe each.
+
+The admin pages read those rows (``cached_service_health``), and signal
+extraction skips an analyser that ``is_down`` instead of waiting out its
+request timeout. A status older than ``HEALTH_STATUS_MAX_AGE`` counts as
+unknown, so a stale 'unhealthy' never blocks a service that has come back.
+
+Configuration: ``HEALTH_CHECK_INTERVAL`` seconds between rounds (default 300,
+0 disables the monitor), ``HEALTH_CHECK_MODELS`` (default false: each model
+probe is a real, if tiny, paid completion, so every round bills every active
+model) and ``HEALTH_STATUS_MAX_AGE`` (default 900).
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from app.models.assessment import AssessmentService, assessment_services
+from app.models.config import ai_models
+from app.models.signals import signal_backfill
+from app.utils import analyser_client
+from app.utils.db_query import first
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = float(os.environ.get("HEALTH_CHECK_INTERVAL", "300"))
+HEALTH_CHECK_MODELS = os.environ.get("HEALTH_CHECK_MODELS", "false").lower() == "true"
+HEALTH_STATUS_MAX_AGE = float(os.environ.get("HEALTH_STATUS_MAX_AGE", "900"))
+_PROBE_TIMEOUT = 3.0
+
+_task: Optional[asyncio.Task] = None
+
+
+def check_analysers() -> list[dict[str, Any]]:
+    """Probe every analyser now and record the results. Blocking."""
+    results = analyser_client.service_health(timeout=_PROBE_TIMEOUT)
+    now = datetime.now().isoformat()
+    for s in results:
+        values = {
+            "service_url": s["url"],
+            "health_check_url": f"{s['url']}/health",
+            "capabilities": json.dumps({"role": s["role"]}),
+            "timeout_seconds": int(_PROBE_TIMEOUT),
+            "is_active": True,
+            "health_status": "healthy" if s["ok"] else "unhealthy",
+            "health_error": s["error"] or "",
+            "service_version": s["version"] or "",
+            "last_health_check": now,
+            "updated_at": now,
+        }
+        row = first(assessment_services, service_name=s["name"])
+        if row is None:
+            assessment_services.insert(
+                AssessmentService(service_name=s["name"], created_at=now, **values)
+            )
+        else:
+            assessment_services.update(values, pk_values=row.id)
+    down = [s["name"] for s in results if not s["ok"]]
+    if down:
+        logger.warning(f"Health check: analyser(s) down: {', '.join(down)}")
+    return results
+
+
+async def check_ai_models() -> list[dict[str, Any]]:
+    """Probe each active AI model once and record the results."""
+    from app.services import llm_health
+
+    results = await llm_health.check_models(probes=1)
+    for r in results:
+        ai_models.update(
+            {
+                "health_status": r["status"],
+                "health_error": r["error"] or "",
+                "health_latency": r["response_time"],
+                "last_health_check": r["checked_at"],
+            },
+            pk_values=r["id"],
+        )
+    return results
+
+
+async def run_once() -> None:
+    """One monitoring round: analysers (off the loop), then models.
+
+    Once any analyser answers, drafts skipped while it was down are
+    backfilled (see ``signal_service.backfill_skipped_signals``).
+    """
+    from app.services import signal_service
+
+    results = await asyncio.to_thread(check_analysers)
+    if any(s["ok"] for s in results) and signal_backfill.count:
+        await asyncio.to_thread(signal_service.backfill_skipped_signals)
+    if HEALTH_CHECK_MODELS:
+        await check_ai_models()
+
+
+def cached_service_health() -> list[dict[str, Any]]:
+    """Last recorded analyser health, shaped like ``service_health()``.
+
+    Adds ``checked_at`` and ``status`` ('healthy', 'unhealthy' or 'unknown'
+    when never checked or older than ``HEALTH_STATUS_MAX_AGE``).
+    """
+    results = []
+    for name, url_fn, role in analyser_client._SERVICES:
+        row = first(assessment_services, service_name=name)
+        status = _fresh_status(row)
+        results.append(
+            {
+                "name": name,
+                "role": role,
+                "url": url_fn(),
+                "ok": status == "healthy",
+                "status": status,
+                "version": (row.service_version or None) if row else None,
+                "error": (row.health_error or None) if row else None,
+                "checked_at": row.last_health_check if row else None,
+            }
+        )
+    return results
+
+
+def is_down(service_name: str) -> bool:
+    """True if the monitor recently found this analyser unreachable."""
+    row = first(assessment_services, service_name=service_name)
+    return _fresh_status(row) == "unhealthy"
+
+
+def _fresh_status(row: Any) -> str:
+    if row is None or not row.last_health_check:
+        return "unknown"
+    cutoff = datetime.now() - timedelta(seconds=HEALTH_STATUS_MAX_AGE)
+    if datetime.fromisoformat(row.last_health_check) < cutoff:
+        return "unknown"
+    return row.health_status or "unknown"
+
+
+async def _monitor() -> None:
+    while True:
+        try:
+            await run_once()
+        except Exception as e:  # keep monitoring whatever one round does
+            logger.error(f"Health check round failed: {e}")
+        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+
+
+def start() -> None:
+    """Start the monitor on the running loop (app startup). Idempotent."""
+    global _task
+    if HEALTH_CHECK_INTERVAL <= 0 or (_task is not None and not _task.done()):
+        return
+    _task = asyncio.get_running_loop().create_task(_monitor())
+    logger.info(f"Health monitor started (every {HEALTH_CHECK_INTERVAL:g}s)")
+
+
+async def stop() -> None:
+    """Cancel the monitor task (app shutdown)."""
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _task
+    _task = None
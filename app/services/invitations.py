@@ -0,0 +1,180 @@
+"""
+Bulk student invitations for a course.
+
+``invite_students`` works on the whole roster at once instead of per address:
+one query finds which addresses are already enrolled in the course, one finds
+which already have accounts, and the new accounts, re-issued join tokens and
+enrollments are then written in batches inside a single transaction. A
+roster of thousands of students costs a handful of statements rather than a
+scan and two commits per student.
+
+Per student the outcome matches ``invite_token_for``: a new address gets an
+unverified student account with an expiring join token (INVITE_TOKEN_HOURS),
+a pending invitee keeps a live token or gets a fresh one once it expired,
+and a student who already registered is simply enrolled — no token, since a
+join link must never reset an active account's password.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any
+
+from app.models.course import enrollments
+from app.models.user import Role, db, invalidate_user, users
+from app.utils.auth import INVITE_TOKEN_HOURS, generate_token_expiry
+from app.utils.email import generate_verification_token
+
+INSERT_BATCH = 500  # rows per INSERT statement
+
+
+def parse_email_list(text: str) -> list[str]:
+    """Addresses pasted one per line (commas and semicolons also separate)."""
+    for sep in (",", ";"):
+        text = text.replace(sep, "\n")
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def parse_roster_csv(text: str) -> list[str]:
+    """Email addresses from an exported class roster.
+
+    Uses the column whose header mentions "email" when there is one (LMS
+    exports usually have it); otherwise the first cell of each row that looks
+    like an address.
+    """
+    rows = list(csv.reader(io.StringIO(text.lstrip("\ufeff"))))
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    column = next((i for i, name in enumerate(header) if "email" in name), None)
+    if column is not None:
+        return [
+            row[column].strip()
+            for row in rows[1:]
+            if len(row) > column and row[column].strip()
+        ]
+    return [
+        cell
+        for row in rows
+        for cell in [next((c.strip() for c in row if "@" in c), "")]
+        if cell
+    ]
+
+
+def invite_students(course_id: int, emails: list[str]) -> dict[str, list[Any]]:
+    """
+    Invite a roster of students to a course.
+
+    Returns:
+        dict with ``invited`` (email, join token) for students who need a
+        join link, ``enrolled`` (emails of registered students enrolled
+        directly), ``already_enrolled`` and ``failed`` (email, reason).
+    """
+    result: dict[str, list[Any]] = {
+        "invited": [],
+        "enrolled": [],
+        "already_enrolled": [],
+        "failed": [],
+    }
+    candidates: list[str] = []
+    seen: set[str] = set()
+    for email in emails:
+        email = email.strip()
+        if not email or email in seen:
+            continue
+        seen.add(email)
+        # Basic email validation
+        if "@" not in email or "." not in email:
+            result["failed"].append((email, "Invalid email format"))
+        else:
+            candidates.append(email)
+    if not candidates:
+        return result
+
+    enrolled = {
+        row["student_email"]
+        for row in db.query(
+            "SELECT student_email FROM enrollments WHERE course_id = ? "
+            "AND student_email IN (SELECT value FROM json_each(?))",
+            [course_id, json.dumps(candidates)],
+        )
+    }
+    result["already_enrolled"] = [e for e in candidates if e in enrolled]
+    to_enroll = [e for e in candidates if e not in enrolled]
+    if not to_enroll:
+        return result
+
+    existing = {
+        row["email"]: row
+        for row in db.query(
+            "SELECT email, verified, verification_token, verification_token_expiry "
+            "FROM users WHERE email IN (SELECT value FROM json_each(?))",
+            [json.dumps(to_enroll)],
+        )
+    }
+    expiry = generate_token_expiry(INVITE_TOKEN_HOURS)
+    new_users: list[dict[str, Any]] = []
+    reissued: list[tuple[str, str, str]] = []
+    for email in to_enroll:
+        account = existing.get(email)
+        if account is not None and account["verified"]:
+            result["enrolled"].append(email)
+            continue
+        if account is not None and _token_is_live(account):
+            token = account["verification_token"]
+        else:
+            token = generate_verification_token(email)
+            if account is None:
+                new_users.append(_new_student(email, token, expiry))
+            else:
+                reissued.append((token, expiry, email))
+        result["invited"].append((email, token))
+
+    with db.conn:
+        if new_users:
+            users.insert_all(new_users, batch_size=INSERT_BATCH)
+        if reissued:
+            db.conn.executemany(
+                "UPDATE users SET verification_token = ?, "
+                "verification_token_expiry = ? WHERE email = ?",
+                reissued,
+            )
+        enrollments.insert_all(
+            [{"course_id": course_id, "student_email": e} for e in to_enroll],
+            batch_size=INSERT_BATCH,
+        )
+    for _, _, email in reissued:
+        invalidate_user(email)
+    return result
+
+
+def _token_is_live(account: dict[str, Any]) -> bool:
+    """Same rule as ``find_user_by_token`` for verification tokens."""
+    if not account["verification_token"]:
+        return False
+    expiry = account["verification_token_expiry"] or ""
+    if not expiry:
+        return True
+    try:
+        return datetime.fromisoformat(expiry) > datetime.now()
+    except ValueError:
+        return False
+
+
+def _new_student(email: str, token: str, expiry: str) -> dict[str, Any]:
+    return {
+        "email": email,
+        "name": "",
+        "password": "",  # Set when they complete registration
+        "role": Role.STUDENT.value,
+        "verified": False,
+        "verification_token": token,
+        "verification_token_expiry": expiry,
+        "approved": True,
+        "department": "",
+        "reset_token": "",
+        "reset_token_expiry": "",
+        "status": "active",
+        "last_active": "",
+    }
@@ -0,0 +1,263 @@
+"""
+Concurrent health probes for the configured LLM providers.
+
+Each active ``ai_models`` row gets a few tiny completions through
+``litellm.acompletion`` — the same call parameters feedback generation uses
+(see ``FeedbackGenerator._build_call_params``) — and reports whether it
+answered, how fast (p50/p90/max over the probes) and, if not, a short error
+category. Providers are probed concurrently, at most ``concurrency`` at a
+time, and each one has an overall ``deadline``: an unreachable provider
+costs one deadline, in parallel with the others, so checking the whole fleet
+takes about as long as the slowest provider.
+
+Used by ``tools/check_llm_health.py``.
+
+``check_connection`` is the "Test Connection" button on the model forms: one
+probe of an unsaved configuration with a short deadline (``MODEL_TEST_DEADLINE``,
+default 8 s). Results are cached per configuration for ``MODEL_TEST_CACHE_TTL``
+seconds (default 300); a repeated test answers from the cache at once and, if
+that result is stale or a failure, re-probes in the background so the next
+click sees the fresh outcome. Every successful probe adds to a per-model
+latency window that ``latency_stats`` summarises for the rest of the app.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Optional
+
+import litellm
+import requests
+
+from app.models.config import AIModel, ai_models
+from app.services.feedback_generator import _ENV_VAR_MAP, FeedbackGenerator
+from app.utils.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+PROBE_PROMPT = "Respond with exactly: OK"
+DEFAULT_PROBES = 3
+DEFAULT_DEADLINE = 15.0  # seconds per provider, all probes together
+DEFAULT_CONCURRENCY = 8
+
+MODEL_TEST_DEADLINE = float(os.environ.get("MODEL_TEST_DEADLINE", "8"))
+MODEL_TEST_CACHE_TTL = float(os.environ.get("MODEL_TEST_CACHE_TTL", "300"))
+OLLAMA_LIST_TIMEOUT = 3.0
+
+# Providers that work without an API key
+_KEYLESS_PROVIDERS = {"ollama", "custom"}
+
+_LATENCY_WINDOW = 50  # successful calls remembered per model
+_latencies: dict[str, deque] = {}
+# config hash -> {"result", "at" (monotonic), "refresh" (Task or None)}
+_test_results: dict[str, dict[str, Any]] = {}
+
+
+def classify_error(provider: str, message: str) -> tuple[str, str]:
+    """Map an exception message to ``(status, short error)``."""
+    msg = message.lower()
+    if "api_key" in msg or "unauthorized" in msg or "authentication" in msg:
+        return "auth_error", "Invalid API key"
+    if "rate limit" in msg or "ratelimit" in msg:
+        return "rate_limit", "Rate limit exceeded"
+    if "connection" in msg or "refused" in msg:
+        if provider.lower() == "ollama":
+            return "connection_error", "Ollama not running"
+        return "connection_error", "Connection failed"
+    if "model" in msg and "not found" in msg:
+        return "model_error", "Model not available"
+    return "error", message[:80]
+
+
+async def probe_model(
+    model: AIModel,
+    probes: int = DEFAULT_PROBES,
+    deadline: float = DEFAULT_DEADLINE,
+) -> dict[str, Any]:
+    """Probe one model ``probes`` times within ``deadline`` seconds."""
+    generator = FeedbackGenerator()
+    config = generator._get_model_config(model)
+    provider = (model.provider or "").lower()
+    result: dict[str, Any] = {
+        "id": model.id,
+        "provider": model.provider,
+        "model": model.model_id,
+        "name": model.name,
+        "status": "checking",
+        "response_time": None,
+        "latency": None,
+        "probes": probes,
+        "succeeded": 0,
+        "error": None,
+        "has_api_key": "api_key" in config,
+        "checked_at": datetime.now().isoformat(),
+    }
+
+    if not result["has_api_key"] and provider not in _KEYLESS_PROVIDERS:
+        result["status"] = "no_api_key"
+        env_var = _ENV_VAR_MAP.get(provider)
+        result["error"] = f"Missing {env_var}" if env_var else "Missing API key"
+        return result
+
+    params = generator._build_call_params(
+        model,
+        [{"role": "user", "content": PROBE_PROMPT}],
+        {**config, "temperature": 0, "max_tokens": 10},
+    )
+    params.pop("response_format", None)
+    latencies: list[float] = []
+
+    async def run_probes() -> None:
+        for _ in range(probes):
+            started = time.perf_counter()
+            response = await litellm.acompletion(
+                **params, timeout=deadline, num_retries=0
+            )
+            if not getattr(response, "choices", None):
+                raise ValueError("No response received")
+            latencies.append(time.perf_counter() - started)
+            record_latency(params["model"], latencies[-1])
+
+    try:
+        await asyncio.wait_for(run_probes(), timeout=deadline)
+        result["status"] = "healthy"
+    except asyncio.TimeoutError:
+        result["status"] = "timeout"
+        result["error"] = f"No answer within {deadline:g}s"
+    except Exception as e:
+        result["status"], result["error"] = classify_error(provider, str(e))
+
+    result["succeeded"] = len(latencies)
+    if latencies:
+        result["latency"] = {
+            "p50": round(percentile(latencies, 50), 3),
+            "p90": round(percentile(latencies, 90), 3),
+            "max": round(max(latencies), 3),
+        }
+        result["response_time"] = result["latency"]["p50"]
+    return result
+
+
+async def check_models(
+    models: list[AIModel] | None = None,
+    probes: int = DEFAULT_PROBES,
+    deadline: float = DEFAULT_DEADLINE,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> list[dict[str, Any]]:
+    """Probe every model (default: all active ones) concurrently.
+
+    Results come back in the order of ``models``.
+    """
+    if models is None:
+        models = [m for m in ai_models() if m.active]
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def limited(model: AIModel) -> dict[str, Any]:
+        async with limit:
+            return await probe_model(model, probes=probes, deadline=deadline)
+
+    return list(await asyncio.gather(*(limited(m) for m in models)))
+
+
+def record_latency(model: str, seconds: float) -> None:
+    """Remember one successful call's latency for ``model`` (LiteLLM string)."""
+    _latencies.setdefault(model, deque(maxlen=_LATENCY_WINDOW)).append(seconds)
+
+
+def latency_stats(model: str) -> Optional[dict[str, Any]]:
+    """p50/p90/max over the last successful calls to ``model``, or None."""
+    window = list(_latencies.get(model, ()))
+    if not window:
+        return None
+    return {
+        "count": len(window),
+        "p50": round(percentile(window, 50), 3),
+        "p90": round(percentile(window, 90), 3),
+        "max": round(max(window), 3),
+    }
+
+
+async def list_ollama_models(
+    base_url: str, timeout: float = OLLAMA_LIST_TIMEOUT
+) -> list[dict[str, Any]]:
+    """Models pulled on an Ollama server (``/api/tags``), off the event loop.
+
+    Raises ``requests`` exceptions, or ``ValueError`` for a non-200 answer.
+    """
+    url = base_url.strip().rstrip("/") + "/api/tags"
+    resp = await asyncio.to_thread(requests.get, url, timeout=timeout, verify=True)
+    if resp.status_code != 200:
+        raise ValueError(f"Server responded with status {resp.status_code}")
+    return list(resp.json().get("models", []))
+
+
+def _config_key(provider: str, model_id: str, api_key: str, base_url: str) -> str:
+    raw = "\0".join([provider, model_id, api_key, base_url])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+async def check_connection(
+    provider: str,
+    model_id: str = "",
+    api_key: str = "",
+    base_url: str = "",
+) -> dict[str, Any]:
+    """Probe an (unsaved) model configuration once, through the result cache.
+
+    Returns a ``probe_model`` result plus ``cached`` (True when answered from
+    the cache) and ``refreshing`` (True when a re-probe of a stale or failed
+    cached result is running in the background). An Ollama configuration
+    without a model id is tested with the first model the server lists.
+    """
+    provider = provider.lower()
+    api_key, base_url = api_key.strip(), base_url.strip()
+    if provider == "ollama" and not model_id:
+        try:
+            listed = await list_ollama_models(base_url or "http://localhost:11434")
+        except Exception:
+            listed = []
+        model_id = listed[0]["name"].replace(":latest", "") if listed else "llama2"
+
+    key = _config_key(provider, model_id, api_key, base_url)
+    entry = _test_results.get(key)
+    if entry is not None:
+        stale = time.monotonic() - entry["at"] > MODEL_TEST_CACHE_TTL
+        refreshing = entry["refresh"] is not None and not entry["refresh"].done()
+        if (stale or entry["result"]["status"] != "healthy") and not refreshing:
+            entry["refresh"] = asyncio.get_running_loop().create_task(
+                _probe_config(key, provider, model_id, api_key, base_url)
+            )
+            refreshing = True
+        return {**entry["result"], "cached": True, "refreshing": refreshing}
+    result = await _probe_config(key, provider, model_id, api_key, base_url)
+    return {**result, "cached": False, "refreshing": False}
+
+
+async def _probe_config(
+    key: str, provider: str, model_id: str, api_key: str, base_url: str
+) -> dict[str, Any]:
+    config: dict[str, Any] = {}
+    if api_key:
+        config["api_key"] = api_key
+    if base_url:
+        config["api_base"] = base_url
+    model = AIModel(
+        name=model_id,
+        provider=provider,
+        model_id=model_id,
+        api_config=json.dumps(config),
+        active=True,
+    )
+    result = await probe_model(model, probes=1, deadline=MODEL_TEST_DEADLINE)
+    previous = _test_results.get(key, {})
+    _test_results[key] = {
+        "result": result,
+        "at": time.monotonic(),
+        "refresh": previous.get("refresh"),
+    }
+    return result
@@ -1,37 +1,136 @@
 """
 Draft progress analysis and comparison service.
 Analyzes improvements between drafts and generates progress insights.
+
+Each draft with released feedback is reduced once to a score entry
+(``score_draft``): its weighted overall score and a score per rubric
+category, taken from the draft's per-category ``AggregatedFeedback`` rows.
+Everything else — progressions, comparisons, improvement metrics — works on
+those entries, which is what lets ``progress_snapshot`` store them and
+update one draft at a time.
 """
 
-import json
 from typing import Any, ClassVar, Optional
 
 from app.models.feedback import AggregatedFeedback, Draft
 
+_EMPTY_METRICS = {
+    "total_improvement": 0,
+    "average_improvement_per_draft": 0,
+    "best_improvement": 0,
+    "consistency_score": 0,
+}
+
+
+def weighted_score(scores: dict[int, float], weights: dict[int, float]) -> float:
+    """
+    Overall score from category scores (keyed by category id), weighted by
+    rubric weight — a plain mean when the weights are missing or zero.
+    """
+    total_weight = sum(weights.get(cid, 0.0) for cid in scores)
+    if total_weight > 0:
+        return sum(s * weights.get(cid, 0.0) for cid, s in scores.items()) / (
+            total_weight
+        )
+    return sum(scores.values()) / len(scores)
+
+
+def score_draft(
+    draft: Draft,
+    feedback_list: list[AggregatedFeedback],
+    rubric_categories: list[Any],
+) -> Optional[dict[str, Any]]:
+    """
+    Reduce one draft's released feedback rows to a score entry.
+
+    The overall score is ``weighted_score`` over the category scores.
+    Returns ``None`` when the draft has no scored feedback.
+    """
+    weights = {cat.id: float(cat.weight or 0) for cat in rubric_categories}
+    names = {cat.id: cat.name for cat in rubric_categories}
+    scores = {
+        fb.category_id: float(fb.aggregated_score)
+        for fb in feedback_list
+        if fb.draft_id == draft.id and fb.aggregated_score is not None
+    }
+    if not scores:
+        return None
+    return {
+        "draft_id": draft.id,
+        "version": draft.version,
+        "score": round(weighted_score(scores, weights), 2),
+        "categories": {
+            names.get(cid, f"Category {cid}"): score for cid, score in scores.items()
+        },
+    }
+
+
+def improvement_metrics(scores: list[float]) -> dict[str, Any]:
+    """
+    Improvement metrics over the overall scores of the drafts with feedback,
+    oldest first. ``drafts_submitted`` is left for the caller to fill in.
+    """
+    metrics: dict[str, Any] = {
+        **_EMPTY_METRICS,
+        "drafts_with_feedback": len(scores),
+        "current_score": scores[-1] if scores else 0,
+        "initial_score": scores[0] if scores else 0,
+    }
+    if len(scores) < 2:
+        return metrics
+
+    improvements = [scores[i] - scores[i - 1] for i in range(1, len(scores))]
+    total_improvement = scores[-1] - scores[0]
+    avg_imp = sum(improvements) / len(improvements)
+    variance = sum((imp - avg_imp) ** 2 for imp in improvements) / len(improvements)
+    metrics.update(
+        {
+            "total_improvement": total_improvement,
+            "average_improvement_per_draft": total_improvement / (len(scores) - 1),
+            # Best single improvement
+            "best_improvement": max(0, *improvements),
+            # Convert variance to a 0-100 consistency score (lower variance = higher score)
+            "consistency_score": max(0, 100 - variance),
+        }
+    )
+    return metrics
+
 
 class ProgressAnalyzer:
     """Analyzes student progress across multiple drafts."""
 
-    def __init__(self, drafts: list[Draft], feedback_list: list[AggregatedFeedback]):
+    def __init__(
+        self,
+        drafts: list[Draft],
+        feedback_list: list[AggregatedFeedback],
+        rubric_categories: Optional[list[Any]] = None,
+    ):
         """
         Initialize the progress analyzer.
 
         Args:
             drafts: List of student drafts for an assignment
-            feedback_list: List of aggregated feedback for the drafts
+            feedback_list: List of released aggregated feedback for the drafts
+                (one row per draft and rubric category)
+            rubric_categories: The assignment's rubric categories, used to
+                name and weight the category scores
         """
         self.drafts = sorted(drafts, key=lambda d: d.version)
-        self.feedback_by_draft = self._organize_feedback(feedback_list)
-
-    def _organize_feedback(
-        self, feedback_list: list[AggregatedFeedback]
-    ) -> dict[int, AggregatedFeedback]:
-        """Organize feedback by draft ID for easy lookup."""
-        feedback_dict = {}
-        for feedback in feedback_list:
-            if feedback.draft_id not in feedback_dict:
-                feedback_dict[feedback.draft_id] = feedback
-        return feedback_dict
+        categories = rubric_categories or []
+        self.entries: dict[int, dict[str, Any]] = {}
+        for draft in self.drafts:
+            entry = score_draft(draft, feedback_list, categories)
+            if entry is not None:
+                self.entries[draft.id] = entry
+
+    @classmethod
+    def from_entries(
+        cls, drafts: list[Draft], entries: list[dict[str, Any]]
+    ) -> "ProgressAnalyzer":
+        """An analyzer over precomputed ``score_draft`` entries."""
+        analyzer = cls(drafts, [])
+        analyzer.entries = {entry["draft_id"]: entry for entry in entries}
+        return analyzer
 
     def get_score_progression(self) -> list[dict[str, Any]]:
         """
@@ -42,22 +141,14 @@ class ProgressAnalyzer:
         """
         progression = []
         for draft in self.drafts:
-            feedback = self.feedback_by_draft.get(draft.id)
-            if feedback:
-                try:
-                    score = float(getattr(feedback, "overall_score", 0))
-                except (ValueError, TypeError):
-                    score = 0
-            else:
-                score = 0
-
+            entry = self.entries.get(draft.id)
             progression.append(
                 {
                     "version": draft.version,
-                    "score": score,
+                    "score": entry["score"] if entry else 0,
                     "submission_date": draft.submission_date,
                     "word_count": getattr(draft, "word_count", 0),
-                    "has_feedback": feedback is not None,
+                    "has_feedback": entry is not None,
                 }
             )
         return progression
@@ -77,35 +168,16 @@ class ProgressAnalyzer:
         category_progression: dict[str, list[dict[str, Any]]] = {
             cat.name: [] for cat in rubric_categories
         }
-
         for draft in self.drafts:
-            feedback = self.feedback_by_draft.get(draft.id)
-            if feedback and hasattr(feedback, "category_scores"):
-                try:
-                    if isinstance(feedback.category_scores, str):
-                        category_scores = json.loads(feedback.category_scores)
-                    else:
-                        category_scores = feedback.category_scores or {}
-                except (json.JSONDecodeError, TypeError):
-                    category_scores = {}
-
-                for cat in rubric_categories:
-                    cat_score_data = category_scores.get(cat.name, {})
-                    if isinstance(cat_score_data, dict):
-                        score = cat_score_data.get("score", 0)
-                    else:
-                        score = float(cat_score_data) if cat_score_data else 0
-
-                    category_progression[cat.name].append(
-                        {"version": draft.version, "score": score, "has_feedback": True}
-                    )
-            else:
-                # No feedback for this draft
-                for cat in rubric_categories:
-                    category_progression[cat.name].append(
-                        {"version": draft.version, "score": 0, "has_feedback": False}
-                    )
-
+            entry = self.entries.get(draft.id)
+            for cat in rubric_categories:
+                category_progression[cat.name].append(
+                    {
+                        "version": draft.version,
+                        "score": entry["categories"].get(cat.name, 0) if entry else 0,
+                        "has_feedback": entry is not None,
+                    }
+                )
         return category_progression
 
     def compare_drafts(
@@ -127,22 +199,10 @@ class ProgressAnalyzer:
         if not draft1 or not draft2:
             return {"error": "One or both drafts not found"}
 
-        feedback1 = self.feedback_by_draft.get(draft1.id)
-        feedback2 = self.feedback_by_draft.get(draft2.id)
-
-        # Get scores
-        score1 = 0.0
-        score2 = 0.0
-        if feedback1:
-            try:
-                score1 = float(getattr(feedback1, "overall_score", 0))
-            except (ValueError, TypeError):
-                score1 = 0
-        if feedback2:
-            try:
-                score2 = float(getattr(feedback2, "overall_score", 0))
-            except (ValueError, TypeError):
-                score2 = 0
+        entry1 = self.entries.get(draft1.id)
+        entry2 = self.entries.get(draft2.id)
+        score1 = entry1["score"] if entry1 else 0.0
+        score2 = entry2["score"] if entry2 else 0.0
 
         # Calculate changes
         score_change = score2 - score1
@@ -150,8 +210,8 @@ class ProgressAnalyzer:
             getattr(draft1, "word_count", 0) or 0
         )
 
-        # Extract key changes from feedback
-        changes_summary = self._extract_changes_summary(feedback1, feedback2)
+        # Extract key changes from the category scores
+        changes_summary = self._extract_changes_summary(entry1, entry2)
 
         return {
             "draft1": {
@@ -180,15 +240,15 @@ class ProgressAnalyzer:
 
     def _extract_changes_summary(
         self,
-        feedback1: Optional[AggregatedFeedback],
-        feedback2: Optional[AggregatedFeedback],
+        entry1: Optional[dict[str, Any]],
+        entry2: Optional[dict[str, Any]],
     ) -> dict[str, list[str]]:
         """
-        Extract a summary of changes between two feedback instances.
+        Extract a summary of changes between two drafts' score entries.
 
         Args:
-            feedback1: First feedback instance
-            feedback2: Second feedback instance
+            entry1: First draft's score entry
+            entry2: Second draft's score entry
 
         Returns:
             Dictionary with improvements, regressions, and maintained strengths
@@ -199,44 +259,12 @@ class ProgressAnalyzer:
             "maintained": [],
         }
 
-        if not feedback1 or not feedback2:
-            return summary
-
-        # Parse category scores for both drafts
-        try:
-            if hasattr(feedback1, "category_scores"):
-                if isinstance(feedback1.category_scores, str):
-                    cat_scores1 = json.loads(feedback1.category_scores)
-                else:
-                    cat_scores1 = feedback1.category_scores or {}
-            else:
-                cat_scores1 = {}
-
-            if hasattr(feedback2, "category_scores"):
-                if isinstance(feedback2.category_scores, str):
-                    cat_scores2 = json.loads(feedback2.category_scores)
-                else:
-                    cat_scores2 = feedback2.category_scores or {}
-            else:
-                cat_scores2 = {}
-        except (json.JSONDecodeError, TypeError):
+        if not entry1 or not entry2:
             return summary
 
         # Compare category scores
-        for category, score_data2 in cat_scores2.items():
-            score_data1 = cat_scores1.get(category, {})
-
-            if isinstance(score_data1, dict):
-                score1 = score_data1.get("score", 0)
-            else:
-                score1 = float(score_data1) if score_data1 else 0
-
-            if isinstance(score_data2, dict):
-                score2 = score_data2.get("score", 0)
-            else:
-                score2 = float(score_data2) if score_data2 else 0
-
-            change = score2 - score1
+        for category, score2 in entry2["categories"].items():
+            change = score2 - entry1["categories"].get(category, 0)
             if change > 5:  # Significant improvement
                 summary["improvements"].append(f"{category}: +{change:.1f} points")
             elif change < -5:  # Significant regression
@@ -253,60 +281,10 @@ class ProgressAnalyzer:
         Returns:
             Dictionary containing various improvement metrics
         """
-        if len(self.drafts) < 2:
-            return {
-                "total_improvement": 0,
-                "average_improvement_per_draft": 0,
-                "best_improvement": 0,
-                "consistency_score": 0,
-                "drafts_submitted": len(self.drafts),
-            }
-
-        progression = self.get_score_progression()
-        scores = [p["score"] for p in progression if p["has_feedback"]]
-
-        if len(scores) < 2:
-            return {
-                "total_improvement": 0,
-                "average_improvement_per_draft": 0,
-                "best_improvement": 0,
-                "consistency_score": 0,
-                "drafts_submitted": len(self.drafts),
-            }
-
-        # Calculate metrics
-        total_improvement = scores[-1] - scores[0]
-        average_improvement = total_improvement / (len(scores) - 1)
-
-        # Find best single improvement
-        best_improvement = 0
-        for i in range(1, len(scores)):
-            improvement = scores[i] - scores[i - 1]
-            if improvement > best_improvement:
-                best_improvement = improvement
-
-        # Calculate consistency (lower variance = more consistent)
-        improvements = [scores[i] - scores[i - 1] for i in range(1, len(scores))]
-        if improvements:
-            avg_imp = sum(improvements) / len(improvements)
-            variance = sum((imp - avg_imp) ** 2 for imp in improvements) / len(
-                improvements
-            )
-            # Convert variance to a 0-100 consistency score (lower variance = higher score)
-            consistency_score = max(0, 100 - variance)
-        else:
-            consistency_score = 0
-
-        return {
-            "total_improvement": total_improvement,
-            "average_improvement_per_draft": average_improvement,
-            "best_improvement": best_improvement,
-            "consistency_score": consistency_score,
-            "drafts_submitted": len(self.drafts),
-            "drafts_with_feedback": len(scores),
-            "current_score": scores[-1] if scores else 0,
-            "initial_score": scores[0] if scores else 0,
-        }
+        scores = [
+            self.entries[d.id]["score"] for d in self.drafts if d.id in self.entries
+        ]
+        return {**improvement_metrics(scores), "drafts_submitted": len(self.drafts)}
 
     # Curated skill-development resources, matched on category-name keywords.
     # Durable public references only; instructors can point at unit-specific
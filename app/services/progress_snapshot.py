@@ -0,0 +1,177 @@
+"""
+Precomputed progress for the student assignment view.
+
+Rebuilding a ``ProgressAnalyzer`` on every ``/student/assignments/{id}``
+view re-scored every draft's feedback each time. Instead, one
+``progress_snapshots`` row per student and assignment holds the per-draft
+score entries (``progress_analyzer.score_draft``), the improvement metrics
+over them and the next-step recommendations for the latest scored draft.
+
+The row is updated incrementally when a draft's feedback is released or
+edited after release (``feedback_review`` calls ``record_release``): only
+that draft is re-scored, then the metrics are recomputed from the stored
+scores. The view reads the row with ``get_snapshot``, which rebuilds it from
+scratch when it is missing (existing data, first view) or was scored against
+a rubric that has since changed.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Optional
+
+from app.models.assignment import rubric_categories, rubrics
+from app.models.feedback import (
+    ProgressSnapshot,
+    aggregated_feedback,
+    drafts,
+    progress_snapshots,
+)
+from app.services.feedback_review import RELEASED
+from app.services.progress_analyzer import (
+    ProgressAnalyzer,
+    improvement_metrics,
+    score_draft,
+)
+from app.utils.db_query import by_id, first, where
+
+logger = logging.getLogger(__name__)
+
+
+def _rubric_categories(assignment_id: int) -> list[Any]:
+    rubric = first(rubrics, assignment_id=assignment_id)
+    return where(rubric_categories, rubric_id=rubric.id) if rubric else []
+
+
+def _rubric_key(categories: list[Any]) -> str:
+    return ";".join(
+        f"{c.id}:{c.name}:{c.weight}" for c in sorted(categories, key=lambda c: c.id)
+    )
+
+
+def _released_rows(draft_id: int) -> list[Any]:
+    return where(aggregated_feedback, draft_id=draft_id, status=RELEASED)
+
+
+def _as_dict(row: Any) -> dict[str, Any]:
+    return {
+        "entries": json.loads(row.entries or "[]"),
+        "metrics": json.loads(row.metrics or "{}"),
+        "recommendations": json.loads(row.recommendations or "[]"),
+        "recommendations_draft_id": row.recommendations_draft_id,
+    }
+
+
+def _save(
+    student_email: str,
+    assignment_id: int,
+    snapshot: dict[str, Any],
+    categories: list[Any],
+) -> dict[str, Any]:
+    scores = [entry["score"] for entry in snapshot["entries"]]
+    snapshot["metrics"] = improvement_metrics(scores)
+    values = {
+        "entries": json.dumps(snapshot["entries"]),
+        "metrics": json.dumps(snapshot["metrics"]),
+        "recommendations": json.dumps(snapshot["recommendations"]),
+        "recommendations_draft_id": snapshot["recommendations_draft_id"],
+        "rubric_key": _rubric_key(categories),
+        "updated_at": datetime.now().isoformat(),
+    }
+    row = first(
+        progress_snapshots, student_email=student_email, assignment_id=assignment_id
+    )
+    if row is None:
+        progress_snapshots.insert(
+            ProgressSnapshot(
+                student_email=student_email, assignment_id=assignment_id, **values
+            )
+        )
+    else:
+        progress_snapshots.update(values, pk_values=row.id)
+    return snapshot
+
+
+def rebuild(
+    student_email: str,
+    assignment_id: int,
+    categories: Optional[list[Any]] = None,
+) -> dict[str, Any]:
+    """Score every draft of this student's assignment and store the snapshot."""
+    if categories is None:
+        categories = _rubric_categories(assignment_id)
+    student_drafts = where(
+        drafts, assignment_id=assignment_id, student_email=student_email
+    )
+    feedback = [row for d in student_drafts for row in _released_rows(d.id)]
+    analyzer = ProgressAnalyzer(student_drafts, feedback, categories)
+    entries = [
+        analyzer.entries[d.id] for d in analyzer.drafts if d.id in analyzer.entries
+    ]
+
+    snapshot: dict[str, Any] = {
+        "entries": entries,
+        "recommendations": [],
+        "recommendations_draft_id": None,
+    }
+    if entries:
+        latest_id = entries[-1]["draft_id"]
+        snapshot["recommendations"] = analyzer.get_next_steps_recommendations(
+            [row for row in feedback if row.draft_id == latest_id], categories
+        )
+        snapshot["recommendations_draft_id"] = latest_id
+    return _save(student_email, assignment_id, snapshot, categories)
+
+
+def record_release(draft_id: int) -> None:
+    """Fold one draft's (newly) released feedback into its snapshot."""
+    draft = by_id(drafts, draft_id)
+    if draft is None:
+        return
+    categories = _rubric_categories(draft.assignment_id)
+    row = first(
+        progress_snapshots,
+        student_email=draft.student_email,
+        assignment_id=draft.assignment_id,
+    )
+    rows = _released_rows(draft_id)
+    entry = score_draft(draft, rows, categories)
+    if row is None or row.rubric_key != _rubric_key(categories) or entry is None:
+        rebuild(draft.student_email, draft.assignment_id, categories)
+        return
+
+    snapshot = _as_dict(row)
+    entries = [e for e in snapshot["entries"] if e["draft_id"] != draft_id]
+    entries.append(entry)
+    entries.sort(key=lambda e: e["version"])
+    snapshot["entries"] = entries
+    if entries[-1]["draft_id"] == draft_id:
+        snapshot["recommendations"] = ProgressAnalyzer(
+            [], []
+        ).get_next_steps_recommendations(rows, categories)
+        snapshot["recommendations_draft_id"] = draft_id
+    _save(draft.student_email, draft.assignment_id, snapshot, categories)
+    logger.debug(
+        f"Progress snapshot updated for {draft.student_email} "
+        f"(assignment {draft.assignment_id}, draft {draft_id})"
+    )
+
+
+def get_snapshot(
+    student_email: str,
+    assignment_id: int,
+    categories: Optional[list[Any]] = None,
+) -> dict[str, Any]:
+    """The stored progress snapshot, rebuilt first if missing or out of date.
+
+    Returns ``entries``, ``metrics`` (without ``drafts_submitted``, which
+    the view knows), ``recommendations`` and ``recommendations_draft_id``.
+    """
+    if categories is None:
+        categories = _rubric_categories(assignment_id)
+    row = first(
+        progress_snapshots, student_email=student_email, assignment_id=assignment_id
+    )
+    if row is None or row.rubric_key != _rubric_key(categories):
+        return rebuild(student_email, assignment_id, categories)
+    return _as_dict(row)
@@ -1,13 +1,29 @@
 """
 Prompt template system for generating AI prompts based on rubrics
+
+A feedback prompt is split into a **prefix** — assignment context, rubric
+criteria, feedback and JSON-format instructions — and a **suffix** holding the
+draft context and the student submission. The prefix is identical for every
+student on an assignment, so it is compiled once per assignment/rubric
+revision into a ``PromptSkeleton`` and cached; per-draft work is a
+``string.Template`` substitution of the draft version and submission. Keeping
+the prefix byte-stable also lets providers with prompt caching reuse it.
 """
 
+import hashlib
 import json
+from collections import OrderedDict
 from dataclasses import dataclass
+from string import Template
 from typing import Optional
 
 from app.models.assignment import Assignment, RubricCategory, rubric_categories, rubrics
 from app.models.config import FeedbackStyle, feedback_styles
+from app.utils.db_query import by_id, first, where
+
+# Compiled skeletons kept in memory (LRU). One entry per assignment revision.
+_SKELETON_CACHE_SIZE = 128
+_SKELETON_CACHE: "OrderedDict[tuple[int, str], PromptSkeleton]" = OrderedDict()
 
 
 @dataclass
@@ -28,6 +44,40 @@ class PromptContext:
     custom_prompt: Optional[str] = None  # From assignment config
 
 
+@dataclass(frozen=True)
+class PromptSkeleton:
+    """A feedback prompt precompiled for one assignment/rubric revision.
+
+    ``prefix`` is the static, cacheable part. The suffix templates take
+    ``$draft_version``, ``$word_count`` and ``$student_submission``; revision
+    drafts (version > 1) use their own template so iterative guidance is baked
+    in rather than branched on per call.
+    """
+
+    revision: str
+    prefix: str
+    first_draft_suffix: Template
+    revision_suffix: Template
+
+    def render_suffix(self, student_submission: str, draft_version: int) -> str:
+        """Substitute one draft into the variable part of the prompt."""
+        template = (
+            self.revision_suffix if draft_version > 1 else self.first_draft_suffix
+        )
+        word_count = len(student_submission.split()) if student_submission else 0
+        return template.substitute(
+            draft_version=draft_version,
+            word_count=word_count or "Not specified",
+            student_submission=student_submission,
+        )
+
+    def render(self, student_submission: str, draft_version: int) -> str:
+        """The complete prompt: prefix followed by the rendered suffix."""
+        return (
+            self.prefix + "\n\n" + self.render_suffix(student_submission, draft_version)
+        )
+
+
 class PromptTemplate:
     """Base class for prompt templates"""
 
@@ -75,6 +125,25 @@ Your role is to:
 
     def generate_prompt(self, context: PromptContext) -> str:
         """Generate a complete prompt based on the context"""
+        return self.compile(context).render(
+            context.student_submission, context.draft_version
+        )
+
+    def compile(self, context: PromptContext, revision: str = "") -> PromptSkeleton:
+        """Compile the static prefix and suffix templates for a context.
+
+        Only assignment-level fields of ``context`` are read; the submission
+        and draft version are left as template placeholders.
+        """
+        return PromptSkeleton(
+            revision=revision,
+            prefix=self.generate_prefix(context),
+            first_draft_suffix=self._compile_suffix(context, is_revision=False),
+            revision_suffix=self._compile_suffix(context, is_revision=True),
+        )
+
+    def generate_prefix(self, context: PromptContext) -> str:
+        """The static part of the prompt, shared by every draft"""
         prompt_parts = []
 
         # Add assignment context
@@ -83,22 +152,35 @@ Your role is to:
         # Add rubric criteria
         prompt_parts.append(self._format_rubric_criteria(context))
 
-        # Add student submission
-        prompt_parts.append(self._format_student_submission(context))
-
         # Add feedback instructions
         prompt_parts.append(self._format_feedback_instructions(context))
 
         return "\n\n".join(prompt_parts)
 
+    def _compile_suffix(self, context: PromptContext, is_revision: bool) -> Template:
+        """The per-draft part of the prompt as a ``string.Template``"""
+        return Template(
+            "\n\n".join(
+                [
+                    self._format_draft_context(context, is_revision),
+                    self._format_student_submission(context),
+                ]
+            )
+        )
+
     def _format_assignment_context(self, context: PromptContext) -> str:
         """Format the assignment context section"""
         return f"""## Assignment Context
 
 Title: {context.assignment.title}
-Description: {context.assignment.description}
-Draft: {context.draft_version} of {context.max_drafts}
-Word Count: {context.word_count or "Not specified"}"""
+Description: {context.assignment.description}"""
+
+    def _format_draft_context(self, context: PromptContext, is_revision: bool) -> str:
+        """Format the draft section (template placeholders, not values)"""
+        return f"""## Draft Context
+
+Draft: $draft_version of {context.max_drafts}
+Word Count: $word_count"""
 
     def _format_rubric_criteria(self, context: PromptContext) -> str:
         """Format the rubric criteria section"""
@@ -121,10 +203,10 @@ Word Count: {context.word_count or "Not specified"}"""
         return criteria_text
 
     def _format_student_submission(self, context: PromptContext) -> str:
-        """Format the student submission section"""
-        return f"""## Student Submission
+        """Format the student submission section (template placeholder)"""
+        return """## Student Submission
 
-{context.student_submission}"""
+$student_submission"""
 
     def _format_feedback_instructions(self, context: PromptContext) -> str:
         """Format the feedback instructions based on settings"""
@@ -259,27 +341,23 @@ Ensure all scores are between 0 and 100, and all text fields contain specific, a
 class IterativePromptTemplate(PromptTemplate):
     """Specialized template for iterative feedback on multiple drafts"""
 
-    def _format_assignment_context(self, context: PromptContext) -> str:
+    def _format_draft_context(self, context: PromptContext, is_revision: bool) -> str:
         """Add draft-specific context for iterative feedback"""
-        base_context = super()._format_assignment_context(context)
+        base_context = super()._format_draft_context(context, is_revision)
 
-        if context.draft_version > 1:
-            base_context += f"\n\nNote: This is draft {context.draft_version} of {context.max_drafts}. "
+        if is_revision:
+            base_context += (
+                f"\n\nNote: This is draft $draft_version of {context.max_drafts}. "
+            )
             base_context += "Please acknowledge improvements from previous drafts while still providing constructive feedback for continued improvement."
 
-        return base_context
-
-    def _get_combined_feedback_instructions(self, context: PromptContext) -> str:
-        """Add iterative-specific instructions"""
-        base_instructions = super()._get_combined_feedback_instructions(context)
+            if context.feedback_level not in ("overall", "criterion"):
+                base_context += "\n\nFor revision drafts, also comment on:"
+                base_context += "\n   - Progress made since the previous draft"
+                base_context += "\n   - Whether previous feedback was addressed"
+                base_context += "\n   - Remaining areas for improvement"
 
-        if context.draft_version > 1:
-            base_instructions += "\n\n3. For revision drafts, also comment on:"
-            base_instructions += "\n   - Progress made since the previous draft"
-            base_instructions += "\n   - Whether previous feedback was addressed"
-            base_instructions += "\n   - Remaining areas for improvement"
-
-        return base_instructions
+        return base_context
 
 
 def create_prompt_template(
@@ -291,57 +369,72 @@ def create_prompt_template(
     return PromptTemplate(context)
 
 
-def generate_feedback_prompt(
+def _revision_key(
+    assignment: Assignment,
+    categories: list[RubricCategory],
+    style: Optional[FeedbackStyle],
+    feedback_level: str,
+) -> str:
+    """Fingerprint of everything that shapes the static prompt prefix.
+
+    Any edit to the assignment's feedback config, a rubric category, or the
+    chosen style yields a new key, so stale skeletons are never served.
+    """
+    material = {
+        "title": assignment.title,
+        "description": assignment.description,
+        "max_drafts": assignment.max_drafts,
+        "feedback_tone": getattr(assignment, "feedback_tone", None),
+        "feedback_detail": getattr(assignment, "feedback_detail", None),
+        "feedback_focus": getattr(assignment, "feedback_focus", None),
+        "custom_prompt": getattr(assignment, "custom_prompt", None),
+        "categories": [
+            (c.id, c.name, c.description, c.weight)
+            for c in sorted(categories, key=lambda c: c.id)
+        ],
+        "style": (style.id, style.name, style.description) if style else None,
+        "feedback_level": feedback_level,
+    }
+    encoded = json.dumps(material, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def get_prompt_skeleton(
     assignment: Assignment,
-    student_submission: str,
-    draft_version: int,
     feedback_style_id: Optional[int] = None,
     feedback_level: str = "both",
-) -> str:
+) -> PromptSkeleton:
     """
-    Generate a complete feedback prompt for an assignment submission
+    Get the compiled prompt skeleton for an assignment, building it on a miss
 
     Args:
         assignment: The assignment object
-        student_submission: The student's submitted text
-        draft_version: Which draft number this is
         feedback_style_id: Optional feedback style to use
         feedback_level: Type of feedback ('overall', 'criterion', 'both')
 
     Returns:
-        Complete prompt string ready for AI model
+        PromptSkeleton for the assignment's current rubric revision
     """
     # Get rubric categories for the assignment
-    assignment_rubric = None
-    for rubric in rubrics():
-        if rubric.assignment_id == assignment.id:
-            assignment_rubric = rubric
-            break
-
+    assignment_rubric = first(rubrics, assignment_id=assignment.id)
     if not assignment_rubric:
         raise ValueError(f"No rubric found for assignment {assignment.id}")
 
-    # Get rubric categories
-    categories = []
-    for category in rubric_categories():
-        if category.rubric_id == assignment_rubric.id:
-            categories.append(category)
-
+    categories = where(rubric_categories, rubric_id=assignment_rubric.id)
     if not categories:
         raise ValueError(
             f"No rubric categories found for rubric {assignment_rubric.id}"
         )
 
     # Get feedback style if specified
-    style = None
-    if feedback_style_id:
-        for fs in feedback_styles():
-            if fs.id == feedback_style_id:
-                style = fs
-                break
+    style = by_id(feedback_styles, feedback_style_id) if feedback_style_id else None
 
-    # Calculate word count
-    word_count = len(student_submission.split()) if student_submission else 0
+    revision = _revision_key(assignment, categories, style, feedback_level)
+    cache_key = (assignment.id, revision)
+    skeleton = _SKELETON_CACHE.get(cache_key)
+    if skeleton is not None:
+        _SKELETON_CACHE.move_to_end(cache_key)
+        return skeleton
 
     # Parse assignment feedback configuration
     focus_areas = None
@@ -351,16 +444,15 @@ def generate_feedback_prompt(
         except (json.JSONDecodeError, TypeError, ValueError):
             focus_areas = None
 
-    # Create context with all configuration
+    # Assignment-level context only; per-draft fields stay as placeholders
     context = PromptContext(
         assignment=assignment,
         rubric_categories=categories,
-        student_submission=student_submission,
-        draft_version=draft_version,
+        student_submission="",
+        draft_version=1,
         max_drafts=assignment.max_drafts,
         feedback_style=style,
         feedback_level=feedback_level,
-        word_count=word_count,
         feedback_tone=getattr(assignment, "feedback_tone", "encouraging"),
         feedback_detail=getattr(assignment, "feedback_detail", "standard"),
         focus_areas=focus_areas,
@@ -371,6 +463,62 @@ def generate_feedback_prompt(
     template = create_prompt_template(
         "iterative" if assignment.max_drafts > 1 else "standard", context
     )
+    skeleton = template.compile(context, revision=revision)
+
+    _SKELETON_CACHE[cache_key] = skeleton
+    while len(_SKELETON_CACHE) > _SKELETON_CACHE_SIZE:
+        _SKELETON_CACHE.popitem(last=False)
+    return skeleton
+
+
+def clear_prompt_skeleton_cache() -> None:
+    """Drop every compiled skeleton (tests, or after bulk rubric imports)."""
+    _SKELETON_CACHE.clear()
+
+
+def generate_feedback_prompt_parts(
+    assignment: Assignment,
+    student_submission: str,
+    draft_version: int,
+    feedback_style_id: Optional[int] = None,
+    feedback_level: str = "both",
+) -> tuple[str, str]:
+    """
+    Generate a feedback prompt as ``(prefix, suffix)``
+
+    The prefix is byte-identical for every draft of the same assignment
+    revision — send it first (and mark it cacheable) so providers with
+    prompt caching can reuse it; the suffix carries the draft and submission.
+    """
+    skeleton = get_prompt_skeleton(assignment, feedback_style_id, feedback_level)
+    return skeleton.prefix, skeleton.render_suffix(student_submission, draft_version)
+
+
+def generate_feedback_prompt(
+    assignment: Assignment,
+    student_submission: str,
+    draft_version: int,
+    feedback_style_id: Optional[int] = None,
+    feedback_level: str = "both",
+) -> str:
+    """
+    Generate a complete feedback prompt for an assignment submission
+
+    Args:
+        assignment: The assignment object
+        student_submission: The student's submitted text
+        draft_version: Which draft number this is
+        feedback_style_id: Optional feedback style to use
+        feedback_level: Type of feedback ('overall', 'criterion', 'both')
 
-    # Generate and return prompt
-    return template.generate_prompt(context)
+    Returns:
+        Complete prompt string ready for AI model
+    """
+    prefix, suffix = generate_feedback_prompt_parts(
+        assignment,
+        student_submission,
+        draft_version,
+        feedback_style_id=feedback_style_id,
+        feedback_level=feedback_level,
+    )
+    return prefix + "\n\n" + suffix
@@ -1,33 +1,84 @@
 """
 Rubric generation service using AI to extract or create rubrics from assignment specifications
+
+Generating a rubric is one long model call (often 20-40 s), so the instructor
+route does not wait for it: ``start_rubric_job`` runs ``generate_rubric`` as a
+task on the event loop with the instructor's configured models and returns a
+job id the page polls (``get_rubric_job``) or cancels (``cancel_rubric_job``).
+Each job is bounded by ``RUBRIC_GENERATION_TIMEOUT`` seconds; finished jobs are
+forgotten after ``RUBRIC_JOB_TTL``. Generated rubrics are cached per prompt and
+model for ``RUBRIC_CACHE_TTL`` seconds, so regenerating from an unchanged
+specification does not call the model again.
 """
 
+import asyncio
+import copy
+import hashlib
 import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
 from typing import Any, Optional
 
 import litellm
 
+from app.models.config import AIModel
 
-def generate_rubric_from_spec(
-    assignment_title: str,
-    assignment_instructions: str,
-    spec_content: Optional[str] = None,
-    assignment_type: str = "essay",
-) -> tuple[bool, list[dict[str, Any]], str]:
-    """
-    Generate a rubric from assignment specification using AI.
+logger = logging.getLogger(__name__)
 
-    Args:
-        assignment_title: Title of the assignment
-        assignment_instructions: Brief instructions
-        spec_content: Full specification text content (if uploaded)
-        assignment_type: Type of assignment (essay, research, presentation, etc.)
+# Where instructor_assignments_create saves uploaded specifications
+SPEC_ROOT = Path("data/assignment_specs")
 
-    Returns:
-        Tuple of (success, rubric_categories, error_message)
-        rubric_categories is a list of dicts with 'name', 'description', 'weight'
+RUBRIC_GENERATION_TIMEOUT = float(os.environ.get("RUBRIC_GENERATION_TIMEOUT", "120"))
+RUBRIC_JOB_TTL = float(os.environ.get("RUBRIC_JOB_TTL", "900"))
+RUBRIC_CACHE_TTL = float(os.environ.get("RUBRIC_CACHE_TTL", "3600"))
+_PROMPT_CACHE_SIZE = 64
+
+_SYSTEM_PROMPT = (
+    "You are an expert educator creating assessment rubrics. Return only valid JSON."
+)
+
+_jobs: dict[str, dict[str, Any]] = {}
+_prompt_cache: OrderedDict[str, tuple[float, list[dict[str, Any]]]] = OrderedDict()
+
+
+async def load_spec_text(assignment: Any) -> Optional[str]:
+    """
+    Specification text for an assignment, or None if it has none.
+
+    Prefers the text extracted at upload. When that is missing (extraction
+    failed, or the spec predates it) the stored file is extracted through the
+    text cache, so repeated rubric generations parse it only once.
     """
+    spec_content: Optional[str] = getattr(assignment, "spec_content", None)
+    if spec_content:
+        return spec_content
+    spec_path = getattr(assignment, "spec_file_path", None)
+    if not spec_path or not (SPEC_ROOT / spec_path).is_file():
+        return None
+
+    from app.utils import text_cache
+    from app.utils.file_handlers import DOCUMENT_EXTENSIONS, extract_stored_file
+
+    path = SPEC_ROOT / spec_path
+    ext = path.suffix.lower()
+    if ext not in DOCUMENT_EXTENSIONS:
+        return await extract_stored_file(path, ext)
+    checksum = text_cache.checksum_bytes(path.read_bytes())
+    return await text_cache.extract_cached(
+        checksum, lambda: extract_stored_file(path, ext)
+    )
 
+
+def build_rubric_prompt(
+    assignment_title: str,
+    assignment_instructions: str,
+    spec_content: Optional[str] = None,
+) -> str:
+    """The rubric-generation prompt for an assignment."""
     # Combine all available information
     context = f"Assignment Title: {assignment_title}\n\n"
     context += f"Instructions: {assignment_instructions}\n\n"
@@ -35,8 +86,7 @@ def generate_rubric_from_spec(
     if spec_content:
         context += f"Full Specification:\n{spec_content}\n\n"
 
-    # Create the prompt for rubric generation
-    prompt = f"""
+    return f"""
     You are an educational assessment expert. Based on the following assignment information,
     generate a comprehensive rubric for evaluating student submissions.
 
@@ -63,75 +113,277 @@ def generate_rubric_from_spec(
     Ensure the weights sum to exactly 100.
     """
 
+
+def _strip_code_fences(response_text: str) -> str:
+    """Remove a surrounding markdown code block from a model reply."""
+    cleaned_response = response_text.strip()
+    if cleaned_response.startswith("```json"):
+        cleaned_response = cleaned_response[7:]
+    if cleaned_response.startswith("```"):
+        cleaned_response = cleaned_response[3:]
+    if cleaned_response.endswith("```"):
+        cleaned_response = cleaned_response[:-3]
+    return cleaned_response.strip()
+
+
+def parse_rubric_response(
+    response_text: str,
+) -> tuple[bool, list[dict[str, Any]], str]:
+    """
+    Parse and validate a generated rubric.
+
+    Returns:
+        Tuple of (success, rubric_categories, error_message); weights are
+        normalised to sum to 100.
+    """
     try:
-        # Generate rubric using litellm
-        response = litellm.completion(
-            model="gpt-3.5-turbo",  # Default model
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert educator creating assessment rubrics. Return only valid JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=1500,
-            temperature=0.7,
-        )
+        rubric_categories = json.loads(_strip_code_fences(response_text))
+    except json.JSONDecodeError as e:
+        return False, [], f"Failed to parse AI response as JSON: {e!s}"
 
-        # Extract the response text
-        response_text = response.choices[0].message.content
+    # Validate the rubric
+    if not isinstance(rubric_categories, list):
+        return False, [], "Invalid rubric format: expected a list of categories"
+
+    if len(rubric_categories) < 3:
+        return False, [], "Rubric must have at least 3 categories"
 
-        # Parse the JSON response
-        # Clean response - remove any markdown code blocks
-        cleaned_response = response_text.strip()
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.startswith("```"):
-            cleaned_response = cleaned_response[3:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
+    if len(rubric_categories) > 8:
+        return False, [], "Rubric should not have more than 8 categories"
 
-        # Parse JSON
-        rubric_categories = json.loads(cleaned_response)
+    # Validate each category and check weights
+    total_weight = 0.0
+    for category in rubric_categories:
+        if not isinstance(category, dict) or not all(
+            key in category for key in ["name", "description", "weight"]
+        ):
+            return (
+                False,
+                [],
+                "Each category must have name, description, and weight",
+            )
 
-        # Validate the rubric
-        if not isinstance(rubric_categories, list):
-            return False, [], "Invalid rubric format: expected a list of categories"
+        if not isinstance(category["weight"], (int, float)):
+            return False, [], f"Invalid weight for category {category['name']}"
 
-        if len(rubric_categories) < 3:
-            return False, [], "Rubric must have at least 3 categories"
+        total_weight += float(category["weight"])
 
-        if len(rubric_categories) > 8:
-            return False, [], "Rubric should not have more than 8 categories"
+    if total_weight <= 0:
+        return False, [], "Category weights must be positive"
 
-        # Validate each category and check weights
-        total_weight = 0.0
+    # Adjust weights if they don't sum to 100 (allow small rounding errors)
+    if abs(total_weight - 100) > 0.1:
+        # Normalize weights to sum to 100
         for category in rubric_categories:
-            if not all(key in category for key in ["name", "description", "weight"]):
-                return (
-                    False,
-                    [],
-                    "Each category must have name, description, and weight",
-                )
+            category["weight"] = round((category["weight"] / total_weight) * 100, 1)
 
-            if not isinstance(category["weight"], (int, float)):
-                return False, [], f"Invalid weight for category {category['name']}"
+    return True, rubric_categories, ""
 
-            total_weight += float(category["weight"])
 
-        # Adjust weights if they don't sum to 100 (allow small rounding errors)
-        if abs(total_weight - 100) > 0.1:
-            # Normalize weights to sum to 100
-            for category in rubric_categories:
-                category["weight"] = round((category["weight"] / total_weight) * 100, 1)
+def _cache_key(model_string: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_string}\0{prompt}".encode()).hexdigest()
 
-        return True, rubric_categories, ""
 
-    except json.JSONDecodeError as e:
-        return False, [], f"Failed to parse AI response as JSON: {e!s}"
-    except Exception as e:
-        return False, [], f"Error generating rubric: {e!s}"
+def _cache_get(key: str) -> Optional[list[dict[str, Any]]]:
+    entry = _prompt_cache.get(key)
+    if entry is None:
+        return None
+    stored_at, categories = entry
+    if time.time() - stored_at > RUBRIC_CACHE_TTL:
+        del _prompt_cache[key]
+        return None
+    _prompt_cache.move_to_end(key)
+    return copy.deepcopy(categories)
+
+
+def _cache_put(key: str, categories: list[dict[str, Any]]) -> None:
+    _prompt_cache[key] = (time.time(), copy.deepcopy(categories))
+    _prompt_cache.move_to_end(key)
+    while len(_prompt_cache) > _PROMPT_CACHE_SIZE:
+        _prompt_cache.popitem(last=False)
+
+
+async def generate_rubric(
+    assignment_title: str,
+    assignment_instructions: str,
+    spec_content: Optional[str],
+    models: list[AIModel],
+) -> tuple[bool, list[dict[str, Any]], str]:
+    """
+    Generate a rubric with the first of ``models`` that produces a valid one.
+
+    Uses the same LiteLLM call parameters as feedback generation (see
+    ``FeedbackGenerator._build_call_params``) through ``litellm.acompletion``,
+    so the event loop stays free while the model works. A rubric already
+    generated for the same prompt and model is served from the prompt cache.
+
+    Returns:
+        Tuple of (success, rubric_categories, error_message)
+    """
+    from app.services.feedback_generator import FeedbackGenerator
+
+    if not models:
+        return (
+            False,
+            [],
+            "No AI models are configured. Add or activate one under AI Models.",
+        )
+
+    prompt = build_rubric_prompt(
+        assignment_title, assignment_instructions, spec_content
+    )
+    messages = [
+        {"role": "system", "content": _SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+    generator = FeedbackGenerator()
+    error_msg = ""
+    for model in models:
+        config = generator._get_model_config(model)
+        params = generator._build_call_params(
+            model, messages, {**config, "max_tokens": 1500}
+        )
+        # A JSON array is expected; OpenAI's JSON mode only allows objects
+        params.pop("response_format", None)
+        key = _cache_key(params["model"], prompt)
+        cached = _cache_get(key)
+        if cached is not None:
+            return True, cached, ""
+        try:
+            response = await litellm.acompletion(
+                **params, timeout=RUBRIC_GENERATION_TIMEOUT
+            )
+            success, categories, error_msg = parse_rubric_response(
+                response.choices[0].message.content or ""
+            )
+        except Exception as e:
+            success, categories = False, []
+            error_msg = f"Error generating rubric: {e!s}"
+        if success:
+            _cache_put(key, categories)
+            return True, categories, ""
+        logger.warning(f"Rubric generation with {params['model']} failed: {error_msg}")
+    return False, [], error_msg
+
+
+# ---------------------------------------------------------------------------
+# Background jobs
+# ---------------------------------------------------------------------------
+
+
+def start_rubric_job(assignment: Any, instructor_email: str) -> str:
+    """
+    Start generating a rubric for ``assignment`` in the background.
+
+    Must be called on the running event loop (i.e. from an async route).
+    Returns the job id to poll with ``get_rubric_job``; an instructor who
+    clicks generate again while a job for the same assignment is still
+    running gets that job back instead of a second model call.
+    """
+    from app.services.feedback_generator import FeedbackGenerator
+
+    _evict_jobs()
+    for job_id, job in _jobs.items():
+        if (
+            job["status"] == "running"
+            and job["assignment_id"] == assignment.id
+            and job["owner"] == instructor_email
+        ):
+            return job_id
+
+    models = FeedbackGenerator()._get_instructor_active_models(instructor_email)
+
+    async def run() -> tuple[bool, list[dict[str, Any]], str]:
+        try:
+            spec_content = await load_spec_text(assignment)
+        except Exception as e:
+            logger.warning(f"Failed to read specification file: {e}")
+            spec_content = None
+        return await asyncio.wait_for(
+            generate_rubric(
+                assignment.title,
+                getattr(assignment, "instructions", None) or assignment.description,
+                spec_content,
+                models,
+            ),
+            timeout=RUBRIC_GENERATION_TIMEOUT,
+        )
+
+    job_id = uuid.uuid4().hex
+    task = asyncio.get_running_loop().create_task(run())
+    _jobs[job_id] = {
+        "task": task,
+        "status": "running",
+        "assignment_id": assignment.id,
+        "owner": instructor_email,
+        "created": time.time(),
+    }
+    task.add_done_callback(lambda t: _finish_job(job_id, t))
+    return job_id
+
+
+def get_rubric_job(job_id: str, instructor_email: str) -> Optional[dict[str, Any]]:
+    """
+    A job's state, or None if it is unknown, expired or not this instructor's.
+
+    ``status`` is 'running', 'done' (with ``categories``), 'error' (with
+    ``error``) or 'cancelled'.
+    """
+    _evict_jobs()
+    job = _jobs.get(job_id)
+    if job is None or job["owner"] != instructor_email:
+        return None
+    view = {
+        "id": job_id,
+        "status": job["status"],
+        "assignment_id": job["assignment_id"],
+    }
+    for key in ("categories", "error"):
+        if key in job:
+            view[key] = job[key]
+    return view
+
+
+def cancel_rubric_job(job_id: str, instructor_email: str) -> bool:
+    """Cancel a running job. Returns False if there was nothing to cancel."""
+    job = _jobs.get(job_id)
+    if job is None or job["owner"] != instructor_email or job["status"] != "running":
+        return False
+    job["task"].cancel()
+    job.update(status="cancelled", finished=time.time())
+    return True
+
+
+def _finish_job(job_id: str, task: asyncio.Task) -> None:
+    job = _jobs.get(job_id)
+    if job is None or job["status"] != "running":
+        return
+    if task.cancelled():
+        job["status"] = "cancelled"
+    elif isinstance(task.exception(), asyncio.TimeoutError):
+        job["status"] = "error"
+        job["error"] = (
+            f"The AI model did not answer within {RUBRIC_GENERATION_TIMEOUT:g}s"
+        )
+    elif task.exception() is not None:
+        job["status"] = "error"
+        job["error"] = f"Error generating rubric: {task.exception()!s}"
+    else:
+        success, categories, error_msg = task.result()
+        if success:
+            job.update(status="done", categories=categories)
+        else:
+            job.update(status="error", error=error_msg)
+    job["finished"] = time.time()
+
+
+def _evict_jobs() -> None:
+    """Forget finished jobs older than ``RUBRIC_JOB_TTL``."""
+    cutoff = time.time() - RUBRIC_JOB_TTL
+    for job_id in [
+        j for j, job in _jobs.items() if job.get("finished", cutoff) < cutoff
+    ]:
+        del _jobs[job_id]
 
 
 def get_rubric_template(template_type: str) -> list[dict[str, Any]]:
@@ -330,16 +582,7 @@ def extract_rubric_from_text(text: str) -> tuple[bool, list[dict[str, Any]], str
         response_text = response.choices[0].message.content
 
         # Clean and parse response
-        cleaned_response = response_text.strip()
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.startswith("```"):
-            cleaned_response = cleaned_response[3:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-        cleaned_response = cleaned_response.strip()
-
-        parsed = json.loads(cleaned_response)
+        parsed = json.loads(_strip_code_fences(response_text))
 
         # Check if it's an error response
         if isinstance(parsed, dict) and "error" in parsed:
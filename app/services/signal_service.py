@@ -7,6 +7,10 @@ score, aggregate, or touch the feedback generator.
 
 Run in the background at submission time, while ``draft.content`` still exists
 (content is cleared after feedback per ADR 002 / 008).
+
+A source whose analyser is down (circuit open, or reported down by the health
+monitor) is skipped at once and queued in ``signal_backfill``;
+``backfill_skipped_signals`` re-extracts those drafts once it is back.
 """
 
 import logging
@@ -15,7 +19,13 @@ from datetime import datetime
 from typing import Any
 
 from app.models.feedback import drafts
-from app.models.signals import Signal, signals
+from app.models.signals import (
+    Signal,
+    SignalBackfill,
+    signal_backfill,
+    signals,
+)
+from app.services import health_monitor
 from app.utils import analyser_client
 from app.utils.db_query import by_id, count, first, where
 
@@ -199,7 +209,8 @@ def extract_signals_for_draft(draft_id: int) -> bool:
     Extract and persist lens signals for a draft. The assignment's assessment
     type picks the sources: essay → document-analyser + cite-sight, code →
     code-analyser. Each source is idempotent and degrades independently — one
-    analyser being down doesn't block the others' signals.
+    analyser being down doesn't block the others' signals, and one the health
+    monitor already reports down is skipped without waiting on its timeout.
 
     Returns True if any source's signals are stored (or already present),
     False otherwise (draft missing, no content, all analysers unreachable).
@@ -230,8 +241,28 @@ def extract_signals_for_draft(draft_id: int) -> bool:
             stored_any = True
             continue
 
+        circuit = analyser_client.breaker(source)
+        skip_reason = (
+            "circuit_open"
+            if circuit.state == analyser_client.OPEN
+            else ("service_down" if health_monitor.is_down(source) else None)
+        )
+        if skip_reason:
+            logger.info(
+                "signal extraction: %s unavailable (%s); deferring draft %s",
+                source,
+                skip_reason,
+                draft_id,
+            )
+            _defer(draft_id, source, skip_reason)
+            continue
+
         flat = extractor(draft)
         if not flat:
+            if circuit.available():
+                _clear_deferred(draft_id, source)  # a real, empty answer
+            else:
+                _defer(draft_id, source, "request_failed")
             logger.warning(
                 "signal extraction: no %s signals for draft %s (analyser down "
                 "or unsupported submission?)",
@@ -257,11 +288,82 @@ def extract_signals_for_draft(draft_id: int) -> bool:
             source,
             draft_id,
         )
+        _clear_deferred(draft_id, source)
         stored_any = True
 
     return stored_any
 
 
+def _defer(draft_id: int, source: str, reason: str) -> None:
+    """Queue a skipped source for ``backfill_skipped_signals``."""
+    row = first(signal_backfill, draft_id=draft_id, source=source)
+    if row is None:
+        signal_backfill.insert(
+            SignalBackfill(
+                draft_id=draft_id,
+                source=source,
+                reason=reason,
+                attempts=0,
+                created_at=datetime.now().isoformat(),
+            )
+        )
+    else:
+        signal_backfill.update({"reason": reason}, pk_values=row.id)
+
+
+def _clear_deferred(draft_id: int, source: str) -> None:
+    row = first(signal_backfill, draft_id=draft_id, source=source)
+    if row is not None:
+        signal_backfill.delete(row.id)
+
+
+def _unavailable(source: str) -> bool:
+    return analyser_client.breaker(
+        source
+    ).state == analyser_client.OPEN or health_monitor.is_down(source)
+
+
+def backfill_skipped_signals(limit: int = 50) -> int:
+    """Re-extract drafts whose sources were skipped while an analyser was down.
+
+    Drafts are taken oldest first; one whose skipped analysers are all still
+    unavailable is left for the next run. Entries for drafts that are gone or
+    whose content has since been cleared are dropped — there is nothing left
+    to analyse. Returns how many drafts gained signals.
+    """
+    pending: dict[int, list[Any]] = {}
+    for row in signal_backfill(order_by="id"):
+        pending.setdefault(row.draft_id, []).append(row)
+
+    # Skip still-unavailable drafts before taking ``limit``, so a backlog for
+    # an analyser that is still down can't starve drafts for one that's back.
+    ready = [
+        (draft_id, rows)
+        for draft_id, rows in pending.items()
+        if not all(_unavailable(r.source) for r in rows)
+    ]
+    done = 0
+    for draft_id, rows in ready[:limit]:
+        draft = by_id(drafts, draft_id)
+        if draft is None or not (getattr(draft, "content", "") or "").strip():
+            for r in rows:
+                signal_backfill.delete(r.id)
+            continue
+        now = datetime.now().isoformat()
+        for r in rows:
+            signal_backfill.update(
+                {"attempts": (r.attempts or 0) + 1, "last_attempt_at": now},
+                pk_values=r.id,
+            )
+        before = count(signals, draft_id=draft_id)
+        extract_signals_for_draft(draft_id)
+        if count(signals, draft_id=draft_id) > before:
+            done += 1
+    if done:
+        logger.info("signal backfill: re-extracted signals for %d draft(s)", done)
+    return done
+
+
 def get_signals_for_draft(draft_id: int) -> list[Signal]:
     """Return stored signals for a draft (read side, used by the instructor view)."""
     return where(signals, draft_id=draft_id)
@@ -0,0 +1,172 @@
+"""
+Row sources for the instructor submission exports (CSV and feedback ZIP).
+
+Drafts are read in keyset batches (``EXPORT_BATCH_SIZE`` drafts at a time,
+``id > last id``) from one ``drafts JOIN assignments LEFT JOIN
+aggregated_feedback`` query, so each draft arrives with its per-category
+scores and no per-draft lookups are needed. Rows are yielded one draft at a
+time: memory stays flat however large the cohort, and no cursor is held open
+between batches while the response streams.
+
+The overall ``score`` is the category scores weighted by rubric weight
+(``progress_analyzer.weighted_score``); a draft without feedback has
+``None``. ``iter_feedback_rows`` does the same over the full feedback rows
+(text, status, reviewer) with their category names joined in, for the
+per-draft Markdown files of the feedback ZIP.
+"""
+
+import json
+from collections.abc import Iterator
+from itertools import groupby
+from operator import itemgetter
+from types import SimpleNamespace
+from typing import Any, Optional
+
+from app.models.assignment import assignments, rubric_categories, rubrics
+from app.models.feedback import drafts
+from app.services.progress_analyzer import weighted_score
+from app.utils.db_query import where
+
+EXPORT_BATCH_SIZE = 500
+
+_BATCH_SQL = """
+    SELECT d.id, d.assignment_id, a.title, d.student_email, d.version, d.status,
+           d.submission_date, af.category_id, af.aggregated_score
+    FROM (
+        SELECT * FROM drafts
+        WHERE assignment_id IN (SELECT value FROM json_each(?)) AND id > ?
+        ORDER BY id
+        LIMIT ?
+    ) d
+    JOIN assignments a ON a.id = d.assignment_id
+    LEFT JOIN aggregated_feedback af ON af.draft_id = d.id
+    ORDER BY d.id
+"""
+
+
+_FEEDBACK_BATCH_SQL = """
+    SELECT d.id, d.student_email, d.version, d.submission_date,
+           af.category_id, af.aggregated_score, af.feedback_text, af.status,
+           af.release_date, af.edited_by_instructor, af.instructor_email,
+           rc.name
+    FROM (
+        SELECT * FROM drafts
+        WHERE assignment_id = ? AND id > ?
+        ORDER BY id
+        LIMIT ?
+    ) d
+    LEFT JOIN aggregated_feedback af ON af.draft_id = d.id
+    LEFT JOIN rubric_categories rc ON rc.id = af.category_id
+    ORDER BY d.id, af.id
+"""
+
+
+def course_assignment_ids(course_id: int) -> list[int]:
+    return [a.id for a in where(assignments, course_id=course_id)]
+
+
+def _categories(assignment_ids: list[int]) -> list[Any]:
+    found = []
+    for assignment_id in assignment_ids:
+        for rubric in where(rubrics, assignment_id=assignment_id):
+            found.extend(where(rubric_categories, rubric_id=rubric.id))
+    return found
+
+
+def category_columns(assignment_ids: list[int]) -> list[str]:
+    """Category names across the assignments' rubrics, first-seen order."""
+    return list(dict.fromkeys(c.name for c in _categories(assignment_ids)))
+
+
+def iter_export_rows(
+    assignment_ids: list[int], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[tuple[Any, Optional[float], dict[str, float]]]:
+    """``(draft, score, {category name: score})`` per draft, in id order.
+
+    ``draft`` carries ``id, assignment_id, assignment_title, student_email,
+    version, status, submission_date``.
+    """
+    categories = {c.id: c for c in _categories(assignment_ids)}
+    weights = {cid: float(c.weight or 0) for cid, c in categories.items()}
+    ids_json = json.dumps(assignment_ids)
+    last_id = 0
+    while True:
+        batch = list(drafts.db.execute(_BATCH_SQL, [ids_json, last_id, batch_size]))
+        if not batch:
+            return
+        for _, group in groupby(batch, key=itemgetter(0)):
+            rows = list(group)
+            head = rows[0]
+            draft = SimpleNamespace(
+                id=head[0],
+                assignment_id=head[1],
+                assignment_title=head[2],
+                student_email=head[3],
+                version=head[4],
+                status=head[5],
+                submission_date=head[6],
+            )
+            scores = {row[7]: float(row[8]) for row in rows if row[8] is not None}
+            yield _export_row(draft, scores, categories, weights)
+        last_id = batch[-1][0]
+
+
+def _export_row(
+    draft: SimpleNamespace,
+    scores: dict[int, float],
+    categories: dict[int, Any],
+    weights: dict[int, float],
+) -> tuple[Any, Optional[float], dict[str, float]]:
+    by_name = {
+        categories[cid].name if cid in categories else f"Category {cid}": score
+        for cid, score in scores.items()
+    }
+    overall = weighted_score(scores, weights) if scores else None
+    return draft, overall, by_name
+
+
+def iter_feedback_rows(
+    assignment_id: int, batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[tuple[Any, list[Any], dict[int, str]]]:
+    """``(draft, aggregated_rows, {category id: name})`` per draft, in id order.
+
+    The arguments ``markdown_export.build_feedback_markdown`` takes for one
+    draft: ``draft`` carries ``id, student_email, version, submission_date``
+    and each aggregated row the ``AggregatedFeedback`` fields it reads.
+    """
+    last_id = 0
+    while True:
+        batch = list(
+            drafts.db.execute(_FEEDBACK_BATCH_SQL, [assignment_id, last_id, batch_size])
+        )
+        if not batch:
+            return
+        for _, group in groupby(batch, key=itemgetter(0)):
+            joined = list(group)
+            head = joined[0]
+            draft = SimpleNamespace(
+                id=head[0],
+                student_email=head[1],
+                version=head[2],
+                submission_date=head[3],
+            )
+            rows: list[Any] = []
+            names: dict[int, str] = {}
+            for row in joined:
+                if row[4] is None and row[5] is None:
+                    continue  # LEFT JOIN: draft without feedback
+                rows.append(
+                    SimpleNamespace(
+                        category_id=row[4],
+                        aggregated_score=row[5] or 0.0,
+                        feedback_text=row[6],
+                        status=row[7],
+                        release_date=row[8],
+                        edited_by_instructor=bool(row[9]),
+                        instructor_email=row[10],
+                    )
+                )
+                if row[11] is not None:
+                    names[row[4]] = row[11]
+            yield draft, rows, names
+        last_id = batch[-1][0]
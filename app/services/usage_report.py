@@ -4,6 +4,8 @@ LLM usage / cost reporting (Phase 3).
 Rolls up the per-run token counts and cost captured on ``model_runs`` (see
 ``feedback_generator._extract_usage``) into per-assignment and per-course
 totals — answering "what does this cost per cohort". Pure read-side; no network.
+``cached_tokens`` (the part of ``input_tokens`` served from a provider prompt
+cache) shows what the shared rubric prefix saves.
 
 Only real LLM runs are counted (``model_id > 0``): the signal-engine sentinel
 (``-1``) and mock runs (``0``) carry no token cost.
@@ -22,12 +24,19 @@ def _is_llm_run(run: Any) -> bool:
 
 
 def _blank() -> dict[str, Any]:
-    return {"llm_runs": 0, "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0}
+    return {
+        "llm_runs": 0,
+        "input_tokens": 0,
+        "cached_tokens": 0,
+        "output_tokens": 0,
+        "cost_usd": 0.0,
+    }
 
 
 def _accumulate(acc: dict[str, Any], run: Any) -> None:
     acc["llm_runs"] += 1
     acc["input_tokens"] += int(getattr(run, "input_tokens", 0) or 0)
+    acc["cached_tokens"] += int(getattr(run, "cached_tokens", 0) or 0)
     acc["output_tokens"] += int(getattr(run, "output_tokens", 0) or 0)
     acc["cost_usd"] += float(getattr(run, "cost_usd", 0.0) or 0.0)
 
@@ -10,11 +10,18 @@ Endpoint choice (verified 2026-05-24): we POST already-extracted text to
 ``/text`` rather than uploading the file to ``/analyse``. FeedForward already
 extracts text in ``file_handlers.py``, and ``/text`` returns the richer signal
 set (readability + writing quality + vocabulary + NER).
+
+Each analyser sits behind a ``CircuitBreaker``: once it has failed
+``ANALYSER_BREAKER_THRESHOLD`` times in a row, calls return ``None``
+immediately for ``ANALYSER_BREAKER_COOLDOWN`` seconds instead of every
+submission waiting out a connection or read timeout.
 """
 
 import contextlib
 import logging
 import os
+import threading
+import time
 from typing import Any, Optional
 
 import requests
@@ -30,6 +37,143 @@ _DEFAULT_TIMEOUT = float(os.environ.get("DOCUMENT_ANALYSER_TIMEOUT", "60"))
 # (~0.4s per reference plus URL checks) — needs much more headroom.
 _CITE_TIMEOUT = float(os.environ.get("CITE_SIGHT_TIMEOUT", "180"))
 
+# Circuit breaker: after this many consecutive outage failures (connection
+# error, timeout, HTTP 5xx) an analyser is skipped for the cool-down, then one
+# trial call decides whether it is back.
+BREAKER_THRESHOLD = int(os.environ.get("ANALYSER_BREAKER_THRESHOLD", "3"))
+BREAKER_COOLDOWN = float(os.environ.get("ANALYSER_BREAKER_COOLDOWN", "60"))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """Per-analyser circuit breaker (closed → open → half-open → closed).
+
+    Closed: calls go through; consecutive outage failures are counted.
+    Open: calls are refused until ``cooldown`` seconds after the last failure.
+    Half-open: a single trial call is let through; success closes the circuit,
+    failure re-opens it for another cool-down. Thread-safe — signal extraction
+    runs in worker threads.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: Optional[int] = None,
+        cooldown: Optional[float] = None,
+    ):
+        self.name = name
+        self.threshold = BREAKER_THRESHOLD if threshold is None else threshold
+        self.cooldown = BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.failures = 0  # consecutive, reset by any success
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._cooled_down():
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (claims the half-open trial)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and not self._cooled_down():
+                return False
+            if self._trial_running:
+                return False
+            self._state = HALF_OPEN
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("%s answered again; circuit closed", self.name)
+            self._state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or self.failures >= self.threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        "%s failing; circuit open for %gs", self.name, self.cooldown
+                    )
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+
+    def available(self) -> bool:
+        """True when closed and the last call did not fail — i.e. an empty
+        result from this analyser was a real answer, not an outage."""
+        with self._lock:
+            return self._state == CLOSED and self.failures == 0
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.cooldown
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def breaker(name: str) -> CircuitBreaker:
+    """The circuit breaker for an analyser, created on first use."""
+    with _BREAKERS_LOCK:
+        if name not in _BREAKERS:
+            _BREAKERS[name] = CircuitBreaker(name)
+        return _BREAKERS[name]
+
+
+def reset_breakers() -> None:
+    """Forget every breaker's state (tests, or after a redeploy)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
+
+
+def _post(
+    service: str, url: str, timeout: float, **kwargs: Any
+) -> Optional[dict[str, Any]]:
+    """POST through the service's circuit breaker; parsed JSON or ``None``.
+
+    Outages (connection errors, timeouts, 5xx) count against the breaker;
+    a 4xx or invalid JSON means the service is up but rejected this input.
+    """
+    circuit = breaker(service)
+    if not circuit.allow():
+        logger.info("%s circuit open; skipping %s", service, url)
+        return None
+    try:
+        resp = requests.post(url, timeout=timeout, **kwargs)
+        resp.raise_for_status()
+    except requests.HTTPError as e:
+        status = e.response.status_code if e.response is not None else 500
+        if status >= 500:
+            circuit.record_failure()
+        else:
+            circuit.record_success()
+        logger.warning("%s %s request failed: %s", service, url, e)
+        return None
+    except requests.RequestException as e:
+        circuit.record_failure()
+        logger.warning("%s %s request failed: %s", service, url, e)
+        return None
+    circuit.record_success()
+    try:
+        result: dict[str, Any] = resp.json()
+        return result
+    except ValueError as e:  # JSON decode error
+        logger.warning("%s %s returned invalid JSON: %s", service, url, e)
+        return None
+
 
 def _base_url() -> str:
     """Base URL of the document-analyser service (override with DOCUMENT_ANALYSER_URL)."""
@@ -115,21 +259,12 @@ def analyse_text(
     """
     if not text or not text.strip():
         return None
-    try:
-        resp = requests.post(
-            f"{_base_url()}/text",
-            json={"text": text},
-            timeout=timeout,
-        )
-        resp.raise_for_status()
-        result: dict[str, Any] = resp.json()
-        return result
-    except requests.RequestException as e:
-        logger.warning("document-analyser /text request failed: %s", e)
-        return None
-    except ValueError as e:  # JSON decode error
-        logger.warning("document-analyser /text returned invalid JSON: %s", e)
-        return None
+    return _post(
+        "document-analyser",
+        f"{_base_url()}/text",
+        timeout,
+        json={"text": text},
+    )
 
 
 def analyse_code(
@@ -144,21 +279,12 @@ def analyse_code(
     """
     if not content or not content.strip():
         return None
-    try:
-        resp = requests.post(
-            f"{_code_base_url()}/analyse",
-            files={"file": (filename, content.encode("utf-8"), "text/plain")},
-            timeout=timeout,
-        )
-        resp.raise_for_status()
-        result: dict[str, Any] = resp.json()
-        return result
-    except requests.RequestException as e:
-        logger.warning("code-analyser /analyse request failed: %s", e)
-        return None
-    except ValueError as e:  # JSON decode error
-        logger.warning("code-analyser /analyse returned invalid JSON: %s", e)
-        return None
+    return _post(
+        "code-analyser",
+        f"{_code_base_url()}/analyse",
+        timeout,
+        files={"file": (filename, content.encode("utf-8"), "text/plain")},
+    )
 
 
 def analyse_citations(
@@ -181,27 +307,18 @@ def analyse_citations(
     if verify is None:
         verify = cite_verification_enabled()
     flag = "true" if verify else "false"
-    try:
-        resp = requests.post(
-            f"{_cite_base_url()}/analyse",
-            files={"file": ("submission.txt", text.encode("utf-8"), "text/plain")},
-            data={
-                "citationStyle": "auto",
-                "checkUrls": flag,
-                "checkDoi": flag,
-                "checkInText": "true",
-            },
-            timeout=timeout,
-        )
-        resp.raise_for_status()
-        result: dict[str, Any] = resp.json()
-        return result
-    except requests.RequestException as e:
-        logger.warning("cite-sight /analyse request failed: %s", e)
-        return None
-    except ValueError as e:  # JSON decode error
-        logger.warning("cite-sight /analyse returned invalid JSON: %s", e)
-        return None
+    return _post(
+        "cite-sight",
+        f"{_cite_base_url()}/analyse",
+        timeout,
+        files={"file": ("submission.txt", text.encode("utf-8"), "text/plain")},
+        data={
+            "citationStyle": "auto",
+            "checkUrls": flag,
+            "checkDoi": flag,
+            "checkInText": "true",
+        },
+    )
 
 
 def analyse_sentiment(
@@ -216,18 +333,9 @@ def analyse_sentiment(
     """
     if not text or not text.strip():
         return None
-    try:
-        resp = requests.post(
-            f"{_base_url()}/semantic/sentiment",
-            json={"text": text},
-            timeout=timeout,
-        )
-        resp.raise_for_status()
-        result: dict[str, Any] = resp.json()
-        return result
-    except requests.RequestException as e:
-        logger.warning("document-analyser /semantic/sentiment request failed: %s", e)
-        return None
-    except ValueError as e:  # JSON decode error
-        logger.warning("document-analyser /semantic/sentiment invalid JSON: %s", e)
-        return None
+    return _post(
+        "document-analyser",
+        f"{_base_url()}/semantic/sentiment",
+        timeout,
+        json={"text": text},
+    )
@@ -2,6 +2,7 @@
 Authentication utility functions
 """
 
+import os
 import re
 from datetime import datetime, timedelta
 
@@ -10,6 +11,11 @@ from passlib.context import CryptContext
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Lifetimes of single-use links: email verification, and the student join
+# links instructors hand out (longer — they travel through an LMS).
+VERIFICATION_TOKEN_HOURS = int(os.environ.get("VERIFICATION_TOKEN_HOURS", "72"))
+INVITE_TOKEN_HOURS = int(os.environ.get("INVITE_TOKEN_HOURS", str(14 * 24)))
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -4,19 +4,24 @@ CSV builders for instructor exports.
 Kept separate from the route module so unit tests don't drag in the FastHTML
 app initialisation (which requires ``.env`` at import time). Each function
 takes the rows it needs and returns a CSV string — the caller wraps it in a
-Starlette ``Response`` with ``Content-Disposition``.
+Starlette ``Response`` with ``Content-Disposition``. ``iter_submissions_csv``
+yields its CSV in chunks instead, for a ``StreamingResponse``.
 """
 
 from __future__ import annotations
 
 import csv
 import io
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 SUBMISSION_FIELDS = ["student_email", "version", "status", "submission_date", "score"]
 
 
+ASSIGNMENT_FIELDS = ["assignment_id", "assignment_title"]
+_FLUSH_ROWS = 200  # rows per streamed chunk
+
+
 def build_submissions_csv(rows: Iterable[tuple[Any, float | None]]) -> str:
     """CSV body for the per-assignment "Export Data" download.
 
@@ -24,17 +29,96 @@ def build_submissions_csv(rows: Iterable[tuple[Any, float | None]]) -> str:
     score is the aggregated 0-100 across rubric categories; ``None`` renders as
     an empty cell so spreadsheets can distinguish "no feedback yet" from "zero".
     """
+    return "".join(iter_submissions_csv((draft, score, {}) for draft, score in rows))
+
+
+def iter_submissions_csv(
+    rows: Iterable[tuple[Any, float | None, dict[str, float]]],
+    categories: Iterable[str] = (),
+    with_assignment: bool = False,
+) -> Iterator[str]:
+    """Streamed ``build_submissions_csv``: yields the CSV in chunks.
+
+    Each row also carries ``{category name: score}``, written as one column
+    per name in ``categories`` after the overall score. ``with_assignment``
+    prefixes every row with the draft's ``assignment_id`` and
+    ``assignment_title`` (whole-course exports). Only ``_FLUSH_ROWS`` rows
+    are buffered at a time.
+    """
+    categories = list(categories)
     buf = io.StringIO()
     writer = csv.writer(buf)
-    writer.writerow(SUBMISSION_FIELDS)
-    for draft, score in rows:
+    writer.writerow(
+        (ASSIGNMENT_FIELDS if with_assignment else []) + SUBMISSION_FIELDS + categories
+    )
+    for i, (draft, score, category_scores) in enumerate(rows, start=1):
+        prefix = (
+            [getattr(draft, f, "") for f in ASSIGNMENT_FIELDS]
+            if with_assignment
+            else []
+        )
         writer.writerow(
-            [
+            prefix
+            + [
                 getattr(draft, "student_email", ""),
                 getattr(draft, "version", ""),
                 getattr(draft, "status", ""),
                 getattr(draft, "submission_date", ""),
-                f"{score:.1f}" if score is not None else "",
+                _score_cell(score),
             ]
+            + [_score_cell(category_scores.get(name)) for name in categories]
         )
+        if i % _FLUSH_ROWS == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def _score_cell(score: float | None) -> str:
+    return f"{score:.1f}" if score is not None else ""
+
+
+COHORT_FIELDS = [
+    "section",
+    "category",
+    "drafts",
+    "students",
+    "mean",
+    "p10",
+    "p25",
+    "p50",
+    "p75",
+    "p90",
+]
+
+
+def build_cohort_csv(analytics: dict[str, Any]) -> str:
+    """CSV body for the cohort progression download.
+
+    ``analytics`` is ``cohort_analytics.cohort_analytics(...)``. One row per
+    band: ``score`` rows for a draft version (``drafts`` = ``"2"``), ``change``
+    rows between two versions (``"1->2"``) and ``first_to_latest`` rows for
+    each student's first → latest change. Empty bands have empty cells.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COHORT_FIELDS)
+
+    def write(section: str, category: str, drafts: str, band: dict) -> None:
+        stats = [band[k] for k in ("mean", "p10", "p25", "p50", "p75", "p90")]
+        writer.writerow(
+            [section, category, drafts, band["n"]]
+            + ["" if v is None else f"{v:.1f}" for v in stats]
+        )
+
+    for row in analytics["bands"]:
+        write("score", row["category"], str(row["version"]), row)
+    for row in analytics["deltas"]:
+        drafts = f"{row['from_version']}->{row['to_version']}"
+        write("change", row["category"], drafts, row)
+    write("first_to_latest", "Overall", "first->latest", analytics["improvement"])
+    for row in analytics["category_improvement"]:
+        write("first_to_latest", row["category"], "first->latest", row)
     return buf.getvalue()
@@ -12,10 +12,13 @@ comprehension. This module gives those patterns names and a uniform surface:
 - ``first(table, **filters)`` — first such row, or ``None``.
 - ``count(table, **filters)`` — how many rows match.
 
-Behaviour for non-PK filters is unchanged from the inlined comprehensions: a
-Python-side scan over ``table()``. That's deliberate — the win here is the
-seam, not performance. Once the seam is in place, switching ``where`` to a
-fastlite-native SQL ``where=`` is a one-file change.
+Non-PK filters compile to a fastlite-native SQL ``WHERE`` (``col = ?`` joined
+with ``AND``; ``None`` becomes ``IS NULL``), so SQLite does the filtering and
+only matching rows are built into dataclasses. Rows come back in ``rowid``
+order — the same order the original ``table()`` scans produced (which is not
+primary-key order for text keys such as ``users.email``). A filter on a
+column the table doesn't have matches nothing (or everything, for ``None``),
+mirroring the old ``getattr(row, k, None) == v`` semantics.
 """
 
 from typing import Any, Optional
@@ -31,20 +34,56 @@ def by_id(table: Any, pk: Any) -> Optional[Any]:
         return None
 
 
-def _matches(row: Any, filters: dict[str, Any]) -> bool:
-    return all(getattr(row, k, None) == v for k, v in filters.items())
+def _compile(table: Any, filters: dict[str, Any]) -> Optional[tuple[str, list]]:
+    """Build ``(where_sql, args)`` for equality filters.
+
+    Returns ``None`` when a filter can never match (an unknown column compared
+    to a non-``None`` value), letting callers skip the query entirely.
+    """
+    columns = table.columns_dict
+    clauses: list[str] = []
+    args: list[Any] = []
+    for key, value in filters.items():
+        if key not in columns:
+            if value is None:
+                continue  # getattr(row, key, None) is None for every row
+            return None
+        if value is None:
+            clauses.append(f"[{key}] IS NULL")
+        else:
+            clauses.append(f"[{key}] = ?")
+            args.append(value)
+    return " AND ".join(clauses), args
+
+
+# Insertion (rowid) order, as an unordered ``table()`` scan returns rows
+_ORDER_BY = "rowid"
 
 
 def where(table: Any, **filters: Any) -> list[Any]:
     """Every row matching every keyword filter by equality (order preserved)."""
-    return [r for r in table() if _matches(r, filters)]
+    compiled = _compile(table, filters)
+    if compiled is None:
+        return []
+    sql, args = compiled
+    rows: list[Any] = table(where=sql or None, where_args=args, order_by=_ORDER_BY)
+    return rows
 
 
 def first(table: Any, **filters: Any) -> Optional[Any]:
     """First row matching every keyword filter by equality, or ``None``."""
-    return next((r for r in table() if _matches(r, filters)), None)
+    compiled = _compile(table, filters)
+    if compiled is None:
+        return None
+    sql, args = compiled
+    rows = table(where=sql or None, where_args=args, order_by=_ORDER_BY, limit=1)
+    return rows[0] if rows else None
 
 
 def count(table: Any, **filters: Any) -> int:
     """Count of rows matching every keyword filter by equality."""
-    return sum(1 for r in table() if _matches(r, filters))
+    compiled = _compile(table, filters)
+    if compiled is None:
+        return 0
+    sql, args = compiled
+    return int(table.count_where(sql or "1", args))
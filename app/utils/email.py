@@ -1,5 +1,18 @@
 """
 Email utility functions for sending emails and generating tokens
+
+All mail goes through one long-lived SMTP session (``SMTPConnection``) that
+is opened, secured and authenticated once and reused until it has been idle
+for ``SMTP_IDLE_TIMEOUT`` seconds, instead of a new connection + STARTTLS +
+login per message.
+
+Account emails sent in the background are queued in the ``email_outbox``
+table (``queue_email``) and delivered by a single worker thread, so a wave of
+registrations or password resets becomes one SMTP session working through a
+queue rather than dozens of parallel ones. A failed delivery is retried with
+exponential backoff (``EMAIL_RETRY_BACKOFF`` seconds, doubling) up to
+``EMAIL_MAX_ATTEMPTS`` times; rejected recipients are not retried. Queued
+rows survive a restart and are picked up when the app starts.
 """
 
 import logging
@@ -8,7 +21,10 @@ import pathlib
 import secrets
 import smtplib
 import threading
+import time
+from datetime import datetime, timedelta
 from email.message import EmailMessage
+from typing import Optional
 
 from dotenv import load_dotenv
 
@@ -47,6 +63,14 @@ SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
 SMTP_USER = os.environ.get("SMTP_USER", "")
 SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
 SMTP_FROM = os.environ.get("SMTP_FROM", "")
+# Set to false only for a local relay that does not offer STARTTLS
+SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true").lower() != "false"
+SMTP_TIMEOUT = 30  # seconds per SMTP command
+SMTP_IDLE_TIMEOUT = float(os.environ.get("SMTP_IDLE_TIMEOUT", "60"))
+
+# Outbound queue retries
+EMAIL_MAX_ATTEMPTS = int(os.environ.get("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BACKOFF = float(os.environ.get("EMAIL_RETRY_BACKOFF", "30"))
 
 # Use these settings for local SMTP if AWS SES isn't working yet
 # SMTP_SERVER   = "mail.borck.me"
@@ -74,30 +98,263 @@ APP_DOMAIN = os.environ.get("APP_DOMAIN", "https://feedforward.serveur.au:5001")
 
 # Email sending is done via SMTP only
 
+# Per-message rejections: the server reset the transaction, so the session is
+# still usable for the next message.
+_MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+)
 
-def send_email_async(send_fn, *args) -> None:
-    """Fire-and-forget email send on a daemon thread.
 
-    Account emails (verification, password reset) are sent out-of-band so
-    request timing never reveals whether an address exists, and requests
-    don't block on SMTP. Failures are logged by the send function itself.
+def _is_permanent(e: Exception) -> bool:
+    """Only a 5xx rejection of the recipients is final; a 4xx is "try later"."""
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        return bool(e.recipients) and all(
+            code >= 500 for code, _ in e.recipients.values()
+        )
+    return False
+
+
+def _stops_round(e: Exception) -> bool:
+    """True when the next messages would fail the same way: the server is
+    unreachable or refuses our sender. Recipient refusals (4xx or 5xx) are
+    about that one message, so the round carries on."""
+    if isinstance(e, smtplib.SMTPSenderRefused):
+        return True
+    return not isinstance(e, _MESSAGE_ERRORS)
+
+
+class SMTPConnection:
+    """One authenticated SMTP session, reused across messages. Thread-safe."""
+
+    def __init__(self) -> None:
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, msg: EmailMessage) -> None:
+        """Send one message, (re)connecting if needed. Raises on failure."""
+        with self._lock:
+            self._close_if_idle_locked()
+            try:
+                try:
+                    self._connect_locked().send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    # The server dropped a session we still held; retry once
+                    self._close_locked()
+                    self._connect_locked().send_message(msg)
+            except _MESSAGE_ERRORS:
+                self._last_used = time.monotonic()
+                raise
+            except Exception:
+                self._close_locked()
+                raise
+            self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        with self._lock:
+            self._close_if_idle_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _connect_locked(self) -> smtplib.SMTP:
+        if self._server is not None:
+            return self._server
+        # Use SMTP_SSL for port 465, regular SMTP with STARTTLS for other ports
+        if SMTP_PORT == 465:
+            logger.debug("Using SMTP_SSL connection")
+            server: smtplib.SMTP = smtplib.SMTP_SSL(
+                SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT
+            )
+        else:
+            logger.debug("Using SMTP with STARTTLS")
+            server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+            if SMTP_USE_TLS:
+                server.starttls()
+        try:
+            # Set debug level for verbose logging if needed
+            if os.environ.get("SMTP_DEBUG", "0") == "1":
+                server.set_debuglevel(1)
+            if SMTP_USER:
+                server.login(SMTP_USER, SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        logger.debug(f"SMTP session opened to {SMTP_SERVER}:{SMTP_PORT}")
+        self._server = server
+        self._last_used = time.monotonic()
+        return server
+
+    def _close_if_idle_locked(self) -> None:
+        if (
+            self._server is not None
+            and time.monotonic() - self._last_used > SMTP_IDLE_TIMEOUT
+        ):
+            self._close_locked()
+
+    def _close_locked(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+
+_connection = SMTPConnection()
+
+_wake = threading.Event()
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+_worker_lock = threading.Lock()
+
+
+def queue_email(to_email: str, subject: str, content: str) -> bool:
     """
-    threading.Thread(target=send_fn, args=args, daemon=True).start()
+    Queue an email for the background mail worker
 
-
-def send_verification_email(user_email: str, token: str) -> tuple[bool, str]:
+    Returns:
+        bool: False if SMTP is not configured (nothing is queued)
     """
-    Send an email verification link to the user
+    from app.models.outbox import OutboxEmail, email_outbox
 
-    Args:
-        user_email: The user's email address
-        token: The verification token
+    if not SMTP_SERVER:
+        logger.error("SMTP is not configured (SMTP_SERVER unset) — cannot send email")
+        return False
+    now = datetime.now().isoformat()
+    email_outbox.insert(
+        OutboxEmail(
+            to_email=to_email,
+            subject=subject,
+            content=content,
+            status="queued",
+            attempts=0,
+            last_error="",
+            created_at=now,
+            next_attempt_at=now,
+        )
+    )
+    start_mail_worker()
+    _wake.set()
+    return True
+
+
+def deliver_due(limit: int = 50) -> float:
+    """
+    Deliver queued emails that are due, over the shared SMTP session
 
     Returns:
-        tuple: (success, message)
-            - success: True if the email was sent successfully, False otherwise
-            - message: Success message or error details
+        float: seconds until the worker should look again
     """
+    from app.models.outbox import email_outbox
+
+    now = datetime.now()
+    due = email_outbox(
+        where="status = ? AND next_attempt_at <= ?",
+        where_args=["queued", now.isoformat()],
+        order_by="id",
+        limit=limit,
+    )
+    for row in due:
+        try:
+            _connection.send(_build_message(row.to_email, row.subject, row.content))
+        except Exception as e:
+            attempts = row.attempts + 1
+            error_msg = _describe_error(e)
+            failed = _is_permanent(e) or attempts >= EMAIL_MAX_ATTEMPTS
+            delay: float = EMAIL_RETRY_BACKOFF * 2 ** (attempts - 1)
+            email_outbox.update(
+                {
+                    "status": "failed" if failed else "queued",
+                    "attempts": attempts,
+                    "last_error": error_msg,
+                    "next_attempt_at": (now + timedelta(seconds=delay)).isoformat(),
+                },
+                pk_values=row.id,
+            )
+            logger.error(
+                f"EMAIL ERROR: to {row.to_email} (attempt {attempts}): {error_msg}"
+                + ("; giving up" if failed else f"; retrying in {delay:g}s")
+            )
+            if _stops_round(e):
+                # The rest of the batch would fail too: back off as a whole
+                return max(delay, 1.0)
+            continue
+        email_outbox.delete(row.id)
+    if len(due) == limit:
+        return 0.0
+    upcoming = email_outbox(
+        where="status = ?", where_args=["queued"], order_by="next_attempt_at", limit=1
+    )
+    if not upcoming:
+        return SMTP_IDLE_TIMEOUT
+    next_at = datetime.fromisoformat(upcoming[0].next_attempt_at)
+    return min(max((next_at - datetime.now()).total_seconds(), 0.0), SMTP_IDLE_TIMEOUT)
+
+
+def start_mail_worker() -> None:
+    """Start the mail worker thread if it is not running. Idempotent."""
+    global _worker
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _worker = threading.Thread(target=_worker_loop, name="mail-outbox", daemon=True)
+        _worker.start()
+
+
+def stop_mail_worker(timeout: float = 5.0) -> None:
+    """Stop the mail worker and close the SMTP session (app shutdown).
+
+    Mail still queued stays in the outbox for the next start.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is not None:
+            _stop.set()
+            _wake.set()
+            _worker.join(timeout)
+            _worker = None
+            _stop.clear()
+    _connection.close()
+
+
+def _worker_loop() -> None:
+    while not _stop.is_set():
+        _wake.clear()
+        _connection.close_if_idle()
+        try:
+            wait = deliver_due()
+        except Exception as e:  # keep the worker alive whatever one round does
+            logger.error(f"Mail worker round failed: {e}")
+            wait = EMAIL_RETRY_BACKOFF
+        _wake.wait(timeout=wait)
+
+
+def _build_message(to_email: str, subject: str, content: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg.set_content(content)
+    msg["Subject"] = subject
+    msg["From"] = SMTP_FROM
+    msg["To"] = to_email
+    return msg
+
+
+def _describe_error(e: Exception) -> str:
+    if isinstance(e, ConnectionRefusedError):
+        return "Connection refused. Please check if the SMTP server is reachable."
+    if isinstance(e, smtplib.SMTPAuthenticationError):
+        return "Authentication failed. Please check SMTP username and password."
+    if isinstance(e, smtplib.SMTPException):
+        return f"SMTP error: {e!s}"
+    return f"Failed to send email via SMTP: {e!s}"
+
+
+def verification_message(token: str) -> tuple[str, str]:
+    """Subject and body of the email verification message."""
     verify_link = f"{APP_DOMAIN}/verify?token={token}"
     subject = "Verify Your FeedForward Account"
     content = f"""
@@ -112,12 +369,33 @@ If you did not sign up for FeedForward, you can safely ignore this email.
 Best regards,
 The FeedForward Team
 """
+    return subject, content
+
+
+def send_verification_email(user_email: str, token: str) -> tuple[bool, str]:
+    """
+    Send an email verification link to the user
 
+    Args:
+        user_email: The user's email address
+        token: The verification token
+
+    Returns:
+        tuple: (success, message)
+            - success: True if the email was sent successfully, False otherwise
+            - message: Success message or error details
+    """
     # Log debugging information
     logger.info(f"Sending verification email to {user_email}")
 
     # We always use SMTP
-    return send_with_smtp(user_email, subject, content)
+    return send_with_smtp(user_email, *verification_message(token))
+
+
+def queue_verification_email(user_email: str, token: str) -> bool:
+    """Queue an email verification link for background delivery."""
+    logger.info(f"Queueing verification email to {user_email}")
+    return queue_email(user_email, *verification_message(token))
 
 
 # Mailgun function removed
@@ -125,7 +403,7 @@ The FeedForward Team
 
 def send_with_smtp(to_email: str, subject: str, content: str) -> tuple[bool, str]:
     """
-    Send an email using SMTP
+    Send an email now, over the shared SMTP session
 
     Args:
         to_email: Recipient email address
@@ -139,82 +417,23 @@ def send_with_smtp(to_email: str, subject: str, content: str) -> tuple[bool, str
         logger.error("SMTP is not configured (SMTP_SERVER unset) — cannot send email")
         return False, "Email is not configured on this server"
 
-    error_msg = ""
+    # Log debugging information
+    logger.debug(f"Using SMTP to send email to {to_email}")
+    logger.debug(
+        f"SMTP Settings: Server={SMTP_SERVER}, Port={SMTP_PORT}, User={SMTP_USER}"
+    )
     try:
-        # Log debugging information
-        logger.debug(f"Using SMTP to send email to {to_email}")
-        logger.debug(
-            f"SMTP Settings: Server={SMTP_SERVER}, Port={SMTP_PORT}, User={SMTP_USER}"
-        )
-
-        msg = EmailMessage()
-        msg.set_content(content)
-        msg["Subject"] = subject
-        msg["From"] = SMTP_FROM
-        msg["To"] = to_email
-
-        # Use SMTP_SSL for port 465, regular SMTP with STARTTLS for other ports
-        if SMTP_PORT == 465:
-            logger.debug("Using SMTP_SSL connection")
-            with smtplib.SMTP_SSL(SMTP_SERVER, SMTP_PORT) as server:
-                logger.debug("SMTP_SSL connection established")
-                server.login(SMTP_USER, SMTP_PASSWORD)
-                logger.debug("Login successful")
-
-                # Set debug level for verbose logging if needed
-                if os.environ.get("SMTP_DEBUG", "0") == "1":
-                    server.set_debuglevel(1)
-
-                server.send_message(msg)
-                logger.debug("Message sent")
-        else:
-            logger.debug("Using SMTP with STARTTLS")
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                logger.debug("SMTP connection established")
-                server.starttls()
-                logger.debug("STARTTLS successful")
-                server.login(SMTP_USER, SMTP_PASSWORD)
-                logger.debug("Login successful")
-
-                # Set debug level for verbose logging if needed
-                if os.environ.get("SMTP_DEBUG", "0") == "1":
-                    server.set_debuglevel(1)
-
-                server.send_message(msg)
-                logger.debug("Message sent")
-
+        _connection.send(_build_message(to_email, subject, content))
+        logger.debug("Message sent")
         return True, "Email sent successfully via SMTP"
-    except ConnectionRefusedError:
-        error_msg = "Connection refused. Please check if the SMTP server is reachable."
-        logger.error(f"EMAIL ERROR: {error_msg}")
-        return False, error_msg
-    except smtplib.SMTPAuthenticationError:
-        error_msg = "Authentication failed. Please check SMTP username and password."
-        logger.error(f"EMAIL ERROR: {error_msg}")
-        return False, error_msg
-    except smtplib.SMTPException as e:
-        error_msg = f"SMTP error: {e!s}"
-        logger.error(f"EMAIL ERROR: {error_msg}")
-        return False, error_msg
     except Exception as e:
-        error_msg = f"Failed to send email via SMTP: {e!s}"
+        error_msg = _describe_error(e)
         logger.error(f"EMAIL ERROR: {error_msg}")
         return False, error_msg
 
 
-def send_password_reset_email(user_email: str, token: str) -> tuple[bool, str]:
-    """
-    Send a password reset link to the user
-
-    Args:
-        user_email: The user's email address
-        token: The reset token
-
-    Returns:
-        tuple: (success, message)
-            - success: True if the email was sent successfully, False otherwise
-            - message: Success message or error details
-    """
+def password_reset_message(token: str) -> tuple[str, str]:
+    """Subject and body of the password reset message."""
     reset_link = f"{APP_DOMAIN}/reset-password?token={token}"
     subject = "Reset Your FeedForward Password"
     content = f"""
@@ -229,12 +448,33 @@ This link will expire in 24 hours. If you did not request a password reset, you
 Best regards,
 The FeedForward Team
 """
+    return subject, content
+
+
+def send_password_reset_email(user_email: str, token: str) -> tuple[bool, str]:
+    """
+    Send a password reset link to the user
 
+    Args:
+        user_email: The user's email address
+        token: The reset token
+
+    Returns:
+        tuple: (success, message)
+            - success: True if the email was sent successfully, False otherwise
+            - message: Success message or error details
+    """
     # Log debugging information
     logger.info(f"Sending password reset email to {user_email}")
 
     # We always use SMTP
-    return send_with_smtp(user_email, subject, content)
+    return send_with_smtp(user_email, *password_reset_message(token))
+
+
+def queue_password_reset_email(user_email: str, token: str) -> bool:
+    """Queue a password reset link for background delivery."""
+    logger.info(f"Queueing password reset email to {user_email}")
+    return queue_email(user_email, *password_reset_message(token))
 
 
 def generate_verification_token(email: str) -> str:
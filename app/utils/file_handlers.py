@@ -1,14 +1,70 @@
 """
 File handling utilities for processing uploaded documents
+
+PDF and Word parsing is CPU-bound and runs synchronously inside pypdf and
+python-docx, so it never runs on the event loop. Jobs run in worker
+processes, at most ``EXTRACTION_WORKERS`` at once and one job per worker, where
+each one gets a CPU-time budget (``EXTRACTION_CPU_SECONDS``, enforced with
+``RLIMIT_CPU``) and a wall-clock limit (``EXTRACTION_TIMEOUT``). A job that
+blows either limit takes only its own worker down; other jobs keep running.
+At most ``EXTRACTION_MAX_QUEUE`` jobs may be queued or running; beyond that
+``ExtractionQueueFullError`` is raised so callers can ask the user to retry
+instead of piling up work.
+
+``store_upload`` writes an upload to disk and hashes it in one streaming
+pass, so the submit handler never holds the whole file in memory twice.
+Document text is cached by content hash (``app.utils.text_cache``), so the
+same PDF or Word file is only parsed once per ``extractor_version()``.
+
+PDFs are read page by page (``iter_pdf_pages``) and extraction stops once
+the text reaches ``EXTRACTION_MAX_WORDS`` words or ``EXTRACTION_MAX_CHARS``
+characters — more than any prompt uses — so a 500-page scan costs a few
+pages of work and bounded memory rather than the whole document.
 """
 
+import asyncio
+import hashlib
 import io
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections.abc import Generator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, BinaryIO, Callable, Optional
 
 import docx  # TECH-DEBT: Add type stubs for python-docx
 import pypdf  # TECH-DEBT: Add type stubs for pypdf
 from starlette.datastructures import UploadFile
 
+try:
+    import resource
+except ImportError:  # Windows — no per-job CPU limit
+    resource = None  # type: ignore[assignment]
+
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", "2"))
+EXTRACTION_TIMEOUT = float(os.environ.get("EXTRACTION_TIMEOUT", "60"))
+EXTRACTION_CPU_SECONDS = int(os.environ.get("EXTRACTION_CPU_SECONDS", "30"))
+EXTRACTION_MAX_QUEUE = int(os.environ.get("EXTRACTION_MAX_QUEUE", "32"))
+EXTRACTION_MAX_WORDS = int(os.environ.get("EXTRACTION_MAX_WORDS", "50000"))
+EXTRACTION_MAX_CHARS = int(os.environ.get("EXTRACTION_MAX_CHARS", "400000"))
+
+# Pages slower than this are logged individually
+SLOW_PAGE_SECONDS = 2.0
+
+# Bump when extraction output changes for the same bytes (new cleanup rules,
+# different join); cached text from other versions is then ignored.
+_EXTRACTOR_REVISION = 1
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 # Extensions read as plain text: prose formats plus every extension the code
 # assessment handler accepts (code submissions are just text).
 PLAIN_TEXT_EXTENSIONS = {
@@ -33,6 +89,36 @@ PLAIN_TEXT_EXTENSIONS = {
     ".ipynb",
 }
 
+# Extensions parsed by a document library (and so run in the process pool)
+DOCUMENT_EXTENSIONS = {".pdf", ".docx"}
+
+
+class ExtractionQueueFullError(RuntimeError):
+    """Too many extraction jobs are already queued or running."""
+
+
+@dataclass(frozen=True)
+class StoredUpload:
+    """An upload written to disk, with the size and SHA-256 taken on the way."""
+
+    path: Path
+    size: int
+    checksum: str
+
+
+def extractor_version() -> str:
+    """Identifies what ``extract_*`` produces today, for text caches."""
+    return (
+        f"{_EXTRACTOR_REVISION}:pypdf-{pypdf.__version__}:"
+        f"{EXTRACTION_MAX_WORDS}w:{EXTRACTION_MAX_CHARS}c"
+    )
+
+
+def is_supported_file(filename: str) -> bool:
+    """True if ``extract_file_content`` can read this file type."""
+    ext = Path(filename or "").suffix.lower()
+    return ext in PLAIN_TEXT_EXTENSIONS or ext in DOCUMENT_EXTENSIONS
+
 
 async def extract_file_content(file: UploadFile) -> str:
     """
@@ -46,6 +132,7 @@ async def extract_file_content(file: UploadFile) -> str:
 
     Raises:
         ValueError: If file type is not supported
+        ExtractionQueueFullError: If the extraction pool is saturated
         Exception: If there's an error processing the file
     """
     if not file or not file.filename:
@@ -60,6 +147,31 @@ async def extract_file_content(file: UploadFile) -> str:
     # Reset file pointer for potential future reads
     await file.seek(0)
 
+    if file_ext in DOCUMENT_EXTENSIONS:
+        # Same bytes, same text: skip the parse when it was done before
+        from app.utils import text_cache
+
+        return await text_cache.extract_cached(
+            text_cache.checksum_bytes(content_bytes),
+            lambda: run_extraction_job(extract_bytes, content_bytes, file_ext),
+        )
+    return extract_bytes(content_bytes, file_ext)
+
+
+async def extract_stored_file(path: Path | str, file_ext: str) -> str:
+    """Extract text from a file already on disk (see ``store_upload``).
+
+    Only the path crosses the process boundary; the worker reads the file.
+    """
+    file_ext = file_ext.lower()
+    if file_ext in DOCUMENT_EXTENSIONS:
+        text: str = await run_extraction_job(_extract_path, str(path), file_ext)
+        return text
+    return await asyncio.to_thread(_extract_path, str(path), file_ext)
+
+
+def extract_bytes(content_bytes: bytes, file_ext: str) -> str:
+    """Dispatch on extension and return the stripped text (synchronous)."""
     try:
         if file_ext in PLAIN_TEXT_EXTENSIONS:
             # Handle text files (prose and source code)
@@ -87,48 +199,353 @@ async def extract_file_content(file: UploadFile) -> str:
         raise Exception(f"Error processing {file_ext} file: {e!s}") from e
 
 
-def extract_pdf_content(content_bytes: bytes) -> str:
+def _extract_path(path: str, file_ext: str) -> str:
+    with open(path, "rb") as f:
+        if file_ext == ".pdf":
+            # pypdf seeks within the file; no need to hold it all in memory
+            try:
+                return extract_pdf_content(f).strip()
+            except Exception as e:
+                raise Exception(f"Error processing {file_ext} file: {e!s}") from e
+        return extract_bytes(f.read(), file_ext)
+
+
+# ----------------------------------------------------------------------
+# Process pool with per-job limits
+# ----------------------------------------------------------------------
+
+# Forked workers start instantly and need nothing re-imported; the job
+# functions above are plain module-level callables either way.
+_MP_CONTEXT = multiprocessing.get_context(
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+)
+
+# Each job runs alone in a single-process executor, so a job that overruns
+# can be killed without touching anyone else's. Idle executors are kept (up to
+# EXTRACTION_WORKERS) and reused; the semaphore caps how many run at once.
+_idle_workers: list[ProcessPoolExecutor] = []
+_pool_lock = threading.Lock()
+_jobs_in_flight = 0
+_slots: Optional[asyncio.Semaphore] = None
+_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _limited_job(cpu_seconds: int, fn: Callable[..., Any], *args: Any) -> Any:
+    """Worker-side wrapper: cap this job's CPU time, then run it.
+
+    ``RLIMIT_CPU`` counts the whole process, and workers are reused, so the
+    soft limit is set to the CPU already used plus this job's budget.
+    Exceeding it raises SIGXCPU, which kills the worker.
     """
-    Extract text from PDF content
+    if resource is not None and cpu_seconds > 0:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(usage.ru_utime + usage.ru_stime) + cpu_seconds
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    return fn(*args)
+
+
+def _worker_slots() -> asyncio.Semaphore:
+    global _slots, _slots_loop
+    loop = asyncio.get_running_loop()
+    if _slots is None or _slots_loop is not loop:
+        _slots = asyncio.Semaphore(max(1, EXTRACTION_WORKERS))
+        _slots_loop = loop
+    return _slots
+
+
+def _take_worker() -> ProcessPoolExecutor:
+    with _pool_lock:
+        if _idle_workers:
+            return _idle_workers.pop()
+    return ProcessPoolExecutor(max_workers=1, mp_context=_MP_CONTEXT)
+
+
+def _return_worker(worker: ProcessPoolExecutor) -> None:
+    with _pool_lock:
+        if len(_idle_workers) < max(1, EXTRACTION_WORKERS):
+            _idle_workers.append(worker)
+            return
+    worker.shutdown(wait=False)
+
+
+def _kill_worker(worker: ProcessPoolExecutor) -> None:
+    """Terminate a worker whose job overran or was abandoned.
+
+    A running job can't be cancelled, so the only way to reclaim a worker
+    stuck past its wall-clock limit is to terminate its process. The worker
+    runs nothing else, so no other job is affected.
+    """
+    for proc in list((getattr(worker, "_processes", None) or {}).values()):
+        proc.terminate()
+    worker.shutdown(wait=False, cancel_futures=True)
+
+
+def extraction_queue_full() -> bool:
+    """True when a new extraction job would be rejected."""
+    return _jobs_in_flight >= EXTRACTION_MAX_QUEUE
+
+
+async def run_extraction_job(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run ``fn(*args)`` in a worker process under the per-job limits.
+
+    Raises ``ExtractionQueueFullError`` when ``EXTRACTION_MAX_QUEUE`` jobs are
+    already queued or running, and ``ValueError`` when the job exceeds its
+    time or CPU budget. The time limit counts from when the job starts, not
+    while it waits for one of the ``EXTRACTION_WORKERS`` slots. With
+    ``EXTRACTION_WORKERS=0`` jobs run in a thread instead (wall-clock limit
+    only).
+    """
+    global _jobs_in_flight
+    with _pool_lock:
+        if _jobs_in_flight >= EXTRACTION_MAX_QUEUE:
+            raise ExtractionQueueFullError(
+                "Too many documents are being processed right now"
+            )
+        _jobs_in_flight += 1
+    try:
+        if EXTRACTION_WORKERS <= 0:
+            return await asyncio.wait_for(
+                asyncio.to_thread(fn, *args), timeout=EXTRACTION_TIMEOUT
+            )
+
+        async with _worker_slots():
+            worker = _take_worker()
+            healthy = False
+            try:
+                future = asyncio.get_running_loop().run_in_executor(
+                    worker, _limited_job, EXTRACTION_CPU_SECONDS, fn, *args
+                )
+                result = await asyncio.wait_for(future, timeout=EXTRACTION_TIMEOUT)
+                healthy = True
+                return result
+            except asyncio.TimeoutError:
+                raise ValueError(
+                    f"Document took longer than {EXTRACTION_TIMEOUT:g}s to process"
+                ) from None
+            except BrokenProcessPool:
+                raise ValueError("Document exceeded the processing limits") from None
+            except Exception:
+                healthy = True  # the job itself raised; its worker is fine
+                raise
+            finally:
+                if healthy:
+                    _return_worker(worker)
+                else:
+                    _kill_worker(worker)
+    finally:
+        with _pool_lock:
+            _jobs_in_flight -= 1
+
+
+# ----------------------------------------------------------------------
+# Storage
+# ----------------------------------------------------------------------
+
+
+def _copy_and_hash(src: BinaryIO, dest: Path, max_bytes: int) -> StoredUpload:
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest, "wb") as out:
+            while chunk := src.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ValueError(
+                        f"File size exceeds {max_bytes // (1024 * 1024)}MB limit"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return StoredUpload(path=dest, size=size, checksum=digest.hexdigest())
+
+
+async def store_upload(
+    file: UploadFile, dest: Path, max_bytes: int = 10 * 1024 * 1024
+) -> StoredUpload:
+    """Write an upload to ``dest``, computing its size and SHA-256 as it goes.
+
+    Runs in a thread (one pass, chunked) and removes the partial file if the
+    size limit is hit. Leaves the upload's file pointer rewound.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    file.file.seek(0)
+    try:
+        return await asyncio.to_thread(_copy_and_hash, file.file, dest, max_bytes)
+    finally:
+        file.file.seek(0)
+
+
+@dataclass(frozen=True)
+class PdfPage:
+    """One page of extracted PDF text and how long it took."""
+
+    number: int  # 1-based
+    page_count: int
+    text: str
+    seconds: float
+
+
+@dataclass
+class PdfExtraction:
+    """Result of a budgeted PDF extraction."""
+
+    text: str
+    page_count: int
+    pages_read: int
+    truncated: bool
+    page_seconds: list[float] = field(default_factory=list)
+
+
+def iter_pdf_pages(
+    source: bytes | BinaryIO,
+) -> Generator[PdfPage, None, None]:
+    """
+    Yield a PDF's pages one at a time, extracting text lazily
 
     Args:
-        content_bytes: PDF file content as bytes
+        source: PDF bytes, or a seekable binary file (read in place)
 
-    Returns:
-        Extracted text
+    Raises:
+        ValueError: If the PDF is encrypted, empty or unreadable
     """
+    stream = io.BytesIO(source) if isinstance(source, bytes) else source
     try:
-        pdf_file = io.BytesIO(content_bytes)
-        pdf_reader = pypdf.PdfReader(pdf_file)
+        pdf_reader = pypdf.PdfReader(stream)
+    except pypdf.errors.PdfReadError as e:
+        raise ValueError(f"Invalid or corrupted PDF file: {e!s}") from e
 
-        # Check if PDF is encrypted
-        if pdf_reader.is_encrypted:
-            raise ValueError("Cannot extract text from encrypted PDF files")
+    # Check if PDF is encrypted
+    if pdf_reader.is_encrypted:
+        raise ValueError("Cannot extract text from encrypted PDF files")
+
+    # Check if PDF has pages
+    page_count = len(pdf_reader.pages)
+    if page_count == 0:
+        raise ValueError("PDF file has no pages")
+
+    for index in range(page_count):
+        started = time.perf_counter()
+        page_text = pdf_reader.pages[index].extract_text() or ""
+        yield PdfPage(
+            number=index + 1,
+            page_count=page_count,
+            text=page_text,
+            seconds=time.perf_counter() - started,
+        )
+
+
+def _first_words(text: str, count: int) -> str:
+    """``text`` cut just after its ``count``-th word, line breaks intact."""
+    for n, match in enumerate(re.finditer(r"\S+", text), start=1):
+        if n == count:
+            return text[: match.end()]
+    return text if count > 0 else ""
+
+
+def extract_pdf_pages(
+    source: bytes | BinaryIO,
+    max_words: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> PdfExtraction:
+    """
+    Extract PDF text page by page until the word or character budget is hit
 
-        # Check if PDF has pages
-        if len(pdf_reader.pages) == 0:
-            raise ValueError("PDF file has no pages")
+    Args:
+        source: PDF bytes or a seekable binary file
+        max_words: Stop after this many words (default ``EXTRACTION_MAX_WORDS``)
+        max_chars: Stop after this many characters (default ``EXTRACTION_MAX_CHARS``)
 
-        text_content = []
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            page_text = page.extract_text()
-            if page_text:
-                text_content.append(page_text)
+    Returns:
+        The joined text (cut at the budget), page counts and per-page timings
+    """
+    max_words = EXTRACTION_MAX_WORDS if max_words is None else max_words
+    max_chars = EXTRACTION_MAX_CHARS if max_chars is None else max_chars
+
+    pages = iter_pdf_pages(source)
+    page_count = 0
+    text_content: list[str] = []
+    page_seconds: list[float] = []
+    words = chars = 0
+    truncated = False
+    for page in pages:
+        page_count = page.page_count
+        page_seconds.append(page.seconds)
+        if page.seconds > SLOW_PAGE_SECONDS:
+            logger.warning(f"PDF page {page.number} took {page.seconds:.1f}s")
+        if not page.text:
+            continue
+
+        # ``chars`` counts the newline each page is joined with, so a page
+        # that exactly fills the budget leaves it at or past ``max_chars``.
+        if (max_words and words >= max_words) or (max_chars and chars >= max_chars):
+            truncated = True
+            break
+        text = page.text
+        page_words = len(text.split())
+        if max_words and words + page_words > max_words:
+            text = _first_words(text, max_words - words)
+            truncated = True
+        if max_chars and chars + len(text) > max_chars:
+            text = text[: max(0, max_chars - chars)]
+            truncated = True
+        text_content.append(text)
+        words += len(text.split())
+        chars += len(text) + 1
+        if truncated:
+            break
+    pages.close()
+
+    return PdfExtraction(
+        text="\n".join(text_content),
+        page_count=page_count,
+        pages_read=len(page_seconds),
+        truncated=truncated,
+        page_seconds=page_seconds,
+    )
+
+
+def extract_pdf_content(
+    content: bytes | BinaryIO,
+    max_words: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> str:
+    """
+    Extract text from PDF content
 
-        # Join and clean up text
-        full_text = "\n".join(text_content)
+    Reads pages lazily and stops at the word/character budget (see
+    ``extract_pdf_pages``).
+
+    Args:
+        content: PDF file content as bytes, or a seekable binary file
+        max_words: Word budget (default ``EXTRACTION_MAX_WORDS``)
+        max_chars: Character budget (default ``EXTRACTION_MAX_CHARS``)
+
+    Returns:
+        Extracted text
+    """
+    try:
+        result = extract_pdf_pages(content, max_words=max_words, max_chars=max_chars)
 
         # Check if we extracted any text
-        if not full_text.strip():
+        if not result.text.strip():
             raise ValueError(
                 "No text content found in PDF. The PDF might contain only images."
             )
 
-        return full_text
+        if result.truncated:
+            logger.info(
+                f"PDF extraction stopped at the budget after {result.pages_read} "
+                f"of {result.page_count} pages"
+            )
+        return result.text
 
-    except pypdf.errors.PdfReadError as e:
-        raise ValueError(f"Invalid or corrupted PDF file: {e!s}") from e
+    except ValueError:
+        raise
     except Exception as e:
         raise Exception(f"Error extracting PDF content: {e!s}") from e
 
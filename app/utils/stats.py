@@ -0,0 +1,17 @@
+"""
+Small summary statistics shared by the analytics and health code.
+
+``percentile`` is nearest-rank: it always returns one of the values (no
+interpolation), which keeps score bands and latency figures readable.
+"""
+
+import math
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (``q`` in 0..100) of non-empty ``values``."""
+    if not values:
+        raise ValueError("percentile requires at least one value")
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
@@ -0,0 +1,133 @@
+"""
+Persistent cache of extracted document text, keyed by content.
+
+Parsing a PDF or Word file is the expensive part of handling an upload, and
+the same bytes come back often: a spec re-uploaded for a new term, a draft
+resubmitted unchanged, a retry after a feedback failure. Entries live in
+``extracted_texts`` keyed by the file's SHA-256 and ``extractor_version()``,
+so a parser upgrade or a new budget simply misses and re-extracts.
+
+The cache is bounded by ``TEXT_CACHE_MAX_BYTES`` of text; when a store pushes
+it over, the least recently used entries are evicted. ``cache_stats`` reports
+entry count, size and the hit rate of this process.
+"""
+
+import hashlib
+import logging
+import os
+from collections.abc import Awaitable
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from app.models.assessment import ExtractedText, extracted_texts
+from app.utils.db_query import first, where
+from app.utils.file_handlers import extractor_version
+
+logger = logging.getLogger(__name__)
+
+TEXT_CACHE_MAX_BYTES = int(
+    os.environ.get("TEXT_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# Per-process counters; reset on restart
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def checksum_bytes(content: bytes) -> str:
+    """SHA-256 of ``content``, the cache key for in-memory uploads."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def lookup(checksum: str) -> Optional[str]:
+    """Cached text for these bytes under the current extractor, or None."""
+    row = first(
+        extracted_texts, checksum=checksum, extractor_version=extractor_version()
+    )
+    if row is None:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    extracted_texts.update(
+        {"hits": (row.hits or 0) + 1, "last_used_at": datetime.now().isoformat()},
+        pk_values=row.id,
+    )
+    text: str = row.text
+    return text
+
+
+def store(checksum: str, text: str) -> None:
+    """Cache ``text`` for these bytes, evicting old entries if over budget."""
+    now = datetime.now().isoformat()
+    extracted_texts.insert(
+        ExtractedText(
+            checksum=checksum,
+            extractor_version=extractor_version(),
+            text=text,
+            extracted_at=now,
+            size=len(text.encode()),
+            hits=0,
+            last_used_at=now,
+        ),
+        replace=True,
+    )
+    _evict()
+
+
+def forget(checksum: str) -> None:
+    """Drop every cached version for these bytes (e.g. the file was deleted)."""
+    for row in where(extracted_texts, checksum=checksum):
+        extracted_texts.delete(row.id)
+
+
+async def extract_cached(checksum: str, extract: Callable[[], Awaitable[str]]) -> str:
+    """Return cached text for ``checksum`` or run ``extract()`` and cache it.
+
+    Failures are not cached, so a file that timed out is tried again.
+    """
+    text = lookup(checksum)
+    if text is not None:
+        return text
+    text = await extract()
+    store(checksum, text)
+    return text
+
+
+def _total_bytes() -> int:
+    row = extracted_texts.db.execute(
+        "SELECT COALESCE(SUM(size), 0) FROM extracted_texts"
+    ).fetchone()
+    return int(row[0])
+
+
+def _evict() -> None:
+    excess = _total_bytes() - TEXT_CACHE_MAX_BYTES
+    if excess <= 0:
+        return
+    # Only ids and sizes — the text itself never needs loading to evict
+    for row in extracted_texts(
+        select="id, size", order_by="last_used_at, id", as_cls=False
+    ):
+        if excess <= 0:
+            break
+        extracted_texts.delete(row["id"])
+        excess -= row["size"] or 0
+        _stats["evictions"] += 1
+    logger.info(f"Text cache over {TEXT_CACHE_MAX_BYTES} bytes; evicted LRU entries")
+
+
+def cache_stats() -> dict[str, Any]:
+    """Entries, bytes and this process's hit rate."""
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        "entries": extracted_texts.count,
+        "bytes": _total_bytes(),
+        "max_bytes": TEXT_CACHE_MAX_BYTES,
+        **_stats,
+        "hit_rate": round(_stats["hits"] / lookups, 3) if lookups else 0.0,
+    }
+
+
+def reset_stats() -> None:
+    """Zero the per-process counters."""
+    for key in _stats:
+        _stats[key] = 0
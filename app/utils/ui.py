@@ -641,9 +641,9 @@ def dynamic_header(session=None):
     # Check if user is authenticated
     if session and "auth" in session:
         try:
-            from app.models.user import Role, users
+            from app.models.user import Role, get_user
 
-            user = users[session["auth"]]
+            user = get_user(session["auth"])
 
             # Determine dashboard link based on role
             dashboard_link = "/"
@@ -817,3 +817,30 @@ def error_card(title, message, error_code="", error_type="Error"):
             "max-w-md mx-auto"
         ),
     )
+
+
+def connection_test_result(result):
+    """
+    Outcome of a model "Test Connection" probe (see llm_health.check_connection)
+
+    Args:
+        result: Probe result dict (status, error, latency, cached, refreshing)
+    """
+    if result["status"] == "healthy":
+        latency = result["latency"]["p50"] if result.get("latency") else None
+        detail = f"{result['model']} answered in {latency:.2f}s" if latency else ""
+        heading, colour = "✅ Connection successful!", "green"
+    else:
+        detail = f"Error: {result['error'] or result['status']}"
+        heading, colour = "❌ Connection failed", "red"
+    if result.get("cached"):
+        checked = result["checked_at"][11:19]
+        if result.get("refreshing"):
+            detail += f" (result from {checked}; re-checking in the background)"
+        else:
+            detail += f" (result from {checked})"
+    return fh.Div(
+        fh.P(heading, cls=f"text-{colour}-600 font-medium"),
+        fh.P(detail, cls="text-gray-600 text-sm mt-1"),
+        cls=f"p-4 bg-{colour}-50 rounded-lg",
+    )
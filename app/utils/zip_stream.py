@@ -0,0 +1,53 @@
+"""
+ZIP archives written as a stream of chunks.
+
+``zipfile`` can write to an unseekable file: each entry then carries a data
+descriptor after its compressed data instead of sizes patched into the local
+header. ``iter_zip`` hands it such a file, which only buffers what has been
+written since the last chunk was taken, and yields the bytes after every
+entry — so an archive of any size needs no more memory than its largest
+compressed entry, and the first bytes go out before the last file exists.
+"""
+
+from __future__ import annotations
+
+import io
+import zipfile
+from collections.abc import Iterable, Iterator
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file whose contents are drained by ``take``."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(files: Iterable[tuple[str, str | bytes]]) -> Iterator[bytes]:
+    """Deflated ZIP of ``(name, content)`` pairs, yielded entry by entry.
+
+    ``files`` is consumed lazily; ``str`` content is written as UTF-8.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files:
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            with zf.open(name, mode="w") as entry:
+                entry.write(content)
+            chunk = sink.take()
+            if chunk:
+                yield chunk
+    yield sink.take()  # central directory
@@ -3,24 +3,28 @@
 lens-contract standard surface (/health, /manifest, bearer auth via
 FEEDFORWARD_PRACTICE_AUTH_TOKEN) plus the practice routes. Feedback runs
 are asynchronous jobs (the family's 202-and-poll pattern) because model
-calls can take minutes on local hardware.
+calls can take minutes on local hardware; they run on a bounded worker pool
+(see jobs.py) and report their ``queue_position`` while waiting.
+``/practice/feedback/stream`` is the progressive alternative: one request,
+answered with server-sent events as the model writes, run in one of the same
+pool's slots.
 """
 
-import threading
-import uuid
-from typing import Any
+import json
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from lens_contract import add_auth, add_contract_routes, add_cors
 from pydantic import BaseModel, Field
 
+from feedforward_practice.jobs import JobStore, QueueFullError
 from feedforward_practice.manifest import MANIFEST
 from feedforward_practice.providers import (
     ProviderConfig,
     ProviderError,
     list_models,
 )
-from feedforward_practice.run import practice_feedback
+from feedforward_practice.run import apractice_feedback, astream_practice_feedback
 
 app = FastAPI(title=MANIFEST["name"], version=MANIFEST["version"])
 add_contract_routes(app, MANIFEST)
@@ -41,37 +45,65 @@ class FeedbackRequest(BaseModel):
     provider: ProviderIn = ProviderIn()
 
 
-_jobs: dict[str, dict[str, Any]] = {}
-_jobs_lock = threading.Lock()
+_store = JobStore.from_env()
 
 
-def _run_job(job_id: str, req: FeedbackRequest) -> None:
+async def _run_job(req: FeedbackRequest) -> dict:
     provider = ProviderConfig.from_env().merged(req.provider.model_dump())
-    try:
-        result = practice_feedback(req.rubric, req.draft_text, provider, req.num_runs)
-        update = {"status": "done", "result": result}
-    except Exception as e:  # surfaced to the UI as a friendly failure
-        update = {"status": "error", "error": str(e)}
-    with _jobs_lock:
-        _jobs[job_id].update(update)
+    return await apractice_feedback(req.rubric, req.draft_text, provider, req.num_runs)
 
 
 @app.post("/practice/feedback", status_code=202)
 def start_feedback(req: FeedbackRequest):
-    job_id = uuid.uuid4().hex
-    with _jobs_lock:
-        _jobs[job_id] = {"status": "running"}
-    threading.Thread(target=_run_job, args=(job_id, req), daemon=True).start()
-    return {"id": job_id, "status": "running"}
+    try:
+        return _store.submit(lambda: _run_job(req))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e)) from e
 
 
 @app.get("/practice/feedback/{job_id}")
 def get_feedback(job_id: str):
-    with _jobs_lock:
-        job = _jobs.get(job_id)
-        if job is None:
-            raise HTTPException(status_code=404, detail="Unknown job")
-        return {"id": job_id, **job}
+    job = _store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@app.post("/practice/feedback/stream")
+async def stream_feedback(req: FeedbackRequest):
+    """Server-sent events: ``token`` and ``category`` while the first run is
+    written, then ``result`` (or ``error``) once every run is in.
+
+    Holds one of the job store's worker slots while it runs (waiting its
+    turn if they are busy), so streams and queued jobs share one bound; 429
+    when the queue is full, as for ``/practice/feedback``.
+    """
+    if _store.queue_full():
+        raise HTTPException(
+            status_code=429, detail="Too many feedback runs are waiting"
+        )
+    provider = ProviderConfig.from_env().merged(req.provider.model_dump())
+
+    async def events():
+        try:
+            async with _store.slot():
+                async for item in astream_practice_feedback(
+                    req.rubric, req.draft_text, provider, req.num_runs
+                ):
+                    event = item.pop("event")
+                    yield _sse(event, item)
+        except Exception as e:  # surfaced to the UI as a friendly failure
+            yield _sse("error", {"error": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/practice/models")
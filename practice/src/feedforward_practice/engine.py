@@ -92,24 +92,12 @@ def parse_response(raw: str, rubric: dict) -> dict:
         text = text[start : end + 1]
 
     data = json.loads(text)
-    wanted = {
-        c["name"].strip().lower(): c["name"] for c in rubric["rubric"]["categories"]
-    }
-    categories = []
-    for cat in data.get("categories", []):
-        key = str(cat.get("name", "")).strip().lower()
-        if key not in wanted:
-            continue
-        score = max(0.0, min(100.0, float(cat.get("score", 0))))
-        categories.append(
-            {
-                "name": wanted[key],
-                "score": score,
-                "feedback": str(cat.get("feedback", "")).strip(),
-                "strengths": [str(s) for s in cat.get("strengths", [])][:3],
-                "improvements": [str(s) for s in cat.get("improvements", [])][:3],
-            }
-        )
+    wanted = _wanted(rubric)
+    categories = [
+        c
+        for c in (_category(cat, wanted) for cat in data.get("categories", []))
+        if c is not None
+    ]
     return {
         "overall_feedback": str(data.get("overall_feedback", "")).strip(),
         "categories": categories,
@@ -121,6 +109,105 @@ def parse_response(raw: str, rubric: dict) -> dict:
     }
 
 
+def _wanted(rubric: dict) -> dict[str, str]:
+    return {
+        c["name"].strip().lower(): c["name"] for c in rubric["rubric"]["categories"]
+    }
+
+
+def _category(cat: Any, wanted: dict[str, str]) -> dict | None:
+    """Normalise one model category, or None if it isn't in the rubric."""
+    if not isinstance(cat, dict):
+        return None
+    key = str(cat.get("name", "")).strip().lower()
+    if key not in wanted:
+        return None
+    score = max(0.0, min(100.0, float(cat.get("score", 0))))
+    return {
+        "name": wanted[key],
+        "score": score,
+        "feedback": str(cat.get("feedback", "")).strip(),
+        "strengths": [str(s) for s in cat.get("strengths", [])][:3],
+        "improvements": [str(s) for s in cat.get("improvements", [])][:3],
+    }
+
+
+_CATEGORIES_START = re.compile(r'"categories"\s*:\s*\[')
+
+
+class CategoryStream:
+    """Pick complete categories out of a response while it streams in.
+
+    ``feed(chunk)`` returns the categories whose JSON object closed in that
+    chunk, normalised as in ``parse_response`` and with their ``level``, so
+    a UI can show each one as soon as the model finishes writing it. The
+    whole text (``text``) still goes through ``parse_response`` at the end.
+    """
+
+    def __init__(self, rubric: dict):
+        self.text = ""
+        self._wanted = _wanted(rubric)
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._item_start = -1
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        self.text += chunk
+        if self._done:
+            return []
+        if not self._in_array:
+            m = _CATEGORIES_START.search(self.text, max(0, self._pos - 32))
+            if not m:
+                self._pos = len(self.text)
+                return []
+            self._in_array = True
+            self._pos = m.end()
+        return self._scan()
+
+    def _scan(self) -> list[dict]:
+        found = []
+        text = self.text
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0:  # end of the categories array
+                    self._done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0 and ch == "}":
+                    cat = self._load(text[self._item_start : i + 1])
+                    if cat is not None:
+                        found.append(cat)
+        self._pos = len(text)
+        return found
+
+    def _load(self, fragment: str) -> dict | None:
+        try:
+            cat = _category(json.loads(fragment), self._wanted)
+        except (ValueError, TypeError):
+            return None
+        if cat is not None:
+            cat["level"] = level_for(cat["score"])
+        return cat
+
+
 def aggregate_runs(runs: list[dict], rubric: dict) -> dict:
     """Aggregate 1..N parsed runs into the final feedback payload.
 
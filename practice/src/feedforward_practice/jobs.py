@@ -0,0 +1,255 @@
+"""Bounded job queue for the sidecar API.
+
+Feedback runs go through a fixed pool of worker threads, so a student firing
+run after run queues them instead of hammering a local Ollama with parallel
+requests. A job may be a coroutine function: each worker keeps one event loop
+for its lifetime and runs async jobs on it. Work that can't be a pooled job —
+a streamed run answered as it is written — takes one of the same
+``concurrency`` slots with ``slot()``, queueing (and hitting the queue cap)
+like any job. Slots are handed out strictly in queue order, so a stream
+never starts ahead of older jobs. Finished jobs are kept for a while so the
+shell can poll them, then dropped: after ``ttl`` seconds, or
+least-recently-polled first once more than ``max_jobs`` are held. Setting a database path keeps finished results in
+SQLite as well, so they survive a sidecar restart (off by default — the
+desktop app stores nothing unless asked to).
+
+Configuration via arguments or environment:
+FEEDFORWARD_PRACTICE_CONCURRENCY (default 1), FEEDFORWARD_PRACTICE_MAX_QUEUE
+(20), FEEDFORWARD_PRACTICE_MAX_JOBS (100), FEEDFORWARD_PRACTICE_JOB_TTL
+(3600 seconds), FEEDFORWARD_PRACTICE_JOB_DB (unset).
+"""
+
+import asyncio
+import contextlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+
+class QueueFullError(RuntimeError):
+    """Too many jobs are already waiting."""
+
+
+class JobStore:
+    """Runs callables on a bounded pool and remembers their outcome."""
+
+    def __init__(
+        self,
+        concurrency: int = 1,
+        max_queue: int = 20,
+        max_jobs: int = 100,
+        ttl: float = 3600.0,
+        db_path: str = "",
+    ):
+        self.max_queue = max_queue
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, concurrency), thread_name_prefix="practice-job"
+        )
+        self._jobs: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._queue: list[str] = []  # ids waiting for a worker, oldest first
+        # Tickets not yet granted a slot, oldest first, with what starts them
+        self._waiters: OrderedDict[str, Callable[[str], Any]] = OrderedDict()
+        self._free = max(1, concurrency)
+        self._lock = threading.Lock()
+        self._local = threading.local()  # per-worker event loop
+        self._db = _open_db(db_path) if db_path else None
+
+    @classmethod
+    def from_env(cls) -> "JobStore":
+        env = os.environ.get
+        return cls(
+            concurrency=int(env("FEEDFORWARD_PRACTICE_CONCURRENCY", "1")),
+            max_queue=int(env("FEEDFORWARD_PRACTICE_MAX_QUEUE", "20")),
+            max_jobs=int(env("FEEDFORWARD_PRACTICE_MAX_JOBS", "100")),
+            ttl=float(env("FEEDFORWARD_PRACTICE_JOB_TTL", "3600")),
+            db_path=env("FEEDFORWARD_PRACTICE_JOB_DB", ""),
+        )
+
+    def submit(self, fn: Callable[[], Any]) -> dict[str, Any]:
+        """Queue ``fn`` (sync, or returning an awaitable); returns the new
+        job's public view."""
+        with self._lock:
+            # Granted jobs go to the pool; _run can't start before we unlock
+            job_id = self._enqueue_locked(
+                lambda ticket: self._pool.submit(self._run, ticket, fn)
+            )
+            self._jobs[job_id] = {"status": "queued", "created": time.time()}
+            self._evict_locked()
+            return {
+                "id": job_id,
+                "status": "queued",
+                "queue_position": self._queue.index(job_id) + 1,
+            }
+
+    def queue_full(self) -> bool:
+        """True when ``submit`` or ``slot`` would raise ``QueueFullError``."""
+        with self._lock:
+            return len(self._queue) >= self.max_queue
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a worker slot for work run outside the pool.
+
+        Waits its turn in the queue like a job; raises ``QueueFullError``
+        at once if the queue is full. The slot is released when the block
+        exits, including by cancellation (e.g. the client went away).
+        """
+        loop = asyncio.get_running_loop()
+        granted: asyncio.Future[None] = loop.create_future()
+        with self._lock:
+            ticket = self._enqueue_locked(
+                lambda _: loop.call_soon_threadsafe(_resolve, granted)
+            )
+        try:
+            await granted
+        except BaseException:
+            with self._lock:
+                self._queue.remove(ticket)
+                if self._waiters.pop(ticket, None) is None:
+                    self._release_locked()  # granted just as we gave up
+            raise
+        with self._lock:
+            self._queue.remove(ticket)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._release_locked()
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Public view of a job (with ``queue_position`` while queued)."""
+        with self._lock:
+            self._evict_locked()
+            job = self._jobs.get(job_id)
+            if job is None:
+                return self._load(job_id)
+            self._jobs.move_to_end(job_id)
+            view = {"id": job_id, "status": job["status"]}
+            if job["status"] == "queued":
+                # 1 = next to start
+                view["queue_position"] = self._queue.index(job_id) + 1
+            for key in ("result", "error"):
+                if key in job:
+                    view[key] = job[key]
+            return view
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _enqueue_locked(self, start: Callable[[str], Any]) -> str:
+        """Queue a ticket; ``start(ticket)`` is called once it holds a slot."""
+        if len(self._queue) >= self.max_queue:
+            raise QueueFullError("Too many feedback runs are waiting")
+        ticket = uuid.uuid4().hex
+        self._queue.append(ticket)
+        self._waiters[ticket] = start
+        self._grant_locked()
+        return ticket
+
+    def _grant_locked(self) -> None:
+        """Hand free slots to the oldest waiting tickets."""
+        while self._free and self._waiters:
+            ticket, start = self._waiters.popitem(last=False)
+            self._free -= 1
+            start(ticket)
+
+    def _release_locked(self) -> None:
+        self._free += 1
+        self._grant_locked()
+
+    def _run(self, job_id: str, fn: Callable[[], Any]) -> None:
+        with self._lock:
+            self._queue.remove(job_id)
+            if job_id in self._jobs:
+                self._jobs[job_id]["status"] = "running"
+        try:
+            result = fn()
+            if inspect.isawaitable(result):
+                result = self._runner().run(result)
+            update = {"status": "done", "result": result}
+        except Exception as e:  # surfaced to the UI as a friendly failure
+            update = {"status": "error", "error": str(e)}
+        finally:
+            with self._lock:
+                self._release_locked()
+        update["finished"] = time.time()
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(update)
+            self._save(job_id, update)
+
+    def _runner(self) -> asyncio.Runner:
+        runner = getattr(self._local, "runner", None)
+        if runner is None:
+            runner = self._local.runner = asyncio.Runner()
+        return runner
+
+    def _evict_locked(self) -> None:
+        """Drop expired finished jobs, then the least recently polled ones."""
+        cutoff = time.time() - self.ttl
+        for job_id in [
+            j for j, job in self._jobs.items() if job.get("finished", cutoff) < cutoff
+        ]:
+            del self._jobs[job_id]
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            for job_id in [j for j, job in self._jobs.items() if "finished" in job][
+                :excess
+            ]:
+                del self._jobs[job_id]
+        if self._db is not None:
+            self._db.execute("DELETE FROM jobs WHERE finished < ?", (cutoff,))
+
+    def _save(self, job_id: str, update: dict[str, Any]) -> None:
+        if self._db is None:
+            return
+        self._db.execute(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?)",
+            (
+                job_id,
+                update["status"],
+                json.dumps(update.get("result")),
+                update.get("error", ""),
+                update["finished"],
+            ),
+        )
+
+    def _load(self, job_id: str) -> dict[str, Any] | None:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT status, result, error FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        status, result, error = row
+        view: dict[str, Any] = {"id": job_id, "status": status}
+        if status == "done":
+            view["result"] = json.loads(result)
+        else:
+            view["error"] = error
+        return view
+
+
+def _resolve(future: "asyncio.Future[None]") -> None:
+    if not future.done():  # the waiter may have been cancelled meanwhile
+        future.set_result(None)
+
+
+def _open_db(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS jobs ("
+        "id TEXT PRIMARY KEY, status TEXT, result TEXT, error TEXT, finished REAL)"
+    )
+    return conn
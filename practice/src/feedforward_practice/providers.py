@@ -13,7 +13,9 @@ FEEDFORWARD_PRACTICE_BASE_URL, FEEDFORWARD_PRACTICE_API_KEY,
 FEEDFORWARD_PRACTICE_MODEL.
 """
 
+import json
 import os
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
 import httpx
@@ -68,11 +70,10 @@ def list_models(config: ProviderConfig) -> list[str]:
         raise ProviderError(f"Could not list models at {config.base_url}: {e}") from e
 
 
-def chat(config: ProviderConfig, system: str, user: str) -> str:
-    """One chat completion; returns the assistant text."""
+def _payload(config: ProviderConfig, system: str, user: str) -> dict:
     if not config.model:
         raise ProviderError("No model configured")
-    payload = {
+    return {
         "model": config.model,
         "messages": [
             {"role": "system", "content": system},
@@ -80,6 +81,29 @@ def chat(config: ProviderConfig, system: str, user: str) -> str:
         ],
         "temperature": 0.4,
     }
+
+
+def _content(resp: httpx.Response) -> str:
+    resp.raise_for_status()
+    data = resp.json()
+    return data["choices"][0]["message"]["content"]
+
+
+def _provider_error(e: Exception) -> ProviderError:
+    if isinstance(e, httpx.HTTPStatusError):
+        detail = e.response.text[:300]
+        return ProviderError(
+            f"Model endpoint returned {e.response.status_code}: {detail}"
+        )
+    return ProviderError(f"Model call failed: {e}")
+
+
+_CALL_ERRORS = (httpx.HTTPError, KeyError, IndexError, ValueError)
+
+
+def chat(config: ProviderConfig, system: str, user: str) -> str:
+    """One chat completion; returns the assistant text."""
+    payload = _payload(config, system, user)
     try:
         resp = httpx.post(
             f"{config.base_url}/chat/completions",
@@ -87,13 +111,76 @@ def chat(config: ProviderConfig, system: str, user: str) -> str:
             json=payload,
             timeout=DEFAULT_TIMEOUT,
         )
-        resp.raise_for_status()
-        data = resp.json()
-        return data["choices"][0]["message"]["content"]
-    except httpx.HTTPStatusError as e:
-        detail = e.response.text[:300]
-        raise ProviderError(
-            f"Model endpoint returned {e.response.status_code}: {detail}"
-        ) from e
-    except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
-        raise ProviderError(f"Model call failed: {e}") from e
+        return _content(resp)
+    except _CALL_ERRORS as e:
+        raise _provider_error(e) from e
+
+
+def async_client() -> httpx.AsyncClient:
+    """A client for a burst of calls to one endpoint (keep-alive pooled).
+
+    Use as ``async with async_client() as client:`` and pass it to every
+    ``achat`` in the burst so the runs share connections.
+    """
+    return httpx.AsyncClient(
+        timeout=DEFAULT_TIMEOUT,
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+    )
+
+
+async def achat(
+    config: ProviderConfig,
+    system: str,
+    user: str,
+    client: httpx.AsyncClient | None = None,
+) -> str:
+    """Async ``chat``; reuses ``client``'s connections when given one."""
+    if client is None:
+        async with async_client() as own:
+            return await achat(config, system, user, own)
+    payload = _payload(config, system, user)
+    try:
+        resp = await client.post(
+            f"{config.base_url}/chat/completions",
+            headers=_headers(config),
+            json=payload,
+        )
+        return _content(resp)
+    except _CALL_ERRORS as e:
+        raise _provider_error(e) from e
+
+
+async def achat_stream(
+    config: ProviderConfig,
+    system: str,
+    user: str,
+    client: httpx.AsyncClient,
+) -> AsyncIterator[str]:
+    """Stream a chat completion; yields text deltas as the model writes them.
+
+    Uses the OpenAI-compatible ``stream: true`` server-sent events, which
+    Ollama's /v1 endpoint also speaks.
+    """
+    payload = {**_payload(config, system, user), "stream": True}
+    try:
+        async with client.stream(
+            "POST",
+            f"{config.base_url}/chat/completions",
+            headers=_headers(config),
+            json=payload,
+        ) as resp:
+            if resp.is_error:
+                await resp.aread()
+                resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if delta:
+                    yield delta
+    except _CALL_ERRORS as e:
+        raise _provider_error(e) from e
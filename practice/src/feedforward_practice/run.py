@@ -1,7 +1,27 @@
-"""Top-level orchestration: rubric + draft + provider -> aggregated feedback."""
+"""Top-level orchestration: rubric + draft + provider -> aggregated feedback.
+
+The ``num_runs`` model calls are independent, so they run concurrently over
+one keep-alive HTTP client (at most ``FEEDFORWARD_PRACTICE_RUN_CONCURRENCY``
+at a time, default 5): a five-run session takes about as long as its
+slowest run. Results are aggregated in run order, whatever order they
+finish in. ``astream_practice_feedback`` additionally streams the first
+run's tokens and completed categories for a progressive UI.
+"""
+
+import asyncio
+import os
+from collections.abc import AsyncIterator
 
 from feedforward_practice import engine
-from feedforward_practice.providers import ProviderConfig, ProviderError, chat
+from feedforward_practice.providers import (
+    ProviderConfig,
+    ProviderError,
+    achat,
+    achat_stream,
+    async_client,
+)
+
+RUN_CONCURRENCY = int(os.environ.get("FEEDFORWARD_PRACTICE_RUN_CONCURRENCY", "5"))
 
 
 def practice_feedback(
@@ -15,22 +35,113 @@ def practice_feedback(
     Returns the aggregated feedback payload plus run diagnostics. Raises
     RubricError / ProviderError / ValueError for unusable inputs; partial
     run failures are tolerated as long as one run parses.
+
+    For synchronous callers only (the CLI, scripts): each call runs
+    ``apractice_feedback`` on a fresh event loop. Code already on an event
+    loop — the API, job workers — must await ``apractice_feedback``
+    directly; calling this from a running loop raises ``RuntimeError``.
     """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(apractice_feedback(rubric, draft_text, provider, num_runs))
+    raise RuntimeError(
+        "practice_feedback() cannot run inside an event loop; "
+        "await apractice_feedback() instead"
+    )
+
+
+async def apractice_feedback(
+    rubric: dict,
+    draft_text: str,
+    provider: ProviderConfig,
+    num_runs: int = 1,
+    max_concurrency: int | None = None,
+) -> dict:
+    """Async ``practice_feedback``; runs go out concurrently."""
     rubric = engine.validate_rubric(rubric)
     if not draft_text or not draft_text.strip():
         raise ValueError("Draft is empty")
     num_runs = max(1, min(int(num_runs), 5))
 
     prompt = engine.build_prompt(rubric, draft_text)
+    limit = asyncio.Semaphore(max(1, max_concurrency or RUN_CONCURRENCY))
+
+    async def one_run(client) -> dict:
+        async with limit:
+            raw = await achat(provider, prompt["system"], prompt["user"], client)
+        return engine.parse_response(raw, rubric)
+
+    async with async_client() as client:
+        outcomes = await asyncio.gather(
+            *(one_run(client) for _ in range(num_runs)), return_exceptions=True
+        )
 
+    return _aggregate(outcomes, rubric, draft_text)
+
+
+async def astream_practice_feedback(
+    rubric: dict,
+    draft_text: str,
+    provider: ProviderConfig,
+    num_runs: int = 1,
+    max_concurrency: int | None = None,
+) -> AsyncIterator[dict]:
+    """Practice feedback as a stream of events for a progressive UI.
+
+    The first run streams: ``{"event": "token", "text": ...}`` for each piece
+    of model output and ``{"event": "category", "category": ...}`` as each
+    rubric category completes. Any further runs go out alongside it
+    unstreamed. Ends with ``{"event": "result", "result": ...}`` — the same
+    payload ``practice_feedback`` returns — or raises like it does.
+    """
+    rubric = engine.validate_rubric(rubric)
+    if not draft_text or not draft_text.strip():
+        raise ValueError("Draft is empty")
+    num_runs = max(1, min(int(num_runs), 5))
+
+    prompt = engine.build_prompt(rubric, draft_text)
+    limit = asyncio.Semaphore(max(1, max_concurrency or RUN_CONCURRENCY))
+
+    async def one_run(client) -> dict:
+        async with limit:
+            raw = await achat(provider, prompt["system"], prompt["user"], client)
+        return engine.parse_response(raw, rubric)
+
+    async with async_client() as client:
+        others = [asyncio.ensure_future(one_run(client)) for _ in range(num_runs - 1)]
+        stream = engine.CategoryStream(rubric)
+        try:
+            async with limit:
+                async for text in achat_stream(
+                    provider, prompt["system"], prompt["user"], client
+                ):
+                    yield {"event": "token", "text": text}
+                    for category in stream.feed(text):
+                        yield {"event": "category", "category": category}
+            first: dict | BaseException = engine.parse_response(stream.text, rubric)
+        except (ProviderError, ValueError) as e:
+            first = e
+        except BaseException:
+            for task in others:
+                task.cancel()
+            raise
+        outcomes = [first] + list(await asyncio.gather(*others, return_exceptions=True))
+
+    yield {"event": "result", "result": _aggregate(outcomes, rubric, draft_text)}
+
+
+def _aggregate(outcomes: list, rubric: dict, draft_text: str) -> dict:
+    """Combine per-run outcomes (parsed dicts or exceptions), in run order."""
     parsed_runs: list[dict] = []
     errors: list[str] = []
-    for _ in range(num_runs):
-        try:
-            raw = chat(provider, prompt["system"], prompt["user"])
-            parsed_runs.append(engine.parse_response(raw, rubric))
-        except (ProviderError, ValueError) as e:  # noqa: PERF203
-            errors.append(str(e))
+    for outcome in outcomes:
+        if isinstance(outcome, (ProviderError, ValueError)):
+            errors.append(str(outcome))
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            parsed_runs.append(outcome)
 
     if not parsed_runs:
         raise ProviderError(
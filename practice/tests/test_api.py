@@ -1,5 +1,6 @@
 """API tests (require the [serve] extra: fastapi + lens-contract)."""
 
+import asyncio
 import time
 
 import pytest
@@ -23,21 +24,21 @@ def test_health_and_manifest():
 
 
 def test_feedback_job_lifecycle(monkeypatch):
-    monkeypatch.setattr(
-        api_mod,
-        "practice_feedback",
-        lambda rubric, draft, provider, runs: {"overall": {"score": 75.0}},
-    )
+    async def fake(rubric, draft, provider, runs):
+        return {"overall": {"score": 75.0}}
+
+    monkeypatch.setattr(api_mod, "apractice_feedback", fake)
     resp = client.post(
         "/practice/feedback",
         json={"rubric": RUBRIC, "draft_text": "My draft", "num_runs": 1},
     )
     assert resp.status_code == 202
+    assert resp.json()["status"] == "queued"
     job_id = resp.json()["id"]
 
     for _ in range(50):
         job = client.get(f"/practice/feedback/{job_id}").json()
-        if job["status"] != "running":
+        if job["status"] not in ("queued", "running"):
             break
         time.sleep(0.05)
     assert job["status"] == "done"
@@ -45,23 +46,132 @@ def test_feedback_job_lifecycle(monkeypatch):
 
 
 def test_feedback_job_error_surfaces(monkeypatch):
-    def boom(rubric, draft, provider, runs):
+    async def boom(rubric, draft, provider, runs):
         raise ValueError("Draft is empty")
 
-    monkeypatch.setattr(api_mod, "practice_feedback", boom)
+    monkeypatch.setattr(api_mod, "apractice_feedback", boom)
     job_id = client.post(
         "/practice/feedback",
         json={"rubric": RUBRIC, "draft_text": " ", "num_runs": 1},
     ).json()["id"]
     for _ in range(50):
         job = client.get(f"/practice/feedback/{job_id}").json()
-        if job["status"] != "running":
+        if job["status"] not in ("queued", "running"):
             break
         time.sleep(0.05)
     assert job["status"] == "error"
     assert "empty" in job["error"]
 
 
+def test_full_queue_is_rejected(monkeypatch):
+    import threading
+
+    from feedforward_practice.jobs import JobStore
+
+    release = threading.Event()
+    monkeypatch.setattr(api_mod, "_store", JobStore(concurrency=1, max_queue=1))
+
+    async def held(*args):
+        await asyncio.to_thread(release.wait, 5)
+        return {}
+
+    monkeypatch.setattr(api_mod, "apractice_feedback", held)
+    body = {"rubric": RUBRIC, "draft_text": "My draft", "num_runs": 1}
+    try:
+        client.post("/practice/feedback", json=body)  # running
+        for _ in range(50):
+            if not api_mod._store._queue:
+                break
+            time.sleep(0.01)
+        waiting = client.post("/practice/feedback", json=body).json()
+        assert waiting["queue_position"] == 1
+        assert (
+            client.get(f"/practice/feedback/{waiting['id']}").json()["queue_position"]
+            == 1
+        )
+        assert client.post("/practice/feedback", json=body).status_code == 429
+    finally:
+        release.set()
+
+
+def test_stream_sends_tokens_categories_then_result(monkeypatch):
+    import json
+
+    from feedforward_practice import run as run_mod
+    from tests.test_engine import model_json
+
+    raw = model_json()
+
+    async def fake_stream(cfg, system, user, client):
+        for i in range(0, len(raw), 40):
+            yield raw[i : i + 40]
+
+    monkeypatch.setattr(run_mod, "achat_stream", fake_stream)
+    body = {
+        "rubric": RUBRIC,
+        "draft_text": "My draft",
+        "provider": {"model": "m"},
+    }
+    with client.stream("POST", "/practice/feedback/stream", json=body) as resp:
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        lines = list(resp.iter_lines())
+    events = [ln.removeprefix("event: ") for ln in lines if ln.startswith("event: ")]
+    data = [
+        json.loads(ln.removeprefix("data: ")) for ln in lines if ln.startswith("data: ")
+    ]
+    assert events[0] == "token"
+    assert events.count("category") == 2
+    assert events[-1] == "result"
+    assert events.index("category") < len(events) - 2  # before the stream ends
+    assert "".join(d["text"] for e, d in zip(events, data) if e == "token") == raw
+    assert data[-1]["result"]["overall"]["score"] > 0
+
+
+def test_stream_reports_errors_as_events(monkeypatch):
+    body = {"rubric": RUBRIC, "draft_text": "  "}
+    resp = client.post("/practice/feedback/stream", json=body)
+    assert "event: error" in resp.text
+    assert "empty" in resp.text
+
+
+def test_stream_is_rejected_when_the_queue_is_full(monkeypatch):
+    from feedforward_practice.jobs import JobStore
+
+    store = JobStore(concurrency=1, max_queue=0)
+    monkeypatch.setattr(api_mod, "_store", store)
+    body = {"rubric": RUBRIC, "draft_text": "My draft", "provider": {"model": "m"}}
+    assert client.post("/practice/feedback/stream", json=body).status_code == 429
+
+
+def test_stream_releases_its_slot_when_the_client_goes(monkeypatch):
+    from feedforward_practice import run as run_mod
+    from feedforward_practice.jobs import JobStore
+
+    store = JobStore(concurrency=1)
+    monkeypatch.setattr(api_mod, "_store", store)
+
+    async def endless(cfg, system, user, client):
+        while True:
+            yield "x"
+            await asyncio.sleep(0)
+
+    monkeypatch.setattr(run_mod, "achat_stream", endless)
+    req = api_mod.FeedbackRequest(
+        rubric=RUBRIC, draft_text="My draft", provider={"model": "m"}
+    )
+
+    async def scenario():
+        resp = await api_mod.stream_feedback(req)
+        body = resp.body_iterator
+        assert (await anext(body)).startswith("event: token")
+        assert store._free == 0  # held by the stream
+        await body.aclose()  # what the server does on disconnect
+        async with store.slot():
+            return True
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 5))
+
+
 def test_unknown_job_404():
     assert client.get("/practice/feedback/nope").status_code == 404
 
@@ -0,0 +1,134 @@
+"""Multi-run timing and connection reuse against a local stub
+OpenAI-compatible server (each completion takes ``DELAY`` seconds)."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from feedforward_practice.providers import ProviderConfig
+from feedforward_practice.run import practice_feedback
+from tests.test_engine import RUBRIC, model_json
+
+DELAY = 0.3
+
+
+class _StubServer:
+    def __init__(self):
+        self.connections: set[int] = set()
+        self.requests = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                req = json.loads(
+                    self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                )
+                with stub._lock:
+                    stub.connections.add(self.client_address[1])
+                    stub.requests += 1
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                time.sleep(DELAY)
+                with stub._lock:
+                    stub._in_flight -= 1
+                if req.get("stream"):
+                    return self._send_stream(model_json())
+                body = json.dumps(
+                    {"choices": [{"message": {"content": model_json()}}]}
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_stream(self, text):
+                events = [
+                    {"choices": [{"delta": {"content": text[i : i + 25]}}]}
+                    for i in range(0, len(text), 25)
+                ]
+                body = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
+                body = (body + "data: [DONE]\n\n").encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.config = ProviderConfig(
+            base_url=f"http://127.0.0.1:{self.server.server_port}/v1", model="stub"
+        )
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def stub():
+    server = _StubServer()
+    yield server
+    server.close()
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def test_five_runs_take_about_as_long_as_one(stub):
+    one, single = _timed(lambda: practice_feedback(RUBRIC, "A draft.", stub.config, 1))
+    five, multi = _timed(lambda: practice_feedback(RUBRIC, "A draft.", stub.config, 5))
+    assert five["runs"] == 5 and five["failed_runs"] == 0
+    assert multi < 2 * DELAY + single
+    assert stub.max_in_flight == 5
+    assert five["overall"]["score"] == one["overall"]["score"]
+
+
+def test_concurrency_limit_is_respected(stub, monkeypatch):
+    from feedforward_practice import run as run_mod
+
+    monkeypatch.setattr(run_mod, "RUN_CONCURRENCY", 2)
+    _, elapsed = _timed(lambda: practice_feedback(RUBRIC, "A draft.", stub.config, 4))
+    assert stub.max_in_flight == 2
+    assert elapsed >= 2 * DELAY
+
+
+def test_sequential_runs_reuse_connections(stub, monkeypatch):
+    from feedforward_practice import run as run_mod
+
+    monkeypatch.setattr(run_mod, "RUN_CONCURRENCY", 1)
+    practice_feedback(RUBRIC, "A draft.", stub.config, 3)
+    assert stub.requests == 3
+    assert len(stub.connections) == 1
+
+
+def test_streamed_run_yields_tokens_then_matching_result(stub):
+    import asyncio
+
+    from feedforward_practice.run import astream_practice_feedback
+
+    async def collect():
+        stream = astream_practice_feedback(RUBRIC, "A draft.", stub.config, 3)
+        return [e async for e in stream]
+
+    events = asyncio.run(collect())
+    kinds = [e["event"] for e in events]
+    assert kinds[-1] == "result" and kinds.count("category") == 2
+    assert "".join(e["text"] for e in events if e["event"] == "token") == model_json()
+    result = events[-1]["result"]
+    assert result["runs"] == 3
+    assert result == practice_feedback(RUBRIC, "A draft.", stub.config, 3)
@@ -104,3 +104,25 @@ def test_aggregate_weighted_mean_and_levels():
 def test_levels_match_shared_contract():
     assert level_for(95)["label"] == "On the bullseye"
     assert level_for(50)["color"] == "red"
+
+
+def test_category_stream_emits_each_category_once_complete():
+    raw = "Here you go:\n```json\n" + model_json() + "\n```"
+    stream = engine.CategoryStream(RUBRIC)
+    emitted = []
+    for i in range(0, len(raw), 7):  # small, arbitrary chunk boundaries
+        emitted.append([c["name"] for c in stream.feed(raw[i : i + 7])])
+    names = [n for chunk in emitted for n in chunk]
+    assert names == ["Argument", "Evidence"]
+    # Argument is reported before the Evidence object has been written
+    first_at = next(i for i, chunk in enumerate(emitted) if chunk)
+    assert first_at * 7 < raw.index('"evidence"')
+    assert stream.text == raw
+
+
+def test_category_stream_matches_parse_response():
+    stream = engine.CategoryStream(RUBRIC)
+    streamed = stream.feed(model_json())
+    parsed = engine.parse_response(model_json(), RUBRIC)["categories"]
+    assert [{k: v for k, v in c.items() if k != "level"} for c in streamed] == parsed
+    assert streamed[0]["level"] == level_for(80)
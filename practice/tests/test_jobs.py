@@ -0,0 +1,189 @@
+"""Job store tests: bounded concurrency, queue position, TTL/LRU, SQLite."""
+
+import contextlib
+import threading
+import time
+
+import pytest
+
+from feedforward_practice.jobs import JobStore, QueueFullError
+
+
+def _wait(store, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_concurrency_is_capped_and_queue_positions_reported():
+    store = JobStore(concurrency=2)
+    release = threading.Event()
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        release.wait(5)
+        with lock:
+            running[0] -= 1
+        return "ok"
+
+    ids = [store.submit(work)["id"] for _ in range(5)]
+    time.sleep(0.1)
+    assert [store.get(i).get("queue_position") for i in ids[2:]] == [1, 2, 3]
+    release.set()
+    assert all(_wait(store, i)["result"] == "ok" for i in ids)
+    assert peak[0] == 2
+
+
+def test_errors_are_reported():
+    store = JobStore()
+
+    def boom():
+        raise ValueError("Draft is empty")
+
+    job = _wait(store, store.submit(boom)["id"])
+    assert job == {"id": job["id"], "status": "error", "error": "Draft is empty"}
+
+
+def test_async_jobs_share_each_workers_loop():
+    import asyncio
+
+    store = JobStore(concurrency=1)
+
+    async def which_loop():
+        await asyncio.sleep(0)
+        return id(asyncio.get_running_loop())
+
+    first = _wait(store, store.submit(which_loop)["id"])
+    second = _wait(store, store.submit(which_loop)["id"])
+    assert first["status"] == "done"
+    assert first["result"] == second["result"]
+
+
+def test_slots_are_shared_with_pooled_jobs():
+    import asyncio
+
+    store = JobStore(concurrency=1, max_queue=2)
+
+    async def enter_and_leave():
+        async with store.slot():
+            pass
+
+    async def scenario():
+        async with store.slot():
+            job_id = store.submit(lambda: "ran")["id"]
+            waiter = asyncio.create_task(enter_and_leave())
+            await asyncio.sleep(0.1)
+            assert store.get(job_id) == {
+                "id": job_id,
+                "status": "queued",
+                "queue_position": 1,
+            }
+            assert store.queue_full()
+            with pytest.raises(QueueFullError):
+                await enter_and_leave()
+        await waiter
+        return job_id
+
+    job_id = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert _wait(store, job_id)["result"] == "ran"
+
+
+def test_slots_are_granted_in_queue_order():
+    import asyncio
+
+    store = JobStore(concurrency=1)
+    release = threading.Event()
+    order = []
+
+    async def scenario():
+        first = store.submit(lambda: release.wait(5))["id"]
+        second = store.submit(lambda: order.append("job"))["id"]
+
+        async def stream():
+            async with store.slot():
+                order.append("stream")
+
+        waiter = asyncio.create_task(stream())
+        await asyncio.sleep(0.1)
+        assert store.get(second)["queue_position"] == 1
+        release.set()
+        await waiter
+        return first
+
+    first = asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert _wait(store, first)["status"] == "done"
+    assert order == ["job", "stream"]
+
+
+def test_cancelled_slot_holder_frees_the_slot():
+    import asyncio
+
+    store = JobStore(concurrency=1)
+
+    async def scenario():
+        entered = asyncio.Event()
+
+        async def hold():
+            async with store.slot():
+                entered.set()
+                await asyncio.sleep(30)
+
+        task = asyncio.create_task(hold())
+        await entered.wait()
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        async with store.slot():  # free again
+            return True
+
+    assert asyncio.run(asyncio.wait_for(scenario(), 5))
+
+
+def test_queue_cap():
+    store = JobStore(concurrency=1, max_queue=1)
+    release = threading.Event()
+    store.submit(lambda: release.wait(5))
+    time.sleep(0.05)
+    store.submit(lambda: None)
+    with pytest.raises(QueueFullError):
+        store.submit(lambda: None)
+    release.set()
+
+
+def test_finished_jobs_expire_after_ttl():
+    store = JobStore(ttl=0.05)
+    job_id = _wait(store, store.submit(lambda: 1)["id"])["id"]
+    time.sleep(0.1)
+    assert store.get(job_id) is None
+
+
+def test_least_recently_polled_finished_jobs_are_evicted():
+    store = JobStore(max_jobs=2)
+    a = _wait(store, store.submit(lambda: 1)["id"])["id"]
+    b = _wait(store, store.submit(lambda: 2)["id"])["id"]
+    store.get(a)  # a is now more recent than b
+    c = _wait(store, store.submit(lambda: 3)["id"])["id"]
+    assert store.get(b) is None
+    assert store.get(a)["result"] == 1 and store.get(c)["result"] == 3
+
+
+def test_sqlite_persistence_survives_a_new_store(tmp_path):
+    db = str(tmp_path / "jobs.db")
+    first = JobStore(db_path=db)
+    job_id = _wait(first, first.submit(lambda: {"score": 70})["id"])["id"]
+    first.shutdown()
+
+    second = JobStore(db_path=db)
+    assert second.get(job_id) == {
+        "id": job_id,
+        "status": "done",
+        "result": {"score": 70},
+    }
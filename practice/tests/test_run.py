@@ -9,8 +9,17 @@ from feedforward_practice.providers import ProviderConfig, ProviderError
 from tests.test_engine import RUBRIC, model_json
 
 
+def _as_async(fn):
+    """Adapt a sync (cfg, system, user) stub to the async ``achat`` shape."""
+
+    async def stub(cfg, system, user, client=None):
+        return fn(cfg, system, user)
+
+    return stub
+
+
 def test_practice_feedback_happy_path(monkeypatch):
-    monkeypatch.setattr(run_mod, "chat", lambda cfg, s, u: model_json())
+    monkeypatch.setattr(run_mod, "achat", _as_async(lambda cfg, s, u: model_json()))
     result = run_mod.practice_feedback(RUBRIC, "A draft.", ProviderConfig(model="m"))
     assert result["overall"]["score"] > 0
     assert result["failed_runs"] == 0
@@ -26,7 +35,7 @@ def test_partial_run_failures_tolerated(monkeypatch):
             raise item
         return item
 
-    monkeypatch.setattr(run_mod, "chat", flaky)
+    monkeypatch.setattr(run_mod, "achat", _as_async(flaky))
     result = run_mod.practice_feedback(
         RUBRIC, "A draft.", ProviderConfig(model="m"), num_runs=2
     )
@@ -38,7 +47,7 @@ def test_all_failures_raise(monkeypatch):
     def broken(cfg, s, u):
         raise ProviderError("endpoint down")
 
-    monkeypatch.setattr(run_mod, "chat", broken)
+    monkeypatch.setattr(run_mod, "achat", _as_async(broken))
     with pytest.raises(ProviderError, match="endpoint down"):
         run_mod.practice_feedback(RUBRIC, "A draft.", ProviderConfig(model="m"))
 
@@ -49,11 +58,23 @@ def test_empty_draft_rejected():
 
 
 def test_unparseable_model_output(monkeypatch):
-    monkeypatch.setattr(run_mod, "chat", lambda c, s, u: "I cannot help with that.")
+    monkeypatch.setattr(
+        run_mod, "achat", _as_async(lambda c, s, u: "I cannot help with that.")
+    )
     with pytest.raises(ProviderError, match="No JSON object"):
         run_mod.practice_feedback(RUBRIC, "A draft.", ProviderConfig(model="m"))
 
 
+def test_sync_wrapper_refuses_a_running_loop():
+    import asyncio
+
+    async def from_async_code():
+        run_mod.practice_feedback(RUBRIC, "A draft.", ProviderConfig(model="m"))
+
+    with pytest.raises(RuntimeError, match="apractice_feedback"):
+        asyncio.run(from_async_code())
+
+
 def test_num_runs_clamped(monkeypatch):
     counter = {"n": 0}
 
@@ -61,7 +82,7 @@ def test_num_runs_clamped(monkeypatch):
         counter["n"] += 1
         return model_json()
 
-    monkeypatch.setattr(run_mod, "chat", counting)
+    monkeypatch.setattr(run_mod, "achat", _as_async(counting))
     run_mod.practice_feedback(RUBRIC, "d", ProviderConfig(model="m"), num_runs=99)
     assert counter["n"] == 5
 
@@ -21,38 +21,52 @@ import pytest
 @pytest.fixture(autouse=True)
 def _clean_tables():
     """Wipe signal/draft rows between tests so state doesn't leak."""
-    from app.models.assessment import assessment_types, submission_files
+    from app.models.assessment import (
+        assessment_services,
+        assessment_types,
+        extracted_texts,
+        file_blobs,
+        submission_files,
+    )
     from app.models.assignment import assignments, rubric_categories, rubrics
     from app.models.course import courses, enrollments
     from app.models.feedback import (
         aggregated_feedback,
         category_scores,
         drafts,
+        feedback_batches,
         feedback_items,
         model_runs,
+        progress_snapshots,
     )
     from app.models.signal_rules import signal_rules
-    from app.models.signals import signals
+    from app.models.signals import signal_backfill, signals
 
     tables = (
         signals,
+        signal_backfill,
         signal_rules,
         category_scores,
         feedback_items,
         aggregated_feedback,
         model_runs,
+        progress_snapshots,
+        feedback_batches,
         rubric_categories,
         rubrics,
         drafts,
         submission_files,
+        extracted_texts,
         assignments,
         assessment_types,
+        assessment_services,
         courses,
         enrollments,
     )
     for table in tables:
         for row in list(table()):
             table.delete(row.id)
+    file_blobs.delete_where()
     yield
 
 
@@ -65,3 +79,25 @@ def _reset_rate_limiter():
     rate_limit._BUCKETS.clear()
     yield
     rate_limit._BUCKETS.clear()
+
+
+@pytest.fixture(autouse=True)
+def _reset_user_cache():
+    """Tests write users rows directly; don't let the identity cache see
+    a previous test's version of an account."""
+    from app.models.user import clear_user_cache
+
+    clear_user_cache()
+    yield
+    clear_user_cache()
+
+
+@pytest.fixture(autouse=True)
+def _reset_analyser_breakers():
+    """Analyser circuit breakers are per-process; a test that fails calls
+    must not leave the next one facing an open circuit."""
+    from app.utils import analyser_client
+
+    analyser_client.reset_breakers()
+    yield
+    analyser_client.reset_breakers()
@@ -0,0 +1,83 @@
+"""Tests for the instructor recent-activity feed query."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.assignment import Assignment, assignments
+from app.models.course import Course, courses
+from app.models.feedback import Draft, drafts
+from app.services.activity import activity_marker, recent_activity
+
+MINE = "feed-mine@test.local"
+OTHER = "feed-other@test.local"
+T0 = datetime(2026, 10, 1, 9, 0)
+
+
+def _assignment(instructor, title):
+    course = courses.insert(
+        Course(code="C", title=f"{title} course", instructor_email=instructor)
+    )
+    return assignments.insert(Assignment(course_id=course.id, title=title))
+
+
+def _draft(assignment, minutes, status="submitted"):
+    return drafts.insert(
+        Draft(
+            assignment_id=assignment.id,
+            student_email="s@test.local",
+            version=1,
+            submission_date=(T0 + timedelta(minutes=minutes)).isoformat(),
+            status=status,
+        )
+    )
+
+
+@pytest.fixture
+def feed():
+    mine = _assignment(MINE, "Mine")
+    other = _assignment(OTHER, "Other")
+    mine_drafts = [_draft(mine, m) for m in range(3)]
+    # the other instructor's drafts are all newer than ours
+    other_drafts = [_draft(other, 100 + m) for m in range(20)]
+    return mine_drafts, other_drafts
+
+
+def test_newest_first_and_only_this_instructors_courses(feed):
+    mine_drafts, _ = feed
+    items = recent_activity(MINE, limit=10)
+    assert [i["draft_id"] for i in items] == [d.id for d in reversed(mine_drafts)]
+    assert items[0]["assignment_title"] == "Mine"
+    assert items[0]["course_title"] == "Mine course"
+
+
+def test_limit_applies_per_instructor(feed):
+    _, other_drafts = feed
+    items = recent_activity(OTHER, limit=5)
+    assert [i["draft_id"] for i in items] == [d.id for d in other_drafts[::-1][:5]]
+    assert len(recent_activity(MINE, limit=2)) == 2
+
+
+def test_marker_changes_with_new_drafts_and_status_changes(feed):
+    mine_drafts, _ = feed
+    marker = activity_marker(recent_activity(MINE, limit=10))
+    assert activity_marker(recent_activity(MINE, limit=10)) == marker
+
+    drafts.update({"status": "feedback_ready"}, pk_values=mine_drafts[0].id)
+    changed = activity_marker(recent_activity(MINE, limit=10))
+    assert changed != marker
+
+    _draft(assignments[mine_drafts[0].assignment_id], 50)
+    assert activity_marker(recent_activity(MINE, limit=10)) != changed
+
+
+def test_feed_query_reads_drafts_through_an_index():
+    plan = drafts.db.execute(
+        "EXPLAIN QUERY PLAN SELECT d.id FROM courses c "
+        "JOIN assignments a ON a.course_id = c.id "
+        "JOIN drafts d ON d.assignment_id = a.id "
+        "WHERE c.instructor_email = ? ORDER BY d.submission_date DESC LIMIT 5",
+        [MINE],
+    ).fetchall()
+    details = [str(row[-1]) for row in plan]
+    assert not any(d.startswith("SCAN d") for d in details), details
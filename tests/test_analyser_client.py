@@ -125,3 +125,78 @@ def test_service_health_handles_non_200(monkeypatch):
     results = analyser_client.service_health()
     assert all(not r["ok"] for r in results)
     assert all(r["error"] == "HTTP 503" for r in results)
+
+
+# ---- circuit breaker ----
+
+
+def _counting_post(monkeypatch, exc=None, status=200):
+    calls = []
+
+    class FakeResp:
+        status_code = status
+
+        def raise_for_status(self):
+            if status >= 400:
+                raise requests.HTTPError(f"HTTP {status}", response=self)
+
+        def json(self):
+            return {"ok": True}
+
+    def post(*args, **kwargs):
+        calls.append(args[0])
+        if exc:
+            raise exc
+        return FakeResp()
+
+    monkeypatch.setattr(analyser_client.requests, "post", post)
+    return calls
+
+
+def test_circuit_opens_after_consecutive_failures(monkeypatch):
+    calls = _counting_post(monkeypatch, exc=requests.ConnectTimeout("timed out"))
+    for _ in range(analyser_client.BREAKER_THRESHOLD + 2):
+        assert analyser_client.analyse_text("an essay") is None
+    assert len(calls) == analyser_client.BREAKER_THRESHOLD
+    circuit = analyser_client.breaker("document-analyser")
+    assert circuit.state == analyser_client.OPEN
+    # other analysers have their own circuit
+    assert analyser_client.breaker("cite-sight").state == analyser_client.CLOSED
+
+
+def test_half_open_trial_closes_the_circuit_on_success(monkeypatch):
+    _counting_post(monkeypatch, exc=requests.ConnectionError("refused"))
+    circuit = analyser_client.breaker("document-analyser")
+    circuit.cooldown = 0
+    for _ in range(circuit.threshold):
+        analyser_client.analyse_text("an essay")
+    assert circuit.state == analyser_client.HALF_OPEN
+
+    assert circuit.allow()  # the single trial call
+    assert not circuit.allow()  # nobody else while it runs
+    circuit.record_success()
+    assert circuit.state == analyser_client.CLOSED
+
+    calls = _counting_post(monkeypatch)
+    assert analyser_client.analyse_text("an essay") == {"ok": True}
+    assert len(calls) == 1
+
+
+def test_failed_trial_reopens_the_circuit(monkeypatch):
+    circuit = analyser_client.breaker("cite-sight")
+    circuit.cooldown = 0
+    for _ in range(circuit.threshold):
+        circuit.record_failure()
+    assert circuit.allow()
+    circuit.cooldown = 60
+    circuit.record_failure()
+    assert circuit.state == analyser_client.OPEN
+    assert not circuit.allow()
+
+
+def test_client_errors_do_not_trip_the_circuit(monkeypatch):
+    calls = _counting_post(monkeypatch, status=422)
+    for _ in range(analyser_client.BREAKER_THRESHOLD + 1):
+        assert analyser_client.analyse_code("x = 1", "a.py") is None
+    assert len(calls) == analyser_client.BREAKER_THRESHOLD + 1
+    assert analyser_client.breaker("code-analyser").available()
@@ -0,0 +1,198 @@
+"""Tests for the cohort-level progression analytics."""
+
+import csv
+from io import StringIO
+
+import pytest
+
+from app.services import cohort_analytics
+from app.utils.csv_export import COHORT_FIELDS, build_cohort_csv
+
+ASSIGNMENT = 11
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    cohort_analytics._cache.clear()
+    cohort_analytics._revisions.clear()
+    yield
+    cohort_analytics._cache.clear()
+    cohort_analytics._revisions.clear()
+
+
+def _rubric():
+    from app.models.assignment import (
+        Rubric,
+        RubricCategory,
+        rubric_categories,
+        rubrics,
+    )
+
+    rubric = rubrics.insert(Rubric(assignment_id=ASSIGNMENT, assessment_type_id=0))
+    return [
+        rubric_categories.insert(
+            RubricCategory(rubric_id=rubric.id, name=name, description="", weight=w)
+        )
+        for name, w in (("Structure", 3.0), ("Clarity", 1.0))
+    ]
+
+
+def _scored(student, version, cats, scores):
+    from app.models.feedback import (
+        AggregatedFeedback,
+        Draft,
+        aggregated_feedback,
+        drafts,
+    )
+
+    draft = drafts.insert(
+        Draft(
+            assignment_id=ASSIGNMENT,
+            student_email=student,
+            version=version,
+            content="",
+            status="feedback_ready",
+        )
+    )
+    rows = [
+        aggregated_feedback.insert(
+            AggregatedFeedback(
+                draft_id=draft.id,
+                category_id=cat.id,
+                aggregated_score=score,
+                status="pending_review",
+            )
+        )
+        for cat, score in zip(cats, scores)
+    ]
+    return draft, rows
+
+
+def _cohort():
+    cats = _rubric()
+    # Structure improves a lot, Clarity barely; "c" only submitted once.
+    _scored("a@x", 1, cats, [40.0, 70.0])
+    _scored("a@x", 2, cats, [60.0, 70.0])
+    _scored("a@x", 3, cats, [80.0, 72.0])
+    _scored("b@x", 1, cats, [50.0, 80.0])
+    _scored("b@x", 3, cats, [70.0, 78.0])
+    _scored("c@x", 1, cats, [90.0, 90.0])
+    return cats
+
+
+def _row(rows, category, **match):
+    return next(
+        r
+        for r in rows
+        if r["category"] == category and all(r[k] == v for k, v in match.items())
+    )
+
+
+def test_bands_per_version_and_category():
+    _cohort()
+    analytics = cohort_analytics.cohort_analytics(ASSIGNMENT)
+    assert analytics["students"] == 3
+    assert analytics["versions"] == [1, 2, 3]
+
+    structure_v1 = _row(analytics["bands"], "Structure", version=1)
+    assert structure_v1["n"] == 3
+    assert structure_v1["mean"] == 60.0
+    assert (structure_v1["p10"], structure_v1["p50"], structure_v1["p90"]) == (
+        40.0,
+        50.0,
+        90.0,
+    )
+    # Overall is weighted 3:1 — a's draft 1 is (3*40 + 70) / 4
+    assert _row(analytics["bands"], "Overall", version=1)["p10"] == 47.5
+
+
+def test_deltas_and_first_to_latest_improvement():
+    _cohort()
+    analytics = cohort_analytics.cohort_analytics(ASSIGNMENT)
+
+    # Only a@x has both draft 1 and 2
+    assert (
+        _row(analytics["deltas"], "Structure", from_version=1, to_version=2)["n"] == 1
+    )
+    improved = analytics["category_improvement"]
+    assert [r["category"] for r in improved] == ["Structure", "Clarity"]
+    assert improved[0]["mean"] == 30.0  # (+40, +20)
+    assert analytics["improvement"]["n"] == 2  # c@x has a single draft
+    assert sum(count for _, count in analytics["improvement"]["buckets"]) == 2
+
+
+def test_compare_any_two_versions():
+    _cohort()
+    rows = cohort_analytics.compare_versions(ASSIGNMENT, 1, 3)
+    structure = _row(rows, "Structure")
+    assert structure["n"] == 2
+    assert structure["mean"] == 30.0
+    assert _row(rows, "Clarity")["mean"] == 0.0  # +2 and -2
+
+
+def test_cached_until_feedback_changes(monkeypatch):
+    from app.services.feedback_review import apply_review
+
+    cats = _rubric()
+    _scored("a@x", 1, cats, [40.0, 70.0])
+    draft, rows = _scored("a@x", 2, cats, [60.0, 70.0])
+    first = cohort_analytics.cohort_analytics(ASSIGNMENT)
+
+    calls = []
+    real_load = cohort_analytics._load_matrix
+    monkeypatch.setattr(
+        cohort_analytics,
+        "_load_matrix",
+        lambda assignment_id: calls.append(assignment_id) or real_load(assignment_id),
+    )
+    assert cohort_analytics.cohort_analytics(ASSIGNMENT) is first
+    assert calls == []
+
+    apply_review(draft.id, {f"score_{rows[0].id}": "90"}, "i@x", approve=False)
+    refreshed = cohort_analytics.cohort_analytics(ASSIGNMENT)
+    assert calls == [ASSIGNMENT]
+    assert _row(refreshed["deltas"], "Structure", from_version=1)["mean"] == 50.0
+
+
+def test_new_feedback_rows_invalidate_the_cache():
+    cats = _rubric()
+    _scored("a@x", 1, cats, [40.0, 70.0])
+    first = cohort_analytics.cohort_analytics(ASSIGNMENT)
+    _scored("a@x", 2, cats, [60.0, 70.0])
+    refreshed = cohort_analytics.cohort_analytics(ASSIGNMENT)
+    assert refreshed is not first
+    assert _row(refreshed["deltas"], "Structure", from_version=1)["mean"] == 20.0
+
+
+def test_offsetting_edits_invalidate_the_cache():
+    from app.services.feedback_review import apply_review
+
+    cats = _rubric()
+    _scored("a@x", 1, cats, [40.0, 70.0])
+    draft, rows = _scored("a@x", 2, cats, [60.0, 70.0])
+    first = cohort_analytics.cohort_analytics(ASSIGNMENT)
+
+    # Structure +10, Clarity -10: count, max id and score sum are unchanged
+    fields = {f"score_{rows[0].id}": "70", f"score_{rows[1].id}": "60"}
+    apply_review(draft.id, fields, "i@x", approve=False)
+    refreshed = cohort_analytics.cohort_analytics(ASSIGNMENT)
+    assert refreshed is not first
+    assert _row(refreshed["deltas"], "Structure", from_version=1)["mean"] == 30.0
+    assert _row(refreshed["deltas"], "Clarity", from_version=1)["mean"] == -10.0
+
+
+def test_cohort_csv_has_a_row_per_band():
+    _cohort()
+    analytics = cohort_analytics.cohort_analytics(ASSIGNMENT)
+    rows = list(csv.reader(StringIO(build_cohort_csv(analytics))))
+    assert rows[0] == COHORT_FIELDS
+    sections = [r[0] for r in rows[1:]]
+    assert sections.count("score") == len(analytics["bands"])
+    assert sections.count("change") == len(analytics["deltas"])
+    assert rows[1 + len(analytics["bands"]) + 1][:5] == [
+        "change",
+        "Structure",
+        "1->2",
+        "1",
+        "20.0",
+    ]
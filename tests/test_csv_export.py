@@ -105,3 +105,52 @@ def test_csv_missing_attrs_render_empty():
     drafts = [(_Draft(), None)]
     rows = _csv_rows(build_submissions_csv(drafts))
     assert rows[1] == ["", "", "", "", ""]
+
+
+def test_streamed_csv_adds_category_and_assignment_columns():
+    from app.utils.csv_export import iter_submissions_csv
+
+    draft = _Draft(
+        assignment_id=3,
+        assignment_title="Essay",
+        student_email="s@x.com",
+        version=1,
+        status="feedback_ready",
+        submission_date="2026-05-01",
+    )
+    chunks = list(
+        iter_submissions_csv(
+            [(draft, 70.0, {"Clarity": 65.0})],
+            categories=["Structure", "Clarity"],
+            with_assignment=True,
+        )
+    )
+    rows = _csv_rows("".join(chunks))
+    assert rows[0] == [
+        "assignment_id",
+        "assignment_title",
+        *SUBMISSION_FIELDS,
+        "Structure",
+        "Clarity",
+    ]
+    assert rows[1] == [
+        "3",
+        "Essay",
+        "s@x.com",
+        "1",
+        "feedback_ready",
+        "2026-05-01",
+        "70.0",
+        "",
+        "65.0",
+    ]
+
+
+def test_streamed_csv_is_chunked(monkeypatch):
+    from app.utils import csv_export
+
+    monkeypatch.setattr(csv_export, "_FLUSH_ROWS", 2)
+    drafts = [(_Draft(student_email=f"s{i}@x.com"), None, {}) for i in range(5)]
+    chunks = list(csv_export.iter_submissions_csv(drafts))
+    assert len(chunks) == 3  # header + 2 rows, 2 rows, 1 row
+    assert len(_csv_rows("".join(chunks))) == 6
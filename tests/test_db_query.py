@@ -80,3 +80,39 @@ def test_count_matches():
     assert count(signals, draft_id=1) == 2
     assert count(signals, name="a") == 2
     assert count(signals, draft_id=999) == 0
+
+
+# ---- SQL-native filter edge cases ----
+
+
+def test_where_none_matches_null_column():
+    _insert(draft_id=1, name="a")
+    signals.insert(
+        Signal(draft_id=None, source="x", name="b", value=0.0, raw="", created_at="t")
+    )
+    rows = where(signals, draft_id=None)
+    assert [r.name for r in rows] == ["b"]
+
+
+def test_unknown_column_matches_nothing():
+    _insert(draft_id=1)
+    assert where(signals, no_such_column=1) == []
+    assert first(signals, no_such_column=1) is None
+    assert count(signals, no_such_column=1) == 0
+
+
+def test_where_preserves_insertion_order():
+    ids = [_insert(draft_id=7, name=n) for n in ("c", "a", "b")]
+    assert [r.id for r in where(signals, draft_id=7)] == ids
+
+
+def test_text_primary_key_rows_come_back_in_insertion_order():
+    from app.models.user import User, users
+
+    emails = ["zed@example.com", "amy@example.com", "max@example.com"]
+    for email in emails:
+        users.insert(User(email=email, name="", role="student"))
+    assert [u.email for u in where(users, role="student")] == [
+        u.email for u in users() if u.role == "student"
+    ]
+    assert first(users, role="student").email == "zed@example.com"
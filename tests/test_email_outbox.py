@@ -0,0 +1,237 @@
+"""Tests for the pooled SMTP session and the outbound mail queue.
+
+A small in-process SMTP server (in the spirit of aiosmtpd's ``Controller``,
+built on the standard library) records sessions, logins and messages.
+"""
+
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.models.outbox import email_outbox
+from app.utils import email
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.sessions += 1
+        self.reply("220 standin ESMTP")
+        rcpts = []
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-standin")
+                self.reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                server.logins += 1
+                self.reply("235 Authentication successful")
+            elif verb == "MAIL":
+                rcpts = []
+                if server.refuse_sender > 0:
+                    server.refuse_sender -= 1
+                    self.reply("451 Sender temporarily rejected")
+                else:
+                    self.reply("250 OK")
+            elif verb == "RCPT":
+                address = line.split(":", 1)[1].strip("<> ")
+                if address in server.reject:
+                    self.reply("550 No such user")
+                elif address in server.defer:
+                    self.reply("450 Mailbox busy, try again later")
+                else:
+                    rcpts.append(address)
+                    self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                body = []
+                while (data := self.rfile.readline()) not in (b".\r\n", b""):
+                    body.append(data.decode())
+                if server.fail_data > 0:
+                    server.fail_data -= 1
+                    self.reply("451 Try again later")
+                else:
+                    server.messages.append((rcpts, "".join(body)))
+                    self.reply("250 Queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:  # RSET, NOOP
+                self.reply("250 OK")
+
+
+class StandInSMTP(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.sessions = 0
+        self.logins = 0
+        self.messages = []
+        self.reject = set()
+        self.defer = set()
+        self.refuse_sender = 0
+        self.fail_data = 0
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    server = StandInSMTP()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(email, "SMTP_SERVER", "127.0.0.1")
+    monkeypatch.setattr(email, "SMTP_PORT", server.server_address[1])
+    monkeypatch.setattr(email, "SMTP_USE_TLS", False)
+    monkeypatch.setattr(email, "SMTP_USER", "mailer")
+    monkeypatch.setattr(email, "SMTP_PASSWORD", "secret")
+    monkeypatch.setattr(email, "SMTP_FROM", "noreply@example.com")
+    monkeypatch.setattr(email, "EMAIL_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(email, "_connection", email.SMTPConnection())
+    email_outbox.delete_where()
+    yield server
+    email.stop_mail_worker()
+    email_outbox.delete_where()
+    server.shutdown()
+    server.server_close()
+
+
+def test_messages_share_one_authenticated_session(smtp):
+    for i in range(5):
+        assert email.send_with_smtp(f"user{i}@example.com", "Hi", "Body") == (
+            True,
+            "Email sent successfully via SMTP",
+        )
+    assert len(smtp.messages) == 5
+    assert smtp.sessions == 1
+    assert smtp.logins == 1
+
+
+def test_idle_session_is_closed_and_reopened(smtp, monkeypatch):
+    email.send_with_smtp("a@example.com", "Hi", "Body")
+    monkeypatch.setattr(email, "SMTP_IDLE_TIMEOUT", 0)
+    email.send_with_smtp("b@example.com", "Hi", "Body")
+    assert smtp.sessions == 2
+    assert len(smtp.messages) == 2
+
+
+def test_queue_delivers_in_order_over_one_session(smtp):
+    for i in range(3):
+        assert email.queue_verification_email(f"user{i}@example.com", f"tok{i}")
+    # the worker started by queue_email drains the outbox
+    deadline = time.time() + 5
+    while email_outbox.count and time.time() < deadline:
+        time.sleep(0.01)
+    assert email_outbox.count == 0
+    assert [rcpts for rcpts, _ in smtp.messages] == [
+        ["user0@example.com"],
+        ["user1@example.com"],
+        ["user2@example.com"],
+    ]
+    assert "tok0" in smtp.messages[0][1]
+    assert smtp.sessions == 1
+
+
+def test_temporary_failure_is_retried_with_backoff(smtp, monkeypatch):
+    monkeypatch.setattr(email, "start_mail_worker", lambda: None)
+    smtp.fail_data = 1
+    email.queue_email("a@example.com", "Hi", "Body")
+    email.deliver_due()
+    (row,) = email_outbox()
+    assert row.status == "queued"
+    assert row.attempts == 1
+    assert "451" in row.last_error
+
+    email.deliver_due()  # backoff is 0 here, so it is due again
+    assert email_outbox.count == 0
+    assert len(smtp.messages) == 1
+    assert smtp.sessions == 1  # a per-message error keeps the session
+
+
+def test_backoff_doubles_and_gives_up(smtp, monkeypatch):
+    monkeypatch.setattr(email, "start_mail_worker", lambda: None)
+    monkeypatch.setattr(email, "EMAIL_RETRY_BACKOFF", 10)
+    smtp.fail_data = 99
+    email.queue_email("a@example.com", "Hi", "Body")
+    email.deliver_due()
+    (row,) = email_outbox()
+    wait = email.deliver_due()  # not due yet: nothing is sent
+    assert 0 < wait <= 10
+    assert email_outbox[row.id].attempts == 1
+
+    monkeypatch.setattr(email, "EMAIL_MAX_ATTEMPTS", 2)
+    email_outbox.update({"next_attempt_at": row.created_at}, pk_values=row.id)
+    email.deliver_due()
+    assert email_outbox[row.id].status == "failed"
+    assert email_outbox[row.id].attempts == 2
+
+
+def test_rejected_recipient_is_not_retried(smtp, monkeypatch):
+    monkeypatch.setattr(email, "start_mail_worker", lambda: None)
+    smtp.reject.add("gone@example.com")
+    email.queue_email("gone@example.com", "Hi", "Body")
+    email.queue_email("ok@example.com", "Hi", "Body")
+    email.deliver_due()
+    (row,) = email_outbox()
+    assert row.to_email == "gone@example.com"
+    assert row.status == "failed"
+    assert [rcpts for rcpts, _ in smtp.messages] == [["ok@example.com"]]
+
+
+def test_deferred_recipient_is_retried_without_holding_up_the_round(smtp, monkeypatch):
+    monkeypatch.setattr(email, "start_mail_worker", lambda: None)
+    monkeypatch.setattr(email, "EMAIL_RETRY_BACKOFF", 5)
+    smtp.defer.add("busy@example.com")
+    email.queue_email("busy@example.com", "Hi", "Body")
+    email.queue_email("ok@example.com", "Hi", "Body")
+    assert 0 < email.deliver_due() <= 5  # look again when the deferral is due
+    rows = {r.to_email: r for r in email_outbox()}
+    assert rows["busy@example.com"].status == "queued"
+    assert rows["busy@example.com"].attempts == 1
+    assert "450" in rows["busy@example.com"].last_error
+    assert "ok@example.com" not in rows  # delivered in the same round
+    assert [rcpts for rcpts, _ in smtp.messages] == [["ok@example.com"]]
+
+    smtp.defer.clear()
+    for row in email_outbox():
+        email_outbox.update({"next_attempt_at": row.created_at}, pk_values=row.id)
+    email.deliver_due()
+    assert email_outbox.count == 0
+
+
+def test_refused_sender_is_retried_and_stops_the_round(smtp, monkeypatch):
+    monkeypatch.setattr(email, "start_mail_worker", lambda: None)
+    monkeypatch.setattr(email, "EMAIL_RETRY_BACKOFF", 5)
+    smtp.refuse_sender = 1
+    email.queue_email("a@example.com", "Hi", "Body")
+    email.queue_email("b@example.com", "Hi", "Body")
+    assert email.deliver_due() == 5
+    rows = sorted(email_outbox(), key=lambda r: r.id)
+    assert [r.status for r in rows] == ["queued", "queued"]
+    assert [r.attempts for r in rows] == [1, 0]
+
+
+def test_unreachable_server_stops_the_round(smtp, monkeypatch):
+    monkeypatch.setattr(email, "start_mail_worker", lambda: None)
+    monkeypatch.setattr(email, "EMAIL_RETRY_BACKOFF", 5)
+    email.queue_email("a@example.com", "Hi", "Body")
+    email.queue_email("b@example.com", "Hi", "Body")
+    smtp.shutdown()
+    smtp.server_close()
+    assert email.deliver_due() == 5
+    attempts = sorted(r.attempts for r in email_outbox())
+    assert attempts == [0, 1]  # the second message was not tried
+
+
+def test_queue_refuses_without_smtp(monkeypatch):
+    monkeypatch.setattr(email, "SMTP_SERVER", "")
+    assert not email.queue_email("a@example.com", "Hi", "Body")
+    assert email_outbox.count == 0
@@ -0,0 +1,371 @@
+"""Tests for batch-API feedback runs against a local stub of the OpenAI
+files/batches endpoints."""
+
+import asyncio
+import json
+import re
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import evidence, feedback_batch
+from app.services.evidence import EvidenceResult
+from app.services.feedback_batch import BatchFeedbackRunner
+from app.services.feedback_generator import FeedbackGenerator
+
+REPLY = json.dumps(
+    {
+        "criteria_feedback": [
+            {
+                "criterion_name": "Clarity",
+                "strengths": ["Clear"],
+                "improvements": [],
+                "score": 80,
+            }
+        ],
+        "overall_feedback": {"summary": "Good", "score": 80},
+    }
+)
+
+
+class _StubBatchServer:
+    """Minimal OpenAI batch API: files are stored, batches complete instantly
+    (or stay ``in_progress`` until ``finish()``), one canned reply per request."""
+
+    def __init__(self, hold=False, fail_ids=()):
+        self.files: dict[str, str] = {}
+        self.batches: dict[str, dict] = {}
+        self.hold = hold
+        self.fail_ids = set(fail_ids)
+        self._n = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body: bytes):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path.endswith("/files"):
+                    fid = stub._id("file")
+                    stub.files[fid] = "\n".join(
+                        line
+                        for line in data.decode(errors="replace").splitlines()
+                        if line.startswith('{"custom_id"')
+                    )
+                    self._send(
+                        json.dumps(
+                            {
+                                "id": fid,
+                                "object": "file",
+                                "bytes": len(data),
+                                "created_at": 0,
+                                "filename": "in.jsonl",
+                                "purpose": "batch",
+                                "status": "processed",
+                            }
+                        ).encode()
+                    )
+                elif self.path.endswith("/batches"):
+                    req = json.loads(data)
+                    batch = {
+                        "id": stub._id("batch"),
+                        "object": "batch",
+                        "endpoint": req["endpoint"],
+                        "input_file_id": req["input_file_id"],
+                        "completion_window": "24h",
+                        "status": "in_progress",
+                        "created_at": 0,
+                    }
+                    stub.batches[batch["id"]] = batch
+                    if not stub.hold:
+                        stub._complete(batch)
+                    self._send(json.dumps(batch).encode())
+
+            def do_GET(self):
+                m = re.search(r"/batches/([^/]+)$", self.path)
+                if m:
+                    return self._send(json.dumps(stub.batches[m.group(1)]).encode())
+                m = re.search(r"/files/([^/]+)/content$", self.path)
+                if m:
+                    return self._send(stub.files[m.group(1)].encode())
+                self.send_response(404)
+                self.end_headers()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1"
+
+    def _id(self, prefix):
+        self._n += 1
+        return f"{prefix}-{self._n}"
+
+    def _complete(self, batch):
+        out, err = [], []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            req = json.loads(line)
+            if req["custom_id"] in self.fail_ids:
+                err.append(
+                    json.dumps(
+                        {
+                            "custom_id": req["custom_id"],
+                            "response": None,
+                            "error": {"code": "bad", "message": "boom"},
+                        }
+                    )
+                )
+                continue
+            body = {
+                "id": "c",
+                "object": "chat.completion",
+                "created": 0,
+                "model": req["body"]["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": REPLY},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 100,
+                    "completion_tokens": 20,
+                    "total_tokens": 120,
+                },
+            }
+            out.append(
+                json.dumps(
+                    {
+                        "custom_id": req["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                        "error": None,
+                    }
+                )
+            )
+        batch["status"] = "completed"
+        batch["output_file_id"] = self._id("file")
+        self.files[batch["output_file_id"]] = "\n".join(out)
+        if err:
+            batch["error_file_id"] = self._id("file")
+            self.files[batch["error_file_id"]] = "\n".join(err)
+
+    def finish(self):
+        for batch in self.batches.values():
+            if batch["status"] != "completed":
+                self._complete(batch)
+
+    def close(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def stub():
+    server = _StubBatchServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def batch_model(stub):
+    from app.models.config import AIModel, ai_models
+
+    model = ai_models.insert(
+        AIModel(
+            name="Batch stub",
+            provider="openai",
+            model_id="gpt-4o-mini",
+            api_config=json.dumps({"api_base": stub.url, "api_key": "sk-test"}),
+            owner_type="system",
+            active=True,
+        )
+    )
+    yield model
+    ai_models.delete(model.id)
+
+
+def _assignment_with_drafts(n=2):
+    from app.models.assignment import (
+        Assignment,
+        Rubric,
+        RubricCategory,
+        assignments,
+        rubric_categories,
+        rubrics,
+    )
+    from app.models.feedback import Draft, drafts
+
+    a = assignments.insert(
+        Assignment(
+            course_id=1,
+            title="Essay",
+            description="Argue.",
+            max_drafts=2,
+            created_by="inst@example.com",
+            status="active",
+            created_at=datetime.now().isoformat(),
+        )
+    )
+    r = rubrics.insert(Rubric(assignment_id=a.id, assessment_type_id=1))
+    rubric_categories.insert(
+        RubricCategory(rubric_id=r.id, name="Clarity", description="", weight=100)
+    )
+    ds = [
+        drafts.insert(
+            Draft(
+                assignment_id=a.id,
+                student_email=f"s{i}@example.com",
+                version=1,
+                content=f"student text {i}",
+                status="submitted",
+                submission_date=datetime.now().isoformat(),
+            )
+        )
+        for i in range(n)
+    ]
+    return a, ds
+
+
+def _generator(models):
+    gen = FeedbackGenerator()
+    gen._get_instructor_active_models = lambda email: models
+    gen._get_assignment_settings = lambda aid: SimpleNamespace(
+        num_runs=1,
+        feedback_style_id=None,
+        feedback_level="both",
+        aggregation_method_id=None,
+    )
+    return gen
+
+
+@pytest.fixture(autouse=True)
+def _no_signals(monkeypatch):
+    async def produce(self, draft, assignment, settings):
+        return EvidenceResult(kind="signals", model_run_id=None, success=False)
+
+    monkeypatch.setattr(evidence.SignalEvidenceSource, "produce", produce)
+
+
+async def test_batch_run_stores_feedback_for_every_draft(stub, batch_model):
+    from app.models.feedback import (
+        aggregated_feedback,
+        drafts,
+        feedback_batches,
+        model_runs,
+    )
+
+    a, ds = _assignment_with_drafts(2)
+    runner = BatchFeedbackRunner(_generator([batch_model]), poll_interval=0, timeout=5)
+    summary = await runner.run_assignment(a.id)
+
+    assert summary == {"drafts": 2, "batches": 1, "requests": 2}
+    (job,) = feedback_batches()
+    assert job.status == "completed" and job.request_count == 2
+    for d in ds:
+        assert drafts[d.id].status == "feedback_ready"
+        (run,) = [r for r in model_runs() if r.draft_id == d.id]
+        assert run.status == "complete"
+        assert run.input_tokens == 100 and run.output_tokens == 20
+        assert [
+            af.aggregated_score for af in aggregated_feedback() if af.draft_id == d.id
+        ] == [80]
+
+
+async def test_request_lines_carry_the_interactive_prompt(stub, batch_model):
+    a, _ = _assignment_with_drafts(1)
+    runner = BatchFeedbackRunner(_generator([batch_model]), poll_interval=0, timeout=5)
+    await runner.submit_assignment(a.id)
+
+    (line,) = next(iter(stub.files.values())).splitlines()
+    req = json.loads(line)
+    assert req["url"] == "/v1/chat/completions"
+    assert req["body"]["model"] == "gpt-4o-mini"
+    assert "api_key" not in req["body"]
+    assert "student text 0" in req["body"]["messages"][-1]["content"]
+
+
+async def test_failed_request_marks_only_its_draft(stub, batch_model):
+    from app.models.feedback import drafts, model_runs
+
+    a, ds = _assignment_with_drafts(2)
+    # model_run ids are assigned in draft order; fail the second draft's run
+    next_run = (max((r.id for r in model_runs()), default=0)) + 2
+    stub.fail_ids = {f"run-{next_run}"}
+    runner = BatchFeedbackRunner(_generator([batch_model]), poll_interval=0, timeout=5)
+    await runner.run_assignment(a.id)
+
+    assert drafts[ds[0].id].status == "feedback_ready"
+    assert drafts[ds[1].id].status == "error"
+
+
+async def test_pending_job_survives_timeout_and_resumes(stub, batch_model):
+    from app.models.feedback import drafts, feedback_batches
+
+    stub.hold = True
+    a, ds = _assignment_with_drafts(1)
+    gen = _generator([batch_model])
+    runner = BatchFeedbackRunner(gen, poll_interval=0, timeout=0)
+    jobs = await runner.submit_assignment(a.id)
+    assert await runner.wait_for(jobs) is False
+    assert drafts[ds[0].id].status == "processing"
+
+    stub.finish()
+    await feedback_batch.resume_pending_batches(
+        BatchFeedbackRunner(gen, poll_interval=0, timeout=5)
+    )
+    assert feedback_batches()[0].status == "completed"
+    assert drafts[ds[0].id].status == "feedback_ready"
+
+
+def test_app_startup_resumes_pending_jobs(stub, batch_model, monkeypatch):
+    import time
+
+    from starlette.testclient import TestClient
+
+    from app import app
+    from app.models.feedback import drafts, feedback_batches
+    from app.services import health_monitor
+
+    stub.hold = True
+    a, ds = _assignment_with_drafts(1)
+    gen = _generator([batch_model])
+    runner = BatchFeedbackRunner(gen, poll_interval=0, timeout=0)
+    asyncio.run(runner.submit_assignment(a.id))
+    assert drafts[ds[0].id].status == "processing"
+
+    # The server went down with the job in flight; it finished meanwhile
+    stub.finish()
+    monkeypatch.setattr(feedback_batch, "feedback_generator", gen)
+    monkeypatch.setattr(health_monitor, "HEALTH_CHECK_INTERVAL", 0)
+    with TestClient(app):
+        deadline = time.monotonic() + 5
+        while drafts[ds[0].id].status == "processing":
+            assert time.monotonic() < deadline, "startup did not resume the job"
+            time.sleep(0.05)
+    assert feedback_batches()[0].status == "completed"
+    assert drafts[ds[0].id].status == "feedback_ready"
+
+
+async def test_no_batch_capable_model_falls_back_to_interactive(monkeypatch):
+    a, ds = _assignment_with_drafts(2)
+    ollama = SimpleNamespace(id=9, provider="ollama", model_id="llama3", api_config="")
+    gen = _generator([ollama])
+    seen = []
+
+    async def interactive(draft_id):
+        seen.append(draft_id)
+        return True
+
+    monkeypatch.setattr(gen, "generate_feedback_for_draft", interactive)
+    summary = await BatchFeedbackRunner(gen).run_assignment(a.id)
+    assert summary["batches"] == 0
+    assert seen == [d.id for d in ds]
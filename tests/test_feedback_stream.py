@@ -0,0 +1,229 @@
+"""Tests for streamed feedback: the incremental criteria parser and the
+streaming model run that persists each criterion as it completes."""
+
+import json
+from types import SimpleNamespace
+
+from app.services.feedback_generator import FeedbackGenerator
+from app.services.feedback_stream import CriteriaStreamParser
+
+REPLY = json.dumps(
+    {
+        "criteria_feedback": [
+            {
+                "criterion_name": "Clarity",
+                "strengths": ['Uses "plain" words {mostly}'],
+                "improvements": ["Tighten [the] intro"],
+                "score": 72,
+            },
+            {
+                "criterion_name": "Evidence",
+                "strengths": [],
+                "improvements": ["Cite sources"],
+                "score": 58,
+            },
+        ],
+        "overall_feedback": {"summary": "Solid start", "score": 65},
+    }
+)
+
+
+def _chunks(text, size=7):
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+# ---- CriteriaStreamParser ----
+
+
+def test_parser_emits_each_criterion_when_it_closes():
+    parser = CriteriaStreamParser()
+    emitted = []
+    for chunk in _chunks(REPLY):
+        emitted.extend(c["criterion_name"] for c in parser.feed(chunk))
+    assert emitted == ["Clarity", "Evidence"]
+    assert parser.done
+    assert parser.text == REPLY
+
+
+def test_parser_tolerates_fences_and_braces_inside_strings():
+    parser = CriteriaStreamParser()
+    for chunk in _chunks("```json\n" + REPLY + "\n```", size=3):
+        parser.feed(chunk)
+    assert [c["score"] for c in parser.criteria] == [72, 58]
+    assert parser.criteria[0]["strengths"] == ['Uses "plain" words {mostly}']
+
+
+def test_parser_keeps_completed_criteria_from_truncated_reply():
+    parser = CriteriaStreamParser()
+    cut = REPLY.index('"criterion_name": "Evidence"') + 10
+    for chunk in _chunks(REPLY[:cut]):
+        parser.feed(chunk)
+    assert [c["criterion_name"] for c in parser.criteria] == ["Clarity"]
+    assert not parser.done
+
+
+# ---- streaming model run ----
+
+
+def _delta_chunk(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text))]
+    )
+
+
+class _Stream:
+    def __init__(self, pieces, fail_after=None):
+        self._pieces = pieces
+        self._fail_after = fail_after
+
+    def __aiter__(self):
+        return self._gen()
+
+    async def _gen(self):
+        for i, piece in enumerate(self._pieces):
+            if self._fail_after is not None and i == self._fail_after:
+                raise ConnectionError("stream dropped")
+            yield _delta_chunk(piece)
+
+
+def _rubric(assignment_id):
+    from app.models.assignment import (
+        Rubric,
+        RubricCategory,
+        rubric_categories,
+        rubrics,
+    )
+
+    r = rubrics.insert(Rubric(assignment_id=assignment_id, assessment_type_id=1))
+    for name in ("Clarity", "Evidence"):
+        rubric_categories.insert(
+            RubricCategory(rubric_id=r.id, name=name, description="", weight=1.0)
+        )
+
+
+def _model_run(draft_id=1):
+    from app.models.feedback import ModelRun, model_runs
+
+    return model_runs.insert(
+        ModelRun(
+            draft_id=draft_id,
+            model_id=5,
+            run_number=1,
+            timestamp="t",
+            prompt="",
+            raw_response="",
+            status="pending",
+        )
+    )
+
+
+async def _run(monkeypatch, stream):
+    from app.services import feedback_generator
+
+    async def fake_acompletion(**kwargs):
+        assert kwargs["stream"] is True
+        return stream
+
+    monkeypatch.setattr(feedback_generator.litellm, "acompletion", fake_acompletion)
+    _rubric(assignment_id=41)
+    run = _model_run()
+    gen = FeedbackGenerator()
+    gen.retry_delay = 0
+    result = await gen._run_streaming_model(
+        run,
+        41,
+        SimpleNamespace(provider="openai", model_id="m"),
+        [{"role": "user", "content": "x"}],
+        {"stream": True},
+    )
+    return run, result
+
+
+async def test_streaming_run_stores_every_criterion_once(monkeypatch):
+    from app.models.feedback import category_scores, feedback_items, model_runs
+
+    run, result = await _run(monkeypatch, _Stream(_chunks(REPLY)))
+    assert result.success
+    scores = [s.score for s in category_scores() if s.model_run_id == run.id]
+    assert sorted(scores) == [58.0, 72.0]
+    general = [
+        i for i in feedback_items() if i.model_run_id == run.id and i.type == "general"
+    ]
+    assert [i.content for i in general] == ["Solid start"]
+    assert model_runs[run.id].status == "complete"
+
+
+async def test_dropped_stream_keeps_partial_criteria(monkeypatch):
+    from app.models.feedback import category_scores, model_runs
+
+    pieces = _chunks(REPLY)
+    cut = next(
+        i for i in range(len(pieces)) if '"Evidence"' in "".join(pieces[: i + 1])
+    )
+    run, result = await _run(monkeypatch, _Stream(pieces, fail_after=cut))
+    assert not result.success
+    assert [s.score for s in category_scores() if s.model_run_id == run.id] == [72.0]
+    assert model_runs[run.id].status == "partial"
+
+
+async def test_draft_with_only_a_cut_stream_is_not_marked_ready(monkeypatch):
+    from datetime import datetime
+
+    from app.models.assignment import Assignment, assignments
+    from app.models.feedback import Draft, aggregated_feedback, drafts
+    from app.services import evidence, feedback_generator
+
+    async def no_signals(self, draft, assignment, settings):
+        return evidence.EvidenceResult(kind="signals", model_run_id=None, success=False)
+
+    monkeypatch.setattr(evidence.SignalEvidenceSource, "produce", no_signals)
+    pieces = _chunks(REPLY)
+    cut = next(
+        i for i in range(len(pieces)) if '"Evidence"' in "".join(pieces[: i + 1])
+    )
+
+    async def fake_acompletion(**kwargs):
+        return _Stream(pieces, fail_after=cut)
+
+    monkeypatch.setattr(feedback_generator.litellm, "acompletion", fake_acompletion)
+    a = assignments.insert(
+        Assignment(
+            course_id=1,
+            title="Essay",
+            description="Argue.",
+            max_drafts=2,
+            created_by="inst@example.com",
+            status="active",
+            created_at=datetime.now().isoformat(),
+        )
+    )
+    _rubric(assignment_id=a.id)
+    draft = drafts.insert(
+        Draft(
+            assignment_id=a.id,
+            student_email="s@example.com",
+            version=1,
+            content="student text",
+            status="submitted",
+            submission_date=datetime.now().isoformat(),
+        )
+    )
+    gen = FeedbackGenerator()
+    gen.retry_delay = 0
+    model = SimpleNamespace(
+        id=5,
+        provider="openai",
+        model_id="m",
+        api_config='{"stream": true, "api_key": "sk-test"}',
+    )
+    gen._get_instructor_active_models = lambda email: [model]
+    gen._get_assignment_settings = lambda aid: SimpleNamespace(
+        num_runs=1,
+        feedback_style_id=None,
+        feedback_level="both",
+        aggregation_method_id=None,
+    )
+
+    assert not await gen.generate_feedback_for_draft(draft.id)
+    assert drafts[draft.id].status == "error"
+    assert not [f for f in aggregated_feedback() if f.draft_id == draft.id]
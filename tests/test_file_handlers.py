@@ -0,0 +1,324 @@
+"""Tests for upload storage and off-loop, bounded document extraction."""
+
+import asyncio
+import hashlib
+import io
+import time
+
+import docx
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.utils import file_handlers
+from app.utils.file_handlers import (
+    ExtractionQueueFullError,
+    extract_file_content,
+    extract_stored_file,
+    run_extraction_job,
+    store_upload,
+)
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """A minimal valid PDF with one line of Helvetica text per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_ref
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(kids),
+        len(kids),
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (i, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(
+        b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (len(objects) + 1, xref)
+    )
+    return out.getvalue()
+
+
+def make_docx(paragraphs: list[str]) -> bytes:
+    document = docx.Document()
+    for p in paragraphs:
+        document.add_paragraph(p)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def _upload(name: str, data: bytes) -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=name)
+
+
+def _burn_cpu():
+    while True:
+        pass
+
+
+def _sleep_then(seconds, value):
+    time.sleep(seconds)
+    return value
+
+
+# ---- storage ----
+
+
+async def test_store_upload_writes_and_hashes_in_one_pass(tmp_path):
+    data = b"x" * (3 * file_handlers.UPLOAD_CHUNK_SIZE + 17)
+    stored = await store_upload(_upload("a.txt", data), tmp_path / "sub" / "a.txt")
+    assert stored.size == len(data)
+    assert stored.checksum == hashlib.sha256(data).hexdigest()
+    assert stored.path.read_bytes() == data
+
+
+async def test_store_upload_enforces_size_limit_and_cleans_up(tmp_path):
+    dest = tmp_path / "big.txt"
+    with pytest.raises(ValueError, match="exceeds"):
+        await store_upload(_upload("big.txt", b"y" * 2048), dest, max_bytes=1024)
+    assert not dest.exists()
+
+
+# ---- extraction ----
+
+
+async def test_pdf_and_docx_extract_in_worker_pool():
+    pdf = await extract_file_content(_upload("s.pdf", make_pdf(["Hello", "World"])))
+    assert "Hello" in pdf and "World" in pdf
+    text = await extract_file_content(_upload("s.docx", make_docx(["One", "Two"])))
+    assert text == "One\nTwo"
+
+
+async def test_extract_stored_file_reads_from_disk(tmp_path):
+    path = tmp_path / "s.pdf"
+    path.write_bytes(make_pdf(["Stored page"]))
+    assert "Stored page" in await extract_stored_file(path, ".pdf")
+
+
+async def test_unsupported_type_is_rejected():
+    with pytest.raises(Exception, match="Unsupported file type"):
+        await extract_file_content(_upload("s.exe", b"MZ"))
+
+
+async def test_queue_depth_cap(monkeypatch):
+    monkeypatch.setattr(file_handlers, "EXTRACTION_MAX_QUEUE", 1)
+    monkeypatch.setattr(file_handlers, "EXTRACTION_WORKERS", 0)
+    slow = asyncio.create_task(run_extraction_job(time.sleep, 0.3))
+    await asyncio.sleep(0.05)
+    assert file_handlers.extraction_queue_full()
+    with pytest.raises(ExtractionQueueFullError):
+        await run_extraction_job(time.sleep, 0)
+    await slow
+    assert not file_handlers.extraction_queue_full()
+
+
+async def test_wall_clock_limit_recycles_the_worker(monkeypatch):
+    monkeypatch.setattr(file_handlers, "EXTRACTION_TIMEOUT", 0.5)
+    with pytest.raises(ValueError, match="longer than"):
+        await run_extraction_job(time.sleep, 30)
+    # a fresh worker serves the next job
+    assert await run_extraction_job(sum, [1, 2, 3]) == 6
+
+
+async def test_overrunning_job_leaves_concurrent_jobs_alone(monkeypatch):
+    monkeypatch.setattr(file_handlers, "EXTRACTION_WORKERS", 2)
+    monkeypatch.setattr(file_handlers, "EXTRACTION_TIMEOUT", 1.0)
+    stuck, ok = await asyncio.gather(
+        run_extraction_job(time.sleep, 30),
+        run_extraction_job(_sleep_then, 0.8, "extracted"),
+        return_exceptions=True,
+    )
+    assert isinstance(stuck, ValueError)
+    assert ok == "extracted"
+
+
+@pytest.mark.skipif(file_handlers.resource is None, reason="needs RLIMIT_CPU")
+async def test_cpu_limit_kills_runaway_job(monkeypatch):
+    monkeypatch.setattr(file_handlers, "EXTRACTION_CPU_SECONDS", 1)
+    monkeypatch.setattr(file_handlers, "EXTRACTION_TIMEOUT", 20)
+    with pytest.raises(ValueError, match="processing limits"):
+        await run_extraction_job(_burn_cpu)
+    assert await run_extraction_job(sum, [4, 5]) == 9
+
+
+@pytest.mark.skipif(file_handlers.resource is None, reason="needs RLIMIT_CPU")
+async def test_cpu_limit_kills_only_the_runaway_job(monkeypatch):
+    monkeypatch.setattr(file_handlers, "EXTRACTION_WORKERS", 2)
+    monkeypatch.setattr(file_handlers, "EXTRACTION_CPU_SECONDS", 1)
+    monkeypatch.setattr(file_handlers, "EXTRACTION_TIMEOUT", 20)
+    runaway, ok = await asyncio.gather(
+        run_extraction_job(_burn_cpu),
+        run_extraction_job(_sleep_then, 2.0, "extracted"),
+        return_exceptions=True,
+    )
+    assert isinstance(runaway, ValueError)
+    assert ok == "extracted"
+
+
+# ---- draft pipeline ----
+
+
+@pytest.fixture
+def blob_root(tmp_path, monkeypatch):
+    from app.services import file_store
+
+    monkeypatch.setattr(file_store, "UPLOAD_ROOT", tmp_path)
+    return tmp_path
+
+
+def _processing_draft():
+    from app.models.feedback import Draft, drafts
+
+    return drafts.insert(
+        Draft(
+            assignment_id=1,
+            student_email="s@example.com",
+            version=1,
+            content="",
+            status="processing",
+            preprocessing_status="pending",
+        )
+    )
+
+
+async def test_background_extraction_fills_the_draft(blob_root):
+    from app.models.feedback import drafts
+    from app.services.background_tasks import _extract_upload_into_draft
+    from app.services.file_store import put_upload
+
+    blob = await put_upload(_upload("d.docx", make_docx(["Three little words"])))
+    draft = _processing_draft()
+    assert await _extract_upload_into_draft(draft.id, blob.checksum, ".docx")
+    draft = drafts[draft.id]
+    assert draft.content == "Three little words"
+    assert draft.word_count == 3
+    assert (draft.status, draft.preprocessing_status) == ("submitted", "complete")
+
+
+async def test_background_extraction_failure_marks_draft_error(blob_root):
+    from app.models.feedback import drafts
+    from app.services.background_tasks import _extract_upload_into_draft
+    from app.services.file_store import put_upload
+
+    blob = await put_upload(_upload("bad.pdf", b"not a pdf"))
+    draft = _processing_draft()
+    assert not await _extract_upload_into_draft(draft.id, blob.checksum, ".pdf")
+    draft = drafts[draft.id]
+    assert (draft.status, draft.preprocessing_status) == ("error", "error")
+    assert "error" in draft.preprocessing_result
+
+
+# ---- page-streaming PDF extraction ----
+
+
+def _ten_word_pages(n):
+    return [" ".join(f"p{i}w{j}" for j in range(10)) for i in range(n)]
+
+
+def test_pdf_extraction_stops_at_word_budget():
+    from app.utils.file_handlers import extract_pdf_pages
+
+    result = extract_pdf_pages(make_pdf(_ten_word_pages(50)), max_words=25)
+    assert result.truncated
+    assert result.page_count == 50
+    assert result.pages_read == 3
+    assert len(result.page_seconds) == 3
+    assert len(result.text.split()) == 25
+    assert result.text.split()[-1] == "p2w4"
+
+
+def test_word_budget_cut_keeps_line_breaks(monkeypatch):
+    from app.utils.file_handlers import PdfPage, extract_pdf_pages
+
+    def pages(source):
+        yield PdfPage(
+            number=1,
+            page_count=1,
+            text="Title\n\nFirst  line\nsecond line",
+            seconds=0.0,
+        )
+
+    monkeypatch.setattr(file_handlers, "iter_pdf_pages", pages)
+    result = extract_pdf_pages(b"", max_words=4)
+    assert result.truncated
+    assert result.text == "Title\n\nFirst  line\nsecond"
+
+
+def test_pdf_extraction_stops_at_char_budget():
+    from app.utils.file_handlers import extract_pdf_pages
+
+    result = extract_pdf_pages(make_pdf(_ten_word_pages(20)), max_chars=100)
+    assert result.truncated and result.pages_read < 20
+    assert len(result.text) <= 100
+
+
+def _fake_pages(monkeypatch, texts):
+    from app.utils.file_handlers import PdfPage
+
+    def pages(source):
+        for i, text in enumerate(texts, start=1):
+            yield PdfPage(number=i, page_count=len(texts), text=text, seconds=0.0)
+
+    monkeypatch.setattr(file_handlers, "iter_pdf_pages", pages)
+
+
+def test_page_that_exactly_fills_char_budget_stops_extraction(monkeypatch):
+    from app.utils.file_handlers import extract_pdf_pages
+
+    _fake_pages(monkeypatch, ["a" * 10, "b" * 160])
+    result = extract_pdf_pages(b"", max_chars=10)
+    assert result.truncated
+    assert result.text == "a" * 10
+
+
+def test_page_that_exactly_fills_word_budget_stops_extraction(monkeypatch):
+    from app.utils.file_handlers import extract_pdf_pages
+
+    _fake_pages(monkeypatch, ["one two three", "four five"])
+    result = extract_pdf_pages(b"", max_words=3)
+    assert result.truncated
+    assert result.text == "one two three"
+
+
+def test_pdf_pages_are_yielded_lazily_from_a_file(tmp_path):
+    from app.utils.file_handlers import iter_pdf_pages
+
+    path = tmp_path / "long.pdf"
+    path.write_bytes(make_pdf(_ten_word_pages(5)))
+    with open(path, "rb") as f:
+        pages = iter_pdf_pages(f)
+        first = next(pages)
+        assert (first.number, first.page_count) == (1, 5)
+        assert first.text.startswith("p0w0")
+        assert first.seconds >= 0
+        pages.close()
+
+
+def test_pdf_within_budget_is_complete():
+    from app.utils.file_handlers import extract_pdf_pages
+
+    result = extract_pdf_pages(make_pdf(_ten_word_pages(3)))
+    assert not result.truncated
+    assert result.pages_read == result.page_count == 3
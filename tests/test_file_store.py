@@ -0,0 +1,149 @@
+"""Tests for the content-addressed upload store."""
+
+import io
+from datetime import datetime
+
+import docx
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.services import file_store
+from app.services.file_store import (
+    blob_path,
+    collect_garbage,
+    extract_blob_text,
+    put_upload,
+    reference_count,
+    release,
+)
+
+
+@pytest.fixture(autouse=True)
+def blob_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_store, "UPLOAD_ROOT", tmp_path)
+    monkeypatch.setattr(file_store, "BLOB_GC_GRACE_SECONDS", 0)
+    return tmp_path
+
+
+def _upload(name, data):
+    return UploadFile(file=io.BytesIO(data), filename=name)
+
+
+def _docx(text):
+    document = docx.Document()
+    document.add_paragraph(text)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def _attach(blob, draft_id=1):
+    from app.models.assessment import SubmissionFile, submission_files
+
+    return submission_files.insert(
+        SubmissionFile(
+            draft_id=draft_id,
+            filename="f.txt",
+            original_filename="f.txt",
+            file_path=str(blob.path.relative_to(file_store.UPLOAD_ROOT)),
+            file_size=blob.size,
+            mime_type="text/plain",
+            checksum=blob.checksum,
+            uploaded_at=datetime.now().isoformat(),
+            removed_at=None,
+        )
+    )
+
+
+async def test_identical_uploads_share_one_blob(blob_root):
+    from app.models.assessment import file_blobs
+
+    a = await put_upload(_upload("a.txt", b"same bytes"))
+    b = await put_upload(_upload("b.txt", b"same bytes"))
+    assert a.path == b.path == blob_path(a.checksum)
+    assert a.path.read_bytes() == b"same bytes"
+    assert [blob.checksum for blob in file_blobs()] == [a.checksum]
+    assert not any((blob_root / "blobs" / "tmp").iterdir())
+
+
+async def test_document_text_is_extracted_once_per_blob(monkeypatch):
+    calls = []
+    real = file_store.extract_stored_file
+
+    async def counting(path, ext):
+        calls.append(path)
+        return await real(path, ext)
+
+    monkeypatch.setattr(file_store, "extract_stored_file", counting)
+    blob = await put_upload(_upload("a.docx", _docx("hello there")))
+    assert await extract_blob_text(blob.checksum, ".docx") == "hello there"
+    assert await extract_blob_text(blob.checksum, ".docx") == "hello there"
+    assert len(calls) == 1
+
+
+async def test_extractor_version_change_reparses(monkeypatch):
+    from app.utils import text_cache
+
+    blob = await put_upload(_upload("a.docx", _docx("v1 text")))
+    await extract_blob_text(blob.checksum, ".docx")
+    monkeypatch.setattr(text_cache, "extractor_version", lambda: "next")
+    blob.path.write_bytes(_docx("v2 text"))
+    assert await extract_blob_text(blob.checksum, ".docx") == "v2 text"
+
+
+async def test_release_collects_blob_after_last_reference():
+    from app.models.assessment import extracted_texts, file_blobs
+
+    blob = await put_upload(_upload("a.docx", _docx("shared")))
+    first, second = _attach(blob, 1), _attach(blob, 2)
+    await extract_blob_text(blob.checksum, ".docx")
+    assert len(extracted_texts()) == 1
+    assert reference_count(blob.checksum) == 2
+
+    assert not release(first.id)
+    assert blob.path.exists()
+    assert release(second.id)
+    assert not blob.path.exists()
+    assert list(file_blobs()) == [] and list(extracted_texts()) == []
+
+
+async def test_upload_is_released_once_extracted(monkeypatch):
+    from app.models.assessment import submission_files
+    from app.models.feedback import Draft, drafts
+    from app.services import background_tasks, signal_service
+
+    async def no_feedback(draft_id):
+        return True
+
+    monkeypatch.setattr(background_tasks, "process_draft_submission", no_feedback)
+    monkeypatch.setattr(signal_service, "queue_signal_extraction", lambda d: None)
+    draft = drafts.insert(
+        Draft(assignment_id=1, student_email="s@x", version=1, content="")
+    )
+    blob = await put_upload(_upload("essay.txt", b"An uploaded essay."))
+    upload = _attach(blob, draft.id)
+
+    await background_tasks._process_upload_with_tracking(
+        draft.id, blob.checksum, ".txt"
+    )
+    assert drafts[draft.id].content == "An uploaded essay."
+    assert submission_files[upload.id].removed_at
+    assert not blob.path.exists()
+
+
+async def test_recent_blob_survives_until_grace_period_passes(monkeypatch):
+    monkeypatch.setattr(file_store, "BLOB_GC_GRACE_SECONDS", 3600)
+    blob = await put_upload(_upload("a.txt", b"in flight"))
+    assert collect_garbage() == 0
+    assert blob.path.exists()
+    monkeypatch.setattr(file_store, "BLOB_GC_GRACE_SECONDS", 0)
+    assert collect_garbage() == 1
+    assert not blob.path.exists()
+
+
+async def test_garbage_collection_keeps_referenced_blobs():
+    kept = await put_upload(_upload("a.txt", b"kept"))
+    _attach(kept)
+    await put_upload(_upload("b.txt", b"orphan"))
+    assert collect_garbage() == 1
+    assert kept.path.exists()
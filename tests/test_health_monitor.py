@@ -0,0 +1,184 @@
+"""Tests for the background health monitor and its cached status."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from app.models.assessment import assessment_services
+from app.services import health_monitor, signal_service
+from app.utils.db_query import first
+
+
+def _probe(down=()):
+    """A fake service_health reporting ``down`` as unreachable."""
+
+    def service_health(timeout=3.0):
+        return [
+            {
+                "name": name,
+                "role": role,
+                "url": f"http://{name}",
+                "ok": name not in down,
+                "version": None if name in down else "1.2.0",
+                "error": "Connection refused" if name in down else None,
+            }
+            for name, _, role in health_monitor.analyser_client._SERVICES
+        ]
+
+    return service_health
+
+
+def test_check_analysers_records_one_row_per_service(monkeypatch):
+    monkeypatch.setattr(
+        health_monitor.analyser_client, "service_health", _probe(down={"cite-sight"})
+    )
+    health_monitor.check_analysers()
+    health_monitor.check_analysers()  # a second round updates, not duplicates
+    assert assessment_services.count == 3
+    row = first(assessment_services, service_name="cite-sight")
+    assert row.health_status == "unhealthy"
+    assert row.health_error == "Connection refused"
+    assert row.health_check_url == "http://cite-sight/health"
+    assert first(assessment_services, service_name="code-analyser").service_version
+
+
+def test_cached_status_reads_the_table_without_probing(monkeypatch):
+    monkeypatch.setattr(
+        health_monitor.analyser_client,
+        "service_health",
+        _probe(down={"document-analyser"}),
+    )
+    health_monitor.check_analysers()
+
+    def no_probe(timeout=3.0):
+        raise AssertionError("cached status must not probe")
+
+    monkeypatch.setattr(health_monitor.analyser_client, "service_health", no_probe)
+    cached = {s["name"]: s for s in health_monitor.cached_service_health()}
+    assert cached["document-analyser"]["status"] == "unhealthy"
+    assert not cached["document-analyser"]["ok"]
+    assert cached["code-analyser"]["ok"]
+    assert cached["code-analyser"]["version"] == "1.2.0"
+
+
+def test_never_checked_or_stale_status_is_unknown(monkeypatch):
+    assert {s["status"] for s in health_monitor.cached_service_health()} == {"unknown"}
+    monkeypatch.setattr(
+        health_monitor.analyser_client, "service_health", _probe(down={"cite-sight"})
+    )
+    health_monitor.check_analysers()
+    assert health_monitor.is_down("cite-sight")
+
+    row = first(assessment_services, service_name="cite-sight")
+    old = datetime.now() - timedelta(seconds=health_monitor.HEALTH_STATUS_MAX_AGE + 5)
+    assessment_services.update({"last_health_check": old.isoformat()}, pk_values=row.id)
+    assert not health_monitor.is_down("cite-sight")
+
+
+def test_signal_extraction_skips_a_known_down_analyser(monkeypatch):
+    from app.models.feedback import Draft, drafts
+
+    monkeypatch.setattr(
+        health_monitor.analyser_client, "service_health", _probe(down={"cite-sight"})
+    )
+    health_monitor.check_analysers()
+
+    def unreachable(draft):
+        raise AssertionError("down analyser must not be called")
+
+    monkeypatch.setattr(
+        signal_service, "_document_signals", lambda draft: {"flesch_score": 60.0}
+    )
+    monkeypatch.setattr(signal_service, "_citation_signals", unreachable)
+    draft = drafts.insert(
+        Draft(
+            assignment_id=1,
+            student_email="s@example.com",
+            version=1,
+            content="An essay with a few words.",
+            status="submitted",
+        )
+    )
+    assert signal_service.extract_signals_for_draft(draft.id) is True
+    sources = {s.source for s in signal_service.get_signals_for_draft(draft.id)}
+    assert sources == {"document-analyser"}
+
+
+def test_model_probe_results_are_written_to_ai_models(monkeypatch):
+    from app.models.config import AIModel, ai_models
+    from app.services import llm_health
+
+    model = ai_models.insert(
+        AIModel(name="Probe", provider="openai", model_id="gpt-4o", active=True)
+    )
+
+    async def fake_check_models(probes=1, **kw):
+        return [
+            {
+                "id": model.id,
+                "status": "timeout",
+                "error": "No answer within 15s",
+                "response_time": None,
+                "checked_at": datetime.now().isoformat(),
+            }
+        ]
+
+    monkeypatch.setattr(llm_health, "check_models", fake_check_models)
+    try:
+        asyncio.run(health_monitor.check_ai_models())
+        row = ai_models[model.id]
+        assert row.health_status == "timeout"
+        assert row.health_error == "No answer within 15s"
+        assert row.last_health_check
+    finally:
+        ai_models.delete(model.id)
+
+
+def test_monitor_is_disabled_with_zero_interval(monkeypatch):
+    monkeypatch.setattr(health_monitor, "HEALTH_CHECK_INTERVAL", 0)
+
+    async def start():
+        health_monitor.start()
+        return health_monitor._task
+
+    assert asyncio.run(start()) is None
+
+
+def test_monitor_runs_rounds_until_stopped(monkeypatch):
+    rounds = []
+
+    async def fake_round():
+        rounds.append(1)
+
+    monkeypatch.setattr(health_monitor, "HEALTH_CHECK_INTERVAL", 0.01)
+    monkeypatch.setattr(health_monitor, "run_once", fake_round)
+
+    async def run():
+        health_monitor.start()
+        await asyncio.sleep(0.1)
+        await health_monitor.stop()
+
+    asyncio.run(run())
+    assert len(rounds) >= 2
+    assert health_monitor._task is None
+
+
+def test_model_probes_are_off_by_default(monkeypatch):
+    import importlib
+
+    monkeypatch.delenv("HEALTH_CHECK_MODELS", raising=False)
+    assert importlib.reload(health_monitor).HEALTH_CHECK_MODELS is False
+
+
+def test_app_lifespan_starts_and_stops_the_monitor(monkeypatch):
+    from starlette.testclient import TestClient
+
+    from app import app
+
+    async def fake_round():
+        pass
+
+    monkeypatch.setattr(health_monitor, "HEALTH_CHECK_INTERVAL", 60)
+    monkeypatch.setattr(health_monitor, "run_once", fake_round)
+    with TestClient(app):
+        assert health_monitor._task is not None
+    assert health_monitor._task is None
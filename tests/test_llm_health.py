@@ -0,0 +1,167 @@
+"""Tests for concurrent LLM provider health probes."""
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import llm_health
+from app.services.llm_health import check_models
+from app.utils.stats import percentile
+
+
+def _model(i, provider="openai", key="sk-test"):
+    return SimpleNamespace(
+        id=i,
+        name=f"Model {i}",
+        provider=provider,
+        model_id=f"m{i}",
+        api_config=json.dumps({"api_key": key} if key else {}),
+        active=True,
+    )
+
+
+@pytest.fixture
+def fake_acompletion(monkeypatch):
+    """Per-model behaviour keyed by model string: a delay, or an exception."""
+    behaviour: dict[str, object] = {}
+    calls: list[str] = []
+
+    async def acompletion(**params):
+        calls.append(params["model"])
+        outcome = behaviour.get(params["model"], 0.01)
+        if isinstance(outcome, Exception):
+            raise outcome
+        await asyncio.sleep(outcome)
+        return SimpleNamespace(choices=[SimpleNamespace()])
+
+    monkeypatch.setattr(llm_health.litellm, "acompletion", acompletion)
+    return SimpleNamespace(behaviour=behaviour, calls=calls)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches():
+    llm_health._test_results.clear()
+    llm_health._latencies.clear()
+    yield
+    llm_health._test_results.clear()
+    llm_health._latencies.clear()
+
+
+def test_percentile_nearest_rank():
+    with pytest.raises(ValueError):
+        percentile([], 50)
+    assert percentile([0.3, 0.1, 0.2], 50) == 0.2
+    assert percentile([0.1, 0.2, 0.3, 0.4, 0.5], 90) == 0.5
+
+
+async def test_providers_are_probed_concurrently(fake_acompletion):
+    models = [_model(i) for i in range(4)]
+    for m in models:
+        fake_acompletion.behaviour[f"openai/{m.model_id}"] = 0.2
+    started = time.perf_counter()
+    results = await check_models(models, probes=1, deadline=5)
+    assert time.perf_counter() - started < 0.5
+    assert [r["id"] for r in results] == [0, 1, 2, 3]
+    assert all(r["status"] == "healthy" for r in results)
+
+
+async def test_hanging_provider_costs_one_deadline(fake_acompletion):
+    slow, fast = _model(1), _model(2)
+    fake_acompletion.behaviour["openai/m1"] = 30
+    started = time.perf_counter()
+    results = await check_models([slow, fast], probes=2, deadline=0.3)
+    assert time.perf_counter() - started < 1
+    assert [r["status"] for r in results] == ["timeout", "healthy"]
+
+
+async def test_latency_percentiles_cover_every_probe(fake_acompletion):
+    (result,) = await check_models([_model(1)], probes=4, deadline=5)
+    assert fake_acompletion.calls == ["openai/m1"] * 4
+    assert result["succeeded"] == 4
+    lat = result["latency"]
+    assert 0 < lat["p50"] <= lat["p90"] <= lat["max"]
+    assert result["response_time"] == lat["p50"]
+
+
+async def test_errors_are_classified_and_keys_checked(fake_acompletion, monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    fake_acompletion.behaviour["ollama/m2"] = ConnectionError("Connection refused")
+    results = await check_models(
+        [_model(1, key=""), _model(2, provider="ollama", key="")], probes=1
+    )
+    assert [r["status"] for r in results] == ["no_api_key", "connection_error"]
+    assert results[1]["error"] == "Ollama not running"
+    assert fake_acompletion.calls == ["ollama/m2"]
+
+
+async def test_probes_record_latency_stats(fake_acompletion):
+    assert llm_health.latency_stats("openai/m1") is None
+    await check_models([_model(1)], probes=3, deadline=5)
+    stats = llm_health.latency_stats("openai/m1")
+    assert stats["count"] == 3
+    assert 0 < stats["p50"] <= stats["p90"] <= stats["max"]
+
+
+async def test_connection_test_is_cached_per_config(fake_acompletion):
+    first = await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    assert first["status"] == "healthy" and not first["cached"]
+    again = await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    assert again["cached"] and again["status"] == "healthy"
+    assert not again["refreshing"]  # fresh success: nothing re-checked
+    assert fake_acompletion.calls == ["openai/m1"]
+    # a different key is a different configuration
+    await llm_health.check_connection("openai", "m1", api_key="sk-b")
+    assert len(fake_acompletion.calls) == 2
+
+
+async def test_stale_or_failed_result_is_refreshed_in_background(
+    fake_acompletion, monkeypatch
+):
+    fake_acompletion.behaviour["openai/m1"] = ConnectionError("Connection refused")
+    failed = await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    assert failed["status"] == "connection_error"
+
+    fake_acompletion.behaviour["openai/m1"] = 0.2
+    started = time.perf_counter()
+    cached = await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    assert time.perf_counter() - started < 0.1  # answered without waiting
+    assert cached["cached"] and cached["status"] == "connection_error"
+    assert cached["refreshing"]
+    (entry,) = llm_health._test_results.values()
+    await entry["refresh"]
+    fresh = await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    assert fresh["status"] == "healthy"
+    assert len(fake_acompletion.calls) == 2  # a fresh success is not re-probed
+
+    monkeypatch.setattr(llm_health, "MODEL_TEST_CACHE_TTL", 0)
+    await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    (entry,) = llm_health._test_results.values()
+    await entry["refresh"]
+    assert len(fake_acompletion.calls) == 3
+
+
+async def test_result_says_re_checking_only_while_refreshing(fake_acompletion):
+    from fasthtml.common import to_xml
+
+    from app.utils.ui import connection_test_result
+
+    await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    cached = await llm_health.check_connection("openai", "m1", api_key="sk-a")
+    html = to_xml(connection_test_result(cached))
+    assert "result from" in html and "re-checking" not in html
+    html = to_xml(connection_test_result({**cached, "refreshing": True}))
+    assert "re-checking in the background" in html
+
+
+async def test_ollama_test_uses_first_listed_model(fake_acompletion, monkeypatch):
+    async def listed(base_url, timeout=3.0):
+        assert base_url == "http://gpu:11434"
+        return [{"name": "mistral:latest"}, {"name": "llama3"}]
+
+    monkeypatch.setattr(llm_health, "list_ollama_models", listed)
+    result = await llm_health.check_connection("ollama", base_url="http://gpu:11434")
+    assert result["status"] == "healthy"
+    assert fake_acompletion.calls == ["ollama/mistral"]
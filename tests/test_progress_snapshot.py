@@ -0,0 +1,147 @@
+"""Tests for the precomputed per-student progress snapshot."""
+
+import json
+
+from app.services import feedback_review, progress_snapshot
+from app.services.progress_analyzer import ProgressAnalyzer
+
+STUDENT = "s@example.com"
+
+
+def _setup(weights=(2.0, 1.0)):
+    from app.models.assignment import (
+        Rubric,
+        RubricCategory,
+        rubric_categories,
+        rubrics,
+    )
+
+    rubric = rubrics.insert(Rubric(assignment_id=7, assessment_type_id=0))
+    return [
+        rubric_categories.insert(
+            RubricCategory(rubric_id=rubric.id, name=name, description="", weight=w)
+        )
+        for name, w in zip(("Structure", "Clarity"), weights)
+    ]
+
+
+def _draft(version, student=STUDENT):
+    from app.models.feedback import Draft, drafts
+
+    return drafts.insert(
+        Draft(
+            assignment_id=7,
+            student_email=student,
+            version=version,
+            content="text",
+            submission_date=f"2026-10-0{version}",
+            status="feedback_ready",
+            word_count=100 * version,
+        )
+    )
+
+
+def _feedback(draft, cats, scores, status="pending_review"):
+    from app.models.feedback import AggregatedFeedback, aggregated_feedback
+
+    return [
+        aggregated_feedback.insert(
+            AggregatedFeedback(
+                draft_id=draft.id,
+                category_id=cat.id,
+                aggregated_score=score,
+                feedback_text="Areas for improvement:\n- Tighten paragraphs",
+                edited_by_instructor=False,
+                instructor_email="",
+                release_date="",
+                status=status,
+            )
+        )
+        for cat, score in zip(cats, scores)
+    ]
+
+
+def _stored():
+    from app.models.feedback import progress_snapshots
+    from app.utils.db_query import first
+
+    return first(progress_snapshots, student_email=STUDENT, assignment_id=7)
+
+
+def test_scores_are_weighted_per_category_rows():
+    cats = _setup()
+    draft = _draft(1)
+    rows = _feedback(draft, cats, [60.0, 90.0], status=feedback_review.RELEASED)
+
+    analyzer = ProgressAnalyzer([draft], rows, cats)
+    assert analyzer.get_score_progression()[0]["score"] == 70.0  # (2*60 + 90) / 3
+    progression = analyzer.get_category_progression(cats)
+    assert progression["Clarity"] == [
+        {"version": 1, "score": 90.0, "has_feedback": True}
+    ]
+
+
+def test_release_builds_then_updates_the_snapshot():
+    cats = _setup()
+    first_draft = _draft(1)
+    _feedback(first_draft, cats, [50.0, 80.0])
+    feedback_review.bulk_approve([first_draft.id], "i@example.com")
+
+    snapshot = progress_snapshot.get_snapshot(STUDENT, 7)
+    assert [e["score"] for e in snapshot["entries"]] == [60.0]
+    assert snapshot["recommendations_draft_id"] == first_draft.id
+    assert snapshot["recommendations"][0]["category"] == "Structure"
+
+    second = _draft(2)
+    rows = _feedback(second, cats, [80.0, 80.0])
+    feedback_review.apply_review(second.id, {}, "i@example.com", approve=True)
+
+    snapshot = progress_snapshot.get_snapshot(STUDENT, 7)
+    assert [e["score"] for e in snapshot["entries"]] == [60.0, 80.0]
+    assert snapshot["metrics"]["total_improvement"] == 20.0
+    assert snapshot["metrics"]["current_score"] == 80.0
+    assert snapshot["recommendations_draft_id"] == second.id
+
+    # Editing released feedback re-scores just that draft
+    feedback_review.apply_review(
+        second.id,
+        {f"score_{rows[0].id}": "95", f"score_{rows[1].id}": "95"},
+        "i@example.com",
+        approve=False,
+    )
+    assert json.loads(_stored().metrics)["current_score"] == 95.0
+
+
+def test_view_reads_the_stored_snapshot(monkeypatch):
+    cats = _setup()
+    draft = _draft(1)
+    _feedback(draft, cats, [70.0, 70.0])
+    feedback_review.bulk_approve([draft.id], "i@example.com")
+
+    def no_rescoring(*args, **kwargs):
+        raise AssertionError("a stored snapshot must not be rebuilt")
+
+    monkeypatch.setattr(progress_snapshot, "rebuild", no_rescoring)
+    assert progress_snapshot.get_snapshot(STUDENT, 7)["entries"][0]["score"] == 70.0
+
+
+def test_missing_or_outdated_snapshot_is_rebuilt():
+    from app.models.assignment import rubric_categories
+
+    cats = _setup()
+    draft = _draft(1)
+    _feedback(draft, cats, [60.0, 90.0], status=feedback_review.RELEASED)
+    assert _stored() is None  # released before snapshots existed
+
+    assert progress_snapshot.get_snapshot(STUDENT, 7)["entries"][0]["score"] == 70.0
+    rubric_categories.update({"weight": 1.0}, pk_values=cats[0].id)
+    assert progress_snapshot.get_snapshot(STUDENT, 7)["entries"][0]["score"] == 75.0
+
+
+def test_pending_feedback_stays_out_of_the_snapshot():
+    cats = _setup()
+    draft = _draft(1)
+    _feedback(draft, cats, [60.0, 90.0])
+    snapshot = progress_snapshot.get_snapshot(STUDENT, 7)
+    assert snapshot["entries"] == []
+    assert snapshot["metrics"]["drafts_with_feedback"] == 0
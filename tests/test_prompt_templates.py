@@ -0,0 +1,139 @@
+"""Tests for the precompiled prompt skeleton (static prefix + per-draft suffix)."""
+
+from datetime import datetime
+
+import pytest
+
+from app.services import prompt_templates
+from app.services.prompt_templates import (
+    generate_feedback_prompt,
+    generate_feedback_prompt_parts,
+    get_prompt_skeleton,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    prompt_templates.clear_prompt_skeleton_cache()
+    yield
+    prompt_templates.clear_prompt_skeleton_cache()
+
+
+def _assignment(max_drafts=3):
+    from app.models.assignment import (
+        Assignment,
+        Rubric,
+        RubricCategory,
+        assignments,
+        rubric_categories,
+        rubrics,
+    )
+
+    a = assignments.insert(
+        Assignment(
+            course_id=1,
+            title="Essay",
+            description="Argue a position.",
+            max_drafts=max_drafts,
+            created_by="i@example.com",
+            status="active",
+            feedback_tone="neutral",
+            feedback_detail="standard",
+            created_at=datetime.now().isoformat(),
+        )
+    )
+    r = rubrics.insert(
+        Rubric(assignment_id=a.id, assessment_type_id=1, type_specific_criteria="")
+    )
+    rubric_categories.insert(
+        RubricCategory(rubric_id=r.id, name="Clarity", description="Clear", weight=60)
+    )
+    rubric_categories.insert(
+        RubricCategory(rubric_id=r.id, name="Evidence", description="Cited", weight=40)
+    )
+    return a, r
+
+
+def test_prefix_is_identical_across_submissions():
+    a, _ = _assignment()
+    p1, s1 = generate_feedback_prompt_parts(a, "first student text", 1)
+    p2, s2 = generate_feedback_prompt_parts(a, "another student's work", 2)
+    assert p1 == p2
+    assert "Clarity (60% of grade)" in p1
+    assert "Please format your response as JSON" in p1
+    assert "first student text" in s1 and "another student's work" in s2
+    assert "first student text" not in p1
+
+
+def test_suffix_substitutes_draft_and_word_count():
+    a, _ = _assignment()
+    _, suffix = generate_feedback_prompt_parts(a, "one two three", 2)
+    assert "Draft: 2 of 3" in suffix
+    assert "Word Count: 3" in suffix
+    assert "For revision drafts" in suffix  # iterative guidance for drafts > 1
+    _, first_suffix = generate_feedback_prompt_parts(a, "one two three", 1)
+    assert "For revision drafts" not in first_suffix
+
+
+def test_submission_text_with_dollar_signs_is_verbatim():
+    a, _ = _assignment()
+    text = "Costs rose to $5 and ${x} and $draft_version"
+    assert generate_feedback_prompt(a, text, 1).endswith(text)
+
+
+def test_skeleton_is_cached_per_revision():
+    a, _ = _assignment()
+    s1 = get_prompt_skeleton(a)
+    assert get_prompt_skeleton(a) is s1
+
+
+def test_rubric_edit_yields_new_revision():
+    from app.models.assignment import RubricCategory, rubric_categories
+
+    a, r = _assignment()
+    before = get_prompt_skeleton(a)
+    rubric_categories.insert(
+        RubricCategory(rubric_id=r.id, name="Style", description="Voice", weight=10)
+    )
+    after = get_prompt_skeleton(a)
+    assert after.revision != before.revision
+    assert "Style" in after.prefix and "Style" not in before.prefix
+
+
+def test_missing_rubric_raises():
+    from app.models.assignment import Assignment, assignments
+
+    a = assignments.insert(
+        Assignment(course_id=1, title="No rubric", max_drafts=1, status="active")
+    )
+    with pytest.raises(ValueError):
+        get_prompt_skeleton(a)
+
+
+# ---- provider messages (prefix first, cache breakpoint where supported) ----
+
+
+def _model(provider):
+    from types import SimpleNamespace
+
+    return SimpleNamespace(provider=provider, model_id="m")
+
+
+def test_anthropic_messages_mark_prefix_cacheable():
+    from app.services.feedback_generator import FeedbackGenerator
+
+    messages = FeedbackGenerator()._build_messages(_model("anthropic"), "PRE", "SUF")
+    blocks = messages[-1]["content"]
+    assert blocks[0] == {
+        "type": "text",
+        "text": "PRE",
+        "cache_control": {"type": "ephemeral"},
+    }
+    assert blocks[1] == {"type": "text", "text": "SUF"}
+
+
+def test_other_providers_get_prefix_first_plain_text():
+    from app.services.feedback_generator import FeedbackGenerator
+
+    messages = FeedbackGenerator()._build_messages(_model("openai"), "PRE", "SUF")
+    assert messages[-1]["content"] == "PRE\n\nSUF"
@@ -9,6 +9,7 @@ test instead of silently passing as the destination page's 200.
 import importlib.util
 import os
 import sys
+import time
 from datetime import datetime
 
 import pytest
@@ -263,6 +264,51 @@ def test_instructor_submission_pages_render(client, scenario):
         _assert_renders(client, path)
 
 
+def test_recent_activity_poll_swaps_on_new_drafts_and_status_changes(client, scenario):
+    import re
+
+    from app.models.feedback import drafts
+
+    _login(client, INSTRUCTOR)
+    resp = client.get("/instructor/recent-activity?seen=")
+    assert resp.status_code == 200
+    assert "Essay 1" in resp.text
+    poller = re.compile(r'hx-get="/instructor/recent-activity\?seen=(\w+)"')
+    seen = poller.search(resp.text).group(1)
+    resp = client.get(f"/instructor/recent-activity?seen={seen}")
+    assert resp.status_code == 204  # unchanged: HTMX leaves the feed alone
+
+    drafts.update({"status": "processing"}, pk_values=scenario["draft"].id)
+    resp = client.get(f"/instructor/recent-activity?seen={seen}")
+    assert resp.status_code == 200
+    assert "Processing" in resp.text
+    assert poller.search(resp.text).group(1) != seen  # the poller's new cursor
+
+
+def test_rubric_job_poll_returns_preview_when_done(client, scenario):
+    from app.services import rubric_generator
+
+    _login(client, INSTRUCTOR)
+    a_id = scenario["assignment"].id
+    base = f"/instructor/assignments/{a_id}/rubric/generate"
+    job = {"owner": INSTRUCTOR, "assignment_id": a_id, "status": "running"}
+    rubric_generator._jobs["smoke"] = job
+    try:
+        assert client.get(f"{base}/smoke").status_code == 204  # keep polling
+        job.update(
+            status="done",
+            categories=[{"name": "Voice", "description": "Tone", "weight": 100}],
+            finished=time.time(),
+        )
+        resp = client.get(f"{base}/smoke")
+        assert resp.status_code == 200
+        assert "Generated Rubric Preview" in resp.text
+        assert "Voice" in resp.text
+        assert "expired" in client.get(f"{base}/unknown").text
+    finally:
+        rubric_generator._jobs.pop("smoke", None)
+
+
 def test_student_assignment_view_renders(client, scenario):
     _login(client, STUDENT)
     _assert_renders(client, f"/student/assignments/{scenario['assignment'].id}")
@@ -283,6 +329,31 @@ def test_student_join_form_renders_with_token(client):
     assert resp.status_code == 200
 
 
+def test_invite_students_accepts_a_roster_upload(client, scenario):
+    from app.models.course import enrollments
+    from app.models.user import users
+
+    _login(client, INSTRUCTOR)
+    course_id = scenario["course"].id
+    roster = (
+        b"Name,Email\nAda,smoke-roster-1@test.local\nBo,smoke-roster-2@test.local\n"
+    )
+    try:
+        resp = client.post(
+            "/instructor/invite-students",
+            data={"course_id": str(course_id), "emails": STUDENT},
+            files={"roster": ("roster.csv", roster, "text/csv")},
+        )
+        assert resp.status_code == 200
+        assert "smoke-roster-1@test.local" in resp.text
+        assert "/student/join?token=" in resp.text
+        assert f"Already enrolled (1): {STUDENT}" in resp.text
+        enrolled = {e.student_email for e in enrollments() if e.course_id == course_id}
+        assert {"smoke-roster-1@test.local", "smoke-roster-2@test.local"} <= enrolled
+    finally:
+        users.delete_where("email LIKE ?", ["smoke-roster-%"])
+
+
 # ---- POST dispatch regression (the dead-handler bug class) ----
 #
 # Same-path GET+POST pairs with custom function names both registered for both
@@ -314,3 +385,228 @@ def test_course_creation_post_actually_creates(client):
     for c in created:
         enrollments.delete_where("course_id = ?", [c.id])
         courses.delete(c.id)
+
+
+def test_student_draft_status_reports_progress(client, scenario):
+    _login(client, STUDENT)
+    resp = client.get(f"/student/submissions/{scenario['draft'].id}/status")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["draft_status"] == "feedback_ready"
+    assert body["categories_total"] == 1
+    assert client.get("/student/submissions/999999/status").status_code == 404
+
+
+# ---- identity cache: app writes are visible on the very next request ----
+
+
+def test_profile_update_is_visible_on_next_request(client):
+    from app.models.user import invalidate_user, users
+
+    _login(client, STUDENT)
+    _assert_renders(client, "/profile")  # warms the identity cache
+    client.post("/profile/update", data={"name": "Renamed Student"})
+    assert "Renamed Student" in client.get("/profile").text
+    users.update({"name": STUDENT.split("@")[0]}, pk_values=STUDENT)
+    invalidate_user(STUDENT)
+
+
+def test_revoked_approval_takes_effect_immediately(client):
+    from app.models.user import invalidate_user, users
+
+    _login(client, INSTRUCTOR)
+    _assert_renders(client, "/instructor/dashboard")
+    users.update({"approved": False}, pk_values=INSTRUCTOR)
+    invalidate_user(INSTRUCTOR)
+    try:
+        resp = client.get("/instructor/dashboard")
+        assert resp.status_code == 303
+        assert resp.headers["location"] == "/login"
+    finally:
+        users.update({"approved": True}, pk_values=INSTRUCTOR)
+        invalidate_user(INSTRUCTOR)
+
+
+def test_file_submission_returns_processing_draft(
+    client, scenario, monkeypatch, tmp_path
+):
+    import hashlib
+
+    from app.models.assessment import submission_files
+    from app.models.feedback import drafts
+    from app.services import background_tasks
+
+    queued = []
+
+    async def fake_queue(draft_id, checksum, file_ext):
+        queued.append((draft_id, checksum, file_ext))
+        return True
+
+    monkeypatch.setattr(background_tasks, "queue_upload_processing", fake_queue)
+    monkeypatch.chdir(tmp_path)
+    _login(client, STUDENT)
+    a_id = scenario["assignment"].id
+    data = b"My second draft, uploaded as a file."
+    resp = client.post(
+        f"/student/assignments/{a_id}/submit",
+        data={"version": "2", "submission_type": "file"},
+        files={"file_upload": ("draft.txt", data, "text/plain")},
+    )
+    assert resp.status_code == 303
+    (draft,) = [d for d in drafts() if d.version == 2]
+    assert draft.status == "processing" and draft.content == ""
+    (sf,) = [f for f in submission_files() if f.draft_id == draft.id]
+    assert sf.checksum == hashlib.sha256(data).hexdigest()
+    assert sf.file_size == len(data)
+    assert queued == [(draft.id, sf.checksum, ".txt")]
+    assert sf.file_path == f"blobs/{sf.checksum[:2]}/{sf.checksum}"
+    assert (tmp_path / "data/uploads" / sf.file_path).read_bytes() == data
+
+
+def test_hiding_a_draft_collects_its_upload(client, scenario, monkeypatch, tmp_path):
+    from app.models.assessment import file_blobs, submission_files
+    from app.models.feedback import drafts
+    from app.services import background_tasks, file_store
+
+    async def fake_queue(draft_id, checksum, file_ext):
+        return True
+
+    monkeypatch.setattr(background_tasks, "queue_upload_processing", fake_queue)
+    monkeypatch.setattr(file_store, "BLOB_GC_GRACE_SECONDS", 0)
+    monkeypatch.chdir(tmp_path)
+    _login(client, STUDENT)
+    a_id = scenario["assignment"].id
+    resp = client.post(
+        f"/student/assignments/{a_id}/submit",
+        data={"version": "2", "submission_type": "file"},
+        files={"file_upload": ("draft.txt", b"Discard me.", "text/plain")},
+    )
+    assert resp.status_code == 303
+    (draft,) = [d for d in drafts() if d.version == 2]
+    (sf,) = [f for f in submission_files() if f.draft_id == draft.id]
+    blob = tmp_path / "data/uploads" / sf.file_path
+    assert blob.exists()
+
+    resp = client.post(f"/student/submissions/hide/{draft.id}")
+    assert resp.status_code == 200
+    assert submission_files[sf.id].removed_at
+    assert not blob.exists()
+    assert sf.checksum not in [b.checksum for b in file_blobs()]
+
+
+def test_student_progress_analysis_renders(client, scenario):
+    from app.models.feedback import Draft, drafts
+
+    draft = scenario["draft"]
+    drafts.insert(  # a second draft, still awaiting feedback
+        Draft(
+            assignment_id=draft.assignment_id,
+            student_email=STUDENT,
+            version=2,
+            content="A better essay.",
+            submission_date=datetime.now().isoformat(),
+            status="feedback_ready",
+            word_count=3,
+        )
+    )
+    _login(client, STUDENT)
+    resp = client.get(f"/student/assignments/{draft.assignment_id}")
+    assert resp.status_code == 200
+    assert "Progress analysis" in resp.text
+
+
+def test_instructor_analytics_tabs_render(client, scenario):
+    from app.models.feedback import (
+        AggregatedFeedback,
+        Draft,
+        aggregated_feedback,
+        drafts,
+    )
+
+    draft = scenario["draft"]
+    second = drafts.insert(
+        Draft(
+            assignment_id=draft.assignment_id,
+            student_email=STUDENT,
+            version=2,
+            content="A better essay.",
+            status="feedback_ready",
+        )
+    )
+    category_id = aggregated_feedback(where="draft_id = ?", where_args=[draft.id])[
+        0
+    ].category_id
+    aggregated_feedback.insert(
+        AggregatedFeedback(
+            draft_id=second.id,
+            category_id=category_id,
+            aggregated_score=85.0,
+            status="pending_review",
+        )
+    )
+    _login(client, INSTRUCTOR)
+    base = f"/instructor/assignments/{draft.assignment_id}/analytics"
+    _assert_renders(client, base)
+    resp = client.get(f"{base}/cohort?from_version=1&to_version=2")
+    assert resp.status_code == 200
+    assert "Which categories improved most" in resp.text
+    resp = client.get(f"{base}/cohort/export")
+    assert resp.status_code == 200
+    assert "change,Clarity,1->2,1,10.0" in resp.text
+
+
+def test_submission_csv_exports_stream(client, scenario):
+    _login(client, INSTRUCTOR)
+    a_id = scenario["assignment"].id
+    resp = client.get(f"/instructor/assignments/{a_id}/submissions/export")
+    assert resp.status_code == 200
+    assert resp.text.splitlines()[0].endswith("score,Clarity")
+    assert "75.0,75.0" in resp.text
+    resp = client.get(f"/instructor/courses/{scenario['course'].id}/submissions/export")
+    assert resp.status_code == 200
+    assert resp.text.startswith("assignment_id,assignment_title,")
+
+
+def test_assignment_feedback_zip_export(client, scenario):
+    import io
+    import zipfile
+
+    _login(client, INSTRUCTOR)
+    resp = client.get(
+        f"/instructor/assignments/{scenario['assignment'].id}/feedback/export"
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/zip"
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        (name,) = zf.namelist()
+        assert name == f"feedback-smoke-stud-{scenario['draft'].id}.md"
+        body = zf.read(name).decode()
+    assert "### Clarity - 75.0/100" in body
+    assert "Status:** Released" in body
+
+
+def test_feedback_zip_entry_names_cannot_escape_the_archive(client, scenario):
+    import io
+    import zipfile
+
+    from app.models.feedback import Draft, drafts
+
+    draft = drafts.insert(
+        Draft(
+            assignment_id=scenario["assignment"].id,
+            student_email="../../x@y.z",
+            version=1,
+            content="An essay.",
+            submission_date=datetime.now().isoformat(),
+            status="feedback_ready",
+            word_count=2,
+        )
+    )
+    _login(client, INSTRUCTOR)
+    resp = client.get(
+        f"/instructor/assignments/{scenario['assignment'].id}/feedback/export"
+    )
+    with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+        names = zf.namelist()
+    assert f"feedback-_.._x-{draft.id}.md" in names
+    assert not any("/" in n or "\\" in n or n.startswith(".") for n in names)
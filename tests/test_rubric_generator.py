@@ -0,0 +1,167 @@
+"""Tests for background rubric generation jobs."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import rubric_generator as rg
+
+RUBRIC = [
+    {"name": "Argument", "description": "Thesis and reasoning", "weight": 2},
+    {"name": "Evidence", "description": "Sources", "weight": 1},
+    {"name": "Style", "description": "Clarity", "weight": 1},
+]
+
+
+def _model(i, provider="openai"):
+    return SimpleNamespace(
+        id=i,
+        name=f"Model {i}",
+        provider=provider,
+        model_id=f"m{i}",
+        api_config=json.dumps({"api_key": "sk-test"}),
+        active=True,
+    )
+
+
+def _assignment(**kw):
+    fields = {
+        "id": 7,
+        "title": "Essay",
+        "description": "d",
+        "instructions": "Write 500 words",
+        "spec_content": "",
+        "spec_file_path": "",
+    }
+    return SimpleNamespace(**{**fields, **kw})
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state():
+    rg._jobs.clear()
+    rg._prompt_cache.clear()
+    yield
+    rg._jobs.clear()
+    rg._prompt_cache.clear()
+
+
+@pytest.fixture
+def fake_acompletion(monkeypatch):
+    """Replies keyed by model string: text, an exception, or a delay."""
+    replies: dict[str, object] = {}
+    calls: list[dict] = []
+
+    async def acompletion(**params):
+        calls.append(params)
+        reply = replies.get(params["model"], json.dumps(RUBRIC))
+        if isinstance(reply, Exception):
+            raise reply
+        if isinstance(reply, float):
+            await asyncio.sleep(reply)
+            reply = json.dumps(RUBRIC)
+        message = SimpleNamespace(content=reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    monkeypatch.setattr(rg.litellm, "acompletion", acompletion)
+    return SimpleNamespace(replies=replies, calls=calls)
+
+
+def _use_models(monkeypatch, models):
+    from app.services.feedback_generator import FeedbackGenerator
+
+    monkeypatch.setattr(
+        FeedbackGenerator, "_get_instructor_active_models", lambda self, e: models
+    )
+
+
+def test_parse_normalises_weights_and_strips_fences():
+    ok, categories, error = rg.parse_rubric_response(
+        "```json\n" + json.dumps(RUBRIC) + "\n```"
+    )
+    assert ok and not error
+    assert [c["weight"] for c in categories] == [50.0, 25.0, 25.0]
+    assert rg.parse_rubric_response("[]")[2] == "Rubric must have at least 3 categories"
+    assert not rg.parse_rubric_response("not json")[0]
+
+
+async def test_generate_uses_configured_model_and_caches_prompt(fake_acompletion):
+    models = [_model(1, provider="anthropic")]
+    ok, categories, _ = await rg.generate_rubric("Essay", "i", "spec", models)
+    assert ok and len(categories) == 3
+    params = fake_acompletion.calls[0]
+    assert params["model"] == "anthropic/m1"
+    assert params["api_key"] == "sk-test"
+    assert "response_format" not in params
+
+    categories[0]["name"] = "edited"  # the cached copy is not shared
+    ok, again, _ = await rg.generate_rubric("Essay", "i", "spec", models)
+    assert ok and again[0]["name"] == "Argument"
+    assert len(fake_acompletion.calls) == 1
+    await rg.generate_rubric("Essay", "i", "other spec", models)
+    assert len(fake_acompletion.calls) == 2
+
+
+async def test_generate_falls_back_to_the_next_model(fake_acompletion):
+    fake_acompletion.replies["openai/m1"] = RuntimeError("Connection refused")
+    ok, _, _ = await rg.generate_rubric("Essay", "i", None, [_model(1), _model(2)])
+    assert ok
+    assert [c["model"] for c in fake_acompletion.calls] == ["openai/m1", "openai/m2"]
+
+    ok, _, error = await rg.generate_rubric("Essay", "i", None, [])
+    assert not ok and "No AI models" in error
+
+
+async def test_job_runs_in_background_and_reports_result(monkeypatch, fake_acompletion):
+    _use_models(monkeypatch, [_model(1)])
+    fake_acompletion.replies["openai/m1"] = 0.05
+    job_id = rg.start_rubric_job(_assignment(), "inst@example.com")
+    assert rg.get_rubric_job(job_id, "inst@example.com")["status"] == "running"
+    # a second click while running reuses the job
+    assert rg.start_rubric_job(_assignment(), "inst@example.com") == job_id
+    assert rg.get_rubric_job(job_id, "other@example.com") is None
+
+    await rg._jobs[job_id]["task"]
+    job = rg.get_rubric_job(job_id, "inst@example.com")
+    assert job["status"] == "done"
+    assert job["categories"][0]["name"] == "Argument"
+    assert len(fake_acompletion.calls) == 1
+
+
+async def test_job_times_out(monkeypatch, fake_acompletion):
+    _use_models(monkeypatch, [_model(1)])
+    monkeypatch.setattr(rg, "RUBRIC_GENERATION_TIMEOUT", 0.05)
+    fake_acompletion.replies["openai/m1"] = 5.0
+    job_id = rg.start_rubric_job(_assignment(), "inst@example.com")
+    with pytest.raises(asyncio.TimeoutError):
+        await rg._jobs[job_id]["task"]
+    job = rg.get_rubric_job(job_id, "inst@example.com")
+    assert job["status"] == "error"
+    assert "did not answer" in job["error"]
+
+
+async def test_cancel_stops_the_model_call(monkeypatch, fake_acompletion):
+    _use_models(monkeypatch, [_model(1)])
+    fake_acompletion.replies["openai/m1"] = 5.0
+    job_id = rg.start_rubric_job(_assignment(), "inst@example.com")
+    await asyncio.sleep(0.01)
+    assert not rg.cancel_rubric_job(job_id, "other@example.com")
+    assert rg.cancel_rubric_job(job_id, "inst@example.com")
+    task = rg._jobs[job_id]["task"]
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert rg.get_rubric_job(job_id, "inst@example.com")["status"] == "cancelled"
+    assert not rg.cancel_rubric_job(job_id, "inst@example.com")
+
+
+def test_finished_jobs_expire(monkeypatch):
+    rg._jobs["old"] = {
+        "status": "done",
+        "owner": "inst@example.com",
+        "assignment_id": 7,
+        "categories": RUBRIC,
+        "finished": 0.0,
+    }
+    assert rg.get_rubric_job("old", "inst@example.com") is None
+    assert "old" not in rg._jobs
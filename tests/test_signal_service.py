@@ -203,3 +203,104 @@ def test_extract_text_only_when_sentiment_unavailable(monkeypatch):
     names = {s.name for s in signal_service.get_signals_for_draft(did)}
     assert "flesch_score" in names
     assert not any(n.startswith("sentiment_") for n in names)
+
+
+# ---- circuit breaker / backfill ----
+
+
+def _open_circuit(source):
+    circuit = signal_service.analyser_client.breaker(source)
+    for _ in range(circuit.threshold):
+        circuit.record_failure()
+    return circuit
+
+
+def test_open_circuit_defers_the_source_without_calling(monkeypatch):
+    from app.models.signals import signal_backfill
+
+    def unreachable(*args, **kwargs):
+        raise AssertionError("open circuit must short-circuit")
+
+    monkeypatch.setattr(signal_service.analyser_client, "analyse_text", unreachable)
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_citations", lambda t, **kw: None
+    )
+    _open_circuit("document-analyser")
+    did = _make_draft()
+    assert signal_service.extract_signals_for_draft(did) is False
+    rows = list(signal_backfill())
+    assert [(r.draft_id, r.source, r.reason) for r in rows] == [
+        (did, "document-analyser", "circuit_open")
+    ]
+
+
+def test_backfill_extracts_once_the_analyser_is_back(monkeypatch):
+    from app.models.signals import signal_backfill
+
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_citations", lambda t, **kw: None
+    )
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_sentiment", lambda text: None
+    )
+    circuit = _open_circuit("document-analyser")
+    did = _make_draft()
+    signal_service.extract_signals_for_draft(did)
+
+    # still open: left for the next run
+    assert signal_service.backfill_skipped_signals() == 0
+    assert signal_backfill.count == 1
+
+    circuit.record_success()
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_text", lambda text: SAMPLE
+    )
+    assert signal_service.backfill_skipped_signals() == 1
+    assert signal_backfill.count == 0
+    assert len(signal_service.get_signals_for_draft(did)) == 14
+
+
+def test_failed_request_is_deferred_but_empty_answer_is_not(monkeypatch):
+    from app.models.signals import signal_backfill
+
+    def failing(text):
+        signal_service.analyser_client.breaker("document-analyser").record_failure()
+
+    monkeypatch.setattr(signal_service.analyser_client, "analyse_text", failing)
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_citations", lambda t, **kw: None
+    )
+    did = _make_draft()
+    signal_service.extract_signals_for_draft(did)
+    assert [(r.source, r.reason) for r in signal_backfill()] == [
+        ("document-analyser", "request_failed")
+    ]
+
+
+def test_backfill_drops_drafts_whose_content_is_gone():
+    from app.models.feedback import drafts
+    from app.models.signals import signal_backfill
+
+    did = _make_draft()
+    signal_service._defer(did, "document-analyser", "circuit_open")
+    drafts.update({"content": ""}, pk_values=did)
+    assert signal_service.backfill_skipped_signals() == 0
+    assert signal_backfill.count == 0
+
+
+def test_backfill_limit_skips_drafts_still_waiting_on_a_down_analyser(monkeypatch):
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_text", lambda text: SAMPLE
+    )
+    monkeypatch.setattr(
+        signal_service.analyser_client, "analyse_sentiment", lambda text: None
+    )
+    _open_circuit("cite-sight")
+    waiting = _make_draft()
+    signal_service._defer(waiting, "cite-sight", "circuit_open")
+    recovered = _make_draft()
+    signal_service._defer(recovered, "document-analyser", "circuit_open")
+
+    assert signal_service.backfill_skipped_signals(limit=1) == 1
+    assert signal_service.get_signals_for_draft(recovered)
+    assert not signal_service.get_signals_for_draft(waiting)
@@ -0,0 +1,95 @@
+"""Tests for the persistent extracted-text cache."""
+
+import io
+
+import docx
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.utils import text_cache
+from app.utils.file_handlers import extract_file_content
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    text_cache.reset_stats()
+    yield
+    text_cache.reset_stats()
+
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    for p in paragraphs:
+        document.add_paragraph(p)
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+async def _extract_counting(calls, text):
+    calls.append(text)
+    return text
+
+
+async def test_second_extraction_of_same_bytes_is_a_hit():
+    calls = []
+    for _ in range(3):
+        got = await text_cache.extract_cached(
+            "abc", lambda: _extract_counting(calls, "parsed")
+        )
+        assert got == "parsed"
+    assert calls == ["parsed"]
+    stats = text_cache.cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == pytest.approx(0.667)
+    assert stats["entries"] == 1 and stats["bytes"] == len("parsed")
+
+
+async def test_failed_extraction_is_not_cached():
+    async def boom():
+        raise ValueError("timed out")
+
+    with pytest.raises(ValueError):
+        await text_cache.extract_cached("abc", boom)
+    assert text_cache.lookup("abc") is None
+
+
+async def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(text_cache, "TEXT_CACHE_MAX_BYTES", 25)
+    text_cache.store("a", "x" * 10)
+    text_cache.store("b", "y" * 10)
+    assert text_cache.lookup("a")  # "b" is now least recently used
+    text_cache.store("c", "z" * 10)
+    assert text_cache.lookup("b") is None
+    assert text_cache.lookup("a") and text_cache.lookup("c")
+    stats = text_cache.cache_stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= 25
+
+
+async def test_extract_file_content_reuses_cached_document_text(monkeypatch):
+    from app.utils import file_handlers
+
+    data = make_docx(["Assignment spec"])
+    first = await extract_file_content(UploadFile(io.BytesIO(data), filename="s.docx"))
+
+    async def no_parse(*args):
+        raise AssertionError("should have come from the cache")
+
+    monkeypatch.setattr(file_handlers, "run_extraction_job", no_parse)
+    again = await extract_file_content(UploadFile(io.BytesIO(data), filename="t.docx"))
+    assert first == again == "Assignment spec"
+    assert text_cache.cache_stats()["hits"] == 1
+
+
+async def test_rubric_spec_falls_back_to_cached_file_text(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services import rubric_generator
+
+    monkeypatch.setattr(rubric_generator, "SPEC_ROOT", tmp_path)
+    (tmp_path / "spec.docx").write_bytes(make_docx(["Write 500 words"]))
+    assignment = SimpleNamespace(spec_content=None, spec_file_path="spec.docx")
+
+    assert await rubric_generator.load_spec_text(assignment) == "Write 500 words"
+    assert await rubric_generator.load_spec_text(assignment) == "Write 500 words"
+    assert text_cache.cache_stats()["hits"] == 1
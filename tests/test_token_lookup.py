@@ -0,0 +1,106 @@
+"""Tests for indexed, expiring token lookup (verify, join, reset links)."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.user import User, find_user_by_token, users
+
+EMAIL = "token-user@test.local"
+
+
+def _iso(hours):
+    return (datetime.now() + timedelta(hours=hours)).isoformat()
+
+
+@pytest.fixture
+def account():
+    def make(**fields):
+        users.insert(
+            User(
+                email=EMAIL,
+                name="Token User",
+                password="x",
+                role="student",
+                verified=False,
+                approved=True,
+                status="active",
+                **fields,
+            ),
+            replace=True,
+        )
+        return users[EMAIL]
+
+    yield make
+    users.delete_where("email = ?", [EMAIL])
+
+
+def test_verification_token_resolves_until_it_expires(account):
+    account(verification_token="tok-v", verification_token_expiry=_iso(1))
+    assert find_user_by_token("tok-v").email == EMAIL
+    account(verification_token="tok-v", verification_token_expiry=_iso(-1))
+    assert find_user_by_token("tok-v") is None
+
+
+def test_verification_token_without_expiry_stays_valid(account):
+    account(verification_token="tok-legacy", verification_token_expiry="")
+    assert find_user_by_token("tok-legacy").email == EMAIL
+
+
+def test_reset_token_needs_a_live_expiry(account):
+    account(reset_token="tok-r", reset_token_expiry=_iso(1))
+    assert find_user_by_token("tok-r", "reset").email == EMAIL
+    assert find_user_by_token("tok-r") is None  # not a verification token
+    account(reset_token="tok-r", reset_token_expiry="")
+    assert find_user_by_token("tok-r", "reset") is None
+
+
+def test_empty_or_unknown_token_matches_nobody(account):
+    account(verification_token="", verification_token_expiry="")
+    assert find_user_by_token("") is None
+    assert find_user_by_token("no-such-token") is None
+
+
+@pytest.mark.parametrize("column", ["verification_token", "reset_token"])
+def test_token_lookup_uses_an_index(column):
+    plan = users.db.execute(
+        f"EXPLAIN QUERY PLAN SELECT * FROM users WHERE [{column}] = ?", ["x"]
+    ).fetchall()
+    assert any("USING INDEX" in str(row) for row in plan)
+
+
+# ---- invitation tokens ----
+
+
+def test_invite_creates_student_with_expiring_token():
+    from app.routes.instructor.students import invite_token_for
+
+    email = "invitee@test.local"
+    try:
+        token = invite_token_for(email)
+        student = users[email]
+        assert student.role == "student" and not student.verified
+        assert find_user_by_token(token).email == email
+        assert invite_token_for(email) == token  # still live: same link
+    finally:
+        users.delete_where("email = ?", [email])
+
+
+def test_invite_reissues_an_expired_token(account):
+    from app.routes.instructor.students import invite_token_for
+
+    account(verification_token="tok-old", verification_token_expiry=_iso(-1))
+    token = invite_token_for(EMAIL)
+    assert token != "tok-old"
+    assert find_user_by_token(token).email == EMAIL
+
+
+def test_invite_never_issues_a_token_for_a_registered_student(account):
+    from app.routes.instructor.students import invite_token_for
+
+    users.insert(
+        User(email=EMAIL, role="student", verified=True, verification_token=""),
+        replace=True,
+    )
+    assert invite_token_for(EMAIL) == ""
+    assert users[EMAIL].verification_token == ""
@@ -22,11 +22,37 @@ def test_extract_usage_reads_litellm_token_counts():
 def test_extract_usage_missing_usage_is_zeros():
     assert _extract_usage(SimpleNamespace(model="x")) == {
         "input_tokens": 0,
+        "cached_tokens": 0,
         "output_tokens": 0,
         "cost_usd": 0.0,
     }
 
 
+def test_extract_usage_reads_openai_cached_tokens():
+    resp = SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=1200,
+            completion_tokens=340,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=1024),
+        ),
+        model="x",
+    )
+    assert _extract_usage(resp)["cached_tokens"] == 1024
+
+
+def test_extract_usage_reads_anthropic_cache_reads():
+    resp = SimpleNamespace(
+        usage=SimpleNamespace(
+            prompt_tokens=1200,
+            completion_tokens=340,
+            prompt_tokens_details=None,
+            cache_read_input_tokens=900,
+        ),
+        model="x",
+    )
+    assert _extract_usage(resp)["cached_tokens"] == 900
+
+
 def _course(code="C1", title="Course", instructor="i@example.com"):
     from app.models.course import Course, courses
 
@@ -77,7 +103,7 @@ def _draft(assignment_id):
     )
 
 
-def _run(draft_id, model_id, inp=0, out=0, cost=0.0, status="complete"):
+def _run(draft_id, model_id, inp=0, out=0, cost=0.0, status="complete", cached=0):
     from app.models.feedback import ModelRun, model_runs
 
     return model_runs.insert(
@@ -90,6 +116,7 @@ def _run(draft_id, model_id, inp=0, out=0, cost=0.0, status="complete"):
             raw_response="",
             status=status,
             input_tokens=inp,
+            cached_tokens=cached,
             output_tokens=out,
             cost_usd=cost,
         )
@@ -100,12 +127,13 @@ def test_usage_for_assignment_sums_llm_runs():
     c = _course()
     a = _assignment(c.id)
     d = _draft(a.id)
-    _run(d.id, model_id=5, inp=1000, out=200, cost=0.012)
+    _run(d.id, model_id=5, inp=1000, out=200, cost=0.012, cached=800)
     _run(d.id, model_id=7, inp=500, out=100, cost=0.006)
 
     u = usage_report.usage_for_assignment(a.id)
     assert u["llm_runs"] == 2
     assert u["input_tokens"] == 1500
+    assert u["cached_tokens"] == 800
     assert u["output_tokens"] == 300
     assert u["cost_usd"] == 0.018
 
@@ -165,6 +193,7 @@ def test_empty_when_no_runs():
     assert usage_report.usage_for_assignment(a.id) == {
         "llm_runs": 0,
         "input_tokens": 0,
+        "cached_tokens": 0,
         "output_tokens": 0,
         "cost_usd": 0.0,
     }
@@ -0,0 +1,73 @@
+"""Tests for the identity cache and user injection in the auth decorators."""
+
+import inspect
+from datetime import datetime
+
+import pytest
+
+from app import login_required
+from app.models import user as user_model
+from app.models.user import User, get_user, invalidate_user, users
+
+EMAIL = "cache-user@test.local"
+
+
+@pytest.fixture
+def account():
+    users.insert(
+        User(
+            email=EMAIL,
+            name="Cache User",
+            password="x",
+            role="student",
+            verified=True,
+            approved=True,
+            status="active",
+            last_active=datetime.now().isoformat(),
+        )
+    )
+    yield EMAIL
+    users.delete_where("email = ?", [EMAIL])
+
+
+def test_get_user_serves_cached_row_until_invalidated(account):
+    assert get_user(account).name == "Cache User"
+    users.update({"name": "Changed"}, pk_values=account)
+    assert get_user(account).name == "Cache User"  # within the TTL
+    invalidate_user(account)
+    assert get_user(account).name == "Changed"
+
+
+def test_get_user_returns_private_copies(account):
+    first = get_user(account)
+    first.name = "Mutated in a handler"
+    assert get_user(account).name == "Cache User"
+
+
+def test_zero_ttl_disables_caching(account, monkeypatch):
+    monkeypatch.setattr(user_model, "USER_CACHE_TTL", 0)
+    get_user(account)
+    users.update({"name": "Changed"}, pk_values=account)
+    assert get_user(account).name == "Changed"
+
+
+def test_missing_user_is_none():
+    assert get_user("nobody@test.local") is None
+
+
+async def test_decorator_injects_user_and_hides_it_from_routing(account):
+    @login_required
+    def handler(session, user, draft_id: int):
+        return user.email, draft_id
+
+    assert list(inspect.signature(handler).parameters) == ["session", "draft_id"]
+    assert await handler({"auth": account}, 7) == (account, 7)
+
+
+async def test_handlers_without_user_param_are_unchanged(account):
+    @login_required
+    async def handler(session, draft_id: int):
+        return draft_id
+
+    assert list(inspect.signature(handler).parameters) == ["session", "draft_id"]
+    assert await handler({"auth": account}, 3) == 3
@@ -0,0 +1,27 @@
+"""
+Re-extract lens signals for drafts skipped while an analyser was down.
+
+Sources skipped because an analyser's circuit was open (or the health monitor
+reported it down) are queued in ``signal_backfill``; see
+app/services/signal_service.py. The health monitor runs this automatically
+once an analyser answers again; this script is for running it by hand.
+"""
+
+import argparse
+import os
+import sys
+
+# Make sure app is in path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from app.models.signals import signal_backfill
+from app.services.signal_service import backfill_skipped_signals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--limit", type=int, default=50, help="Drafts to process (default 50)"
+    )
+    args = parser.parse_args()
+    done = backfill_skipped_signals(limit=args.limit)
+    print(f"Backfilled signals for {done} draft(s); {signal_backfill.count} pending.")
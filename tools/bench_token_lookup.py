@@ -0,0 +1,74 @@
+"""
+Benchmark token-link lookup: full ``users()`` scan vs. the indexed lookup.
+
+Builds a throwaway database with ``--users`` accounts (default 100,000), each
+holding a verification token, then times resolving tokens the old way
+(iterate every user, compare) and through ``find_user_by_token``.
+
+    python tools/bench_token_lookup.py --users 100000 --lookups 200
+"""
+
+import argparse
+import os
+import secrets
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+
+def _ms(samples):
+    return f"p50 {statistics.median(samples) * 1e3:8.3f} ms   max {max(samples) * 1e3:8.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Token lookup benchmark")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument(
+        "--scan-lookups", type=int, default=5, help="Full scans to time (slow)"
+    )
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ["DATABASE_PATH"] = db_path
+    from app.models.user import find_user_by_token, users
+
+    expiry = "2999-01-01T00:00:00"
+    tokens = [secrets.token_urlsafe(32) for _ in range(args.users)]
+    started = time.perf_counter()
+    users.insert_all(
+        {
+            "email": f"user{i}@bench.local",
+            "role": "student",
+            "verified": False,
+            "verification_token": token,
+            "verification_token_expiry": expiry,
+        }
+        for i, token in enumerate(tokens)
+    )
+    print(f"Inserted {args.users:,} users in {time.perf_counter() - started:.1f}s")
+
+    probe = [secrets.choice(tokens) for _ in range(args.lookups)]
+
+    scan = []
+    for token in probe[: args.scan_lookups]:
+        t0 = time.perf_counter()
+        next(u for u in users() if u.verification_token == token)
+        scan.append(time.perf_counter() - t0)
+
+    indexed = []
+    for token in probe:
+        t0 = time.perf_counter()
+        assert find_user_by_token(token) is not None
+        indexed.append(time.perf_counter() - t0)
+
+    print(f"full scan ({len(scan)} lookups):    {_ms(scan)}")
+    print(f"indexed   ({len(indexed)} lookups):  {_ms(indexed)}")
+    os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
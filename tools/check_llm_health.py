@@ -2,6 +2,10 @@
 """
 Health check script for LLM providers
 Verifies connectivity and functionality of all configured AI models
+
+Providers are probed concurrently, each with its own deadline, so a full
+check takes about as long as the slowest provider. --json prints a single
+machine-readable document (per-provider status and p50/p90/max latency).
 """
 
 import asyncio
@@ -9,19 +13,17 @@ import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime
 
 # Add app to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from dotenv import load_dotenv
-from litellm import completion
 from rich import box
 from rich.console import Console
 from rich.table import Table
 
-from app.models.feedback import AIModel, ai_models
-
 # Configure logging
 logging.basicConfig(
     level=logging.WARNING,  # Reduce noise from litellm
@@ -35,122 +37,33 @@ console = Console()
 class LLMHealthChecker:
     """Check health status of all LLM providers"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        probes: int = 3,
+        deadline: float = 15.0,
+        concurrency: int = 8,
+    ):
         load_dotenv()
+        self.probes = probes
+        self.deadline = deadline
+        self.concurrency = concurrency
         self.results = []
 
-    async def check_provider(self, model: AIModel) -> dict:
-        """Check a single provider's health"""
-        start_time = datetime.now()
-
-        result = {
-            "provider": model.provider,
-            "model": model.model_id,
-            "name": model.name,
-            "status": "checking",
-            "response_time": None,
-            "error": None,
-            "has_api_key": False,
-        }
-
-        try:
-            # Check for API key
-            json.loads(model.api_config)
-
-            # Check environment for API key
-            env_var_map = {
-                "OpenAI": "OPENAI_API_KEY",
-                "Anthropic": "ANTHROPIC_API_KEY",
-                "Google": "GOOGLE_API_KEY",
-                "Groq": "GROQ_API_KEY",
-                "Ollama": "OLLAMA_API_BASE",
-            }
-
-            env_var = env_var_map.get(model.provider)
-            if env_var:
-                api_key = os.environ.get(env_var)
-                result["has_api_key"] = bool(api_key)
-
-                if not api_key and model.provider != "Ollama":
-                    result["status"] = "no_api_key"
-                    result["error"] = f"Missing {env_var}"
-                    return result
-
-            # Build model string for LiteLLM
-            if model.provider.lower() == "openai":
-                model_string = model.model_id
-            elif model.provider.lower() == "anthropic":
-                model_string = f"anthropic/{model.model_id}"
-            elif model.provider.lower() == "google":
-                model_string = f"gemini/{model.model_id}"
-            elif model.provider.lower() == "groq":
-                model_string = f"groq/{model.model_id}"
-            elif model.provider.lower() == "ollama":
-                model_string = f"ollama/{model.model_id}"
-            else:
-                model_string = model.model_id
-
-            # Test with a simple prompt
-            test_prompt = "Respond with exactly: OK"
-
-            response = await completion(
-                model=model_string,
-                messages=[{"role": "user", "content": test_prompt}],
-                max_tokens=10,
-                temperature=0,
-                timeout=10,
-            )
-
-            # Calculate response time
-            end_time = datetime.now()
-            response_time = (end_time - start_time).total_seconds()
-
-            if response and response.choices:
-                result["status"] = "healthy"
-                result["response_time"] = round(response_time, 2)
-            else:
-                result["status"] = "unhealthy"
-                result["error"] = "No response received"
-
-        except Exception as e:
-            error_msg = str(e)
-
-            # Categorize the error
-            if "api_key" in error_msg.lower() or "unauthorized" in error_msg.lower():
-                result["status"] = "auth_error"
-                result["error"] = "Invalid API key"
-            elif "rate limit" in error_msg.lower():
-                result["status"] = "rate_limit"
-                result["error"] = "Rate limit exceeded"
-            elif "connection" in error_msg.lower() or "refused" in error_msg.lower():
-                result["status"] = "connection_error"
-                if model.provider.lower() == "ollama":
-                    result["error"] = "Ollama not running"
-                else:
-                    result["error"] = "Connection failed"
-            elif "model" in error_msg.lower() and "not found" in error_msg.lower():
-                result["status"] = "model_error"
-                result["error"] = "Model not available"
-            else:
-                result["status"] = "error"
-                result["error"] = error_msg[:50]  # Truncate long errors
-
-        return result
-
     async def check_all_providers(self) -> list[dict]:
-        """Check all configured providers"""
-        models = ai_models()
-        active_models = [m for m in models if m.active]
+        """Probe every active model concurrently (see app/services/llm_health.py)"""
+        from app.models.config import ai_models
+        from app.services.llm_health import check_models
 
+        active_models = [m for m in ai_models() if m.active]
         if not active_models:
-            console.print("[yellow]No active AI models configured[/yellow]")
             return []
 
-        # Run checks concurrently
-        tasks = [self.check_provider(model) for model in active_models]
-        results = await asyncio.gather(*tasks)
-
-        return results
+        return await check_models(
+            active_models,
+            probes=self.probes,
+            deadline=self.deadline,
+            concurrency=self.concurrency,
+        )
 
     def display_results(self, results: list[dict]):
         """Display results in a formatted table"""
@@ -159,7 +72,7 @@ class LLMHealthChecker:
         table.add_column("Provider", style="cyan", no_wrap=True)
         table.add_column("Model", style="magenta")
         table.add_column("Status", style="bold")
-        table.add_column("Response Time", justify="right")
+        table.add_column("p50 / p90", justify="right")
         table.add_column("API Key", style="dim")
         table.add_column("Error", style="red")
 
@@ -172,14 +85,16 @@ class LLMHealthChecker:
             "rate_limit": "[yellow]⏱️ Rate Limited[/yellow]",
             "connection_error": "[red]🔌 Connection Error[/red]",
             "model_error": "[yellow]❓ Model Error[/yellow]",
+            "timeout": "[red]⌛ Timed Out[/red]",
             "error": "[red]❌ Error[/red]",
             "checking": "[yellow]🔄 Checking...[/yellow]",
         }
 
         for result in results:
             status_display = status_symbols.get(result["status"], result["status"])
+            latency = result["latency"]
             response_time = (
-                f"{result['response_time']}s" if result["response_time"] else "-"
+                f"{latency['p50']:.2f}s / {latency['p90']:.2f}s" if latency else "-"
             )
             api_key_status = "✅" if result["has_api_key"] else "❌"
             error = result["error"] or "-"
@@ -229,6 +144,8 @@ class LLMHealthChecker:
                 console.print(f"\n[dim]Check performed at: {timestamp}[/dim]")
 
                 results = await self.check_all_providers()
+                if not results:
+                    console.print("[yellow]No active AI models configured[/yellow]")
                 self.display_results(results)
 
                 # Wait for next check
@@ -256,28 +173,62 @@ async def main():
     parser.add_argument(
         "--json", "-j", action="store_true", help="Output results as JSON"
     )
+    parser.add_argument(
+        "--probes",
+        type=int,
+        default=3,
+        help="Probe requests per provider, for latency percentiles (default: 3)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=15.0,
+        help="Seconds allowed per provider, all probes together (default: 15)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Providers probed at the same time (default: 8)",
+    )
 
     args = parser.parse_args()
 
-    checker = LLMHealthChecker()
+    checker = LLMHealthChecker(
+        probes=args.probes, deadline=args.deadline, concurrency=args.concurrency
+    )
 
     if args.monitor:
         await checker.continuous_monitoring(args.interval)
+    elif args.json:
+        # Machine-readable: nothing but the JSON document on stdout
+        started = time.perf_counter()
+        results = await checker.check_all_providers()
+        print(
+            json.dumps(
+                {
+                    "checked_at": datetime.now().isoformat(),
+                    "elapsed_seconds": round(time.perf_counter() - started, 3),
+                    "providers": results,
+                },
+                indent=2,
+            )
+        )
+        sys.exit(0 if all(r["status"] == "healthy" for r in results) else 1)
     else:
         console.print("[bold]🏥 LLM Provider Health Check[/bold]\n")
 
         with console.status("[yellow]Checking providers...[/yellow]", spinner="dots"):
             results = await checker.check_all_providers()
 
-        if args.json:
-            # Output as JSON for automation
-            print(json.dumps(results, indent=2))
-        else:
-            # Display formatted table
-            all_healthy = checker.display_results(results)
+        if not results:
+            console.print("[yellow]No active AI models configured[/yellow]")
+
+        # Display formatted table
+        all_healthy = checker.display_results(results)
 
-            # Exit with appropriate code
-            sys.exit(0 if all_healthy else 1)
+        # Exit with appropriate code
+        sys.exit(0 if all_healthy else 1)
 
 
 if __name__ == "__main__":
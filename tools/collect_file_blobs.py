@@ -0,0 +1,18 @@
+"""
+Delete stored upload blobs that no submission references any more.
+
+Blobs are kept while any ``submission_files`` row without ``removed_at``
+points at them; see app/services/file_store.py. Safe to run on a schedule.
+"""
+
+import os
+import sys
+
+# Make sure app is in path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from app.services.file_store import collect_garbage
+
+if __name__ == "__main__":
+    count = collect_garbage()
+    print(f"Removed {count} unreferenced upload blobs.")
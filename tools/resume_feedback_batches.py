@@ -0,0 +1,25 @@
+"""
+Collect the results of batch feedback jobs that are still pending.
+
+A batch run stops polling after FEEDBACK_BATCH_TIMEOUT and leaves its jobs in
+``feedback_batches``; the app also resumes them at startup. This polls every
+unfinished job until it completes (or the timeout passes again) and moves its
+drafts out of "processing". See app/services/feedback_batch.py.
+"""
+
+import asyncio
+import os
+import sys
+
+# Make sure app is in path
+sys.path.insert(0, os.path.abspath(os.path.dirname(os.path.dirname(__file__))))
+
+from app.models.feedback import feedback_batches
+from app.services.feedback_batch import resume_pending_batches
+from app.utils.db_query import count
+
+if __name__ == "__main__":
+    pending = count(feedback_batches, completed_at="")
+    asyncio.run(resume_pending_batches())
+    left = count(feedback_batches, completed_at="")
+    print(f"Resumed {pending} feedback batch job(s); {left} still pending.")